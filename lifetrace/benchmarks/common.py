@@ -0,0 +1,100 @@
+"""
+基准测试公共工具
+提供样本图片收集、字符错误率（CER）计算和耗时统计等函数
+"""
+
+import os
+import statistics
+from pathlib import Path
+
+from lifetrace.util.config import config
+
+# 支持的图片扩展名
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".bmp"}
+
+
+def collect_images(directory: str | None = None, limit: int = 50) -> list[str]:
+    """收集样本图片路径（按文件名排序，结果稳定可复现）
+
+    Args:
+        directory: 图片目录，None 时使用截图目录
+        limit: 最多返回的图片数量，0 表示不限制
+
+    Returns:
+        图片路径列表
+    """
+    directory = directory or config.screenshots_dir
+    if not os.path.isdir(directory):
+        return []
+
+    paths = sorted(
+        str(p) for p in Path(directory).rglob("*") if p.suffix.lower() in IMAGE_EXTENSIONS
+    )
+    return paths[:limit] if limit else paths
+
+
+def levenshtein(a: str, b: str) -> int:
+    """计算两个字符串的编辑距离"""
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a)
+
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,  # 删除
+                    current[j - 1] + 1,  # 插入
+                    previous[j - 1] + (ca != cb),  # 替换
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+def normalize_text(text: str) -> str:
+    """归一化OCR文本（去除空白），避免换行差异影响CER"""
+    return "".join(text.split())
+
+
+def character_error_rate(reference: str, hypothesis: str) -> float:
+    """计算字符错误率 CER = 编辑距离 / 参考文本长度
+
+    Args:
+        reference: 参考文本（全质量路径的识别结果或真实文本）
+        hypothesis: 待评估的识别结果
+
+    Returns:
+        字符错误率，参考文本为空时，结果为空返回0，否则返回1
+    """
+    reference = normalize_text(reference)
+    hypothesis = normalize_text(hypothesis)
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+    return levenshtein(reference, hypothesis) / len(reference)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """计算百分位数（线性插值）"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lower = int(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+def summarize_timings(values_ms: list[float]) -> dict:
+    """汇总耗时统计（毫秒）"""
+    if not values_ms:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0}
+    return {
+        "count": len(values_ms),
+        "mean": statistics.fmean(values_ms),
+        "p50": percentile(values_ms, 50),
+        "p95": percentile(values_ms, 95),
+    }
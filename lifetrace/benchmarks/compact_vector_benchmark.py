@@ -0,0 +1,193 @@
+"""
+紧凑向量存储基准测试
+比较不同维度缩减方式（截断 / PCA）与存储精度（float32 / float16 / int8）下的
+召回率（相对全维度 float32 精确检索的 recall@k）、每个向量占用的字节数和单次查询耗时，
+并给出先用紧凑向量召回 k × rescore_factor 个候选、再用全维度向量重排后的召回率。
+
+向量来自嵌入模型编码的合成 OCR 文本；加 --synthetic 时使用随机生成的各向异性向量，
+不需要加载模型。检索为 numpy 暴力检索（低精度向量还原为 float32 后计算），只反映向量本身的差异。
+
+用法:
+    python -m lifetrace.benchmarks.compact_vector_benchmark --docs 5000 --dims 128,256
+    python -m lifetrace.benchmarks.compact_vector_benchmark --synthetic --docs 20000
+"""
+
+import argparse
+import json
+import random
+import time
+
+import numpy as np
+
+from lifetrace.benchmarks.common import summarize_timings
+from lifetrace.benchmarks.embedding_benchmark import DEFAULT_SEED, generate_texts
+from lifetrace.llm.vector_compression import dequantize_int8, fit_pca, normalize, quantize_int8
+from lifetrace.util.config import config
+
+
+def synthetic_vectors(count: int, dim: int, seed: int) -> np.ndarray:
+    """生成各向异性的随机向量（方差集中在少数方向上，接近真实嵌入的分布）"""
+    rng = np.random.default_rng(seed)
+    scales = 1.0 / np.sqrt(np.arange(1, dim + 1))
+    return normalize(rng.standard_normal((count, dim)).astype(np.float32) * scales)
+
+
+def encode_texts(model_name: str, docs: int, queries: int, seed: int) -> tuple:
+    """用嵌入模型编码合成文档和查询（查询取文档中的一行）"""
+    from sentence_transformers import SentenceTransformer
+
+    texts = generate_texts(docs, seed)
+    rng = random.Random(seed)
+    query_texts = [rng.choice(rng.choice(texts).split("\n")) for _ in range(queries)]
+
+    model = SentenceTransformer(model_name, device="cpu")
+    doc_vectors = model.encode(texts, batch_size=64, normalize_embeddings=True)
+    query_vectors = model.encode(query_texts, batch_size=64, normalize_embeddings=True)
+    return np.asarray(doc_vectors, np.float32), np.asarray(query_vectors, np.float32)
+
+
+def _reduce(vectors: np.ndarray, reduction: str, dims: int, pca) -> np.ndarray:
+    if reduction == "none":
+        return vectors
+    if reduction == "pca":
+        mean, components = pca
+        return normalize((vectors - mean) @ components.T)
+    return normalize(vectors[:, :dims])
+
+
+def _store(vectors: np.ndarray, precision: str) -> tuple[np.ndarray, int]:
+    """按存储精度还原出检索用的向量，并返回每个向量的字节数"""
+    dim = vectors.shape[1]
+    if precision == "int8":
+        codes, scales = quantize_int8(vectors)
+        return dequantize_int8(codes, scales), dim + 4
+    if precision == "float16":
+        return vectors.astype(np.float16).astype(np.float32), dim * 2
+    return vectors, dim * 4
+
+
+def _recall(found: np.ndarray, truth: np.ndarray) -> float:
+    k = truth.shape[1]
+    hits = sum(len(set(f[:k]) & set(t)) for f, t in zip(found, truth, strict=True))
+    return hits / truth.size
+
+
+def run_benchmark(
+    doc_vectors: np.ndarray,
+    query_vectors: np.ndarray,
+    dims_list: list[int],
+    k: int,
+    rescore_factor: int,
+) -> list[dict]:
+    """运行基准测试
+
+    Returns:
+        每种配置的召回率、重排后召回率、字节数和查询耗时
+    """
+    exact_scores = query_vectors @ doc_vectors.T
+    truth = np.argsort(-exact_scores, axis=1)[:, :k]
+    candidates_k = min(k * rescore_factor, len(doc_vectors))
+
+    configs = [("none", doc_vectors.shape[1])]
+    for dims in dims_list:
+        if dims < doc_vectors.shape[1]:
+            configs += [("truncate", dims), ("pca", dims)]
+
+    results = []
+    for reduction, dims in configs:
+        pca = fit_pca(doc_vectors, dims) if reduction == "pca" else None
+        reduced_docs = _reduce(doc_vectors, reduction, dims, pca)
+        reduced_queries = _reduce(query_vectors, reduction, dims, pca)
+        for precision in ("float32", "float16", "int8"):
+            stored, bytes_per_vector = _store(reduced_docs, precision)
+
+            timings = []
+            candidates = []
+            for query in reduced_queries:
+                start = time.perf_counter()
+                scores = stored @ query
+                top = np.argpartition(-scores, candidates_k - 1)[:candidates_k]
+                candidates.append(top[np.argsort(-scores[top])])
+                timings.append((time.perf_counter() - start) * 1000)
+            candidates = np.array(candidates)
+
+            # 用全维度向量对候选重新打分
+            rescored = np.array(
+                [
+                    cand[np.argsort(-(doc_vectors[cand] @ query))]
+                    for cand, query in zip(candidates, query_vectors, strict=True)
+                ]
+            )
+            results.append(
+                {
+                    "reduction": reduction,
+                    "dims": dims,
+                    "precision": precision,
+                    "bytes_per_vector": bytes_per_vector,
+                    "index_mb": bytes_per_vector * len(doc_vectors) / 1024 / 1024,
+                    f"recall@{k}": _recall(candidates, truth),
+                    f"recall@{k}_rescored": _recall(rescored, truth),
+                    "query_ms": summarize_timings(timings),
+                }
+            )
+    return results
+
+
+def print_report(results: list[dict], k: int, docs: int):
+    """输出基准测试报告"""
+    print(f"文档数: {docs}")
+    print(
+        f"{'缩减':<10}{'维度':>6}{'精度':>9}{'字节/向量':>11}{'索引MB':>9}"
+        f"{f'recall@{k}':>12}{'重排后':>9}{'查询ms':>9}"
+    )
+    for item in results:
+        print(
+            f"{item['reduction']:<10}{item['dims']:>6}{item['precision']:>9}"
+            f"{item['bytes_per_vector']:>11}{item['index_mb']:>9.1f}"
+            f"{item[f'recall@{k}']:>12.3f}{item[f'recall@{k}_rescored']:>9.3f}"
+            f"{item['query_ms']['mean']:>9.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LifeTrace 紧凑向量存储基准测试")
+    parser.add_argument("--model", help="嵌入模型（默认读取 vector_db.embedding_model）")
+    parser.add_argument("--synthetic", action="store_true", help="使用随机向量，不加载模型")
+    parser.add_argument("--synthetic-dim", type=int, default=768, help="随机向量的维度")
+    parser.add_argument("--docs", type=int, default=5000, help="文档数量")
+    parser.add_argument("--queries", type=int, default=200, help="查询数量")
+    parser.add_argument("--dims", default="128,256,384", help="缩减后的维度列表，用逗号分隔")
+    parser.add_argument("--k", type=int, default=10, help="recall@k 的 k")
+    parser.add_argument(
+        "--rescore-factor",
+        type=int,
+        help="重排候选倍数（默认读取 vector_db.compact_rescore_factor）",
+    )
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="随机种子")
+    parser.add_argument("--json", help="将结果写入JSON文件")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        vectors = synthetic_vectors(args.docs + args.queries, args.synthetic_dim, args.seed)
+        doc_vectors = vectors[: args.docs]
+        # 查询为文档向量加噪声，保证存在明确的近邻
+        rng = np.random.default_rng(args.seed + 1)
+        picked = doc_vectors[rng.integers(0, args.docs, args.queries)]
+        query_vectors = normalize(picked + 0.5 * vectors[args.docs :])
+    else:
+        model_name = args.model or config.get("vector_db.embedding_model")
+        doc_vectors, query_vectors = encode_texts(model_name, args.docs, args.queries, args.seed)
+
+    dims_list = [int(dims) for dims in args.dims.split(",")]
+    rescore_factor = args.rescore_factor or config.get("vector_db.compact_rescore_factor")
+    results = run_benchmark(doc_vectors, query_vectors, dims_list, args.k, rescore_factor)
+    print_report(results, args.k, len(doc_vectors))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
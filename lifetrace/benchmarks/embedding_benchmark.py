@@ -0,0 +1,141 @@
+"""
+嵌入编码基准测试
+在 CPU 上比较逐条编码（batch=1，原 add_document 的方式）与批量编码的吞吐量。
+批量编码与 VectorDatabase 的写入方式一致：按 write_batch_size 分块，每块调用一次模型；
+可选择分块前是否按长度全局排序。文本为长短不一的合成 OCR 文本（代码、网页段落、中文聊天）。
+
+用法:
+    python -m lifetrace.benchmarks.embedding_benchmark --docs 512
+    python -m lifetrace.benchmarks.embedding_benchmark --batch-sizes 8,32,64 --no-sort
+"""
+
+import argparse
+import json
+import random
+import time
+
+from lifetrace.benchmarks.fixtures import CJK_PHRASES, CODE_LINES, LATIN_WORDS
+from lifetrace.util.config import config
+
+# 默认随机种子
+DEFAULT_SEED = 20240601
+
+
+def generate_texts(count: int, seed: int = DEFAULT_SEED) -> list[str]:
+    """生成长度分布接近真实截图OCR结果的文本（几个词到上千字符）"""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        lines = rng.choice([2, 5, 20, 60])
+        kind = rng.choice(["code", "latin", "cjk"])
+        if kind == "code":
+            parts = [rng.choice(CODE_LINES) for _ in range(lines)]
+        elif kind == "latin":
+            parts = [" ".join(rng.sample(LATIN_WORDS, rng.randint(4, 9))) for _ in range(lines)]
+        else:
+            parts = [rng.choice(CJK_PHRASES) for _ in range(lines)]
+        texts.append("\n".join(parts))
+    return texts
+
+
+def _encode_batched(
+    model, texts: list[str], batch_size: int, chunk_size: int, sort_by_length: bool
+):
+    """分块批量编码（sentence-transformers 只在单次调用内排序，跨块排序需要在调用前完成）"""
+    if sort_by_length:
+        texts = sorted(texts, key=len)
+    for start in range(0, len(texts), chunk_size):
+        model.encode(
+            texts[start : start + chunk_size], batch_size=batch_size, normalize_embeddings=True
+        )
+
+
+def run_benchmark(
+    model_name: str,
+    texts: list[str],
+    batch_sizes: list[int],
+    chunk_size: int,
+    sort_by_length: bool = True,
+) -> dict:
+    """运行基准测试
+
+    Returns:
+        逐条编码和各批大小下的吞吐量（文档/秒）
+    """
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, device="cpu")
+    # 预热一次，避免首次推理的初始化开销计入
+    model.encode(texts[:4], normalize_embeddings=True)
+
+    start = time.perf_counter()
+    for text in texts:
+        model.encode(text, normalize_embeddings=True)
+    single_seconds = time.perf_counter() - start
+
+    results = {
+        "model": model_name,
+        "docs": len(texts),
+        "avg_chars": sum(len(t) for t in texts) / len(texts),
+        "chunk_size": chunk_size,
+        "sort_by_length": sort_by_length,
+        "single": {"seconds": single_seconds, "docs_per_second": len(texts) / single_seconds},
+        "batched": {},
+    }
+    for batch_size in batch_sizes:
+        start = time.perf_counter()
+        _encode_batched(model, texts, batch_size, chunk_size, sort_by_length)
+        seconds = time.perf_counter() - start
+        results["batched"][batch_size] = {
+            "seconds": seconds,
+            "docs_per_second": len(texts) / seconds,
+            "speedup": single_seconds / seconds,
+        }
+    return results
+
+
+def print_report(result: dict):
+    """输出基准测试报告"""
+    print(f"模型: {result['model']}")
+    print(f"文档数: {result['docs']}，平均长度 {result['avg_chars']:.0f} 字符")
+    print(f"逐条编码: {result['single']['docs_per_second']:.1f} 文档/秒")
+    sort_text = "按长度排序" if result["sort_by_length"] else "不排序"
+    print(f"分块大小: {result['chunk_size']}（{sort_text}）")
+    for batch_size, item in result["batched"].items():
+        print(
+            f"批量编码 batch={batch_size:<4}: "
+            f"{item['docs_per_second']:.1f} 文档/秒，加速 {item['speedup']:.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LifeTrace 嵌入编码基准测试")
+    parser.add_argument("--model", help="嵌入模型（默认读取 vector_db.embedding_model）")
+    parser.add_argument("--docs", type=int, default=256, help="文档数量")
+    parser.add_argument("--batch-sizes", default="8,16,32,64", help="批大小列表，用逗号分隔")
+    parser.add_argument(
+        "--chunk-size", type=int, help="分块大小（默认读取 vector_db.write_batch_size）"
+    )
+    parser.add_argument(
+        "--no-sort", dest="sort_by_length", action="store_false", help="批量编码前不按长度排序"
+    )
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="随机种子")
+    parser.add_argument("--json", help="将结果写入JSON文件")
+    args = parser.parse_args()
+
+    model_name = args.model or config.get("vector_db.embedding_model")
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+    texts = generate_texts(args.docs, args.seed)
+
+    chunk_size = args.chunk_size or config.get("vector_db.write_batch_size")
+    result = run_benchmark(model_name, texts, batch_sizes, chunk_size, args.sort_by_length)
+    print_report(result)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+合成桌面截图样本集
+离线、确定性地渲染若干典型桌面场景（代码编辑器、网页、聊天窗口、中英混排、深色模式），
+每张图片附带真实文本，用于 OCR 基准测试的字符错误率计算。
+
+用法:
+    python -m lifetrace.benchmarks.fixtures --output data/ocr_fixtures
+"""
+
+import argparse
+import json
+import os
+import random
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFont
+
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+# 默认样本集目录
+DEFAULT_CORPUS_DIR = "data/ocr_fixtures"
+
+# 默认分辨率
+DEFAULT_RESOLUTIONS = [(1280, 720), (1920, 1080), (2560, 1440)]
+
+# 默认随机种子（保证每次生成的样本完全一致）
+DEFAULT_SEED = 20240601
+
+# 样本清单文件名
+MANIFEST_NAME = "manifest.json"
+
+# 候选字体（按平台常见位置），第一个可用的字体会被使用
+LATIN_FONT_CANDIDATES = [
+    "DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/System/Library/Fonts/Helvetica.ttc",
+    "C:/Windows/Fonts/arial.ttf",
+]
+MONO_FONT_CANDIDATES = [
+    "DejaVuSansMono.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
+    "/System/Library/Fonts/Menlo.ttc",
+    "C:/Windows/Fonts/consola.ttf",
+]
+CJK_FONT_CANDIDATES = [
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/System/Library/Fonts/PingFang.ttc",
+    "/System/Library/Fonts/STHeiti Light.ttc",
+    "C:/Windows/Fonts/msyh.ttc",
+    "C:/Windows/Fonts/simhei.ttf",
+]
+
+CODE_LINES = [
+    "def process_screenshot(screenshot_id: int) -> bool:",
+    "    result = ocr_engine(image_array)",
+    "    if not result:",
+    "        return False",
+    "    text = extract_text(result, threshold=0.5)",
+    "    save_to_database(screenshot_id, text)",
+    "class EventManager:",
+    "    def get_active_event(self, app_name):",
+    "import numpy as np",
+    "from datetime import datetime, timedelta",
+    "for item in batch:",
+    "    queue.put_nowait(item)",
+    "logger.info(f'processed {count} items')",
+    "return {'status': 'ok', 'count': total}",
+]
+LATIN_WORDS = (
+    "screen activity timeline search project meeting report weekly summary design "
+    "review release notes update customer feedback budget schedule document browser"
+).split()
+CJK_PHRASES = (
+    "今天的会议纪要 项目进度汇报 请查看附件 下午三点开会 需求评审 用户反馈汇总 本周工作总结 "
+    "发布计划 数据分析报告 屏幕时间统计 好的，收到 明天见 这个问题已经修复 我们再讨论一下"
+).split()
+
+
+def _find_font(candidates: list[str], size: int) -> ImageFont.FreeTypeFont | None:
+    """按候选列表查找可用字体"""
+    for candidate in candidates:
+        try:
+            return ImageFont.truetype(candidate, size)
+        except OSError:
+            continue
+    return None
+
+
+def _get_fonts(size: int) -> dict:
+    """获取各类字体，缺失的字体回退到 Pillow 内置字体（CJK 除外）"""
+    fallback = ImageFont.load_default(size)
+    return {
+        "latin": _find_font(LATIN_FONT_CANDIDATES, size) or fallback,
+        "mono": _find_font(MONO_FONT_CANDIDATES, size) or fallback,
+        "cjk": _find_font(CJK_FONT_CANDIDATES, size),
+    }
+
+
+def _sentence(rng: random.Random, min_words: int = 4, max_words: int = 9) -> str:
+    """生成随机英文句子"""
+    words = rng.sample(LATIN_WORDS, rng.randint(min_words, max_words))
+    return " ".join(words).capitalize()
+
+
+def _draw_lines(draw, lines, x, y, font, fill, line_height) -> list[str]:
+    """逐行绘制文本并返回真实文本"""
+    for line in lines:
+        draw.text((x, y), line, font=font, fill=fill)
+        y += line_height
+    return lines
+
+
+def _render_editor(width, height, fonts, rng, dark=False) -> tuple[Image.Image, list[str]]:
+    """代码编辑器场景"""
+    if dark:
+        bg, fg, gutter = (30, 30, 30), (212, 212, 212), (45, 45, 45)
+    else:
+        bg, fg, gutter = (255, 255, 255), (30, 30, 30), (240, 240, 240)
+    img = Image.new("RGB", (width, height), bg)
+    draw = ImageDraw.Draw(img)
+    font = fonts["mono"]
+    line_height = int(font.size * 1.6)
+
+    draw.rectangle([0, 0, width // 6, height], fill=gutter)
+    count = max(1, (height - 40) // line_height)
+    lines = [rng.choice(CODE_LINES) for _ in range(count)]
+    _draw_lines(draw, lines, width // 6 + 20, 20, font, fg, line_height)
+    return img, lines
+
+
+def _render_browser(width, height, fonts, rng) -> tuple[Image.Image, list[str]]:
+    """网页场景：地址栏、标题和段落"""
+    img = Image.new("RGB", (width, height), (255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    font = fonts["latin"]
+    line_height = int(font.size * 1.7)
+
+    draw.rectangle([0, 0, width, line_height + 20], fill=(230, 230, 235))
+    url = f"https://example.com/{rng.choice(LATIN_WORDS)}/{rng.choice(LATIN_WORDS)}"
+    lines = [url]
+    draw.text((20, 10), url, font=font, fill=(60, 60, 60))
+
+    y = line_height + 50
+    title = _sentence(rng, 3, 5)
+    title_font = font.font_variant(size=int(font.size * 1.6))
+    draw.text((60, y), title, font=title_font, fill=(20, 20, 20))
+    lines.append(title)
+    y += int(title_font.size * 1.8)
+
+    while y + line_height < height - 20:
+        line = _sentence(rng)
+        draw.text((60, y), line, font=font, fill=(40, 40, 40))
+        lines.append(line)
+        y += line_height
+    return img, lines
+
+
+def _render_chat(width, height, fonts, rng) -> tuple[Image.Image, list[str]]:
+    """聊天窗口场景：左右交替的气泡"""
+    img = Image.new("RGB", (width, height), (237, 237, 237))
+    draw = ImageDraw.Draw(img)
+    font = fonts["cjk"] or fonts["latin"]
+    phrases = CJK_PHRASES if fonts["cjk"] else LATIN_WORDS
+    line_height = int(font.size * 1.6)
+
+    lines = []
+    y = 30
+    left = True
+    while y + line_height * 2 < height - 20:
+        text = rng.choice(phrases) if fonts["cjk"] else _sentence(rng, 2, 5)
+        text_width = int(draw.textlength(text, font=font))
+        x = 40 if left else width - text_width - 80
+        color = (255, 255, 255) if left else (149, 236, 105)
+        draw.rounded_rectangle(
+            [x - 15, y - 8, x + text_width + 15, y + line_height], radius=8, fill=color
+        )
+        draw.text((x, y), text, font=font, fill=(20, 20, 20))
+        lines.append(text)
+        y += line_height + 30
+        left = not left
+    return img, lines
+
+
+def _render_mixed(width, height, fonts, rng) -> tuple[Image.Image, list[str]]:
+    """中英混排文档场景"""
+    img = Image.new("RGB", (width, height), (250, 250, 248))
+    draw = ImageDraw.Draw(img)
+    font = fonts["cjk"]
+    line_height = int(font.size * 1.8)
+
+    lines = []
+    y = 40
+    while y + line_height < height - 20:
+        line = f"{rng.choice(CJK_PHRASES)} {rng.choice(LATIN_WORDS)} {rng.randint(1, 999)}"
+        draw.text((60, y), line, font=font, fill=(30, 30, 30))
+        lines.append(line)
+        y += line_height
+    return img, lines
+
+
+def _scenes(fonts) -> dict:
+    """可用的场景（没有中文字体时跳过中英混排场景）"""
+    scenes = {
+        "editor": lambda w, h, rng: _render_editor(w, h, fonts, rng),
+        "editor_dark": lambda w, h, rng: _render_editor(w, h, fonts, rng, dark=True),
+        "browser": lambda w, h, rng: _render_browser(w, h, fonts, rng),
+        "chat": lambda w, h, rng: _render_chat(w, h, fonts, rng),
+    }
+    if fonts["cjk"]:
+        scenes["mixed_cjk"] = lambda w, h, rng: _render_mixed(w, h, fonts, rng)
+    else:
+        logger.warning("未找到中文字体，跳过中英混排场景，聊天场景使用英文")
+    return scenes
+
+
+def generate_corpus(
+    output_dir: str,
+    resolutions: list[tuple[int, int]] | None = None,
+    seed: int = DEFAULT_SEED,
+) -> list[dict]:
+    """生成样本集并写入清单
+
+    Args:
+        output_dir: 输出目录
+        resolutions: 分辨率列表
+        seed: 随机种子
+
+    Returns:
+        样本列表，每项包含 path、text、scene、width、height
+    """
+    resolutions = resolutions or DEFAULT_RESOLUTIONS
+    os.makedirs(output_dir, exist_ok=True)
+
+    samples = []
+    for width, height in resolutions:
+        # 字号随分辨率缩放（1080p 下约 18px）
+        fonts = _get_fonts(max(12, round(18 * height / 1080)))
+        for scene, render in _scenes(fonts).items():
+            rng = random.Random(f"{seed}-{scene}-{width}x{height}")
+            img, lines = render(width, height, rng)
+            filename = f"{scene}_{width}x{height}.png"
+            img.save(os.path.join(output_dir, filename))
+            samples.append(
+                {
+                    "path": filename,
+                    "text": "\n".join(lines),
+                    "scene": scene,
+                    "width": width,
+                    "height": height,
+                }
+            )
+
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump({"seed": seed, "samples": samples}, f, ensure_ascii=False, indent=2)
+
+    logger.info(f"已生成 {len(samples)} 张样本图片: {output_dir}")
+    return samples
+
+
+def load_corpus(corpus_dir: str) -> list[dict]:
+    """读取样本清单，返回带绝对路径的样本列表"""
+    manifest_path = Path(corpus_dir) / MANIFEST_NAME
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    return [
+        {**sample, "path": str(Path(corpus_dir) / sample["path"])}
+        for sample in manifest["samples"]
+    ]
+
+
+def ensure_corpus(corpus_dir: str, seed: int = DEFAULT_SEED) -> list[dict]:
+    """样本集不存在时生成，存在时直接读取"""
+    if not (Path(corpus_dir) / MANIFEST_NAME).exists():
+        generate_corpus(corpus_dir, seed=seed)
+    return load_corpus(corpus_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成 LifeTrace OCR 合成样本集")
+    parser.add_argument("--output", required=True, help="输出目录")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="随机种子")
+    args = parser.parse_args()
+
+    samples = generate_corpus(args.output, seed=args.seed)
+    print(f"已生成 {len(samples)} 张样本图片: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+OCR 基准测试
+在合成样本集上运行完整 OCR 流程（预处理 + RapidOCR + 文本提取），
+输出吞吐量（张/秒）、p50/p95 延迟、峰值内存（RSS）以及相对真实文本的字符错误率（CER）。
+
+用法:
+    python -m lifetrace.benchmarks.ocr_benchmark --corpus data/ocr_fixtures
+    python -m lifetrace.benchmarks.ocr_benchmark --det-limit-side-len 736 --no-cls --max-size 1280x720
+"""
+
+import argparse
+import json
+import threading
+import time
+from collections import defaultdict
+
+import psutil
+
+from lifetrace.benchmarks.common import character_error_rate, summarize_timings
+from lifetrace.benchmarks.fixtures import DEFAULT_CORPUS_DIR, ensure_corpus
+from lifetrace.jobs.ocr_preprocess import get_preprocess_options, load_image
+
+
+class PeakRSSMonitor:
+    """后台采样当前进程的常驻内存，记录峰值"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak_rss = 0
+        self._process = psutil.Process()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self.peak_rss = max(self.peak_rss, self._process.memory_info().rss)
+            self._stop_event.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop_event.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, self._process.memory_info().rss)
+
+
+def build_engine_overrides(args) -> dict:
+    """根据命令行参数构建 RapidOCR 覆盖参数（未指定的沿用 rapidocr_config.yaml）"""
+    overrides = {}
+    if args.det_limit_side_len is not None:
+        overrides["det_limit_side_len"] = args.det_limit_side_len
+    if args.rec_batch_num is not None:
+        overrides["rec_batch_num"] = args.rec_batch_num
+    if args.use_cls is not None:
+        overrides["use_cls"] = args.use_cls
+    if args.intra_threads is not None:
+        overrides["intra_op_num_threads"] = args.intra_threads
+    if args.inter_threads is not None:
+        overrides["inter_op_num_threads"] = args.inter_threads
+    return overrides
+
+
+def run_benchmark(
+    samples: list[dict], engine_overrides: dict, preprocess_options: dict, repeat: int = 1
+) -> dict:
+    """运行基准测试
+
+    Args:
+        samples: 样本列表（含 path、text、scene）
+        engine_overrides: RapidOCR 覆盖参数
+        preprocess_options: 预处理选项
+        repeat: 每张图片重复次数（延迟取所有次数，CER 取第一次）
+
+    Returns:
+        汇总结果
+    """
+    from lifetrace.jobs.ocr import _create_rapidocr_instance, _extract_text_from_ocr_result
+
+    with PeakRSSMonitor() as monitor:
+        engine = _create_rapidocr_instance(**engine_overrides)
+
+        # 预热一次，避免首次推理的初始化开销计入延迟
+        engine(load_image(samples[0]["path"], preprocess_options))
+
+        latencies_ms = []
+        scene_cers = defaultdict(list)
+        start = time.perf_counter()
+        for sample in samples:
+            for i in range(repeat):
+                t0 = time.perf_counter()
+                img_array = load_image(sample["path"], preprocess_options)
+                result, _ = engine(img_array)
+                text = _extract_text_from_ocr_result(result)
+                latencies_ms.append((time.perf_counter() - t0) * 1000)
+                if i == 0:
+                    scene_cers[sample["scene"]].append(
+                        character_error_rate(sample["text"], text)
+                    )
+        elapsed = time.perf_counter() - start
+
+    all_cers = [cer for cers in scene_cers.values() for cer in cers]
+    return {
+        "engine_overrides": engine_overrides,
+        "preprocess": {**preprocess_options, "max_size": list(preprocess_options["max_size"])},
+        "images": len(latencies_ms),
+        "images_per_second": len(latencies_ms) / elapsed if elapsed else 0.0,
+        "latency_ms": summarize_timings(latencies_ms),
+        "peak_rss_mb": monitor.peak_rss / 1024 / 1024,
+        "cer": sum(all_cers) / len(all_cers) if all_cers else 0.0,
+        "cer_by_scene": {scene: sum(c) / len(c) for scene, c in scene_cers.items()},
+    }
+
+
+def print_report(result: dict):
+    """输出基准测试报告"""
+    latency = result["latency_ms"]
+    print(f"引擎参数: {result['engine_overrides'] or '默认（rapidocr_config.yaml）'}")
+    print(f"预处理: {result['preprocess']}")
+    print(f"图片数: {result['images']}")
+    print(f"吞吐量: {result['images_per_second']:.2f} 张/秒")
+    print(f"延迟: p50 {latency['p50']:.1f} ms, p95 {latency['p95']:.1f} ms")
+    print(f"峰值内存: {result['peak_rss_mb']:.1f} MB")
+    print(f"CER: {result['cer']:.4f}")
+    for scene, cer in sorted(result["cer_by_scene"].items()):
+        print(f"  {scene:<14}{cer:.4f}")
+
+
+def _parse_size(value: str) -> tuple[int, int]:
+    """解析 1920x1080 形式的尺寸"""
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LifeTrace OCR 基准测试")
+    parser.add_argument(
+        "--corpus", default=DEFAULT_CORPUS_DIR, help="样本集目录（不存在时自动生成）"
+    )
+    parser.add_argument("--scenes", help="只测试指定场景，用逗号分隔")
+    parser.add_argument("--repeat", type=int, default=1, help="每张图片重复次数")
+    parser.add_argument("--det-limit-side-len", type=int, help="检测模型输入边长限制")
+    parser.add_argument("--rec-batch-num", type=int, help="识别模型批大小")
+    parser.add_argument(
+        "--cls", dest="use_cls", action="store_true", default=None, help="启用方向分类器"
+    )
+    parser.add_argument("--no-cls", dest="use_cls", action="store_false", help="关闭方向分类器")
+    parser.add_argument("--intra-threads", type=int, help="ONNX Runtime 算子内线程数")
+    parser.add_argument("--inter-threads", type=int, help="ONNX Runtime 算子间线程数")
+    parser.add_argument("--max-size", type=_parse_size, help="预处理最大尺寸，如 1280x720")
+    parser.add_argument("--json", help="将结果写入JSON文件")
+    args = parser.parse_args()
+
+    samples = ensure_corpus(args.corpus)
+    if args.scenes:
+        scenes = set(args.scenes.split(","))
+        samples = [s for s in samples if s["scene"] in scenes]
+    if not samples:
+        print("没有可用的样本")
+        return
+
+    preprocess_options = get_preprocess_options()
+    if args.max_size:
+        preprocess_options["max_size"] = args.max_size
+
+    result = run_benchmark(samples, build_engine_overrides(args), preprocess_options, args.repeat)
+    print_report(result)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
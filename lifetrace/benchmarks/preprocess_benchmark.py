@@ -0,0 +1,158 @@
+"""
+OCR 预处理基准测试
+对比不同预处理选项（目标尺寸、重采样滤镜、draft 解码、灰度）的耗时，
+并以不缩放的全质量路径的识别结果为参考计算字符错误率（CER）。
+
+默认使用合成样本集（见 lifetrace.benchmarks.fixtures），结果可复现；--images 可改用其他图片目录。
+
+用法:
+    python -m lifetrace.benchmarks.preprocess_benchmark --corpus data/ocr_fixtures --limit 20
+    python -m lifetrace.benchmarks.preprocess_benchmark --images data/screenshots --limit 20
+"""
+
+import argparse
+import json
+import time
+
+from lifetrace.benchmarks.common import (
+    character_error_rate,
+    collect_images,
+    summarize_timings,
+)
+from lifetrace.benchmarks.fixtures import DEFAULT_CORPUS_DIR, ensure_corpus
+from lifetrace.jobs.ocr_preprocess import (
+    DEFAULT_IMAGE_MAX_SIZE,
+    get_preprocess_options,
+    load_image,
+)
+
+# 全质量参考路径：原始分辨率、RGB、不缩放
+REFERENCE_OPTIONS = {
+    "max_size": (100000, 100000),
+    "resample": "lanczos",
+    "draft": False,
+    "grayscale": False,
+}
+
+
+def build_variants() -> dict[str, dict]:
+    """构建待对比的预处理方案"""
+    baseline = {
+        "max_size": DEFAULT_IMAGE_MAX_SIZE,
+        "resample": "lanczos",
+        "draft": False,
+        "grayscale": False,
+    }
+    return {
+        "baseline(lanczos)": baseline,
+        "config": get_preprocess_options(),
+        "bilinear": {**baseline, "resample": "bilinear"},
+        "box": {**baseline, "resample": "box"},
+        "grayscale": {**baseline, "grayscale": True},
+        "bilinear+grayscale": {**baseline, "resample": "bilinear", "grayscale": True},
+    }
+
+
+def _run_ocr(ocr_engine, img_array) -> tuple[str, float]:
+    """执行OCR，返回 (文本, 耗时毫秒)"""
+    from lifetrace.jobs.ocr import _extract_text_from_ocr_result
+
+    start = time.perf_counter()
+    result, _ = ocr_engine(img_array)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return _extract_text_from_ocr_result(result), elapsed_ms
+
+
+def run_benchmark(image_paths: list[str], variants: dict[str, dict]) -> dict:
+    """运行基准测试
+
+    Args:
+        image_paths: 样本图片路径
+        variants: 方案名称到预处理选项的映射
+
+    Returns:
+        每个方案的统计结果
+    """
+    from lifetrace.jobs.ocr import _create_rapidocr_instance
+
+    ocr_engine = _create_rapidocr_instance()
+
+    # 参考文本：全质量路径
+    references = {}
+    for path in image_paths:
+        text, _ = _run_ocr(ocr_engine, load_image(path, REFERENCE_OPTIONS))
+        references[path] = text
+
+    results = {}
+    for name, options in variants.items():
+        preprocess_ms, ocr_ms, cers = [], [], []
+        for path in image_paths:
+            start = time.perf_counter()
+            img_array = load_image(path, options)
+            preprocess_ms.append((time.perf_counter() - start) * 1000)
+
+            text, elapsed_ms = _run_ocr(ocr_engine, img_array)
+            ocr_ms.append(elapsed_ms)
+            cers.append(character_error_rate(references[path], text))
+
+        results[name] = {
+            "options": {**options, "max_size": list(options["max_size"])},
+            "preprocess_ms": summarize_timings(preprocess_ms),
+            "ocr_ms": summarize_timings(ocr_ms),
+            "cer": sum(cers) / len(cers) if cers else 0.0,
+        }
+    return results
+
+
+def print_report(results: dict):
+    """以表格形式输出结果（相对 baseline 的节省时间和 CER 变化）"""
+    baseline = next(iter(results.values()))
+    base_pre = baseline["preprocess_ms"]["mean"]
+    base_total = base_pre + baseline["ocr_ms"]["mean"]
+
+    header = (
+        f"{'方案':<22}{'预处理ms':>10}{'OCR ms':>10}{'总计ms':>10}"
+        f"{'节省ms':>10}{'CER':>8}{'ΔCER':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        pre = r["preprocess_ms"]["mean"]
+        total = pre + r["ocr_ms"]["mean"]
+        print(
+            f"{name:<22}{pre:>10.1f}{r['ocr_ms']['mean']:>10.1f}{total:>10.1f}"
+            f"{base_total - total:>10.1f}{r['cer']:>8.3f}{r['cer'] - baseline['cer']:>+8.3f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LifeTrace OCR 预处理基准测试")
+    parser.add_argument(
+        "--corpus", default=DEFAULT_CORPUS_DIR, help="样本集目录（不存在时自动生成）"
+    )
+    parser.add_argument("--images", help="改用指定目录中的图片（不使用样本集）")
+    parser.add_argument("--limit", type=int, default=20, help="最多使用的图片数量")
+    parser.add_argument("--json", help="将结果写入JSON文件")
+    args = parser.parse_args()
+
+    if args.images:
+        image_paths = collect_images(args.images, args.limit)
+    else:
+        image_paths = [sample["path"] for sample in ensure_corpus(args.corpus)]
+        image_paths = image_paths[: args.limit] if args.limit else image_paths
+    if not image_paths:
+        print("未找到样本图片")
+        return
+
+    print(f"样本图片: {len(image_paths)} 张")
+    results = run_benchmark(image_paths, build_variants())
+    print_report(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
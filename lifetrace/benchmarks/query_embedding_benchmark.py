@@ -0,0 +1,145 @@
+"""
+查询编码并发基准测试
+模拟多个 API 请求同时编码查询：每个客户端线程依次编码若干条不同的查询，比较
+- 直接编码：每个请求各自调用一次模型（原 VectorDatabase.search 的方式）
+- 微批处理：请求提交给 EmbeddingBatcher，时间窗口内的请求合并为一次模型调用
+的单次查询延迟（mean / p50 / p95）和总吞吐量。查询互不相同，不经过查询嵌入缓存。
+
+用法:
+    python -m lifetrace.benchmarks.query_embedding_benchmark --clients 8 --queries 20
+    python -m lifetrace.benchmarks.query_embedding_benchmark --window-ms 2,5,10
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+
+from lifetrace.benchmarks.common import summarize_timings
+from lifetrace.benchmarks.fixtures import CJK_PHRASES, LATIN_WORDS
+from lifetrace.llm.embedding_batcher import EmbeddingBatcher
+from lifetrace.llm.embedding_cache import text_key
+from lifetrace.util.config import config
+
+# 默认随机种子
+DEFAULT_SEED = 20240601
+
+
+def generate_queries(count: int, seed: int = DEFAULT_SEED) -> list[str]:
+    """生成长度接近用户搜索输入的查询（几个词或一两个短句）"""
+    rng = random.Random(seed)
+    queries = []
+    for i in range(count):
+        if rng.random() < 0.5:
+            words = rng.sample(LATIN_WORDS, rng.randint(2, 6))
+            queries.append(f"{' '.join(words)} {i}")
+        else:
+            queries.append(f"{rng.choice(CJK_PHRASES)} {i}")
+    return queries
+
+
+def run_clients(embed, queries: list[str], clients: int) -> dict:
+    """多个客户端线程并发编码查询（查询按客户端平均分配）
+
+    Returns:
+        单次查询延迟统计和吞吐量（查询/秒）
+    """
+    timings: list[float] = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(clients)
+
+    def client(client_queries: list[str]):
+        barrier.wait()
+        for query in client_queries:
+            start = time.perf_counter()
+            embed(query)
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                timings.append(elapsed)
+
+    threads = [
+        threading.Thread(target=client, args=(queries[i::clients],)) for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    return {"latency_ms": summarize_timings(timings), "queries_per_second": len(queries) / seconds}
+
+
+def run_benchmark(model_name: str, queries: list[str], clients: int, windows: list[float]) -> dict:
+    """运行基准测试
+
+    Returns:
+        直接编码和各合并窗口下的延迟与吞吐量
+    """
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, device="cpu")
+    # 预热一次，避免首次推理的初始化开销计入
+    model.encode(queries[:4], normalize_embeddings=True)
+
+    def encode(texts: list[str]) -> list[list[float]]:
+        return model.encode(texts, normalize_embeddings=True).tolist()
+
+    results = {
+        "model": model_name,
+        "queries": len(queries),
+        "clients": clients,
+        "direct": run_clients(lambda query: encode([query])[0], queries, clients),
+        "batched": {},
+    }
+    for window_ms in windows:
+        batcher = EmbeddingBatcher(encode, window_ms=window_ms, max_batch_size=clients)
+        result = run_clients(
+            lambda query, b=batcher: b.submit(text_key(query), query).result(), queries, clients
+        )
+        result["avg_batch_size"] = batcher.get_stats()["avg_batch_size"]
+        results["batched"][window_ms] = result
+    return results
+
+
+def print_report(result: dict):
+    """输出基准测试报告"""
+    print(f"模型: {result['model']}")
+    print(f"查询数: {result['queries']}，并发客户端: {result['clients']}")
+    print(f"{'方式':<14}{'平均ms':>9}{'p50':>9}{'p95':>9}{'查询/秒':>10}{'平均批大小':>10}")
+    rows = [("直接编码", result["direct"])]
+    rows += [(f"微批 {window}ms", item) for window, item in result["batched"].items()]
+    for name, item in rows:
+        latency = item["latency_ms"]
+        batch = f"{item['avg_batch_size']:.1f}" if "avg_batch_size" in item else "-"
+        print(
+            f"{name:<14}{latency['mean']:>9.1f}{latency['p50']:>9.1f}{latency['p95']:>9.1f}"
+            f"{item['queries_per_second']:>10.1f}{batch:>10}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LifeTrace 查询编码并发基准测试")
+    parser.add_argument("--model", help="嵌入模型（默认读取 vector_db.embedding_model）")
+    parser.add_argument("--clients", type=int, default=8, help="并发客户端数量")
+    parser.add_argument("--queries", type=int, default=20, help="每个客户端的查询数量")
+    parser.add_argument("--window-ms", default="2,5,10", help="合并窗口列表（毫秒），用逗号分隔")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="随机种子")
+    parser.add_argument("--json", help="将结果写入JSON文件")
+    args = parser.parse_args()
+
+    model_name = args.model or config.get("vector_db.embedding_model")
+    windows = [float(value) for value in args.window_ms.split(",")]
+    queries = generate_queries(args.clients * args.queries, args.seed)
+
+    result = run_benchmark(model_name, queries, args.clients, windows)
+    print_report(result)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
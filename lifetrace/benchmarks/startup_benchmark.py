@@ -0,0 +1,168 @@
+"""
+服务启动基准测试
+统计导入 lifetrace.server 时各依赖包的导入耗时（基于 python -X importtime），
+并在子进程中启动服务，测量首次 /health 返回 200 的时间以及全部组件预热完成的时间。
+
+用法:
+    python -m lifetrace.benchmarks.startup_benchmark
+    python -m lifetrace.benchmarks.startup_benchmark --port 8765 --skip-server --top 20
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+# 默认测试模块
+DEFAULT_MODULE = "lifetrace.server"
+
+# 默认测试端口（避免与正在运行的服务冲突）
+DEFAULT_PORT = 8765
+
+
+def measure_import_times(module: str = DEFAULT_MODULE) -> dict:
+    """在全新子进程中导入模块，统计各顶层包的导入耗时
+
+    Returns:
+        total_ms: 模块导入总耗时
+        packages: 顶层包名到自身导入耗时（毫秒）的映射，按耗时降序
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"导入 {module} 失败:\n{proc.stderr[-2000:]}")
+
+    packages = defaultdict(float)
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        # 格式: import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        name = name.strip()
+        packages[name.split(".")[0]] += int(self_us) / 1000
+        if name == module:
+            total_us = int(cumulative_us)
+
+    return {
+        "total_ms": total_us / 1000,
+        "packages": dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)),
+    }
+
+
+def _get_health(url: str) -> dict | None:
+    """请求健康检查接口，未就绪时返回None"""
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            if response.status == 200:
+                return json.loads(response.read())
+    except (urllib.error.URLError, ConnectionError, TimeoutError):
+        pass
+    return None
+
+
+def measure_server_startup(port: int = DEFAULT_PORT, timeout: float = 120.0) -> dict:
+    """启动服务子进程，测量首次 HTTP 200 与全部组件就绪的时间
+
+    Returns:
+        first_ok_seconds: 从启动进程到 /health 首次返回 200 的秒数
+        ready_seconds: 到所有组件预热完成的秒数（超时为None）
+        components: 最后一次健康检查报告的组件状态
+    """
+    url = f"http://127.0.0.1:{port}/health"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "lifetrace.server:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    first_ok = None
+    ready = None
+    health = None
+    try:
+        while time.perf_counter() - start < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"服务进程提前退出，返回码 {proc.returncode}")
+            health = _get_health(url) or health
+            if health is not None and first_ok is None:
+                first_ok = time.perf_counter() - start
+            if health is not None and health.get("ready"):
+                ready = time.perf_counter() - start
+                break
+            time.sleep(0.05)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    return {
+        "first_ok_seconds": first_ok,
+        "ready_seconds": ready,
+        "components": (health or {}).get("components", {}),
+    }
+
+
+def print_report(result: dict, top: int):
+    """输出基准测试报告"""
+    imports = result.get("imports")
+    if imports:
+        print(f"导入 {result['module']}: {imports['total_ms']:.0f} ms")
+        for name, ms in list(imports["packages"].items())[:top]:
+            print(f"  {name:<28}{ms:>10.1f} ms")
+
+    server = result.get("server")
+    if server:
+        first_ok = server["first_ok_seconds"]
+        ready = server["ready_seconds"]
+        print(f"首次 HTTP 200: {f'{first_ok:.2f} 秒' if first_ok is not None else '超时'}")
+        print(f"全部组件就绪: {f'{ready:.2f} 秒' if ready is not None else '超时'}")
+        for name, info in server["components"].items():
+            seconds = f" ({info['seconds']:.2f} 秒)" if "seconds" in info else ""
+            print(f"  {name:<28}{info['status']}{seconds}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LifeTrace 服务启动基准测试")
+    parser.add_argument("--module", default=DEFAULT_MODULE, help="统计导入耗时的模块")
+    parser.add_argument("--top", type=int, default=15, help="输出导入耗时最多的包数量")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="测试服务端口")
+    parser.add_argument("--timeout", type=float, default=120.0, help="等待服务就绪的超时（秒）")
+    parser.add_argument("--skip-server", action="store_true", help="只统计导入耗时")
+    parser.add_argument("--json", help="将结果写入JSON文件")
+    args = parser.parse_args()
+
+    result = {"module": args.module, "imports": measure_import_times(args.module)}
+    if not args.skip_server:
+        result["server"] = measure_server_startup(args.port, args.timeout)
+    print_report(result, args.top)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+向量库后端基准测试
+比较 ChromaDB 与内存映射索引（mmap）在不同文档规模下的：
+- 写入速率（按 --batch 分批 upsert，文档/秒）
+- 打开耗时（写入完成后重新打开已有索引）
+- 查询延迟（top-k，分无过滤和按应用 + 时间范围过滤两种）及相对精确检索的 recall@k
+- 过滤查询返回满 k 个结果的比例（满足条件的文档足够多时应为 1）
+- 磁盘占用
+mmap 后端写入后再执行一次完整合并（单独计时），行数达到 --ivf-min-rows 时查询走 IVF。
+
+向量为按批生成的随机各向异性向量（不加载模型），生成和精确检索的内存占用与文档数量无关。
+
+用法:
+    python -m lifetrace.benchmarks.vector_backend_benchmark --docs 100000,1000000
+    python -m lifetrace.benchmarks.vector_backend_benchmark --backends mmap --docs 100000 --dim 384
+"""
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from lifetrace.benchmarks.common import summarize_timings
+from lifetrace.benchmarks.compact_vector_benchmark import synthetic_vectors
+from lifetrace.llm.vector_backends import (
+    APP_KEY,
+    BACKEND_CHROMA,
+    BACKEND_MMAP,
+    TIMESTAMP_KEY,
+    ChromaBackend,
+)
+
+# 过滤查询使用的应用名称（文档按序号轮流分配）
+APPS = ("chrome", "vscode", "wechat", "terminal")
+
+# 文档时间：从该时间起每个文档间隔一秒，过滤查询只查后一半文档
+BASE_TIMESTAMP = 1_700_000_000
+
+# 随机种子
+DEFAULT_SEED = 42
+
+
+def batch_vectors(start: int, count: int, dim: int, seed: int) -> np.ndarray:
+    """生成第 start 个文档开始的一批向量（同一参数每次结果相同）"""
+    return synthetic_vectors(count, dim, seed + start)
+
+
+def exact_top_k(
+    queries: np.ndarray, docs: int, dim: int, batch: int, k: int, seed: int
+) -> np.ndarray:
+    """逐批计算精确的 top-k 文档序号（归一化向量，内积越大 l2 距离越小）"""
+    best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+    best_ids = np.zeros((len(queries), 0), dtype=np.int64)
+    for start in range(0, docs, batch):
+        count = min(batch, docs - start)
+        scores = queries @ batch_vectors(start, count, dim, seed).T
+        ids = np.broadcast_to(np.arange(start, start + count), scores.shape)
+        best_scores = np.concatenate([best_scores, scores], axis=1)
+        best_ids = np.concatenate([best_ids, ids], axis=1)
+        top = np.argsort(-best_scores, axis=1)[:, :k]
+        best_scores = np.take_along_axis(best_scores, top, axis=1)
+        best_ids = np.take_along_axis(best_ids, top, axis=1)
+    return best_ids
+
+
+def open_backend(name: str, path: Path, args):
+    """打开（或创建）指定后端的索引"""
+    if name == BACKEND_MMAP:
+        from lifetrace.llm.mmap_vector_index import MmapVectorIndex
+
+        return MmapVectorIndex(
+            path / "mmap",
+            max_segments=args.max_segments,
+            ivf_min_rows=args.ivf_min_rows,
+            ivf_nprobe=args.nprobe,
+        )
+    return ChromaBackend(path, "benchmark")
+
+
+def release_backend(backend):
+    """关闭索引，确保下次打开时重新读取磁盘"""
+    backend.close()
+    if backend.name == BACKEND_CHROMA:
+        # PersistentClient 按路径缓存在进程内，不清除的话重新打开不会读盘
+        from chromadb.api.client import SharedSystemClient
+
+        SharedSystemClient.clear_system_cache()
+
+
+def _directory_mb(path: Path) -> float:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file()) / 1024 / 1024
+
+
+def _run_queries(backend, queries: np.ndarray, k: int, where=None) -> tuple[list, list]:
+    timings = []
+    found = []
+    for query in queries:
+        start = time.perf_counter()
+        results = backend.query([query.tolist()], n_results=k, where=where)
+        timings.append((time.perf_counter() - start) * 1000)
+        found.append([int(doc_id.split("_")[1]) for doc_id in results["ids"][0]])
+    return timings, found
+
+
+def benchmark_backend(name: str, docs: int, queries: np.ndarray, truth: np.ndarray, args) -> dict:
+    """在一个新目录中测试一个后端"""
+    workdir = Path(tempfile.mkdtemp(prefix=f"lifetrace_{name}_", dir=args.workdir))
+    try:
+        backend = open_backend(name, workdir, args)
+        start = time.perf_counter()
+        for batch_start in range(0, docs, args.batch):
+            count = min(args.batch, docs - batch_start)
+            doc_ids = range(batch_start, batch_start + count)
+            backend.upsert(
+                ids=[f"doc_{i}" for i in doc_ids],
+                embeddings=batch_vectors(batch_start, count, args.dim, args.seed).tolist(),
+                documents=[f"document {i}" for i in doc_ids],
+                metadatas=[
+                    {
+                        "screenshot_id": i,
+                        APP_KEY: APPS[i % len(APPS)],
+                        TIMESTAMP_KEY: BASE_TIMESTAMP + i,
+                    }
+                    for i in doc_ids
+                ],
+            )
+        insert_s = time.perf_counter() - start
+
+        compact_s = None
+        if name == BACKEND_MMAP:
+            start = time.perf_counter()
+            backend.compact(force=True)
+            compact_s = time.perf_counter() - start
+        release_backend(backend)
+
+        start = time.perf_counter()
+        backend = open_backend(name, workdir, args)
+        open_s = time.perf_counter() - start
+
+        timings, found = _run_queries(backend, queries, args.k)
+        where = {
+            "$and": [{APP_KEY: APPS[0]}, {TIMESTAMP_KEY: {"$gte": BASE_TIMESTAMP + docs // 2}}]
+        }
+        filtered_timings, filtered_found = _run_queries(backend, queries, args.k, where)
+        matching = sum(1 for i in range(docs // 2, docs) if i % len(APPS) == 0)
+        expected = min(args.k, matching)
+        hits = sum(len(set(f) & set(t)) for f, t in zip(found, truth.tolist(), strict=True))
+        release_backend(backend)
+
+        return {
+            "backend": name,
+            "docs": docs,
+            "insert_docs_per_s": docs / insert_s,
+            "compact_s": compact_s,
+            "open_s": open_s,
+            "query_ms": summarize_timings(timings),
+            "filtered_query_ms": summarize_timings(filtered_timings),
+            f"recall@{args.k}": hits / truth.size,
+            "filtered_full": sum(len(f) == expected for f in filtered_found) / len(queries),
+            "disk_mb": _directory_mb(workdir),
+        }
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def print_report(results: list[dict], k: int):
+    """输出基准测试报告"""
+    print(
+        f"{'后端':<8}{'文档数':>10}{'写入/s':>10}{'合并s':>8}{'打开s':>8}"
+        f"{'查询ms':>9}{'p95':>8}{'过滤ms':>9}{'过滤满额':>8}{f'recall@{k}':>11}{'磁盘MB':>9}"
+    )
+    for item in results:
+        compact = f"{item['compact_s']:.1f}" if item["compact_s"] is not None else "-"
+        print(
+            f"{item['backend']:<8}{item['docs']:>10}{item['insert_docs_per_s']:>10.0f}"
+            f"{compact:>8}{item['open_s']:>8.2f}"
+            f"{item['query_ms']['mean']:>9.2f}{item['query_ms']['p95']:>8.2f}"
+            f"{item['filtered_query_ms']['mean']:>9.2f}{item['filtered_full']:>8.2f}"
+            f"{item[f'recall@{k}']:>11.3f}{item['disk_mb']:>9.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LifeTrace 向量库后端基准测试")
+    parser.add_argument(
+        "--backends", default=f"{BACKEND_CHROMA},{BACKEND_MMAP}", help="测试的后端，用逗号分隔"
+    )
+    parser.add_argument("--docs", default="100000,1000000", help="文档数量列表，用逗号分隔")
+    parser.add_argument("--dim", type=int, default=768, help="向量维度")
+    parser.add_argument("--queries", type=int, default=100, help="查询数量")
+    parser.add_argument("--k", type=int, default=10, help="每次查询返回的数量")
+    parser.add_argument("--batch", type=int, default=5000, help="每次写入的文档数量")
+    parser.add_argument("--max-segments", type=int, default=8, help="mmap 后端的最大段数量")
+    parser.add_argument(
+        "--ivf-min-rows", type=int, default=50000, help="mmap 后端建立 IVF 的最小行数"
+    )
+    parser.add_argument("--nprobe", type=int, default=16, help="mmap 后端 IVF 扫描的簇数量")
+    parser.add_argument("--workdir", help="索引目录的父目录（默认系统临时目录）")
+    parser.add_argument("--keep", action="store_true", help="测试后保留索引目录")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="随机种子")
+    parser.add_argument("--json", help="将结果写入JSON文件")
+    args = parser.parse_args()
+
+    backends = [name.strip() for name in args.backends.split(",") if name.strip()]
+    queries = synthetic_vectors(args.queries, args.dim, args.seed - 1)
+
+    results = []
+    for docs in [int(value) for value in args.docs.split(",")]:
+        truth = exact_top_k(queries, docs, args.dim, args.batch, args.k, args.seed)
+        for name in backends:
+            print(f"测试 {name}，{docs} 个文档...")
+            results.append(benchmark_backend(name, docs, queries, truth, args))
+    print_report(results, args.k)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,8 @@ import os
 from datetime import datetime, timedelta
 
 from lifetrace.storage import get_session, screenshot_mgr
+from lifetrace.storage.models import OCRResult
+from lifetrace.storage.vector_sync_manager import add_vector_tombstones
 from lifetrace.util.config import config
 from lifetrace.util.logging_config import get_logger
 
@@ -52,6 +54,10 @@ class CleanDataService:
                 result["deleted_records"] += deleted["records"]
                 result["freed_space"] += deleted["space"]
 
+            # 尽快删除被清理记录的向量文档（其余由同步和向量库清理任务处理）
+            if result["deleted_records"]:
+                self._flush_vector_deletions()
+
             logger.info(
                 f"数据清理完成 - 删除文件: {result['deleted_files']}, "
                 f"删除记录: {result['deleted_records']}, "
@@ -99,13 +105,19 @@ class CleanDataService:
                     .all()
                 )
 
+                event_ids = set()
                 for screenshot in old_screenshots:
+                    event_id = screenshot.event_id
                     deleted = self._delete_screenshot(screenshot, session)
                     if deleted["success"]:
                         result["files"] += 1
                         result["space"] += deleted["size"]
                         if not self.delete_file_only:
                             result["records"] += 1
+                            event_ids.add(event_id)
+
+                # 截图被删除的事件需要按剩余文本重建向量文档
+                add_vector_tombstones(session, [], list(event_ids))
 
             return result
 
@@ -143,13 +155,19 @@ class CleanDataService:
 
                 logger.info(f"找到 {len(old_screenshots)} 张过期截图")
 
+                event_ids = set()
                 for screenshot in old_screenshots:
+                    event_id = screenshot.event_id
                     deleted = self._delete_screenshot(screenshot, session)
                     if deleted["success"]:
                         result["files"] += 1
                         result["space"] += deleted["size"]
                         if not self.delete_file_only:
                             result["records"] += 1
+                            event_ids.add(event_id)
+
+                # 截图被删除的事件需要按剩余文本重建向量文档
+                add_vector_tombstones(session, [], list(event_ids))
 
             return result
 
@@ -157,6 +175,14 @@ class CleanDataService:
             logger.error(f"按日期清理截图失败: {e}", exc_info=True)
             return result
 
+    def _flush_vector_deletions(self):
+        """处理删除标记，删除向量文档（向量库尚未初始化时留给后续的同步和清理任务）"""
+        from lifetrace.llm.vector_service import get_vector_service
+
+        vector_service = get_vector_service()
+        if vector_service.is_ready() and vector_service.is_enabled():
+            vector_service.apply_tombstones()
+
     def _delete_screenshot(self, screenshot, session) -> dict:
         """删除单个截图
 
@@ -188,6 +214,14 @@ class CleanDataService:
 
             # 如果配置为同时删除记录，则从数据库中删除
             if not self.delete_file_only:
+                # 截图记录删除后其OCR结果不再可用，记录删除标记以便同步删除向量文档
+                ocr_result_ids = [
+                    row.id
+                    for row in session.query(OCRResult.id).filter(
+                        OCRResult.screenshot_id == screenshot.id
+                    )
+                ]
+                add_vector_tombstones(session, ocr_result_ids)
                 session.delete(screenshot)
                 session.flush()
                 logger.debug(f"已删除数据库记录: screenshot_id={screenshot.id}")
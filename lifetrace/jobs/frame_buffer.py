@@ -0,0 +1,105 @@
+"""
+截图帧共享缓冲区
+录制器和 OCR 在同一进程中运行时，录制器把刚截取并预处理好的图像数组按截图ID放入缓冲区，
+OCR 直接取用，避免再从磁盘读取 PNG 并重新解码缩放。缓冲区有容量上限，超出时淘汰最旧的帧；
+未命中时 OCR 回退到磁盘读取。
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from lifetrace.util.config import config
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+
+class FrameBuffer:
+    """有界、线程安全的截图帧缓冲区（按截图ID索引）"""
+
+    def __init__(self, capacity: int = 8):
+        """
+        Args:
+            capacity: 最多缓存的帧数，0 表示禁用
+        """
+        self.capacity = max(0, int(capacity))
+        self._frames: OrderedDict[int, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._active = False
+
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """是否有同进程的 OCR 消费者（没有消费者时录制器不做额外预处理）"""
+        return self._active and self.capacity > 0
+
+    def activate(self):
+        """标记同进程内存在 OCR 消费者"""
+        self._active = True
+
+    def deactivate(self):
+        """取消消费者标记并清空缓冲区"""
+        self._active = False
+        self.clear()
+
+    def publish(self, screenshot_id: int, frame: np.ndarray):
+        """放入一帧，超出容量时淘汰最旧的帧"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._frames[screenshot_id] = frame
+            self._frames.move_to_end(screenshot_id)
+            while len(self._frames) > self.capacity:
+                evicted_id, _ = self._frames.popitem(last=False)
+                self.evictions += 1
+                logger.debug(f"帧缓冲区已满，淘汰截图 {evicted_id}")
+
+    def take(self, screenshot_id: int) -> np.ndarray | None:
+        """取出一帧（取出后从缓冲区移除），未命中返回 None"""
+        with self._lock:
+            frame = self._frames.pop(screenshot_id, None)
+            if frame is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return frame
+
+    def clear(self):
+        """清空缓冲区"""
+        with self._lock:
+            self._frames.clear()
+
+    def get_stats(self) -> dict:
+        """获取缓冲区统计信息"""
+        with self._lock:
+            size = len(self._frames)
+        return {
+            "enabled": self.enabled,
+            "capacity": self.capacity,
+            "size": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# 全局帧缓冲区实例
+_frame_buffer: FrameBuffer | None = None
+_frame_buffer_lock = threading.Lock()
+
+
+def get_frame_buffer() -> FrameBuffer:
+    """获取全局帧缓冲区实例"""
+    global _frame_buffer
+    if _frame_buffer is None:
+        with _frame_buffer_lock:
+            if _frame_buffer is None:
+                _frame_buffer = FrameBuffer(config.get("jobs.ocr.params.frame_buffer_size"))
+    return _frame_buffer
@@ -4,13 +4,18 @@
 """
 
 from lifetrace.jobs.clean_data import execute_clean_data_task, get_clean_data_instance
+from lifetrace.jobs.frame_buffer import get_frame_buffer
 from lifetrace.jobs.ocr import execute_ocr_task
 from lifetrace.jobs.recorder import execute_capture_task, get_recorder_instance
 from lifetrace.jobs.scheduler import get_scheduler_manager
 from lifetrace.jobs.task_context_mapper import execute_mapper_task, get_mapper_instance
 from lifetrace.jobs.task_summary import execute_summary_task, get_summary_instance
+from lifetrace.jobs.vector_gc import execute_vector_gc_task, get_vector_gc_instance
+from lifetrace.llm.vector_indexer import stop_vector_indexer
+from lifetrace.storage import ocr_queue_mgr
 from lifetrace.util.config import config
 from lifetrace.util.logging_config import get_logger
+from lifetrace.util.model_registry import get_model_registry
 
 logger = get_logger()
 
@@ -47,6 +52,9 @@ class JobManager:
         # 启动数据清理任务
         self._start_clean_data_job()
 
+        # 启动向量库清理任务
+        self._start_vector_gc_job()
+
         logger.info("所有后台任务已启动")
 
     def stop_all(self):
@@ -56,6 +64,12 @@ class JobManager:
         # 停止调度器（会自动停止所有调度任务）
         self._stop_scheduler()
 
+        # 等待后台向量索引处理完剩余记录
+        stop_vector_indexer()
+
+        # 停止模型空闲检查
+        get_model_registry().stop()
+
         logger.error("所有后台任务已停止")
 
     def _start_scheduler(self):
@@ -122,6 +136,16 @@ class JobManager:
             )
             logger.info(f"OCR定时任务已添加，间隔: {ocr_interval}秒")
 
+            # 录制器与OCR在同一进程中运行，启用帧共享缓冲区
+            # （任务暂停时同样启用：之后可能通过调度接口恢复，缓冲区有容量上限）
+            get_frame_buffer().activate()
+
+            # 截图入队时立即唤醒OCR任务，定时触发只作为兜底
+            ocr_queue_mgr.add_listener(self._wake_ocr_job)
+
+            # 补充升级前或崩溃遗留的未入队截图
+            ocr_queue_mgr.backfill()
+
             # 如果未启用，则暂停任务
             if not enabled:
                 self.scheduler_manager.pause_job("ocr_job")
@@ -129,6 +153,11 @@ class JobManager:
         except Exception as e:
             logger.error(f"启动OCR任务失败: {e}", exc_info=True)
 
+    def _wake_ocr_job(self):
+        """OCR队列入队回调：唤醒OCR任务（任务暂停时不做任何事）"""
+        if self.scheduler_manager:
+            self.scheduler_manager.wake_job("ocr_job")
+
     def _start_task_context_mapper(self):
         """启动任务上下文映射服务"""
         enabled = config.get("jobs.task_context_mapper.enabled")
@@ -213,6 +242,33 @@ class JobManager:
         except Exception as e:
             logger.error(f"启动数据清理服务失败: {e}", exc_info=True)
 
+    def _start_vector_gc_job(self):
+        """启动向量库清理任务"""
+        enabled = config.get("jobs.vector_gc.enabled")
+
+        try:
+            # 预先初始化全局实例
+            get_vector_gc_instance()
+
+            # 添加到调度器（无论是否启用都添加）
+            interval = config.get("jobs.vector_gc.interval")
+            vector_gc_id = config.get("jobs.vector_gc.id")
+            self.scheduler_manager.add_interval_job(
+                func=execute_vector_gc_task,
+                job_id="vector_gc_job",
+                name=vector_gc_id,
+                seconds=interval,
+                replace_existing=True,
+            )
+            logger.info(f"向量库清理定时任务已添加，间隔: {interval}秒")
+
+            # 如果未启用，则暂停任务
+            if not enabled:
+                self.scheduler_manager.pause_job("vector_gc_job")
+                logger.info("向量库清理服务未启用，已暂停")
+        except Exception as e:
+            logger.error(f"启动向量库清理服务失败: {e}", exc_info=True)
+
 
 # 全局单例
 _job_manager_instance: JobManager | None = None
@@ -4,25 +4,40 @@ LifeTrace 简化OCR处理器
 """
 
 import hashlib
+import importlib.metadata
+import importlib.util
+import json
 import os
 import sys
+import threading
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
+from typing import Any
 
+import numpy as np
 import yaml
-
-from lifetrace.llm.vector_service import create_vector_service
-from lifetrace.storage import get_session, ocr_mgr, screenshot_mgr
+from PIL import Image
+
+from lifetrace.jobs.frame_buffer import get_frame_buffer
+from lifetrace.jobs.ocr_governor import get_ocr_governor, lower_thread_priority
+from lifetrace.jobs.ocr_prefilter import TEXT_POOR, TEXTLESS, classify_frame, downscale_for_ocr
+from lifetrace.jobs.ocr_preprocess import get_preprocess_options, load_image
+from lifetrace.llm.vector_indexer import get_vector_indexer, stop_vector_indexer
+from lifetrace.llm.vector_service import get_vector_service
+from lifetrace.storage import get_session, ocr_mgr, ocr_queue_mgr, screenshot_mgr
 from lifetrace.storage.models import OCRResult, Screenshot
 from lifetrace.util.config import config
 from lifetrace.util.logging_config import get_logger
+from lifetrace.util.model_registry import ModelHandle, get_model_registry
 
 logger = get_logger()
 
 # OCR配置常量
-DEFAULT_IMAGE_MAX_SIZE = (1920, 1080)
 DEFAULT_CONFIDENCE = 0.8
-DEFAULT_PROCESSING_DELAY = 0.1
 MIN_CONFIDENCE_THRESHOLD = 0.5
 
 
@@ -56,36 +71,37 @@ def _setup_rapidocr_config():
 # 设置RapidOCR配置
 _setup_rapidocr_config()
 
-try:
-    import numpy as np
-    from PIL import Image
-    from rapidocr_onnxruntime import RapidOCR
-
-    RAPIDOCR_AVAILABLE = True
-except ImportError:
-    RAPIDOCR_AVAILABLE = False
+# RapidOCR 会连带导入 onnxruntime 和 opencv，这里只检查是否安装，首次创建引擎时再导入
+RAPIDOCR_AVAILABLE = importlib.util.find_spec("rapidocr_onnxruntime") is not None
+if not RAPIDOCR_AVAILABLE:
     logger.error("RapidOCR 未安装！请运行: pip install rapidocr-onnxruntime")
-    sys.exit(1)
 
 
-def _create_rapidocr_instance() -> RapidOCR:
+def _create_rapidocr_instance(**overrides):
     """创建并初始化RapidOCR实例
 
+    Args:
+        **overrides: 覆盖的RapidOCR参数（如 det_limit_side_len、rec_batch_num、use_cls、
+            intra_op_num_threads），用于基准测试等场景调参
+
     Returns:
         RapidOCR实例
     """
+    from rapidocr_onnxruntime import RapidOCR
+
     config_path = _get_rapidocr_config_path()
+    engine_kwargs = {
+        "det_use_cuda": False,
+        "cls_use_cuda": False,
+        "rec_use_cuda": False,
+        "print_verbose": False,
+        **overrides,
+    }
 
     # 检查配置文件是否存在
     if not os.path.exists(config_path):
         logger.warning(f"配置文件不存在: {config_path}，使用默认配置")
-        return RapidOCR(
-            config_path=None,
-            det_use_cuda=False,
-            cls_use_cuda=False,
-            rec_use_cuda=False,
-            print_verbose=False,
-        )
+        return RapidOCR(config_path=None, **engine_kwargs)
 
     logger.info(f"使用RapidOCR配置文件: {config_path}")
 
@@ -96,13 +112,7 @@ def _create_rapidocr_instance() -> RapidOCR:
         # 检查是否有外部模型路径配置
         if "Models" not in config_data:
             logger.info("未找到外部模型配置，使用默认方式")
-            return RapidOCR(
-                config_path=None,
-                det_use_cuda=False,
-                cls_use_cuda=False,
-                rec_use_cuda=False,
-                print_verbose=False,
-            )
+            return RapidOCR(config_path=None, **engine_kwargs)
 
         models_config = config_data["Models"]
         app_path = _get_application_path()
@@ -126,30 +136,124 @@ def _create_rapidocr_instance() -> RapidOCR:
                 det_model_path=det_model_path,
                 rec_model_path=rec_model_path,
                 cls_model_path=cls_model_path,
-                det_use_cuda=False,
-                cls_use_cuda=False,
-                rec_use_cuda=False,
-                print_verbose=False,
+                **engine_kwargs,
             )
         else:
             logger.warning("外部模型文件不存在，使用默认配置")
-            return RapidOCR(
-                config_path=None,
-                det_use_cuda=False,
-                cls_use_cuda=False,
-                rec_use_cuda=False,
-                print_verbose=False,
-            )
+            return RapidOCR(config_path=None, **engine_kwargs)
 
     except Exception as e:
         logger.error(f"读取配置文件失败: {e}，使用默认配置")
-        return RapidOCR(
-            config_path=None,
-            det_use_cuda=False,
-            cls_use_cuda=False,
-            rec_use_cuda=False,
-            print_verbose=False,
-        )
+        return RapidOCR(config_path=None, **engine_kwargs)
+
+
+# 共享OCR引擎句柄（引擎由模型注册表加载，空闲超时后自动卸载）
+_ocr_engine_handle: ModelHandle | None = None
+_ocr_engine_handle_lock = threading.Lock()
+
+
+def get_ocr_engine_handle() -> ModelHandle:
+    """获取进程内共享的RapidOCR引擎句柄"""
+    global _ocr_engine_handle
+    if _ocr_engine_handle is None:
+        with _ocr_engine_handle_lock:
+            if _ocr_engine_handle is None:
+                _ocr_engine_handle = get_model_registry().register(
+                    "rapidocr", _create_rapidocr_instance
+                )
+    return _ocr_engine_handle
+
+
+class OCRWorkerEngines:
+    """线程池中每个工作线程独享的RapidOCR引擎
+
+    RapidOCR 实例不在线程间共享；每个引擎的 ONNX intra_op_num_threads 按工作线程数均分
+    CPU 核心，避免"工作线程数 × 全部核心"的线程超额订阅。引擎由模型注册表加载，空闲超时后卸载。
+    """
+
+    def __init__(self, name: str, workers: int):
+        """
+        Args:
+            name: 引擎名称前缀（在模型注册表中注册为 "{name}-{序号}"）
+            workers: 线程池的工作线程数
+        """
+        self.name = name
+        self.intra_op_num_threads = max(1, (os.cpu_count() or 1) // max(1, workers))
+        self._handles: list[ModelHandle] = []
+        self._next_slot = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _get_handle(self, slot: int) -> ModelHandle:
+        with self._lock:
+            while len(self._handles) <= slot:
+                self._handles.append(
+                    get_model_registry().register(
+                        f"{self.name}-{len(self._handles)}",
+                        partial(
+                            _create_rapidocr_instance,
+                            intra_op_num_threads=self.intra_op_num_threads,
+                        ),
+                    )
+                )
+            return self._handles[slot]
+
+    def get(self, slot: int = 0) -> Any:
+        """加载指定序号的引擎（用于预热和启动检查）"""
+        return self._get_handle(slot).get()
+
+    @contextmanager
+    def use(self) -> Iterator[Any]:
+        """当前线程的引擎（首次使用时分配序号），使用期间防止被空闲卸载"""
+        slot = getattr(self._local, "slot", None)
+        if slot is None:
+            with self._lock:
+                slot = self._local.slot = self._next_slot
+                self._next_slot += 1
+        with self._get_handle(slot).use() as engine:
+            yield engine
+
+    def release(self):
+        """释放全部引擎（线程池关闭后调用）"""
+        with self._lock:
+            handles, self._handles = self._handles, []
+        for handle in handles:
+            handle.release()
+
+
+# RapidOCR版本及配置文件指纹（进程内缓存）
+_rapidocr_fingerprint: tuple[str, str] | None = None
+
+
+def get_engine_version() -> str:
+    """获取当前OCR引擎版本标识
+
+    由 RapidOCR 版本、rapidocr_config.yaml 内容以及预处理和预判参数共同决定，
+    任何一项变化都会产生新的版本，用于筛选需要重新识别的历史截图。
+    """
+    global _rapidocr_fingerprint
+    if _rapidocr_fingerprint is None:
+        try:
+            package_version = importlib.metadata.version("rapidocr_onnxruntime")
+        except importlib.metadata.PackageNotFoundError:
+            package_version = "unknown"
+
+        config_path = _get_rapidocr_config_path()
+        config_hash = hashlib.md5()
+        if os.path.exists(config_path):
+            with open(config_path, "rb") as f:
+                config_hash.update(f.read())
+        _rapidocr_fingerprint = (package_version, config_hash.hexdigest())
+
+    package_version, config_digest = _rapidocr_fingerprint
+    params = {
+        "rapidocr_config": config_digest,
+        "preprocess": get_preprocess_options(),
+        "prefilter_enabled": config.get("jobs.ocr.params.prefilter_enabled"),
+        "prefilter_low_res_scale": config.get("jobs.ocr.params.prefilter_low_res_scale"),
+    }
+    digest = hashlib.md5(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+    return f"rapidocr-{package_version}-{digest[:8]}"
 
 
 def _preprocess_image(image_path: str) -> np.ndarray:
@@ -161,10 +265,7 @@ def _preprocess_image(image_path: str) -> np.ndarray:
     Returns:
         预处理后的图像数组
     """
-    with Image.open(image_path) as img:
-        img = img.convert("RGB")
-        img.thumbnail(DEFAULT_IMAGE_MAX_SIZE, Image.Resampling.LANCZOS)
-        return np.array(img)
+    return load_image(image_path)
 
 
 def _extract_text_from_ocr_result(result, confidence_threshold: float = None) -> str:
@@ -221,7 +322,6 @@ class SimpleOCRProcessor:
     """简化的OCR处理器类"""
 
     def __init__(self):
-        self.ocr = None
         self.vector_service = None
         self.is_running = False
 
@@ -247,36 +347,32 @@ class SimpleOCRProcessor:
                 ocr_results = session.query(OCRResult).count()
                 unprocessed = total_screenshots - ocr_results
 
-                return {
-                    "status": "running" if self.is_running else "stopped",
-                    "total_screenshots": total_screenshots,
-                    "processed": ocr_results,
-                    "unprocessed": unprocessed,
-                    "interval": config.get("jobs.ocr.interval"),
-                }
+            queue_stats = ocr_queue_mgr.get_queue_stats()
+            return {
+                "status": "running" if self.is_running else "stopped",
+                "total_screenshots": total_screenshots,
+                "processed": ocr_results,
+                "unprocessed": unprocessed,
+                "queue": queue_stats,
+                "frame_buffer": get_frame_buffer().get_stats(),
+                "interval": config.get("jobs.ocr.interval"),
+            }
         except Exception as e:
             logger.error(f"获取OCR统计信息失败: {e}")
             return {"status": "error", "error": str(e)}
 
-    def _ensure_ocr_initialized(self):
-        """确保OCR引擎已初始化"""
-        if self.ocr is None:
-            self.ocr = _create_rapidocr_instance()
-
     def process_image(self, image_path):
         """处理单个图像文件"""
         try:
-            # 初始化OCR引擎（如果还没有初始化）
-            self._ensure_ocr_initialized()
-
             # 记录开始时间
             start_time = time.time()
 
             # 图像预处理
             img_array = _preprocess_image(image_path)
 
-            # 执行OCR
-            result, _ = self.ocr(img_array)
+            # 执行OCR（使用进程内共享的引擎）
+            with get_ocr_engine_handle().use() as ocr_engine:
+                result, _ = ocr_engine(img_array)
 
             # 计算处理时间
             processing_time = time.time() - start_time
@@ -291,6 +387,7 @@ class SimpleOCRProcessor:
                 "confidence": ocr_config["default_confidence"],
                 "language": ocr_config["language"],
                 "processing_time": processing_time,
+                "engine_version": get_engine_version(),
             }
 
             save_to_database(image_path, ocr_result, self.vector_service)
@@ -306,8 +403,19 @@ class SimpleOCRProcessor:
             return {"success": False, "error": str(e)}
 
 
+def _persist_ocr_result(screenshot_id: int, ocr_result: dict, vector_service=None) -> bool:
+    """在单个事务中保存OCR结果，并把向量索引交给后台批量索引器"""
+    record = ocr_mgr.save_ocr_result(screenshot_id, ocr_result)
+    if not record:
+        return False
+
+    if vector_service and vector_service.is_enabled():
+        get_vector_indexer(vector_service).submit(record)
+    return True
+
+
 def save_to_database(image_path: str, ocr_result: dict, vector_service=None):
-    """保存OCR结果到数据库"""
+    """保存OCR结果到数据库（按文件路径查找截图，用于处理外部图片）"""
     try:
         # 查找对应的截图记录
         screenshot = screenshot_mgr.get_screenshot_by_path(image_path)
@@ -321,42 +429,7 @@ def save_to_database(image_path: str, ocr_result: dict, vector_service=None):
         else:
             screenshot_id = screenshot["id"]
 
-        # 添加OCR结果到SQLite数据库
-        ocr_result_id = ocr_mgr.add_ocr_result(
-            screenshot_id=screenshot_id,
-            text_content=ocr_result["text_content"],
-            confidence=ocr_result["confidence"],
-            language=ocr_result.get("language", "ch"),
-            processing_time=ocr_result["processing_time"],
-        )
-
-        # 更新截图状态
-        screenshot_mgr.update_screenshot_processed(screenshot_id)
-
-        # 添加到向量数据库
-        if vector_service and vector_service.is_enabled() and ocr_result_id:
-            try:
-                # 获取完整的OCR结果对象
-                with get_session() as session:
-                    ocr_obj = session.query(OCRResult).filter(OCRResult.id == ocr_result_id).first()
-                    screenshot_obj = (
-                        session.query(Screenshot).filter(Screenshot.id == screenshot_id).first()
-                    )
-
-                    if ocr_obj:
-                        success = vector_service.add_ocr_result(ocr_obj, screenshot_obj)
-                        if success:
-                            logger.debug(f"OCR结果已添加到向量数据库: {ocr_result_id}")
-                        else:
-                            logger.warning(f"向量数据库添加失败: {ocr_result_id}")
-                    # 同步事件文档（事件级）
-                    if screenshot_obj and getattr(screenshot_obj, "event_id", None):
-                        try:
-                            vector_service.upsert_event_document(screenshot_obj.event_id)
-                        except Exception:
-                            pass
-            except Exception as ve:
-                logger.error(f"向量数据库操作失败: {ve}")
+        _persist_ocr_result(screenshot_id, ocr_result, vector_service)
 
     except Exception as e:
         logger.error(f"保存OCR结果到数据库失败: {e}")
@@ -413,57 +486,61 @@ def create_screenshot_record(image_path: str):
 # 日志配置已移至统一的logging_config.py中
 
 
-def get_unprocessed_screenshots(logger_instance=None, limit=50):
-    """从数据库获取未处理OCR的截图记录
+def _get_worker_id() -> str:
+    """获取当前OCR工作者标识（进程ID + 线程名）"""
+    return f"{os.getpid()}:{threading.current_thread().name}"
 
-    Args:
-        logger_instance: 日志记录器，如果为None则使用模块级logger
-        limit: 限制返回的记录数量，避免内存溢出
+
+def _recognize(img_array, ocr_engine) -> tuple[list | None, str | None]:
+    """按文本预判结果执行OCR
+
+    Returns:
+        (OCR结果, 预判结果)，未启用预判时预判结果为None，无文本画面的OCR结果为None
     """
-    # 如果没有传入logger，使用模块级logger
-    log = logger_instance if logger_instance is not None else logger
+    if not config.get("jobs.ocr.params.prefilter_enabled"):
+        result, _ = ocr_engine(img_array)
+        return result, None
+
+    prefilter = classify_frame(img_array)
+    if prefilter == TEXTLESS:
+        return None, prefilter
+    if prefilter == TEXT_POOR:
+        img_array = downscale_for_ocr(
+            img_array, config.get("jobs.ocr.params.prefilter_low_res_scale")
+        )
 
-    try:
-        with get_session() as session:
-            # 优化查询：使用NOT EXISTS子查询替代LEFT JOIN
-            # 这种方式在大数据量时性能更好
-            # 按创建时间降序排列，优先处理最新的截图
-            unprocessed = (
-                session.query(Screenshot)
-                .filter(
-                    ~session.query(OCRResult)
-                    .filter(OCRResult.screenshot_id == Screenshot.id)
-                    .exists()
-                )
-                .order_by(Screenshot.created_at.desc())
-                .limit(limit)
-                .all()
-            )
+    result, _ = ocr_engine(img_array)
+    return result, prefilter
 
-            log.info(f"查询到 {len(unprocessed)} 条未处理的截图记录")
 
-            return [
-                {
-                    "id": screenshot.id,
-                    "file_path": screenshot.file_path,
-                    "created_at": screenshot.created_at,
-                }
-                for screenshot in unprocessed
-            ]
-    except Exception as e:
-        log.error(f"查询未处理截图失败: {e}")
-        return []
+def recognize_image(img_array, ocr_engine) -> dict:
+    """对预处理后的图像执行OCR（含文本预判），返回待保存的OCR结果"""
+    start_time = time.time()
+    result, prefilter = _recognize(img_array, ocr_engine)
+
+    ocr_config = _get_ocr_config()
+    return {
+        "text_content": _extract_text_from_ocr_result(result, ocr_config["confidence_threshold"]),
+        "confidence": ocr_config["default_confidence"],
+        "language": ocr_config["language"],
+        "processing_time": time.time() - start_time,
+        "prefilter": prefilter,
+        "engine_version": get_engine_version(),
+    }
 
 
 def process_screenshot_ocr(screenshot_info, ocr_engine, vector_service):
-    """处理单个截图的OCR"""
+    """处理单个已认领截图的OCR，并根据结果完成或释放队列租约"""
     screenshot_id = screenshot_info["id"]
     file_path = screenshot_info["file_path"]
+    max_attempts = config.get("jobs.ocr.params.max_attempts")
 
     try:
-        # 检查文件是否存在
-        if not os.path.exists(file_path):
-            # log.warning(f"截图文件不存在，跳过处理: {file_path}")
+        # 检查文件是否存在（文件已被清理的截图不再重试）
+        if not file_path or not os.path.exists(file_path):
+            ocr_queue_mgr.release(
+                screenshot_id, error="截图文件不存在", max_attempts=max_attempts, permanent=True
+            )
             return False
 
         logger.info(f"开始处理截图 ID {screenshot_id}: {os.path.basename(file_path)}")
@@ -471,94 +548,153 @@ def process_screenshot_ocr(screenshot_info, ocr_engine, vector_service):
         # 记录开始时间
         start_time = time.time()
 
-        # 图像预处理
-        img_array = _preprocess_image(file_path)
+        # 图像预处理：优先使用录制器放入共享缓冲区的帧，未命中时从磁盘读取
+        img_array = get_frame_buffer().take(screenshot_id)
+        if img_array is None:
+            img_array = _preprocess_image(file_path)
 
-        # 使用RapidOCR进行识别
-        result, _ = ocr_engine(img_array)
+        # 使用RapidOCR进行识别（根据文本预判跳过或降低分辨率）
+        ocr_result = recognize_image(img_array, ocr_engine)
 
-        # 计算推理时间
+        # 计算处理时间（包含预处理）
         elapsed_time = time.time() - start_time
+        ocr_result["processing_time"] = elapsed_time
 
-        # 提取OCR识别结果
-        ocr_config = _get_ocr_config()
-        ocr_text = _extract_text_from_ocr_result(result, ocr_config["confidence_threshold"])
-
-        # 保存到数据库
-        ocr_result = {
-            "text_content": ocr_text,
-            "confidence": ocr_config["default_confidence"],
-            "language": ocr_config["language"],
-            "processing_time": elapsed_time,
-        }
-        save_to_database(file_path, ocr_result, vector_service)
+        # 单事务写入结果并移出队列，向量索引异步进行
+        if not _persist_ocr_result(screenshot_id, ocr_result, vector_service):
+            raise RuntimeError("保存OCR结果失败")
 
         logger.info(f"OCR处理完成 ID {screenshot_id}, 用时: {elapsed_time:.2f}秒")
         return True
 
     except Exception as e:
         logger.error(f"处理截图 {screenshot_id} 失败: {e}")
+        ocr_queue_mgr.release(screenshot_id, error=str(e), max_attempts=max_attempts)
         return False
 
 
-# 全局OCR引擎和向量服务（用于调度器模式）
-_ocr_engine = None
-_vector_service = None
+# OCR工作线程池（线程优先级已降低，不与调度器的其他任务共用线程）及各线程的引擎
+_ocr_pool: ThreadPoolExecutor | None = None
+_ocr_worker_engines: OCRWorkerEngines | None = None
+_ocr_pool_lock = threading.Lock()
 
 
-def _ensure_ocr_initialized():
-    """确保OCR引擎已初始化（用于调度器模式）"""
-    global _ocr_engine, _vector_service
+def _get_ocr_pool() -> ThreadPoolExecutor:
+    """获取OCR工作线程池"""
+    global _ocr_pool
+    if _ocr_pool is None:
+        with _ocr_pool_lock:
+            if _ocr_pool is None:
+                _ocr_pool = ThreadPoolExecutor(
+                    max_workers=get_ocr_governor().max_workers,
+                    thread_name_prefix="OCRWorker",
+                    initializer=lower_thread_priority,
+                )
+    return _ocr_pool
 
-    if _ocr_engine is None:
-        logger.info("正在初始化RapidOCR引擎...")
-        try:
-            _ocr_engine = _create_rapidocr_instance()
-            logger.info("RapidOCR引擎初始化成功")
-        except Exception as e:
-            logger.error(f"RapidOCR初始化失败: {e}")
-            raise
-
-    if _vector_service is None:
-        logger.info("正在初始化向量数据库服务...")
-        _vector_service = create_vector_service(config)
-        if _vector_service.is_enabled():
-            logger.info("向量数据库服务已启用")
-        else:
-            logger.info("向量数据库服务未启用或不可用")
 
-    return _ocr_engine, _vector_service
+def get_ocr_worker_engines() -> OCRWorkerEngines:
+    """获取OCR工作线程的引擎（每个线程一个）"""
+    global _ocr_worker_engines
+    if _ocr_worker_engines is None:
+        with _ocr_pool_lock:
+            if _ocr_worker_engines is None:
+                _ocr_worker_engines = OCRWorkerEngines(
+                    "rapidocr-worker", get_ocr_governor().max_workers
+                )
+    return _ocr_worker_engines
+
+
+def _process_claimed(screenshot_info, vector_service) -> bool:
+    """在OCR工作线程中用本线程的引擎处理已认领的截图"""
+    try:
+        with get_ocr_worker_engines().use() as ocr_engine:
+            return process_screenshot_ocr(screenshot_info, ocr_engine, vector_service)
+    except Exception as e:
+        # process_screenshot_ocr 自行处理识别错误，这里只会是引擎加载失败
+        logger.error(f"加载OCR引擎失败: {e}")
+        ocr_queue_mgr.release(
+            screenshot_info["id"],
+            error=str(e),
+            max_attempts=config.get("jobs.ocr.params.max_attempts"),
+        )
+        return False
+
+
+def _drain_ocr_queue(vector_service) -> int:
+    """循环认领并处理OCR队列中的截图，直到队列为空或被调控器暂停
+
+    每轮先由调控器根据 CPU、电池和前台活动决定并发数和间隔，
+    再按并发数认领截图交给OCR线程池并行处理（每个线程使用自己的引擎）。
+
+    Returns:
+        处理成功的截图数量
+    """
+    batch_size = config.get("jobs.ocr.params.batch_size")
+    worker_id = _get_worker_id()
+    governor = get_ocr_governor()
+    pool = _get_ocr_pool()
+
+    processed_count = 0
+    while True:
+        decision = governor.evaluate()
+        if decision["paused"]:
+            logger.info(f"OCR已暂停: {decision['reason']}")
+            break
+
+        claimed = ocr_queue_mgr.claim(
+            worker_id, limit=max(1, min(batch_size, decision["concurrency"]))
+        )
+        if not claimed:
+            break
+
+        logger.debug(
+            f"从OCR队列认领 {len(claimed)} 张截图，并发: {decision['concurrency']}, "
+            f"间隔: {decision['delay']:.2f}秒 ({decision['reason']})"
+        )
+        results = pool.map(lambda info: _process_claimed(info, vector_service), claimed)
+        processed_count += sum(1 for success in results if success)
+
+        if decision["delay"] > 0:
+            time.sleep(decision["delay"])
+
+    return processed_count
+
+
+def _has_pending_ocr() -> bool:
+    """队列中是否有待处理的截图（避免空轮询时加载OCR引擎）"""
+    return ocr_queue_mgr.get_queue_stats().get("pending", 0) > 0
 
 
 def execute_ocr_task():
     """执行一次OCR处理任务（用于调度器调用）
 
+    录制器入队新截图时会立即唤醒本任务，定时触发仅作为兜底，
+    同时负责回收过期租约。
+
     Returns:
         处理成功的截图数量
     """
     try:
-        # 确保OCR引擎已初始化
-        ocr, vector_service = _ensure_ocr_initialized()
-
-        # 从数据库获取未处理的截图
-        unprocessed_screenshots = get_unprocessed_screenshots(logger)
+        # 回收过期租约（工作者崩溃或超时的任务重新入队）
+        ocr_queue_mgr.requeue_stale(
+            config.get("jobs.ocr.params.lease_timeout"),
+            config.get("jobs.ocr.params.max_attempts"),
+        )
 
-        if not unprocessed_screenshots:
+        # 队列为空时不触碰引擎，空闲的引擎可以被模型注册表卸载
+        if not _has_pending_ocr():
             logger.debug("没有待处理的截图")
             return 0
 
-        logger.info(f"发现 {len(unprocessed_screenshots)} 个未处理的截图")
-
-        processed_count = 0
-        # 处理每个未处理的截图
-        for screenshot_info in unprocessed_screenshots:
-            success = process_screenshot_ocr(screenshot_info, ocr, vector_service)
-            if success:
-                processed_count += 1
-                # 处理成功后稍作停顿，避免过度占用资源
-                time.sleep(DEFAULT_PROCESSING_DELAY)
+        # 先加载一个工作线程引擎，引擎不可用时不认领任务
+        get_ocr_worker_engines().get()
+        processed_count = _drain_ocr_queue(get_vector_service())
 
-        logger.info(f"OCR任务完成，成功处理 {processed_count} 张截图")
+        if processed_count:
+            logger.info(f"OCR任务完成，成功处理 {processed_count} 张截图")
+        else:
+            logger.debug("没有待处理的截图")
         return processed_count
 
     except Exception as e:
@@ -577,10 +713,10 @@ def ocr_service():
     # 检查间隔配置
     check_interval = config.get("jobs.ocr.interval")
 
-    # 初始化RapidOCR
+    # 初始化RapidOCR（提前加载一次，配置错误时尽早失败）
     logger.info("正在初始化RapidOCR引擎...")
     try:
-        ocr = _create_rapidocr_instance()
+        get_ocr_worker_engines().get()
         logger.info("RapidOCR引擎初始化成功")
     except Exception as e:
         logger.error(f"RapidOCR初始化失败: {e}")
@@ -588,7 +724,7 @@ def ocr_service():
 
     # 初始化向量数据库服务
     logger.info("正在初始化向量数据库服务...")
-    vector_service = create_vector_service(config)
+    vector_service = get_vector_service()
     if vector_service.is_enabled():
         logger.info("向量数据库服务已启用")
     else:
@@ -601,31 +737,23 @@ def ocr_service():
     logger.info("按 Ctrl+C 停止服务")
     logger.info(f"OCR服务启动完成，检查间隔: {check_interval}秒")
 
-    processed_count = 0
+    # 补充历史未入队的截图
+    ocr_queue_mgr.backfill()
 
     try:
         while True:
-            start_time = time.time()  # noqa: F841
-
-            # 从数据库获取未处理的截图
-            unprocessed_screenshots = get_unprocessed_screenshots(logger)
-
-            if unprocessed_screenshots:
-                logger.info(f"发现 {len(unprocessed_screenshots)} 个未处理的截图")
-
-                # 数据库查询已经按创建时间降序排列，无需再次排序
-                # 直接处理，优先处理最新的截图
+            # 回收过期租约后处理队列中的截图
+            ocr_queue_mgr.requeue_stale(
+                config.get("jobs.ocr.params.lease_timeout"),
+                config.get("jobs.ocr.params.max_attempts"),
+            )
+            if _has_pending_ocr():
+                processed_count = _drain_ocr_queue(vector_service)
+                if processed_count:
+                    logger.info(f"本轮处理 {processed_count} 张截图")
 
-                # 处理每个未处理的截图
-                for screenshot_info in unprocessed_screenshots:
-                    success = process_screenshot_ocr(screenshot_info, ocr, vector_service)
-                    if success:
-                        processed_count += 1
-                        # 处理成功后稍作停顿，避免过度占用资源
-                        time.sleep(DEFAULT_PROCESSING_DELAY)
-            else:
-                # 没有未处理的截图，等待一段时间再检查
-                time.sleep(check_interval)
+            # 队列已空（独立进程无法收到录制器的进程内通知），等待下一轮检查
+            time.sleep(check_interval)
 
     except KeyboardInterrupt:
         logger.error("收到停止信号，结束OCR处理")
@@ -633,6 +761,8 @@ def ocr_service():
         logger.error(f"OCR处理过程中发生错误: {e}")
         raise Exception(e) from e
     finally:
+        # 等待后台向量索引处理完剩余记录
+        stop_vector_indexer()
         logger.error("OCR服务已停止")
 
 
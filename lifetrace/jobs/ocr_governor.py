@@ -0,0 +1,185 @@
+"""
+OCR 资源调控模块
+根据系统 CPU 负载、电池状态和前台活动，动态决定 OCR 的并发数和处理间隔，
+让 OCR 在积压时充分利用空闲算力，在用户忙碌或电量不足时主动让路。
+"""
+
+import os
+import platform
+import threading
+import time
+from datetime import datetime
+from typing import Any
+
+import psutil
+
+from lifetrace.util.config import config
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+# 低于预算此比例时才提升并发（留出回差，避免抖动）
+SCALE_UP_RATIO = 0.7
+
+
+def lower_thread_priority(niceness: int | None = None):
+    """降低当前线程的调度优先级（用作OCR线程池的 initializer）
+
+    Linux 上线程就是独立的调度实体，可以只调整 OCR 工作线程而不影响 API 服务线程；
+    其他平台只能调整整个进程的优先级，会拖慢同进程的服务，因此不做处理。
+    """
+    if niceness is None:
+        niceness = config.get("jobs.ocr.params.worker_nice")
+    if not niceness or platform.system() != "Linux":
+        return
+
+    try:
+        tid = threading.get_native_id()
+        current = os.getpriority(os.PRIO_PROCESS, tid)
+        os.setpriority(os.PRIO_PROCESS, tid, max(current, niceness))
+    except OSError as e:
+        logger.debug(f"降低OCR线程优先级失败: {e}")
+
+
+class OCRGovernor:
+    """OCR 资源调控器
+
+    每轮处理前调用 evaluate() 得到当前决策：
+    - 电池供电且电量低于阈值：暂停
+    - 系统 CPU 超出预算：并发减一、间隔加倍
+    - 系统 CPU 明显低于预算：并发加一、间隔减半
+    - 电池供电或用户前台活跃：并发最多为 1
+    """
+
+    def __init__(
+        self,
+        cpu_budget: float = 50.0,
+        max_workers: int = 2,
+        min_delay: float = 0.0,
+        max_delay: float = 2.0,
+        battery_pause_threshold: float = 20.0,
+        foreground_window: float = 30.0,
+    ):
+        """
+        Args:
+            cpu_budget: 系统总 CPU 使用率上限（百分比）
+            max_workers: 最大并发数
+            min_delay: 每轮之间的最小间隔（秒）
+            max_delay: 每轮之间的最大间隔（秒）
+            battery_pause_threshold: 电池供电时低于此电量（百分比）暂停OCR
+            foreground_window: 最近多少秒内有新截图视为用户前台活跃
+        """
+        self.cpu_budget = float(cpu_budget)
+        self.max_workers = max(1, int(max_workers))
+        self.min_delay = float(min_delay)
+        self.max_delay = max(float(max_delay), self.min_delay)
+        self.battery_pause_threshold = float(battery_pause_threshold)
+        self.foreground_window = float(foreground_window)
+
+        self._lock = threading.Lock()
+        self._concurrency = 1
+        self._delay = self.min_delay
+        self._last_activity = 0.0
+        self._last_decision: dict[str, Any] = {}
+
+        # 初始化 CPU 采样基准（psutil 非阻塞调用返回距上次调用的平均值）
+        psutil.cpu_percent(interval=None)
+
+    def notify_foreground_activity(self):
+        """记录一次前台活动（录制器保存了内容有变化的新截图）"""
+        self._last_activity = time.monotonic()
+
+    def _read_battery(self) -> tuple[bool, float | None]:
+        """读取电池状态
+
+        Returns:
+            (是否电池供电, 电量百分比)，无电池时返回 (False, None)
+        """
+        try:
+            battery = psutil.sensors_battery()
+        except Exception:
+            battery = None
+        if battery is None:
+            return False, None
+        return not battery.power_plugged, battery.percent
+
+    def _adjust(self, cpu_percent: float):
+        """根据 CPU 负载调整并发数和间隔"""
+        if cpu_percent > self.cpu_budget:
+            self._concurrency = max(1, self._concurrency - 1)
+            self._delay = min(self.max_delay, max(self._delay * 2, 0.1))
+        elif cpu_percent < self.cpu_budget * SCALE_UP_RATIO:
+            self._concurrency = min(self.max_workers, self._concurrency + 1)
+            self._delay = max(self.min_delay, self._delay / 2)
+
+    def evaluate(self) -> dict[str, Any]:
+        """评估当前资源状况，返回OCR调控决策"""
+        cpu_percent = psutil.cpu_percent(interval=None)
+        on_battery, battery_percent = self._read_battery()
+        foreground_active = (
+            self._last_activity > 0
+            and time.monotonic() - self._last_activity < self.foreground_window
+        )
+
+        with self._lock:
+            paused = False
+            reasons = []
+
+            if on_battery and battery_percent is not None:
+                if battery_percent < self.battery_pause_threshold:
+                    paused = True
+                    reasons.append(f"电池电量 {battery_percent:.0f}% 低于阈值")
+
+            self._adjust(cpu_percent)
+            concurrency = self._concurrency
+            if cpu_percent > self.cpu_budget:
+                reasons.append(f"CPU {cpu_percent:.0f}% 超出预算 {self.cpu_budget:.0f}%")
+            if on_battery:
+                concurrency = 1
+                reasons.append("电池供电")
+            if foreground_active:
+                concurrency = 1
+                reasons.append("用户前台活跃")
+
+            self._last_decision = {
+                "paused": paused,
+                "concurrency": concurrency,
+                "delay": self._delay,
+                "reason": "，".join(reasons) if reasons else "资源充足",
+                "cpu_percent": cpu_percent,
+                "cpu_budget": self.cpu_budget,
+                "on_battery": on_battery,
+                "battery_percent": battery_percent,
+                "foreground_active": foreground_active,
+                "max_workers": self.max_workers,
+                "evaluated_at": datetime.now().isoformat(),
+            }
+            return dict(self._last_decision)
+
+    def get_status(self) -> dict[str, Any]:
+        """获取最近一次调控决策（尚未评估过时立即评估一次）"""
+        with self._lock:
+            decision = dict(self._last_decision)
+        return decision or self.evaluate()
+
+
+# 全局调控器实例
+_ocr_governor: OCRGovernor | None = None
+_ocr_governor_lock = threading.Lock()
+
+
+def get_ocr_governor() -> OCRGovernor:
+    """获取全局OCR调控器实例"""
+    global _ocr_governor
+    if _ocr_governor is None:
+        with _ocr_governor_lock:
+            if _ocr_governor is None:
+                _ocr_governor = OCRGovernor(
+                    cpu_budget=config.get("jobs.ocr.params.cpu_budget"),
+                    max_workers=config.get("jobs.ocr.params.max_workers"),
+                    min_delay=config.get("jobs.ocr.params.min_delay"),
+                    max_delay=config.get("jobs.ocr.params.max_delay"),
+                    battery_pause_threshold=config.get("jobs.ocr.params.battery_pause_threshold"),
+                    foreground_window=config.get("jobs.ocr.params.foreground_window"),
+                )
+    return _ocr_governor
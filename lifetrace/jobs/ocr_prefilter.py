@@ -0,0 +1,89 @@
+"""
+OCR 文本预判模块
+在缩小后的灰度图上计算边缘密度和文本行结构，快速判断截图是否值得完整OCR：
+- text_rich: 文本丰富，完整识别
+- text_poor: 少量文本（如播放视频时周围的界面文字），降低分辨率识别
+- textless: 无文本结构（纯色画面、全屏视频、游戏），跳过识别
+"""
+
+import numpy as np
+from PIL import Image
+
+from lifetrace.util.config import config
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+# 预判结果
+TEXT_RICH = "text_rich"
+TEXT_POOR = "text_poor"
+TEXTLESS = "textless"
+
+# 预判使用的缩略图尺寸（约为1080p的一半，保留常规字号的笔画）
+PREFILTER_SIZE = (960, 540)
+
+# 相邻像素灰度差超过此值视为边缘（文字笔画通常对比强烈）
+EDGE_THRESHOLD = 40
+
+# 行内边缘像素比例低于此值视为空白行（文本行之间的行距）
+EMPTY_ROW_DENSITY = 0.002
+
+
+def compute_text_features(img_array: np.ndarray) -> dict[str, float]:
+    """计算文本相关特征
+
+    Args:
+        img_array: 预处理后的图像数组（RGB 或灰度）
+
+    Returns:
+        edge_density: 整体边缘像素比例
+        text_bands: 空白行到非空白行的切换次数（近似文本行数）
+    """
+    img = Image.fromarray(img_array)
+    if img.mode != "L":
+        img = img.convert("L")
+    img.thumbnail(PREFILTER_SIZE, Image.Resampling.BILINEAR)
+    gray = np.asarray(img, dtype=np.int16)
+
+    # 水平方向梯度：文字的竖直笔画会产生密集的强边缘
+    edges = np.abs(np.diff(gray, axis=1)) > EDGE_THRESHOLD
+    row_density = edges.mean(axis=1)
+
+    # 文本呈行状排列，行与行之间有空白；照片和视频画面通常没有这种结构
+    active_rows = row_density > EMPTY_ROW_DENSITY
+    text_bands = int(np.count_nonzero(active_rows[1:] & ~active_rows[:-1]))
+
+    return {"edge_density": float(edges.mean()), "text_bands": text_bands}
+
+
+def classify_frame(img_array: np.ndarray) -> str:
+    """判断截图的文本丰富程度
+
+    Returns:
+        TEXT_RICH / TEXT_POOR / TEXTLESS
+    """
+    features = compute_text_features(img_array)
+    rich_bands = config.get("jobs.ocr.params.prefilter_rich_bands")
+    min_edge_density = config.get("jobs.ocr.params.prefilter_min_edge_density")
+
+    if features["edge_density"] < min_edge_density or features["text_bands"] == 0:
+        label = TEXTLESS
+    elif features["text_bands"] >= rich_bands:
+        label = TEXT_RICH
+    else:
+        label = TEXT_POOR
+
+    logger.debug(
+        f"文本预判: {label} (边缘密度 {features['edge_density']:.4f}, "
+        f"文本行 {features['text_bands']})"
+    )
+    return label
+
+
+def downscale_for_ocr(img_array: np.ndarray, scale: float) -> np.ndarray:
+    """按比例缩小图像，用于少量文本的低分辨率识别"""
+    if scale >= 1:
+        return img_array
+    img = Image.fromarray(img_array)
+    size = (max(1, int(img.width * scale)), max(1, int(img.height * scale)))
+    return np.asarray(img.resize(size, Image.Resampling.BILINEAR))
@@ -0,0 +1,108 @@
+"""
+OCR 图像预处理模块
+录制器（内存帧）和 OCR（磁盘文件）共用同一套预处理，保证两条路径输入一致
+"""
+
+import numpy as np
+from PIL import Image
+
+from lifetrace.util.config import config
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+# OCR输入图像的默认最大尺寸
+DEFAULT_IMAGE_MAX_SIZE = (1920, 1080)
+
+# 可配置的重采样滤镜（按速度从快到慢排列）
+RESAMPLE_FILTERS = {
+    "nearest": Image.Resampling.NEAREST,
+    "box": Image.Resampling.BOX,
+    "bilinear": Image.Resampling.BILINEAR,
+    "hamming": Image.Resampling.HAMMING,
+    "bicubic": Image.Resampling.BICUBIC,
+    "lanczos": Image.Resampling.LANCZOS,
+}
+DEFAULT_RESAMPLE = "lanczos"
+
+
+def get_preprocess_options() -> dict:
+    """从配置读取预处理选项
+
+    Returns:
+        包含 max_size, resample, draft, grayscale 的字典
+    """
+    max_size = config.get("jobs.ocr.params.preprocess_max_size")
+    resample = str(config.get("jobs.ocr.params.preprocess_resample")).lower()
+    if resample not in RESAMPLE_FILTERS:
+        logger.warning(f"未知的重采样滤镜 {resample}，使用默认值 {DEFAULT_RESAMPLE}")
+        resample = DEFAULT_RESAMPLE
+
+    return {
+        "max_size": tuple(max_size) if max_size else DEFAULT_IMAGE_MAX_SIZE,
+        "resample": resample,
+        "draft": bool(config.get("jobs.ocr.params.preprocess_draft")),
+        "grayscale": bool(config.get("jobs.ocr.params.preprocess_grayscale")),
+    }
+
+
+def prepare_image(img: Image.Image, options: dict | None = None) -> np.ndarray:
+    """将PIL图像转换为OCR输入并缩放到目标尺寸
+
+    灰度模式下先转换为单通道再缩放，缩放只需处理三分之一的数据。
+
+    Args:
+        img: PIL图像对象（可能会被原地缩放）
+        options: 预处理选项，None 时从配置读取
+
+    Returns:
+        预处理后的图像数组（RGB 为三维数组，灰度为二维数组）
+    """
+    if options is None:
+        options = get_preprocess_options()
+
+    target_mode = "L" if options["grayscale"] else "RGB"
+    if img.mode != target_mode:
+        img = img.convert(target_mode)
+
+    img.thumbnail(options["max_size"], RESAMPLE_FILTERS[options["resample"]])
+    return np.asarray(img)
+
+
+def load_image(image_path: str, options: dict | None = None) -> np.ndarray:
+    """从磁盘读取图像并预处理
+
+    对 JPEG 等支持 draft 模式的格式，解码时直接按接近目标尺寸的比例缩小，
+    跳过大部分全分辨率解码工作；PNG 不支持 draft，此选项对其无影响。
+
+    Args:
+        image_path: 图像文件路径
+        options: 预处理选项，None 时从配置读取
+
+    Returns:
+        预处理后的图像数组
+    """
+    if options is None:
+        options = get_preprocess_options()
+
+    with Image.open(image_path) as img:
+        if options["draft"]:
+            img.draft("L" if options["grayscale"] else "RGB", options["max_size"])
+        return prepare_image(img, options)
+
+
+def prepare_raw_frame(
+    bgra: bytes, size: tuple[int, int], options: dict | None = None
+) -> np.ndarray:
+    """直接从截图的原始BGRA缓冲区生成OCR输入，不经过PNG编解码
+
+    Args:
+        bgra: mss 截图的原始 BGRA 像素数据
+        size: 图像尺寸 (width, height)
+        options: 预处理选项，None 时从配置读取
+
+    Returns:
+        预处理后的图像数组
+    """
+    img = Image.frombuffer("RGB", size, bgra, "raw", "BGRX", 0, 1)
+    return prepare_image(img, options)
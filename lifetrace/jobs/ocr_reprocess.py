@@ -0,0 +1,329 @@
+"""
+历史截图OCR重处理模块
+按时间范围、应用或引擎版本筛选历史截图，用线程池并行重新识别，
+每批结果与断点在同一事务中提交，向量文档批量覆盖写入；任务中断后可从断点继续。
+
+用法:
+    python -m lifetrace.jobs.ocr_reprocess --start 2024-06-01 --end 2024-06-30 --outdated-only
+    python -m lifetrace.jobs.ocr_reprocess --resume 3
+"""
+
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any
+
+from lifetrace.jobs.ocr import (
+    OCRWorkerEngines,
+    _preprocess_image,
+    get_engine_version,
+    recognize_image,
+)
+from lifetrace.jobs.ocr_governor import lower_thread_priority
+from lifetrace.llm.vector_indexer import get_vector_indexer, stop_vector_indexer
+from lifetrace.llm.vector_service import get_vector_service
+from lifetrace.storage import ocr_reprocess_mgr
+from lifetrace.storage.ocr_reprocess_manager import (
+    STATUS_CANCELLED,
+    STATUS_COMPLETED,
+    STATUS_FAILED,
+    STATUS_RUNNING,
+)
+from lifetrace.util.config import config
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+
+class OCRReprocessRunner:
+    """单个重处理任务的后台执行线程"""
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"OCRReprocess-{job_id}", daemon=True
+        )
+        # 本次运行的处理速率（用于估算剩余时间）
+        self._run_started = 0.0
+        self._run_done = 0
+
+    def start(self):
+        self._run_started = time.monotonic()
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def join(self, timeout: float | None = None):
+        self._thread.join(timeout)
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def get_rate(self) -> float:
+        """本次运行的处理速率（张/秒）"""
+        elapsed = time.monotonic() - self._run_started
+        return self._run_done / elapsed if elapsed > 0 else 0.0
+
+    def _process_one(
+        self, item: dict[str, Any], engines: OCRWorkerEngines
+    ) -> dict[str, Any] | None:
+        """用当前线程的引擎重新识别单张截图，失败返回None"""
+        file_path = item["file_path"]
+        try:
+            if not file_path or not os.path.exists(file_path):
+                logger.warning(f"重处理跳过截图 {item['id']}: 文件不存在")
+                return None
+
+            start_time = time.time()
+            with engines.use() as ocr_engine:
+                result = recognize_image(_preprocess_image(file_path), ocr_engine)
+            result["processing_time"] = time.time() - start_time
+            return result
+        except Exception as e:
+            logger.error(f"重处理截图 {item['id']} 失败: {e}")
+            return None
+
+    def _index_records(self, records: list[dict[str, Any]], vector_service):
+        """批量覆盖OCR向量文档，受影响的事件交给索引器合并更新"""
+        if not records or not vector_service or not vector_service.is_enabled():
+            return
+        try:
+            vector_service.add_ocr_records(records, upsert=True)
+            indexer = get_vector_indexer(vector_service)
+            for event_id in {r["event_id"] for r in records if r.get("event_id")}:
+                indexer.schedule_event(event_id)
+        except Exception as e:
+            # 向量写入失败不影响数据库结果，可通过向量同步补齐
+            logger.error(f"重处理结果写入向量库失败: {e}")
+
+    def _run(self):
+        job = ocr_reprocess_mgr.get_job(self.job_id)
+        if not job:
+            logger.error(f"OCR重处理任务 {self.job_id} 不存在")
+            return
+
+        ocr_reprocess_mgr.update_job(
+            self.job_id,
+            status=STATUS_RUNNING,
+            error=None,
+            started_at=job["started_at"] or datetime.now(),
+            finished_at=None,
+        )
+        logger.info(
+            f"OCR重处理任务 {self.job_id} 开始: 已处理 {job['processed']}/{job['total']}，"
+            f"断点截图ID {job['last_screenshot_id']}"
+        )
+
+        # 每个工作线程使用自己的引擎，任务结束后释放
+        workers = max(1, job["workers"])
+        engines = OCRWorkerEngines(f"rapidocr-reprocess-{self.job_id}", workers)
+        try:
+            # 先加载一个引擎，引擎不可用时任务直接失败
+            engines.get()
+            vector_service = get_vector_service()
+            with ThreadPoolExecutor(
+                max_workers=workers,
+                thread_name_prefix=f"OCRReprocessWorker-{self.job_id}",
+                initializer=lower_thread_priority,
+            ) as pool:
+                while not self._stop_event.is_set():
+                    batch = ocr_reprocess_mgr.select_batch(job, job["batch_size"])
+                    if not batch:
+                        break
+
+                    outputs = list(
+                        pool.map(lambda item: self._process_one(item, engines), batch)
+                    )
+                    results = {
+                        item["id"]: output
+                        for item, output in zip(batch, outputs, strict=True)
+                        if output is not None
+                    }
+                    failed_count = len(batch) - len(results)
+
+                    # 结果与断点同一事务提交，之后再写向量（崩溃时最多重做向量写入）
+                    records = ocr_reprocess_mgr.save_batch(
+                        self.job_id, results, batch[-1]["id"], failed_count
+                    )
+                    job["last_screenshot_id"] = batch[-1]["id"]
+                    self._run_done += len(batch)
+                    self._index_records(records, vector_service)
+
+            if self._stop_event.is_set():
+                ocr_reprocess_mgr.update_job(self.job_id, status=STATUS_CANCELLED)
+                logger.info(f"OCR重处理任务 {self.job_id} 已取消")
+            else:
+                ocr_reprocess_mgr.update_job(
+                    self.job_id, status=STATUS_COMPLETED, finished_at=datetime.now()
+                )
+                logger.info(f"OCR重处理任务 {self.job_id} 已完成")
+
+        except Exception as e:
+            logger.error(f"OCR重处理任务 {self.job_id} 失败: {e}")
+            ocr_reprocess_mgr.update_job(
+                self.job_id, status=STATUS_FAILED, error=str(e), finished_at=datetime.now()
+            )
+        finally:
+            engines.release()
+
+
+# 当前进程中正在运行的重处理任务
+_runners: dict[int, OCRReprocessRunner] = {}
+_runners_lock = threading.Lock()
+
+
+def _launch(job_id: int) -> OCRReprocessRunner:
+    """启动任务执行线程（同一任务不会重复启动）"""
+    with _runners_lock:
+        runner = _runners.get(job_id)
+        if runner and runner.is_alive():
+            return runner
+        runner = OCRReprocessRunner(job_id)
+        _runners[job_id] = runner
+        runner.start()
+        return runner
+
+
+def start_reprocess(
+    filters: dict[str, Any], workers: int | None = None, batch_size: int | None = None
+) -> dict[str, Any] | None:
+    """创建并启动重处理任务
+
+    Args:
+        filters: 筛选条件（start_time、end_time、app_name、engine_version、outdated_only）
+        workers: 并行线程数，默认读取配置
+        batch_size: 每批截图数量，默认读取配置
+
+    Returns:
+        任务状态，创建失败返回None
+    """
+    job_id = ocr_reprocess_mgr.create_job(
+        filters,
+        get_engine_version(),
+        workers=workers or config.get("jobs.ocr.params.reprocess_workers"),
+        batch_size=batch_size or config.get("jobs.ocr.params.reprocess_batch_size"),
+    )
+    if job_id is None:
+        return None
+    _launch(job_id)
+    return get_reprocess_status(job_id)
+
+
+def resume_reprocess(job_id: int) -> dict[str, Any] | None:
+    """从断点继续未完成的任务（已完成的任务直接返回状态）"""
+    job = ocr_reprocess_mgr.get_job(job_id)
+    if not job:
+        return None
+    if job["status"] != STATUS_COMPLETED:
+        _launch(job_id)
+    return get_reprocess_status(job_id)
+
+
+def cancel_reprocess(job_id: int) -> dict[str, Any] | None:
+    """取消任务（当前批次处理完后停止，可再次继续）"""
+    job = ocr_reprocess_mgr.get_job(job_id)
+    if not job:
+        return None
+
+    with _runners_lock:
+        runner = _runners.get(job_id)
+    if runner and runner.is_alive():
+        runner.stop()
+    elif job["status"] != STATUS_COMPLETED:
+        ocr_reprocess_mgr.update_job(job_id, status=STATUS_CANCELLED)
+    return get_reprocess_status(job_id)
+
+
+def get_reprocess_status(job_id: int) -> dict[str, Any] | None:
+    """获取任务状态，包含进度和预计剩余时间"""
+    job = ocr_reprocess_mgr.get_job(job_id)
+    if not job:
+        return None
+
+    with _runners_lock:
+        runner = _runners.get(job_id)
+    active = bool(runner and runner.is_alive())
+    rate = runner.get_rate() if active else 0.0
+    remaining = max(0, job["total"] - job["processed"] - job["failed"])
+
+    job["active"] = active
+    job["remaining"] = remaining
+    job["progress"] = (job["processed"] + job["failed"]) / job["total"] if job["total"] else 1.0
+    job["images_per_second"] = rate
+    job["eta_seconds"] = remaining / rate if rate > 0 else None
+    return job
+
+
+def list_reprocess_jobs(limit: int = 20) -> list[dict[str, Any]]:
+    """获取最近的重处理任务状态"""
+    return [get_reprocess_status(job["id"]) for job in ocr_reprocess_mgr.list_jobs(limit)]
+
+
+def _print_status(status: dict[str, Any]):
+    """输出任务进度"""
+    eta = status["eta_seconds"]
+    eta_text = f"{eta / 60:.1f} 分钟" if eta is not None else "未知"
+    print(
+        f"任务 {status['id']} [{status['status']}] "
+        f"{status['processed'] + status['failed']}/{status['total']} "
+        f"(失败 {status['failed']})，速率 {status['images_per_second']:.2f} 张/秒，"
+        f"预计剩余 {eta_text}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LifeTrace 历史截图OCR重处理")
+    parser.add_argument("--start", help="开始时间（ISO格式，如 2024-06-01）")
+    parser.add_argument("--end", help="结束时间（ISO格式，如 2024-06-30T23:59:59）")
+    parser.add_argument("--app", help="只处理指定应用的截图")
+    parser.add_argument("--engine-version", help="只处理由指定引擎版本识别的截图")
+    parser.add_argument(
+        "--outdated-only", action="store_true", help="跳过已由当前引擎版本识别的截图"
+    )
+    parser.add_argument("--workers", type=int, help="并行线程数")
+    parser.add_argument("--batch-size", type=int, help="每批截图数量")
+    parser.add_argument("--resume", type=int, metavar="JOB_ID", help="从断点继续指定任务")
+    parser.add_argument("--interval", type=float, default=10.0, help="进度输出间隔（秒）")
+    args = parser.parse_args()
+
+    if args.resume:
+        status = resume_reprocess(args.resume)
+    else:
+        filters = {
+            "start_time": args.start,
+            "end_time": args.end,
+            "app_name": args.app,
+            "engine_version": args.engine_version,
+            "outdated_only": args.outdated_only,
+        }
+        status = start_reprocess(
+            {k: v for k, v in filters.items() if v}, args.workers, args.batch_size
+        )
+    if not status:
+        print("任务不存在或创建失败")
+        return
+
+    job_id = status["id"]
+    print(f"任务 {job_id}: 待处理 {status['total']} 张截图，引擎版本 {status['engine_version']}")
+    runner = _runners.get(job_id)
+    try:
+        while runner and runner.is_alive():
+            runner.join(args.interval)
+            _print_status(get_reprocess_status(job_id))
+    except KeyboardInterrupt:
+        print("正在停止，当前批次完成后退出（可使用 --resume 继续）...")
+        cancel_reprocess(job_id)
+        runner.join()
+    finally:
+        # 更新仍在等待合并的事件文档
+        stop_vector_indexer()
+    _print_status(get_reprocess_status(job_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -16,7 +16,10 @@ import imagehash
 import mss
 from PIL import Image
 
-from lifetrace.storage import event_mgr, get_session, screenshot_mgr
+from lifetrace.jobs.frame_buffer import get_frame_buffer
+from lifetrace.jobs.ocr_governor import get_ocr_governor
+from lifetrace.jobs.ocr_preprocess import prepare_raw_frame
+from lifetrace.storage import event_mgr, get_session, ocr_queue_mgr, screenshot_mgr
 from lifetrace.util.app_utils import expand_blacklist_apps
 from lifetrace.util.config import config
 from lifetrace.util.logging_config import get_logger
@@ -543,7 +546,17 @@ class ScreenRecorder:
 
             # 获取窗口信息和保存到数据库
             app_name, window_title = self._ensure_window_info(app_name, window_title)
-            self._save_screenshot_metadata(file_path, screen_id, app_name, window_title, timestamp)
+            screenshot_id = self._save_screenshot_metadata(
+                file_path, screen_id, app_name, window_title, timestamp
+            )
+
+            if screenshot_id:
+                # 画面有变化说明用户在前台活动，OCR据此让出CPU
+                get_ocr_governor().notify_foreground_activity()
+
+                # 先把内存中的帧交给同进程的OCR，再入队（入队会立即唤醒OCR任务）
+                self._publish_ocr_frame(screenshot_id, screenshot)
+                ocr_queue_mgr.enqueue(screenshot_id)
 
             return file_path, "success"
 
@@ -575,10 +588,25 @@ class ScreenRecorder:
             return self._get_window_info()
         return app_name, window_title
 
+    def _publish_ocr_frame(self, screenshot_id: int, screenshot):
+        """将截图的预处理帧放入共享缓冲区（仅当同进程内有OCR消费者时）"""
+        frame_buffer = get_frame_buffer()
+        if not frame_buffer.enabled:
+            return
+
+        try:
+            frame_buffer.publish(screenshot_id, prepare_raw_frame(screenshot.bgra, screenshot.size))
+        except Exception as e:
+            logger.warning(f"放入OCR帧缓冲区失败，OCR将从磁盘读取: {e}")
+
     def _save_screenshot_metadata(
         self, file_path: str, screen_id: int, app_name: str, window_title: str, timestamp: datetime
-    ):
-        """保存截图的元数据到数据库"""
+    ) -> int | None:
+        """保存截图的元数据到数据库
+
+        Returns:
+            截图ID，保存失败返回None
+        """
         filename = os.path.basename(file_path)
 
         # 获取图像尺寸
@@ -607,6 +635,8 @@ class ScreenRecorder:
         file_size_kb = file_size / 1024
         logger.info(f"[窗口 {screen_id}] 截图保存: {filename} ({file_size_kb:.2f} KB) - {app_name}")
 
+        return screenshot_id
+
     def capture_all_screens(self) -> list[str]:
         """只截取活跃窗口所在的屏幕"""
         captured_files = []
@@ -779,6 +809,7 @@ class ScreenRecorder:
         )
 
         if screenshot_id:
+            ocr_queue_mgr.enqueue(screenshot_id)
             filename = os.path.basename(file_path)
             logger.debug(f"[窗口 {screen_id}] 已处理未处理文件: {filename} (ID: {screenshot_id})")
             return True
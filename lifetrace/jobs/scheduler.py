@@ -3,6 +3,7 @@ APScheduler 调度器管理模块，用于管理 LifeTrace 的定时任务
 """
 
 import os
+from datetime import datetime
 
 from apscheduler.events import (
     EVENT_JOB_ADDED,
@@ -223,6 +224,34 @@ class SchedulerManager:
             logger.error(f"恢复任务失败: {e}")
             return False
 
+    def wake_job(self, job_id: str) -> bool:
+        """立即唤醒任务，让其尽快执行一次（已暂停的任务保持暂停）
+
+        Args:
+            job_id: 任务ID
+
+        Returns:
+            是否已唤醒
+        """
+        if not self.scheduler or not self.scheduler.running:
+            return False
+
+        try:
+            job = self.scheduler.get_job(job_id)
+            if not job or job.next_run_time is None:
+                return False
+
+            now = datetime.now(job.next_run_time.tzinfo)
+            if job.next_run_time <= now:
+                return True
+
+            self.scheduler.modify_job(job_id, next_run_time=now)
+            logger.debug(f"任务已唤醒: {job_id}")
+            return True
+        except Exception as e:
+            logger.error(f"唤醒任务失败: {e}")
+            return False
+
     def get_job(self, job_id: str):
         """获取任务信息
 
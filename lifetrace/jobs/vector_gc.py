@@ -0,0 +1,64 @@
+"""
+向量库清理任务
+定期删除向量库中对应的OCR结果或事件已不存在的文档，并整理索引回收空间
+"""
+
+from lifetrace.util.config import config
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+
+class VectorGCService:
+    """向量库清理服务"""
+
+    def __init__(self):
+        """初始化向量库清理服务"""
+        self.batch_size = config.get("jobs.vector_gc.params.batch_size")
+        logger.info("向量库清理服务已初始化")
+
+    def execute(self) -> dict:
+        """执行向量库清理任务
+
+        Returns:
+            清理结果（见 VectorService.collect_garbage）
+        """
+        from lifetrace.llm.vector_service import get_vector_service
+
+        try:
+            vector_service = get_vector_service()
+            if not vector_service.is_enabled():
+                logger.debug("向量数据库不可用，跳过向量库清理")
+                return {"enabled": False}
+
+            result = vector_service.collect_garbage(self.batch_size)
+            if "reclaimed_documents" in result:
+                logger.info(
+                    f"向量库清理完成 - 回收文档: {result['reclaimed_documents']}, "
+                    f"释放空间: {result['reclaimed_bytes'] / 1024 / 1024:.2f}MB"
+                )
+            return result
+
+        except Exception as e:
+            logger.error(f"执行向量库清理任务失败: {e}", exc_info=True)
+            return {"error": str(e)}
+
+
+# 全局单例
+_vector_gc_instance: VectorGCService | None = None
+
+
+def get_vector_gc_instance() -> VectorGCService:
+    """获取向量库清理服务单例"""
+    global _vector_gc_instance
+    if _vector_gc_instance is None:
+        _vector_gc_instance = VectorGCService()
+    return _vector_gc_instance
+
+
+def execute_vector_gc_task():
+    """执行向量库清理任务 - 供调度器调用的可序列化函数"""
+    try:
+        get_vector_gc_instance().execute()
+    except Exception as e:
+        logger.error(f"执行向量库清理任务失败: {e}", exc_info=True)
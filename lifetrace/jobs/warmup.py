@@ -0,0 +1,116 @@
+"""
+启动预热模块
+服务开始监听后，在后台线程中依次初始化向量数据库、嵌入模型和OCR引擎，
+让首个请求不必承担模型加载时间；各组件的就绪状态通过 /health 报告。
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from lifetrace.util.config import config
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+# 组件状态
+STATUS_PENDING = "pending"
+STATUS_LOADING = "loading"
+STATUS_READY = "ready"
+STATUS_DISABLED = "disabled"
+STATUS_FAILED = "failed"
+
+_components: dict[str, dict[str, Any]] = {}
+_components_lock = threading.Lock()
+_warmup_thread: threading.Thread | None = None
+
+
+def _set_status(name: str, status: str, **extra):
+    with _components_lock:
+        _components[name] = {"status": status, **extra}
+
+
+def _warm_vector_db() -> bool:
+    """初始化共享向量服务（导入 chromadb 并打开持久化客户端）"""
+    from lifetrace.llm.vector_service import get_vector_service
+
+    return get_vector_service().is_enabled()
+
+
+def _warm_embedding_model() -> bool:
+    """加载嵌入模型并编码一次，完成首次推理的初始化"""
+    from lifetrace.llm.vector_service import get_vector_service
+
+    vector_service = get_vector_service()
+    if not vector_service.is_enabled() or not vector_service.vector_db.embedding_model_name:
+        return False
+    vector_service.vector_db.embed_text("warmup")
+    return True
+
+
+def _warm_ocr_engine() -> bool:
+    """加载首个OCR工作线程的RapidOCR引擎（OCR任务未启用时跳过）"""
+    from lifetrace.jobs.ocr import RAPIDOCR_AVAILABLE, get_ocr_worker_engines
+
+    if not config.get("jobs.ocr.enabled") or not RAPIDOCR_AVAILABLE:
+        return False
+    get_ocr_worker_engines().get()
+    return True
+
+
+# 预热顺序：向量库 -> 嵌入模型 -> OCR引擎
+WARMUP_STEPS: list[tuple[str, Callable[[], bool]]] = [
+    ("vector_db", _warm_vector_db),
+    ("embedding_model", _warm_embedding_model),
+    ("ocr_engine", _warm_ocr_engine),
+]
+
+
+def _run_warmup():
+    for name, step in WARMUP_STEPS:
+        _set_status(name, STATUS_LOADING)
+        start = time.perf_counter()
+        try:
+            enabled = step()
+            elapsed = time.perf_counter() - start
+            _set_status(name, STATUS_READY if enabled else STATUS_DISABLED, seconds=elapsed)
+            if enabled:
+                logger.info(f"预热完成: {name}，用时 {elapsed:.2f}秒")
+        except Exception as e:
+            logger.error(f"预热 {name} 失败: {e}")
+            _set_status(name, STATUS_FAILED, error=str(e))
+
+
+def start_warmup() -> threading.Thread | None:
+    """启动后台预热线程（只启动一次）
+
+    未启用预热时各组件保持 pending，在首次使用时加载。
+    """
+    global _warmup_thread
+    with _components_lock:
+        if _warmup_thread is not None:
+            return _warmup_thread
+        for name, _ in WARMUP_STEPS:
+            _components.setdefault(name, {"status": STATUS_PENDING})
+        if not config.get("server.warmup"):
+            logger.info("已关闭启动预热，模型将在首次使用时加载")
+            return None
+        _warmup_thread = threading.Thread(target=_run_warmup, name="Warmup", daemon=True)
+        _warmup_thread.start()
+        return _warmup_thread
+
+
+def get_readiness() -> dict[str, Any]:
+    """获取各组件的就绪状态
+
+    Returns:
+        ready: 所有组件均已就绪或未启用
+        components: 组件名到状态的映射
+    """
+    with _components_lock:
+        components = {name: dict(info) for name, info in _components.items()}
+    ready = bool(components) and all(
+        info["status"] in (STATUS_READY, STATUS_DISABLED) for info in components.values()
+    )
+    return {"ready": ready, "components": components}
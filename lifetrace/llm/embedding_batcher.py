@@ -0,0 +1,119 @@
+"""查询嵌入微批处理
+
+并发到达的查询编码请求先进入队列，后台线程收集一个很短的时间窗口（或凑满一批）后
+调用一次模型编码，再把结果分发给各请求的 Future。并发请求越多，单次模型调用分摊的开销越大，
+高并发下的尾延迟明显下降；同一文本的并发请求共用一个 Future，只编码一次。
+"""
+
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
+
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+
+class EmbeddingBatcher:
+    """查询嵌入微批处理器"""
+
+    def __init__(
+        self,
+        encode: Callable[[list[str]], list[list[float]]],
+        window_ms: float = 5,
+        max_batch_size: int = 32,
+    ):
+        """
+        Args:
+            encode: 批量编码函数，返回与输入一一对应的向量
+            window_ms: 收到第一个请求后等待更多请求的最长时间（毫秒）
+            max_batch_size: 单批最多的文本数量，凑满后立即编码
+        """
+        self._encode = encode
+        self.window = max(0.0, window_ms) / 1000
+        self.max_batch_size = max(1, int(max_batch_size))
+
+        self._queue: queue.Queue[tuple[str, str]] = queue.Queue()
+        self._pending: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self.requests = 0
+        self.batches = 0
+        self.encoded = 0
+
+    def submit(self, key: str, text: str) -> Future:
+        """提交编码请求
+
+        Args:
+            key: 文本的缓存键（相同键的并发请求合并）
+            text: 待编码文本
+
+        Returns:
+            结果为向量的 Future
+        """
+        with self._lock:
+            self.requests += 1
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            future = Future()
+            self._pending[key] = future
+            self._ensure_worker()
+        self._queue.put((key, text))
+        return future
+
+    def _ensure_worker(self):
+        """首次提交请求时启动后台线程"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="EmbeddingBatcher", daemon=True)
+            self._thread.start()
+
+    def _collect(self) -> list[tuple[str, str]]:
+        """等待第一个请求，再在时间窗口内收集更多请求"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=max(0.0, remaining)))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            self._process(self._collect())
+
+    def _process(self, batch: list[tuple[str, str]]):
+        """一次编码整批文本，把结果（或异常）分发给对应的 Future"""
+        with self._lock:
+            futures = [self._pending.pop(key) for key, _ in batch]
+        try:
+            vectors = self._encode([text for _, text in batch])
+        except Exception as e:
+            logger.error(f"批量编码查询失败: {e}")
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        with self._lock:
+            self.batches += 1
+            self.encoded += len(batch)
+        for future, vector in zip(futures, vectors, strict=True):
+            future.set_result(vector)
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取批处理统计信息"""
+        with self._lock:
+            return {
+                "window_ms": self.window * 1000,
+                "max_batch_size": self.max_batch_size,
+                "requests": self.requests,
+                "batches": self.batches,
+                "encoded": self.encoded,
+                "avg_batch_size": self.encoded / self.batches if self.batches else 0.0,
+            }
@@ -0,0 +1,256 @@
+"""嵌入向量缓存模块
+
+按 (模型名称, 归一化文本哈希) 持久化缓存嵌入向量，避免重复编码相同文本。
+同一页面反复截图、事件文本未变化时，OCR 文本几乎完全重复，命中缓存即可跳过模型推理。
+向量以 float16（或 int8 标量量化）二进制存储在独立的 SQLite 文件中，超过容量时按最近使用时间淘汰。
+命中时只在内存中记录使用时间，随下一次写入（或积累到一定数量、时间后）批量更新，读取不产生写事务。
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from lifetrace.llm.vector_compression import dequantize_int8, quantize_int8
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+# 淘汰时删除到容量的此比例，避免每次写入都触发淘汰
+EVICT_TARGET_RATIO = 0.9
+
+# 缓冲的使用时间达到此数量或距上次写入超过此秒数时写回数据库
+TOUCH_FLUSH_SIZE = 2000
+TOUCH_FLUSH_INTERVAL = 60.0
+
+# 支持的存储精度
+DTYPE_FLOAT16 = "float16"
+DTYPE_INT8 = "int8"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def text_key(text: str) -> str:
+    """计算归一化文本的哈希（合并连续空白、去掉首尾空白）"""
+    normalized = _WHITESPACE_RE.sub(" ", text).strip()
+    return hashlib.md5(normalized.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """基于 SQLite 的嵌入向量缓存"""
+
+    def __init__(
+        self, db_path: str | Path, max_entries: int = 50000, dtype: str = DTYPE_FLOAT16
+    ):
+        """
+        Args:
+            db_path: 缓存数据库文件路径
+            max_entries: 最多缓存的向量数量
+            dtype: 存储精度（float16，或 int8 标量量化，体积约为 float16 的一半）
+        """
+        if dtype not in (DTYPE_FLOAT16, DTYPE_INT8):
+            raise ValueError(f"不支持的嵌入缓存精度: {dtype}")
+        self.db_path = Path(db_path)
+        self.max_entries = max(1, int(max_entries))
+        self.dtype = dtype
+        self._lock = threading.Lock()
+        # 尚未写回的最近使用时间：(模型, 文本哈希) -> 时间
+        self._touched: dict[tuple[str, str], float] = {}
+        self._touched_at = time.monotonic()
+
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used "
+            "ON embedding_cache(last_used)"
+        )
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+
+    def _model_key(self, model: str) -> str:
+        """不同精度的向量按模型名称分开存放，切换精度后旧向量不会被误读"""
+        return model if self.dtype == DTYPE_FLOAT16 else f"{model}#{self.dtype}"
+
+    def _to_blob(self, vector: np.ndarray) -> bytes:
+        if self.dtype == DTYPE_INT8:
+            codes, scales = quantize_int8(vector)
+            return scales.tobytes() + codes.tobytes()
+        return np.asarray(vector, np.float16).tobytes()
+
+    def _from_blob(self, blob: bytes) -> np.ndarray:
+        if self.dtype == DTYPE_INT8:
+            scale = np.frombuffer(blob[:4], dtype=np.float32)
+            return dequantize_int8(np.frombuffer(blob[4:], dtype=np.int8), scale)
+        return np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+
+    def get_many(self, model: str, keys: list[str]) -> dict[str, np.ndarray]:
+        """批量查询缓存
+
+        Args:
+            model: 模型名称
+            keys: 文本哈希列表（text_key 的结果）
+
+        Returns:
+            命中的哈希到向量（float32）的映射
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        if not unique_keys:
+            return {}
+
+        found = {}
+        model = self._model_key(model)
+        try:
+            with self._lock:
+                # SQLite 单条语句的参数数量有上限，分块查询
+                for start in range(0, len(unique_keys), 500):
+                    chunk = unique_keys[start : start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT text_hash, vector FROM embedding_cache "
+                        f"WHERE model = ? AND text_hash IN ({placeholders})",
+                        [model, *chunk],
+                    ).fetchall()
+                    for text_hash, blob in rows:
+                        found[text_hash] = self._from_blob(blob)
+
+                if found:
+                    now = time.time()
+                    for text_hash in found:
+                        self._touched[(model, text_hash)] = now
+                    if (
+                        len(self._touched) >= TOUCH_FLUSH_SIZE
+                        or time.monotonic() - self._touched_at >= TOUCH_FLUSH_INTERVAL
+                    ):
+                        self._flush_touched()
+                        self._conn.commit()
+
+                self.hits += sum(1 for key in keys if key in found)
+                self.misses += sum(1 for key in keys if key not in found)
+        except sqlite3.Error as e:
+            logger.error(f"读取嵌入缓存失败: {e}")
+        return found
+
+    def put_many(self, model: str, vectors: dict[str, np.ndarray]):
+        """批量写入缓存，超出容量时淘汰最久未使用的向量"""
+        if not vectors:
+            return
+
+        now = time.time()
+        model = self._model_key(model)
+        rows = [
+            (model, text_hash, int(vector.shape[-1]), self._to_blob(vector), now)
+            for text_hash, vector in vectors.items()
+        ]
+        try:
+            with self._lock:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO embedding_cache "
+                    "(model, text_hash, dim, vector, last_used) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._count += self._conn.total_changes - before
+                self._flush_touched()
+                if self._count > self.max_entries:
+                    self._evict()
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"写入嵌入缓存失败: {e}")
+
+    def _flush_touched(self):
+        """把缓冲的使用时间写回数据库（调用方持有锁并负责提交）"""
+        self._touched_at = time.monotonic()
+        if not self._touched:
+            return
+        self._conn.executemany(
+            "UPDATE embedding_cache SET last_used = ? WHERE model = ? AND text_hash = ?",
+            [(used, model, text_hash) for (model, text_hash), used in self._touched.items()],
+        )
+        self._touched.clear()
+
+    def _evict(self):
+        """淘汰最久未使用的向量（调用方持有锁）"""
+        excess = self._count - int(self.max_entries * EVICT_TARGET_RATIO)
+        cursor = self._conn.execute(
+            "DELETE FROM embedding_cache WHERE rowid IN "
+            "(SELECT rowid FROM embedding_cache ORDER BY last_used LIMIT ?)",
+            (excess,),
+        )
+        self._count -= cursor.rowcount
+        self.evicted += cursor.rowcount
+        logger.debug(f"嵌入缓存淘汰 {cursor.rowcount} 条")
+
+    def sample(self, model: str, limit: int) -> np.ndarray:
+        """取最近使用的一批向量（用于拟合 PCA 投影等）"""
+        with self._lock:
+            self._flush_touched()
+            self._conn.commit()
+            rows = self._conn.execute(
+                "SELECT vector FROM embedding_cache WHERE model = ? "
+                "ORDER BY last_used DESC LIMIT ?",
+                (self._model_key(model), limit),
+            ).fetchall()
+        return np.array([self._from_blob(blob) for (blob,) in rows], dtype=np.float32)
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._conn.execute("DELETE FROM embedding_cache")
+            self._conn.commit()
+            self._touched.clear()
+            self._count = 0
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取缓存统计信息"""
+        total = self.hits + self.misses
+        size_bytes = self.db_path.stat().st_size if self.db_path.exists() else 0
+        return {
+            "entries": self._count,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evicted": self.evicted,
+            "dtype": self.dtype,
+            "size_mb": size_bytes / 1024 / 1024,
+        }
+
+
+# 全局缓存实例
+_embedding_cache: EmbeddingCache | None = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache(
+    db_path: str | Path, max_entries: int, dtype: str = DTYPE_FLOAT16
+) -> EmbeddingCache:
+    """获取全局嵌入缓存实例（首次调用时创建）"""
+    global _embedding_cache
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingCache(db_path, max_entries, dtype)
+    return _embedding_cache
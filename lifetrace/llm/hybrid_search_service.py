@@ -0,0 +1,225 @@
+"""混合检索服务模块
+
+关键词（OCR文本全文索引）和语义（向量检索）两路并行检索，用倒数排名融合（RRF）合并：
+每个结果的分数为各路 1 / (rrf_k + 名次) 之和。工单号、错误码等精确标识符靠关键词一路命中，
+换了说法的内容靠语义一路命中。
+
+时间和应用过滤在融合排序之前执行：关键词一路在 SQL 中过滤；语义一路的时间范围下推到向量索引
+查询，应用名称（模糊匹配）则多取候选后按数据库中的截图信息过滤。
+每一路有独立的耗时预算，超时的一路结果被忽略，不会拖慢整个请求。
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime
+from typing import Any
+
+from lifetrace.storage import text_search_mgr
+from lifetrace.storage.text_search_manager import extract_search_terms
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+LEG_LEXICAL = "lexical"
+LEG_VECTOR = "vector"
+
+# 有应用过滤条件时语义一路多取的候选倍数（过滤后仍有足够的候选参与融合）
+VECTOR_FILTER_OVERFETCH = 4
+
+# 检索线程数（超时的一路仍会占用线程直到完成）
+MAX_WORKERS = 8
+
+
+def reciprocal_rank_fusion(rankings: dict[str, list[int]], k: int) -> dict[int, float]:
+    """倒数排名融合
+
+    Args:
+        rankings: 各路检索名称到结果ID列表（按名次排序）的映射
+        k: 融合常数，越大则名次靠后的结果权重下降越慢
+
+    Returns:
+        结果ID到融合分数的映射
+    """
+    scores: dict[int, float] = {}
+    for ranked_ids in rankings.values():
+        for rank, doc_id in enumerate(ranked_ids, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return scores
+
+
+def _timed(func, *args) -> tuple[Any, float]:
+    """执行函数并返回 (结果, 耗时毫秒)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, round((time.perf_counter() - start) * 1000, 1)
+
+
+class HybridSearchService:
+    """关键词 + 语义混合检索服务"""
+
+    def __init__(self, config):
+        """
+        Args:
+            config: 配置对象
+        """
+        self.rrf_k = config.get("search.rrf_k")
+        self.candidate_k = max(1, int(config.get("search.candidate_k")))
+        self.budgets = {
+            LEG_LEXICAL: config.get("search.lexical_budget_ms") / 1000,
+            LEG_VECTOR: config.get("search.vector_budget_ms") / 1000,
+        }
+        self._executor = ThreadPoolExecutor(
+            max_workers=MAX_WORKERS, thread_name_prefix="hybrid-search"
+        )
+
+    def _lexical_candidates(
+        self,
+        terms: list[str],
+        start_date: datetime | None,
+        end_date: datetime | None,
+        app_names: list[str] | None,
+    ) -> list[int]:
+        """关键词一路：按全文索引相关性排序的OCR结果ID（已过滤）"""
+        hits = text_search_mgr.search_ocr(terms, start_date, end_date, app_names, self.candidate_k)
+        return [hit["ocr_result_id"] for hit in hits]
+
+    def _vector_candidates(
+        self,
+        query: str,
+        top_k: int,
+        start_date: datetime | None,
+        end_date: datetime | None,
+    ) -> list[int]:
+        """语义一路：按向量距离排序的OCR结果ID（只含OCR文档，已按时间范围过滤）"""
+        from lifetrace.llm.vector_service import build_filter_where, get_vector_service
+
+        vector_service = get_vector_service()
+        if not vector_service.is_enabled():
+            return []
+
+        ocr_result_ids = []
+        where = build_filter_where(start_date, end_date)
+        for result in vector_service.vector_db.search(query, top_k=top_k, where=where):
+            ocr_result_id = (result.get("metadata") or {}).get("ocr_result_id")
+            if ocr_result_id and ocr_result_id not in ocr_result_ids:
+                ocr_result_ids.append(ocr_result_id)
+        return ocr_result_ids
+
+    def search(
+        self,
+        query: str,
+        keywords: list[str] | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        app_names: list[str] | None = None,
+        limit: int = 50,
+    ) -> dict[str, Any]:
+        """混合检索截图
+
+        Args:
+            query: 查询文本（语义一路使用原文）
+            keywords: 关键词一路使用的关键词，None 表示从查询文本中切分
+            start_date: 开始时间
+            end_date: 结束时间
+            app_names: 应用名称列表（模糊匹配任一）
+            limit: 返回数量
+
+        Returns:
+            results: 按融合分数排序的截图列表（每张截图一条），包含截图信息、OCR文本、
+                score（融合分数）以及 lexical_rank / vector_rank（该路名次，未命中为 None）
+            legs: 各路检索的候选数量、耗时和是否超时
+        """
+        if not query or not query.strip():
+            return {"results": [], "legs": {}}
+
+        terms = keywords or extract_search_terms(query)
+        vector_k = self.candidate_k * (VECTOR_FILTER_OVERFETCH if app_names else 1)
+
+        start = time.perf_counter()
+        futures = {
+            LEG_LEXICAL: self._executor.submit(
+                _timed, self._lexical_candidates, terms, start_date, end_date, app_names
+            ),
+            LEG_VECTOR: self._executor.submit(
+                _timed, self._vector_candidates, query, vector_k, start_date, end_date
+            ),
+        }
+
+        rankings: dict[str, list[int]] = {}
+        legs: dict[str, dict[str, Any]] = {}
+        for name, future in futures.items():
+            remaining = self.budgets[name] - (time.perf_counter() - start)
+            try:
+                ranked_ids, elapsed_ms = future.result(timeout=max(0.0, remaining))
+                rankings[name] = ranked_ids
+                legs[name] = {"count": len(ranked_ids), "elapsed_ms": elapsed_ms}
+            except FutureTimeoutError:
+                future.cancel()
+                legs[name] = {"count": 0, "timed_out": True}
+                logger.warning(
+                    f"混合检索的 {name} 一路超出耗时预算（{self.budgets[name] * 1000:.0f}ms），"
+                    "忽略该路结果"
+                )
+            except Exception as e:
+                legs[name] = {"count": 0, "error": str(e)}
+                logger.error(f"混合检索的 {name} 一路失败: {e}")
+
+        # 过滤在排序之前：不满足条件的候选不占名次
+        candidate_ids = {doc_id for ranked_ids in rankings.values() for doc_id in ranked_ids}
+        records = text_search_mgr.get_search_records(
+            list(candidate_ids), start_date, end_date, app_names
+        )
+        rankings = {
+            name: [doc_id for doc_id in ranked_ids if doc_id in records]
+            for name, ranked_ids in rankings.items()
+        }
+        scores = reciprocal_rank_fusion(rankings, self.rrf_k)
+        ranks = {
+            name: {doc_id: rank for rank, doc_id in enumerate(ranked_ids, start=1)}
+            for name, ranked_ids in rankings.items()
+        }
+
+        # 同一张截图只保留分数最高的OCR结果
+        results = []
+        seen_screenshots = set()
+        for doc_id in sorted(scores, key=scores.get, reverse=True):
+            record = records[doc_id]
+            if record["screenshot_id"] in seen_screenshots:
+                continue
+            seen_screenshots.add(record["screenshot_id"])
+            results.append(
+                {
+                    **record,
+                    "id": record["screenshot_id"],
+                    "score": scores[doc_id],
+                    "lexical_rank": ranks.get(LEG_LEXICAL, {}).get(doc_id),
+                    "vector_rank": ranks.get(LEG_VECTOR, {}).get(doc_id),
+                }
+            )
+            if len(results) >= limit:
+                break
+
+        logger.debug(
+            f"混合检索完成: {len(results)} 条结果，耗时 {(time.perf_counter() - start) * 1000:.0f}ms，"
+            f"各路: {legs}"
+        )
+        return {"results": results, "legs": legs}
+
+
+# 进程内共享的混合检索服务实例（API 与 RAG 检索共用同一个线程池）
+_hybrid_search_service: HybridSearchService | None = None
+_hybrid_search_service_lock = threading.Lock()
+
+
+def get_hybrid_search_service() -> HybridSearchService:
+    """获取进程内共享的混合检索服务实例"""
+    global _hybrid_search_service
+    if _hybrid_search_service is None:
+        with _hybrid_search_service_lock:
+            if _hybrid_search_service is None:
+                from lifetrace.util.config import config
+
+                _hybrid_search_service = HybridSearchService(config)
+    return _hybrid_search_service
@@ -0,0 +1,761 @@
+"""内存映射向量索引
+
+进程内的向量库后端（vector_db.backend: mmap），用于替代 ChromaDB：
+- 向量按段保存为连续的 float32 NumPy 矩阵文件，以内存映射方式打开，打开索引时不读入向量
+- 文档ID、文本和元数据保存在 SQLite 中，每个文档记录所在的段和行号（ID 映射），
+  元数据过滤条件转换为 SQL 在 SQLite 中执行（时间和应用字段有表达式索引）
+- 写入只追加：每次写入生成一个新段，覆盖和删除只修改 ID 映射，旧行成为失效行
+- 段数量过多或失效行比例过高时，后台线程把这些段合并为一个新段；
+  行数较多的合并段按 IVF 聚类排序，检索时只扫描与查询最近的若干个簇
+- 检索为矩阵乘法，距离与 ChromaDB 默认的 l2 空间一致（平方欧氏距离）
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from lifetrace.llm.vector_backends import BACKEND_MMAP, FILTER_METADATA_KEYS, VectorBackend
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+# 失效行比例达到该值的段会被合并（回收空间）
+COMPACT_DEAD_RATIO = 0.3
+
+# IVF 聚类：k-means 迭代次数、每个簇的训练样本数、簇数量范围（默认取行数的平方根）
+IVF_ITERATIONS = 10
+IVF_SAMPLES_PER_LIST = 64
+IVF_MIN_LISTS = 16
+IVF_MAX_LISTS = 4096
+
+# 合并时每次复制的行数（限制合并过程的内存占用）
+CHUNK_ROWS = 65536
+
+# 按ID批量查询时每条 SQL 的ID数量（低于 SQLite 的参数数量上限）
+SQL_CHUNK = 500
+
+_SEGMENT_FILE_RE = re.compile(r"^seg_(\d+)\.")
+_METADATA_KEY_RE = re.compile(r"^[A-Za-z0-9_]+$")
+_COMPARISON_OPERATORS = {
+    "$eq": "=",
+    "$ne": "!=",
+    "$gt": ">",
+    "$gte": ">=",
+    "$lt": "<",
+    "$lte": "<=",
+}
+
+
+def where_to_sql(where: dict[str, Any]) -> tuple[str, list[Any]]:
+    """将 ChromaDB 风格的元数据过滤条件转换为 SQL 条件
+
+    支持 $and / $or、等值条件，以及 $eq、$ne、$gt、$gte、$lt、$lte、$in、$nin 操作符。
+
+    Returns:
+        (SQL 条件, 参数列表)
+    """
+    clauses = []
+    params: list[Any] = []
+    for key, value in where.items():
+        if key in ("$and", "$or"):
+            parts = [where_to_sql(item) for item in value]
+            if parts:
+                joiner = " AND " if key == "$and" else " OR "
+                clauses.append("(" + joiner.join(f"({sql})" for sql, _ in parts) + ")")
+                for _, part_params in parts:
+                    params.extend(part_params)
+            continue
+
+        if not _METADATA_KEY_RE.match(key):
+            raise ValueError(f"不支持的元数据字段: {key}")
+        field = f"json_extract(metadata, '$.{key}')"
+        conditions = value if isinstance(value, dict) else {"$eq": value}
+        for operator, operand in conditions.items():
+            if operator in _COMPARISON_OPERATORS:
+                clauses.append(f"{field} {_COMPARISON_OPERATORS[operator]} ?")
+                params.append(operand)
+            elif operator in ("$in", "$nin"):
+                operands = list(operand)
+                if not operands:
+                    clauses.append("0" if operator == "$in" else "1")
+                    continue
+                negation = "NOT " if operator == "$nin" else ""
+                clauses.append(f"{field} {negation}IN ({','.join('?' * len(operands))})")
+                params.extend(operands)
+            else:
+                raise ValueError(f"不支持的过滤操作符: {operator}")
+    return " AND ".join(clauses) or "1", params
+
+
+def train_ivf(sample: np.ndarray, n_lists: int, seed: int = 0) -> np.ndarray:
+    """用 k-means 训练 IVF 簇中心"""
+    rng = np.random.default_rng(seed)
+    centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+    for _ in range(IVF_ITERATIONS):
+        labels = assign_ivf(sample, centroids)
+        order = np.argsort(labels, kind="stable")
+        counts = np.bincount(labels, minlength=n_lists)
+        nonempty = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[nonempty]
+        sums = np.add.reduceat(sample[order], starts, axis=0)
+        centroids[nonempty] = sums / counts[nonempty, None]
+    return centroids
+
+
+def assign_ivf(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """返回每个向量最近的簇"""
+    distances = (centroids**2).sum(axis=1) - 2.0 * (vectors @ centroids.T)
+    return distances.argmin(axis=1)
+
+
+def centroid_distances(query: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """查询向量到各簇中心的距离（省略查询向量的模长平方）"""
+    return (centroids**2).sum(axis=1) - 2.0 * (centroids @ query)
+
+
+def _save_array(path: Path, array: np.ndarray):
+    """写入 .npy 文件（先写临时文件再替换，避免留下不完整的文件）"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+class _Segment:
+    """不可变的向量段：向量矩阵以内存映射方式打开，失效行用掩码标记"""
+
+    def __init__(self, segment_id: int, prefix: Path, alive: np.ndarray):
+        self.id = segment_id
+        self.vectors = np.load(f"{prefix}.npy", mmap_mode="r")
+        self.sq_norms = np.load(f"{prefix}.norms.npy")
+        self.alive = alive
+        self.centroids = None
+        self.offsets = None
+
+        ivf_path = Path(f"{prefix}.ivf.npz")
+        if ivf_path.exists():
+            data = np.load(ivf_path)
+            self.centroids = data["centroids"]
+            self.offsets = data["offsets"]
+
+    @property
+    def rows(self) -> int:
+        return len(self.sq_norms)
+
+    @property
+    def live_rows(self) -> int:
+        return int(self.alive.sum())
+
+    def search(
+        self, query: np.ndarray, k: int, rows: np.ndarray | None = None, nprobe: int = 0
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """检索段内最近的 k 行
+
+        Args:
+            query: 查询向量
+            k: 返回数量
+            rows: 只在这些行中检索（元数据过滤的结果），None 表示整个段
+            nprobe: IVF 检索扫描的簇数量
+
+        Returns:
+            (距离（未加查询向量的模长平方）, 行号)
+        """
+        if rows is None and self.centroids is not None and 0 < nprobe < len(self.centroids):
+            lists = np.argsort(centroid_distances(query, self.centroids))[:nprobe]
+            rows = np.concatenate(
+                [np.arange(self.offsets[i], self.offsets[i + 1]) for i in np.sort(lists)]
+            )
+            rows = rows[self.alive[rows]]
+
+        if rows is None:
+            distances = self.sq_norms - 2.0 * (self.vectors @ query)
+            distances[~self.alive] = np.inf
+            rows = np.arange(self.rows)
+        else:
+            distances = self.sq_norms[rows] - 2.0 * (self.vectors[rows] @ query)
+
+        if len(distances) > k:
+            top = np.argpartition(distances, k - 1)[:k]
+            distances, rows = distances[top], rows[top]
+        finite = np.isfinite(distances)
+        return distances[finite], rows[finite]
+
+
+class MmapVectorIndex(VectorBackend):
+    """内存映射向量索引"""
+
+    name = BACKEND_MMAP
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_segments: int = 8,
+        ivf_min_rows: int = 50000,
+        ivf_nprobe: int = 16,
+        background_compaction: bool = True,
+    ):
+        """
+        Args:
+            path: 索引目录
+            max_segments: 段数量超过该值时合并较小的段
+            ivf_min_rows: 合并出的段行数不少于该值时建立 IVF 聚类
+            ivf_nprobe: IVF 检索扫描的簇数量
+            background_compaction: 写入后是否自动在后台合并
+        """
+        self.path = Path(path)
+        self.max_segments = max(1, int(max_segments))
+        self.ivf_min_rows = int(ivf_min_rows)
+        self.ivf_nprobe = max(1, int(ivf_nprobe))
+        self.background_compaction = background_compaction
+
+        self.dim = None
+        self.compactions = 0
+        self._segments: dict[int, _Segment] = {}
+        self._next_segment_id = 1
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()
+        self._compact_thread = None
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path / "index.db"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS segments (
+                id INTEGER PRIMARY KEY,
+                rows INTEGER NOT NULL,
+                dim INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                id TEXT PRIMARY KEY,
+                segment INTEGER NOT NULL,
+                row INTEGER NOT NULL,
+                document TEXT,
+                metadata TEXT
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_documents_location ON documents(segment, row)"
+        )
+        # 时间和应用过滤字段的表达式索引（与 where_to_sql 生成的表达式一致才会被使用）
+        for key in FILTER_METADATA_KEYS:
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_documents_{key} "
+                f"ON documents(json_extract(metadata, '$.{key}'))"
+            )
+        self._conn.commit()
+        self._load()
+
+    # ---- 段文件 ----
+
+    def _prefix(self, segment_id: int) -> Path:
+        return self.path / f"seg_{segment_id:08d}"
+
+    def _load(self):
+        """打开已有的段（向量以内存映射方式打开），并清理未登记的段文件"""
+        rows = self._conn.execute("SELECT id, rows, dim FROM segments ORDER BY id").fetchall()
+        for segment_id, row_count, dim in rows:
+            prefix = self._prefix(segment_id)
+            if not Path(f"{prefix}.npy").exists():
+                logger.error(f"向量段文件缺失，丢弃该段的文档: {prefix}.npy")
+                with self._conn:
+                    self._conn.execute("DELETE FROM documents WHERE segment = ?", (segment_id,))
+                    self._conn.execute("DELETE FROM segments WHERE id = ?", (segment_id,))
+                continue
+            alive = np.zeros(row_count, dtype=bool)
+            live_rows = self._conn.execute(
+                "SELECT row FROM documents WHERE segment = ?", (segment_id,)
+            ).fetchall()
+            alive[[row for (row,) in live_rows]] = True
+            self._segments[segment_id] = _Segment(segment_id, prefix, alive)
+            self.dim = dim
+
+        # 写入或合并中断时留下的段文件
+        file_ids = set()
+        for file in self.path.glob("seg_*"):
+            match = _SEGMENT_FILE_RE.match(file.name)
+            if not match:
+                continue
+            file_ids.add(int(match.group(1)))
+            if int(match.group(1)) not in self._segments:
+                self._remove_file(file)
+        self._next_segment_id = max([0, *file_ids, *self._segments]) + 1
+
+    def _write_segment_files(
+        self,
+        prefix: Path,
+        vectors: np.ndarray,
+        centroids: np.ndarray | None = None,
+        offsets: np.ndarray | None = None,
+    ):
+        """写入段的向量矩阵、模长平方和 IVF 聚类"""
+        _save_array(Path(f"{prefix}.npy"), vectors)
+        sq_norms = np.einsum("ij,ij->i", vectors, vectors).astype(np.float32)
+        _save_array(Path(f"{prefix}.norms.npy"), sq_norms)
+        if centroids is not None:
+            np.savez(f"{prefix}.ivf.npz", centroids=centroids, offsets=offsets)
+
+    def _remove_file(self, file: Path):
+        try:
+            file.unlink(missing_ok=True)
+        except OSError as e:
+            # 文件仍被内存映射（如 Windows 上进行中的检索），下次打开索引时清理
+            logger.debug(f"暂时无法删除向量段文件 {file}: {e}")
+
+    def _remove_segment_files(self, segment_id: int):
+        for file in self.path.glob(f"{self._prefix(segment_id).name}.*"):
+            self._remove_file(file)
+
+    # ---- ID 映射 ----
+
+    def _select(
+        self, columns: str, where: dict[str, Any] | None = None, ids: list[str] | None = None
+    ) -> list[tuple]:
+        """按ID和元数据条件查询文档表（调用方持有锁）"""
+        where_sql, params = where_to_sql(where) if where else ("1", [])
+        sql = f"SELECT {columns} FROM documents WHERE {where_sql}"
+        if ids is None:
+            return self._conn.execute(sql, params).fetchall()
+        rows = []
+        for start in range(0, len(ids), SQL_CHUNK):
+            chunk = ids[start : start + SQL_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(
+                self._conn.execute(f"{sql} AND id IN ({placeholders})", [*params, *chunk])
+            )
+        return rows
+
+    def _locate(
+        self, ids: list[str] | None = None, where: dict[str, Any] | None = None
+    ) -> dict[str, tuple[int, int]]:
+        """文档ID -> (段, 行号)"""
+        rows = self._select("id, segment, row", where, ids)
+        return {doc_id: (segment, row) for doc_id, segment, row in rows}
+
+    def _mark_dead(self, locations):
+        for segment_id, row in locations:
+            segment = self._segments.get(segment_id)
+            if segment is not None:
+                segment.alive[row] = False
+
+    # ---- 写入和删除 ----
+
+    def add(self, ids, embeddings, documents=None, metadatas=None):
+        self._write(ids, embeddings, documents, metadatas, replace=False)
+
+    def upsert(self, ids, embeddings, documents=None, metadatas=None):
+        self._write(ids, embeddings, documents, metadatas, replace=True)
+
+    def _write(self, ids, embeddings, documents, metadatas, replace: bool):
+        """把一批文档写成一个新段"""
+        if not ids:
+            return
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(ids):
+            raise ValueError("向量数量与文档ID数量不一致")
+        documents = documents or [None] * len(ids)
+        metadatas = metadatas or [None] * len(ids)
+
+        # 同一批内重复的ID只保留最后一个
+        latest = {doc_id: index for index, doc_id in enumerate(ids)}
+
+        with self._lock:
+            if self.dim is not None and vectors.shape[1] != self.dim:
+                raise ValueError(f"向量维度 {vectors.shape[1]} 与索引维度 {self.dim} 不一致")
+            existing = self._locate(list(latest))
+            if not replace:
+                latest = {doc_id: i for doc_id, i in latest.items() if doc_id not in existing}
+                if not latest:
+                    return
+
+            order = list(latest.values())
+            segment_id = self._next_segment_id
+            self._next_segment_id += 1
+            prefix = self._prefix(segment_id)
+            self._write_segment_files(prefix, np.ascontiguousarray(vectors[order]))
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT INTO segments (id, rows, dim) VALUES (?, ?, ?)",
+                        (segment_id, len(order), vectors.shape[1]),
+                    )
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO documents (id, segment, row, document, metadata) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (
+                            (
+                                ids[index],
+                                segment_id,
+                                row,
+                                documents[index],
+                                json.dumps(metadatas[index], ensure_ascii=False)
+                                if metadatas[index] is not None
+                                else None,
+                            )
+                            for row, index in enumerate(order)
+                        ),
+                    )
+            except sqlite3.Error:
+                self._remove_segment_files(segment_id)
+                raise
+
+            self._mark_dead(existing[doc_id] for doc_id in latest if doc_id in existing)
+            self._segments[segment_id] = _Segment(segment_id, prefix, np.ones(len(order), bool))
+            self.dim = vectors.shape[1]
+
+        self._maybe_compact()
+
+    def delete(self, ids=None, where=None):
+        if ids is None and not where:
+            return
+        with self._lock:
+            locations = self._locate(ids, where)
+            if not locations:
+                return
+            with self._conn:
+                self._conn.executemany(
+                    "DELETE FROM documents WHERE id = ?", ((doc_id,) for doc_id in locations)
+                )
+            self._mark_dead(locations.values())
+        self._maybe_compact()
+
+    def reset(self):
+        with self._compact_lock, self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM documents")
+                self._conn.execute("DELETE FROM segments")
+            segment_ids = list(self._segments)
+            self._segments.clear()
+            self.dim = None
+        for segment_id in segment_ids:
+            self._remove_segment_files(segment_id)
+
+    # ---- 读取和检索 ----
+
+    def get(self, ids=None, where=None, include=None):
+        include = include or ["metadatas", "documents"]
+        with self._lock:
+            rows = self._select("id, document, metadata, segment, row", where, ids)
+            embeddings = (
+                [self._segments[segment].vectors[row].tolist() for *_, segment, row in rows]
+                if "embeddings" in include
+                else None
+            )
+        return {
+            "ids": [row[0] for row in rows],
+            "documents": [row[1] for row in rows] if "documents" in include else None,
+            "metadatas": (
+                [json.loads(row[2]) if row[2] else None for row in rows]
+                if "metadatas" in include
+                else None
+            ),
+            "embeddings": embeddings,
+        }
+
+    def query(self, query_embeddings, n_results=10, where=None):
+        queries = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+        with self._lock:
+            segments = list(self._segments.values())
+            allowed = self._allowed_rows(where) if where else None
+
+        results = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        for query in queries:
+            hits = self._search(segments, query, n_results, allowed)
+            with self._lock:
+                documents = self._fetch(hits)
+
+            ids, texts, metadatas, distances = [], [], [], []
+            for distance, segment_id, row in hits:
+                item = documents.get((segment_id, row))
+                if item is None:
+                    # 检索期间被覆盖或删除
+                    continue
+                ids.append(item[0])
+                texts.append(item[1])
+                metadatas.append(json.loads(item[2]) if item[2] else None)
+                distances.append(distance)
+            results["ids"].append(ids)
+            results["documents"].append(texts)
+            results["metadatas"].append(metadatas)
+            results["distances"].append(distances)
+        return results
+
+    def _allowed_rows(self, where: dict[str, Any]) -> dict[int, np.ndarray]:
+        """满足元数据条件的行：段 -> 行号数组"""
+        rows = self._select("segment, row", where)
+        allowed: dict[int, list[int]] = {}
+        for segment_id, row in rows:
+            allowed.setdefault(segment_id, []).append(row)
+        return {
+            segment_id: np.sort(np.asarray(segment_rows, dtype=np.int64))
+            for segment_id, segment_rows in allowed.items()
+        }
+
+    def _search(
+        self,
+        segments: list[_Segment],
+        query: np.ndarray,
+        k: int,
+        allowed: dict[int, np.ndarray] | None,
+    ) -> list[tuple[float, int, int]]:
+        """在各段中检索并合并，返回 (距离, 段, 行号) 列表"""
+        all_distances, all_segments, all_rows = [], [], []
+        for segment in segments:
+            rows = None
+            if allowed is not None:
+                rows = allowed.get(segment.id)
+                if rows is None:
+                    continue
+            distances, hit_rows = segment.search(query, k, rows, self.ivf_nprobe)
+            all_distances.append(distances)
+            all_segments.append(np.full(len(hit_rows), segment.id))
+            all_rows.append(hit_rows)
+        if not all_distances:
+            return []
+
+        distances = np.concatenate(all_distances) + float(query @ query)
+        segment_ids = np.concatenate(all_segments)
+        rows = np.concatenate(all_rows)
+        top = np.argsort(distances, kind="stable")[:k]
+        return [
+            (max(0.0, float(distances[i])), int(segment_ids[i]), int(rows[i])) for i in top
+        ]
+
+    def _fetch(self, hits: list[tuple[float, int, int]]) -> dict[tuple[int, int], tuple]:
+        """按 (段, 行号) 读取文档ID、文本和元数据"""
+        by_segment: dict[int, list[int]] = {}
+        for _, segment_id, row in hits:
+            by_segment.setdefault(segment_id, []).append(row)
+        documents = {}
+        for segment_id, rows in by_segment.items():
+            placeholders = ",".join("?" * len(rows))
+            for doc_id, text, metadata, row in self._conn.execute(
+                "SELECT id, document, metadata, row FROM documents "
+                f"WHERE segment = ? AND row IN ({placeholders})",
+                [segment_id, *rows],
+            ):
+                documents[(segment_id, row)] = (doc_id, text, metadata)
+        return documents
+
+    def count(self) -> int:
+        with self._lock:
+            return sum(segment.live_rows for segment in self._segments.values())
+
+    def iter_ids(self, batch_size=1000):
+        last_id = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id FROM documents WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            yield [row[0] for row in rows]
+            last_id = rows[-1][0]
+
+    # ---- 合并 ----
+
+    def _compaction_candidates(self, force: bool) -> list[_Segment]:
+        """需要合并的段
+
+        失效行比例过高的段都会被合并；段数量超过 max_segments 时，
+        再合并存活行最少的若干段，使段数量回落到 max_segments 的一半。
+        force 为 True 时合并全部段。
+        """
+        segments = list(self._segments.values())
+        if force:
+            if len(segments) > 1 or any(seg.live_rows < seg.rows for seg in segments):
+                return segments
+            return []
+
+        candidates = {
+            seg.id: seg for seg in segments if seg.live_rows <= seg.rows * (1 - COMPACT_DEAD_RATIO)
+        }
+        if len(segments) > self.max_segments:
+            smallest = sorted(segments, key=lambda seg: seg.live_rows)
+            for seg in smallest[: len(segments) - self.max_segments // 2]:
+                candidates[seg.id] = seg
+        return list(candidates.values())
+
+    def _maybe_compact(self):
+        """需要时启动后台合并线程"""
+        if not self.background_compaction:
+            return
+        with self._lock:
+            if self._compact_thread is not None and self._compact_thread.is_alive():
+                return
+            if not self._compaction_candidates(force=False):
+                return
+            self._compact_thread = threading.Thread(
+                target=self._compact_in_background, name="vector-index-compaction", daemon=True
+            )
+            self._compact_thread.start()
+
+    def _compact_in_background(self):
+        try:
+            self.compact()
+        except Exception as e:
+            logger.error(f"向量索引后台合并失败: {e}")
+
+    def _gather(self, segments: dict[int, _Segment], sources: np.ndarray, rows: np.ndarray):
+        """从多个段中读取指定行的向量"""
+        vectors = np.empty((len(rows), self.dim), dtype=np.float32)
+        for segment_id in np.unique(sources):
+            mask = sources == segment_id
+            vectors[mask] = segments[int(segment_id)].vectors[rows[mask]]
+        return vectors
+
+    def compact(self, force: bool = False) -> bool:
+        """合并段：只保留存活行，行数较多时按 IVF 聚类排序
+
+        复制向量时不持有索引锁，检索和写入可以继续；
+        合并期间被覆盖或删除的行在新段中标记为失效。
+        """
+        with self._compact_lock:
+            with self._lock:
+                merging = {seg.id: seg for seg in self._compaction_candidates(force)}
+                if not merging:
+                    return False
+                sources = np.concatenate(
+                    [np.full(seg.rows, seg.id, dtype=np.int64) for seg in merging.values()]
+                )
+                source_rows = np.concatenate(
+                    [np.arange(seg.rows, dtype=np.int64) for seg in merging.values()]
+                )
+                live = np.concatenate([seg.alive for seg in merging.values()])
+                sources, source_rows = sources[live], source_rows[live]
+                segment_id = self._next_segment_id
+                self._next_segment_id += 1
+            prefix = self._prefix(segment_id)
+            total = len(source_rows)
+
+            if total:
+                centroids = offsets = None
+                if total >= self.ivf_min_rows:
+                    n_lists = int(np.clip(np.sqrt(total), IVF_MIN_LISTS, IVF_MAX_LISTS))
+                    n_lists = min(n_lists, total)
+                    rng = np.random.default_rng(segment_id)
+                    picked = np.sort(
+                        rng.choice(total, min(total, n_lists * IVF_SAMPLES_PER_LIST), replace=False)
+                    )
+                    sample = self._gather(merging, sources[picked], source_rows[picked])
+                    centroids = train_ivf(sample, n_lists, seed=segment_id)
+                    labels = np.concatenate(
+                        [
+                            assign_ivf(
+                                self._gather(
+                                    merging,
+                                    sources[start : start + CHUNK_ROWS],
+                                    source_rows[start : start + CHUNK_ROWS],
+                                ),
+                                centroids,
+                            )
+                            for start in range(0, total, CHUNK_ROWS)
+                        ]
+                    )
+                    order = np.argsort(labels, kind="stable")
+                    sources, source_rows = sources[order], source_rows[order]
+                    offsets = np.searchsorted(labels[order], np.arange(n_lists + 1))
+
+                # 分块复制到新段文件，内存占用与段大小无关
+                tmp_path = Path(f"{prefix}.npy.tmp")
+                merged = np.lib.format.open_memmap(
+                    tmp_path, mode="w+", dtype=np.float32, shape=(total, self.dim)
+                )
+                sq_norms = np.empty(total, dtype=np.float32)
+                for start in range(0, total, CHUNK_ROWS):
+                    end = start + CHUNK_ROWS
+                    chunk = self._gather(merging, sources[start:end], source_rows[start:end])
+                    merged[start:end] = chunk
+                    sq_norms[start:end] = np.einsum("ij,ij->i", chunk, chunk)
+                merged.flush()
+                del merged
+                os.replace(tmp_path, f"{prefix}.npy")
+                _save_array(Path(f"{prefix}.norms.npy"), sq_norms)
+                if centroids is not None:
+                    np.savez(f"{prefix}.ivf.npz", centroids=centroids, offsets=offsets)
+
+            with self._lock:
+                alive = np.ones(total, dtype=bool)
+                for seg in merging.values():
+                    mask = sources == seg.id
+                    alive[mask] = seg.alive[source_rows[mask]]
+                moved = np.flatnonzero(alive)
+                try:
+                    with self._conn:
+                        if total:
+                            self._conn.execute(
+                                "INSERT INTO segments (id, rows, dim) VALUES (?, ?, ?)",
+                                (segment_id, total, self.dim),
+                            )
+                        self._conn.executemany(
+                            "UPDATE documents SET segment = ?, row = ? "
+                            "WHERE segment = ? AND row = ?",
+                            (
+                                (segment_id, int(row), int(sources[row]), int(source_rows[row]))
+                                for row in moved
+                            ),
+                        )
+                        self._conn.executemany(
+                            "DELETE FROM segments WHERE id = ?", ((seg_id,) for seg_id in merging)
+                        )
+                except sqlite3.Error:
+                    self._remove_segment_files(segment_id)
+                    raise
+
+                for seg_id in merging:
+                    del self._segments[seg_id]
+                if total:
+                    self._segments[segment_id] = _Segment(segment_id, prefix, alive)
+                self.compactions += 1
+
+        for seg_id in merging:
+            self._remove_segment_files(seg_id)
+        logger.info(
+            f"向量索引合并完成: {len(merging)} 个段 -> {len(moved)} 行"
+            f"{'（IVF）' if total >= self.ivf_min_rows else ''}"
+        )
+        return True
+
+    # ---- 统计和关闭 ----
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            segments = list(self._segments.values())
+            rows = sum(seg.rows for seg in segments)
+            live_rows = sum(seg.live_rows for seg in segments)
+            ivf_segments = sum(1 for seg in segments if seg.centroids is not None)
+        size_bytes = sum(file.stat().st_size for file in self.path.glob("*") if file.is_file())
+        return {
+            "backend": self.name,
+            "path": str(self.path),
+            "segments": len(segments),
+            "ivf_segments": ivf_segments,
+            "rows": rows,
+            "live_rows": live_rows,
+            "dead_rows": rows - live_rows,
+            "dim": self.dim,
+            "size_bytes": size_bytes,
+            "compactions": self.compactions,
+        }
+
+    def close(self):
+        thread = self._compact_thread
+        if thread is not None and thread.is_alive():
+            thread.join()
+        with self._lock:
+            self._segments.clear()
+            self._conn.close()
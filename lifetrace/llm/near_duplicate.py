@@ -0,0 +1,353 @@
+"""近重复OCR文本索引模块
+
+同一页面新增一行聊天、滚动少许时，截图画面不同但OCR文本几乎相同。每段OCR文本计算 64 位
+SimHash 指纹（字符 n-gram，权重为出现次数），指纹切成 max_distance + 1 段写入 LSH 分段表：
+汉明距离不超过 max_distance 的两个指纹至少有一段完全相同，按段值即可找出候选。
+候选再按应用名称、时间窗口和 n-gram 集合的 Jaccard 相似度确认。
+
+确认为近重复的OCR结果不再写入向量，而是记为已有文档的别名；指纹和别名关系保存在向量库目录下
+独立的 SQLite 文件中，按集合名称区分。
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+# 指纹位数
+FINGERPRINT_BITS = 64
+
+# 计算指纹的字符 n-gram 长度（对中文和英文都适用）
+SHINGLE_SIZE = 3
+
+# 短于该长度的文本指纹不稳定，不参与近重复合并
+MIN_TEXT_LENGTH = 50
+
+_MASK = (1 << FINGERPRINT_BITS) - 1
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", text).strip().lower()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Counter:
+    """归一化文本（合并空白、小写）的字符 n-gram 及出现次数"""
+    normalized = _normalize(text)
+    if len(normalized) <= size:
+        return Counter([normalized]) if normalized else Counter()
+    return Counter(normalized[i : i + size] for i in range(len(normalized) - size + 1))
+
+
+def simhash(text: str) -> int:
+    """计算文本的 64 位 SimHash 指纹（无符号整数）"""
+    counts = shingles(text)
+    if not counts:
+        return 0
+    digests = b"".join(
+        hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest() for shingle in counts
+    )
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8).reshape(-1, 8), axis=1)
+    weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+    votes = weights @ (bits.astype(np.float64) * 2 - 1)
+    return int.from_bytes(np.packbits(votes > 0).tobytes(), "big")
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """两个指纹的汉明距离"""
+    return ((a ^ b) & _MASK).bit_count()
+
+
+def jaccard_similarity(a: str, b: str) -> float:
+    """两段文本字符 n-gram 集合的 Jaccard 相似度"""
+    set_a, set_b = set(shingles(a)), set(shingles(b))
+    if not set_a or not set_b:
+        return 0.0
+    return len(set_a & set_b) / len(set_a | set_b)
+
+
+def _to_signed(fingerprint: int) -> int:
+    """SQLite 整数为有符号 64 位"""
+    if fingerprint >> (FINGERPRINT_BITS - 1):
+        return fingerprint - (1 << FINGERPRINT_BITS)
+    return fingerprint
+
+
+class NearDuplicateIndex:
+    """基于 SQLite 的 SimHash 指纹 LSH 索引和别名表"""
+
+    def __init__(self, db_path: str | Path, max_distance: int = 4):
+        """
+        Args:
+            db_path: 索引数据库文件路径
+            max_distance: 视为近重复的最大汉明距离（决定 LSH 分段数）
+        """
+        self.db_path = Path(db_path)
+        self.max_distance = max(0, min(int(max_distance), FINGERPRINT_BITS - 1))
+        bands = self.max_distance + 1
+        width, extra = divmod(FINGERPRINT_BITS, bands)
+        # 各段的 (起始位, 位数)，前 extra 段多一位
+        self._bands = []
+        offset = 0
+        for band in range(bands):
+            bits = width + (1 if band < extra else 0)
+            self._bands.append((offset, bits))
+            offset += bits
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                collection TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                fingerprint INTEGER NOT NULL,
+                app TEXT,
+                ts INTEGER,
+                PRIMARY KEY (collection, doc_id)
+            );
+            CREATE TABLE IF NOT EXISTS fingerprint_bands (
+                collection TEXT NOT NULL,
+                band INTEGER NOT NULL,
+                value INTEGER NOT NULL,
+                doc_id TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_fingerprint_bands_value
+                ON fingerprint_bands(collection, band, value);
+            CREATE INDEX IF NOT EXISTS idx_fingerprint_bands_doc
+                ON fingerprint_bands(collection, doc_id);
+            CREATE TABLE IF NOT EXISTS aliases (
+                collection TEXT NOT NULL,
+                ocr_result_id INTEGER NOT NULL,
+                screenshot_id INTEGER,
+                doc_id TEXT NOT NULL,
+                text_hash TEXT,
+                PRIMARY KEY (collection, ocr_result_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_aliases_doc ON aliases(collection, doc_id);
+            """
+        )
+        self._conn.commit()
+
+    def band_values(self, fingerprint: int) -> list[int]:
+        """指纹各段的取值"""
+        return [
+            (fingerprint >> (FINGERPRINT_BITS - offset - bits)) & ((1 << bits) - 1)
+            for offset, bits in self._bands
+        ]
+
+    def find_candidates(
+        self,
+        collection: str,
+        fingerprint: int,
+        app: str | None,
+        ts: int | None,
+        window: int,
+    ) -> list[tuple[str, int]]:
+        """查找同一应用、时间窗口内、汉明距离不超过 max_distance 的已有文档
+
+        Returns:
+            (文档ID, 汉明距离) 列表，按距离升序
+        """
+        values = self.band_values(fingerprint)
+        band_clause = " OR ".join("(b.band = ? AND b.value = ?)" for _ in values)
+        sql = (
+            "SELECT DISTINCT f.doc_id, f.fingerprint FROM fingerprint_bands b "
+            "JOIN fingerprints f ON f.collection = b.collection AND f.doc_id = b.doc_id "
+            f"WHERE b.collection = ? AND ({band_clause}) AND f.app IS ?"
+        )
+        params: list[Any] = [collection]
+        for band, value in enumerate(values):
+            params += [band, value]
+        params.append(app)
+        if ts is not None:
+            sql += " AND f.ts BETWEEN ? AND ?"
+            params += [ts - window, ts + window]
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"查询近重复候选失败: {e}")
+            return []
+        candidates = [(doc_id, hamming_distance(fingerprint, value)) for doc_id, value in rows]
+        candidates = [item for item in candidates if item[1] <= self.max_distance]
+        return sorted(candidates, key=lambda item: item[1])
+
+    def add_fingerprints(
+        self, collection: str, items: list[tuple[str, int, str | None, int | None]]
+    ):
+        """写入（覆盖）文档指纹
+
+        Args:
+            collection: 集合名称
+            items: (文档ID, 指纹, 规范化应用名称, epoch 秒) 列表
+        """
+        if not items:
+            return
+        doc_ids = [item[0] for item in items]
+        with self._lock:
+            self._delete_in("fingerprint_bands", "doc_id", collection, doc_ids)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO fingerprints (collection, doc_id, fingerprint, app, ts) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (collection, doc_id, _to_signed(fingerprint), app, ts)
+                    for doc_id, fingerprint, app, ts in items
+                ],
+            )
+            self._conn.executemany(
+                "INSERT INTO fingerprint_bands (collection, band, value, doc_id) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (collection, band, value, doc_id)
+                    for doc_id, fingerprint, _, _ in items
+                    for band, value in enumerate(self.band_values(fingerprint))
+                ],
+            )
+            self._conn.commit()
+
+    def remove_documents(self, collection: str, doc_ids: list[str]) -> dict[str, list[int]]:
+        """删除文档的指纹和别名关系
+
+        Returns:
+            文档ID到其别名OCR结果ID列表的映射（这些OCR结果需要重新索引）
+        """
+        released = self.get_aliases(collection, doc_ids)
+        with self._lock:
+            self._delete_in("fingerprint_bands", "doc_id", collection, doc_ids)
+            self._delete_in("fingerprints", "doc_id", collection, doc_ids)
+            self._delete_in("aliases", "doc_id", collection, doc_ids)
+            self._conn.commit()
+        return {
+            doc_id: [alias["ocr_result_id"] for alias in aliases]
+            for doc_id, aliases in released.items()
+        }
+
+    def add_aliases(self, collection: str, items: list[tuple[int, int | None, str, str | None]]):
+        """写入（覆盖）别名关系
+
+        Args:
+            collection: 集合名称
+            items: (OCR结果ID, 截图ID, 文档ID, 文本哈希) 列表
+        """
+        if not items:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO aliases "
+                "(collection, ocr_result_id, screenshot_id, doc_id, text_hash) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(collection, *item) for item in items],
+            )
+            self._conn.commit()
+
+    def remove_aliases(self, collection: str, ocr_result_ids: list[int]) -> set[str]:
+        """删除OCR结果的别名关系
+
+        Returns:
+            受影响（别名列表变化）的文档ID
+        """
+        targets = self.get_alias_targets(collection, ocr_result_ids)
+        if targets:
+            with self._lock:
+                self._delete_in("aliases", "ocr_result_id", collection, list(targets))
+                self._conn.commit()
+        return {target["doc_id"] for target in targets.values()}
+
+    def get_alias_targets(
+        self, collection: str, ocr_result_ids: list[int]
+    ) -> dict[int, dict[str, Any]]:
+        """OCR结果ID到其所属文档的映射（只包含已作为别名的OCR结果）"""
+        rows = self._select_in(
+            "SELECT ocr_result_id, doc_id, text_hash FROM aliases "
+            "WHERE collection = ? AND ocr_result_id IN ({})",
+            collection,
+            ocr_result_ids,
+        )
+        return {row[0]: {"doc_id": row[1], "text_hash": row[2]} for row in rows}
+
+    def get_aliases(self, collection: str, doc_ids: list[str]) -> dict[str, list[dict[str, int]]]:
+        """文档ID到别名列表（按OCR结果ID排序）的映射（没有别名的文档不包含在内）"""
+        rows = self._select_in(
+            "SELECT doc_id, ocr_result_id, screenshot_id FROM aliases "
+            "WHERE collection = ? AND doc_id IN ({}) ORDER BY ocr_result_id",
+            collection,
+            doc_ids,
+        )
+        aliases: dict[str, list[dict[str, int]]] = {}
+        for doc_id, ocr_result_id, screenshot_id in rows:
+            aliases.setdefault(doc_id, []).append(
+                {"ocr_result_id": ocr_result_id, "screenshot_id": screenshot_id}
+            )
+        return aliases
+
+    def get_alias_doc_ids(self, collection: str) -> list[str]:
+        """有别名的所有文档ID"""
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT DISTINCT doc_id FROM aliases WHERE collection = ?", (collection,)
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"读取近重复索引失败: {e}")
+            return []
+        return [row[0] for row in rows]
+
+    def _select_in(self, sql: str, collection: str, values: list) -> list[tuple]:
+        """分块执行 IN 查询（SQLite 单条语句的参数数量有上限）"""
+        rows = []
+        values = list(dict.fromkeys(values))
+        try:
+            with self._lock:
+                for start in range(0, len(values), 500):
+                    chunk = values[start : start + 500]
+                    rows += self._conn.execute(
+                        sql.format(",".join("?" * len(chunk))), [collection, *chunk]
+                    ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"读取近重复索引失败: {e}")
+        return rows
+
+    def _delete_in(self, table: str, column: str, collection: str, values: list):
+        """分块删除（调用方持有锁并负责提交）"""
+        for start in range(0, len(values), 500):
+            chunk = values[start : start + 500]
+            self._conn.execute(
+                f"DELETE FROM {table} WHERE collection = ? AND {column} IN "
+                f"({','.join('?' * len(chunk))})",
+                [collection, *chunk],
+            )
+
+    def clear(self, collection: str):
+        """清空集合的指纹和别名关系"""
+        with self._lock:
+            for table in ("fingerprint_bands", "fingerprints", "aliases"):
+                self._conn.execute(f"DELETE FROM {table} WHERE collection = ?", (collection,))
+            self._conn.commit()
+
+    def get_stats(self, collection: str) -> dict[str, Any]:
+        """获取集合的指纹和别名数量"""
+        with self._lock:
+            fingerprints = self._conn.execute(
+                "SELECT COUNT(*) FROM fingerprints WHERE collection = ?", (collection,)
+            ).fetchone()[0]
+            aliases = self._conn.execute(
+                "SELECT COUNT(*) FROM aliases WHERE collection = ?", (collection,)
+            ).fetchone()[0]
+        return {
+            "fingerprints": fingerprints,
+            "aliases": aliases,
+            "max_distance": self.max_distance,
+        }
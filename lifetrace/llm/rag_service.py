@@ -101,7 +101,9 @@ class RAGService:
             query_type = "statistics" if "统计" in user_query else "search"
 
             logger.info("开始数据检索")
-            retrieved_data = self.retrieval_service.search_by_conditions(parsed_query, max_results)
+            retrieved_data = self.retrieval_service.search_by_conditions(
+                parsed_query, max_results, query_text=user_query
+            )
 
             # 获取统计和构建上下文
             stats = self._get_statistics_if_needed(query_type, user_query, parsed_query)
@@ -253,7 +255,9 @@ class RAGService:
         """流式处理带检索的查询"""
         parsed_query = self.query_parser.parse_query(user_query)
         query_type = "statistics" if "统计" in user_query else "search"
-        retrieved_data = self.retrieval_service.search_by_conditions(parsed_query, max_results)
+        retrieved_data = self.retrieval_service.search_by_conditions(
+            parsed_query, max_results, query_text=user_query
+        )
 
         # 获取统计信息
         stats = None
@@ -732,7 +736,9 @@ LifeTrace是一个生活轨迹记录和分析系统，主要功能包括：
             parsed_query.project_id = project_id
 
         query_type = "statistics" if "统计" in user_query else "search"
-        retrieved_data = self.retrieval_service.search_by_conditions(parsed_query, 500)
+        retrieved_data = self.retrieval_service.search_by_conditions(
+            parsed_query, 500, query_text=user_query
+        )
 
         # 构建上下文
         if query_type == "statistics":
@@ -3,8 +3,10 @@ from typing import Any
 
 from sqlalchemy import func, or_
 
+from lifetrace.llm.hybrid_search_service import get_hybrid_search_service
 from lifetrace.storage import get_session
 from lifetrace.storage.models import Event, EventTaskRelation, OCRResult, Screenshot, Task
+from lifetrace.util.config import config
 from lifetrace.util.logging_config import get_logger
 from lifetrace.util.query_parser import QueryConditions, QueryParser
 
@@ -23,7 +25,7 @@ class RetrievalService:
         logger.info("检索服务初始化完成")
 
     def search_by_conditions(
-        self, conditions: QueryConditions, limit: int = 50
+        self, conditions: QueryConditions, limit: int = 50, query_text: str | None = None
     ) -> list[dict[str, Any]]:
         """
         根据查询条件检索数据
@@ -31,10 +33,16 @@ class RetrievalService:
         Args:
             conditions: 查询条件
             limit: 返回结果的最大数量
+            query_text: 用户原始查询；提供且条件中有关键词时使用混合检索（按相关性排序）
 
         Returns:
             检索到的数据列表
         """
+        if query_text and conditions.keywords and not conditions.project_id:
+            hybrid_results = self._search_hybrid(query_text, conditions, limit)
+            if hybrid_results:
+                return hybrid_results
+
         try:
             logger.info(f"执行数据库查询 - 条件: {conditions}, 限制: {limit}")
 
@@ -155,6 +163,46 @@ class RetrievalService:
             logger.error(f"数据检索失败: {e}")
             return []
 
+    def _search_hybrid(
+        self, query_text: str, conditions: QueryConditions, limit: int
+    ) -> list[dict[str, Any]]:
+        """关键词 + 语义混合检索，时间和应用条件在排序前过滤
+
+        Returns:
+            与 search_by_conditions 格式一致的数据列表（按相关性排序），未启用或失败时为空
+        """
+        if not config.get("search.hybrid_enabled"):
+            return []
+        try:
+            results = get_hybrid_search_service().search(
+                query_text,
+                keywords=conditions.keywords,
+                start_date=conditions.start_date,
+                end_date=conditions.end_date,
+                app_names=conditions.app_names,
+                limit=conditions.limit or limit,
+            )["results"]
+        except Exception as e:
+            logger.error(f"混合检索失败，改用条件查询: {e}")
+            return []
+
+        top_score = results[0]["score"] if results else 1.0
+        data_list = [
+            {
+                "screenshot_id": item["screenshot_id"],
+                "timestamp": item["created_at"].isoformat() if item["created_at"] else None,
+                "app_name": item["app_name"],
+                "window_title": item["window_title"],
+                "file_path": item["file_path"],
+                "ocr_text": item["text_content"] or "",
+                "ocr_count": 1,
+                "relevance_score": item["score"] / top_score,
+            }
+            for item in results
+        ]
+        logger.info(f"混合检索完成，找到 {len(data_list)} 条记录")
+        return data_list
+
     def search_by_query(self, user_query: str, limit: int = 50) -> list[dict[str, Any]]:
         """
         根据用户查询检索数据
@@ -171,7 +219,7 @@ class RetrievalService:
         logger.info(f"查询解析结果: {conditions}")
 
         # 执行检索
-        return self.search_by_conditions(conditions, limit)
+        return self.search_by_conditions(conditions, limit, query_text=user_query)
 
     def search_recent(
         self, hours: int = 24, app_name: str = None, limit: int = 20
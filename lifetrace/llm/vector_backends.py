@@ -0,0 +1,430 @@
+"""向量库后端
+
+VectorDatabase 通过后端读写向量，后端接口与 ChromaDB 集合的用法一致
+（add / upsert / get / query / delete / count），另有 reset、compact 等管理操作：
+- chroma: ChromaDB 持久化集合（默认）
+- mmap: 进程内的内存映射向量索引（见 lifetrace.llm.mmap_vector_index），打开快、内存占用低
+
+开启按月分区（vector_db.partition_by_month）时，文档按 ts 元数据写入各月份的集合，
+带时间范围的查询只检索范围内的月份。
+"""
+
+import importlib.util
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+BACKEND_CHROMA = "chroma"
+BACKEND_MMAP = "mmap"
+
+# 可下推到索引查询的过滤字段：时间（epoch 秒，整数）和规范化的应用名称
+TIMESTAMP_KEY = "ts"
+APP_KEY = "app"
+FILTER_METADATA_KEYS = (TIMESTAMP_KEY, APP_KEY)
+
+# 没有时间元数据的文档所在的分区
+UNPARTITIONED = ""
+
+# 各后端额外需要的依赖（只检查是否安装，不导入）
+BACKEND_DEPENDENCIES = {
+    BACKEND_CHROMA: ("chromadb",),
+    BACKEND_MMAP: (),
+}
+
+
+def missing_backend_dependencies(backend: str) -> list[str]:
+    """返回后端缺失的依赖，后端名称无效时抛出 ValueError"""
+    if backend not in BACKEND_DEPENDENCIES:
+        raise ValueError(f"不支持的向量库后端: {backend}")
+    return [
+        name for name in BACKEND_DEPENDENCIES[backend] if importlib.util.find_spec(name) is None
+    ]
+
+
+class VectorBackend(ABC):
+    """向量库后端接口
+
+    查询结果的格式与 ChromaDB 一致：get 返回 {"ids": [...], "metadatas": [...], ...}，
+    query 返回每个查询向量一组结果 {"ids": [[...]], "distances": [[...]], ...}。
+    距离为 l2 空间（平方欧氏距离）。子类必须实现所有抽象方法，
+    compact、get_stats、close 有默认实现。
+    """
+
+    name = ""
+
+    @abstractmethod
+    def add(
+        self,
+        ids: list[str],
+        embeddings: list[list[float]],
+        documents: list[str] | None = None,
+        metadatas: list[dict[str, Any]] | None = None,
+    ):
+        """添加文档（已存在的ID保持不变）"""
+
+    @abstractmethod
+    def upsert(
+        self,
+        ids: list[str],
+        embeddings: list[list[float]],
+        documents: list[str] | None = None,
+        metadatas: list[dict[str, Any]] | None = None,
+    ):
+        """写入文档，已存在的ID直接覆盖"""
+
+    @abstractmethod
+    def get(
+        self,
+        ids: list[str] | None = None,
+        where: dict[str, Any] | None = None,
+        include: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """按ID或元数据条件读取文档"""
+
+    @abstractmethod
+    def query(
+        self,
+        query_embeddings: list[list[float]],
+        n_results: int = 10,
+        where: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """向量检索"""
+
+    @abstractmethod
+    def delete(self, ids: list[str] | None = None, where: dict[str, Any] | None = None):
+        """按ID或元数据条件删除文档"""
+
+    @abstractmethod
+    def count(self) -> int:
+        """文档数量"""
+
+    @abstractmethod
+    def iter_ids(self, batch_size: int = 1000) -> Iterator[list[str]]:
+        """分批遍历所有文档ID（遍历期间不应删除文档）"""
+
+    @abstractmethod
+    def reset(self):
+        """删除所有文档"""
+
+    def compact(self, force: bool = False) -> bool:
+        """整理索引、回收已删除文档占用的空间
+
+        Returns:
+            是否执行了整理（后端不需要整理时返回 False）
+        """
+        return False
+
+    def get_stats(self) -> dict[str, Any]:
+        """后端自身的统计信息"""
+        return {"backend": self.name}
+
+    def close(self):
+        """释放资源"""
+
+
+class ChromaBackend(VectorBackend):
+    """ChromaDB 持久化集合"""
+
+    name = BACKEND_CHROMA
+
+    def __init__(self, path: str | Path, collection_name: str):
+        import chromadb
+        from chromadb.config import Settings
+
+        self.collection_name = collection_name
+        self.client = chromadb.PersistentClient(
+            path=str(path),
+            settings=Settings(anonymized_telemetry=False, allow_reset=True),
+        )
+        self.collection = self._get_or_create_collection()
+
+    def _get_or_create_collection(self):
+        return self.client.get_or_create_collection(
+            name=self.collection_name,
+            metadata={"description": "LifeTrace OCR text embeddings"},
+        )
+
+    def add(self, ids, embeddings, documents=None, metadatas=None):
+        self.collection.add(
+            ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas
+        )
+
+    def upsert(self, ids, embeddings, documents=None, metadatas=None):
+        self.collection.upsert(
+            ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas
+        )
+
+    def get(self, ids=None, where=None, include=None):
+        return self.collection.get(ids=ids, where=where, include=include or ["metadatas"])
+
+    def query(self, query_embeddings, n_results=10, where=None):
+        return self.collection.query(
+            query_embeddings=query_embeddings, n_results=n_results, where=where
+        )
+
+    def delete(self, ids=None, where=None):
+        self.collection.delete(ids=ids, where=where)
+
+    def count(self) -> int:
+        return self.collection.count()
+
+    def iter_ids(self, batch_size: int = 1000) -> Iterator[list[str]]:
+        offset = 0
+        while True:
+            ids = self.collection.get(limit=batch_size, offset=offset, include=[])["ids"]
+            if not ids:
+                return
+            yield ids
+            offset += len(ids)
+
+    def reset(self):
+        self.client.delete_collection(self.collection_name)
+        self.collection = self._get_or_create_collection()
+
+
+def where_time_range(where: dict[str, Any] | None) -> tuple[float | None, float | None]:
+    """从过滤条件中提取 ts 的取值范围（只分析顶层条件和 $and，$or 视为不限）
+
+    Returns:
+        (下界, 上界)，None 表示不限
+    """
+    low, high = None, None
+    for key, value in (where or {}).items():
+        if key == "$and":
+            for item in value:
+                item_low, item_high = where_time_range(item)
+                if item_low is not None:
+                    low = item_low if low is None else max(low, item_low)
+                if item_high is not None:
+                    high = item_high if high is None else min(high, item_high)
+        elif key == TIMESTAMP_KEY:
+            conditions = value if isinstance(value, dict) else {"$eq": value}
+            for operator, operand in conditions.items():
+                if operator in ("$eq", "$gt", "$gte"):
+                    low = operand if low is None else max(low, operand)
+                if operator in ("$eq", "$lt", "$lte"):
+                    high = operand if high is None else min(high, operand)
+    return low, high
+
+
+def month_partition(timestamp: float | None) -> str:
+    """时间戳所在月份的分区名（本地时间 YYYYMM），没有时间戳时为 UNPARTITIONED"""
+    if timestamp is None:
+        return UNPARTITIONED
+    return time.strftime("%Y%m", time.localtime(timestamp))
+
+
+class MonthPartitionedBackend(VectorBackend):
+    """按月分区的向量库后端
+
+    每个月份是一个独立的后端实例（集合名 {collection_name}_{YYYYMM}），没有 ts 元数据的文档
+    写入 {collection_name}。已有的分区记录在 partitions.json 中。
+    查询条件带 ts 范围时只检索范围内的月份，各分区结果按距离合并；按ID读取和删除访问所有分区。
+    """
+
+    def __init__(
+        self,
+        open_partition: Callable[[str], VectorBackend],
+        collection_name: str,
+        registry_path: str | Path,
+    ):
+        """
+        Args:
+            open_partition: 按集合名称打开（或创建）后端实例的函数
+            collection_name: 集合名称（分区名称的前缀）
+            registry_path: 分区列表文件
+        """
+        self._open_partition = open_partition
+        self.collection_name = collection_name
+        self.registry_path = Path(registry_path)
+        self._lock = threading.RLock()
+        self._partitions: dict[str, VectorBackend] = {}
+
+        months = []
+        if self.registry_path.exists():
+            months = json.loads(self.registry_path.read_text(encoding="utf-8"))
+        for month in [UNPARTITIONED, *months]:
+            self._partitions[month] = self._open(month)
+
+    @property
+    def name(self) -> str:
+        return self._partitions[UNPARTITIONED].name
+
+    def _open(self, month: str) -> VectorBackend:
+        return self._open_partition(
+            f"{self.collection_name}_{month}" if month else self.collection_name
+        )
+
+    def _save_registry(self):
+        self.registry_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.registry_path.with_suffix(".tmp")
+        months = sorted(month for month in self._partitions if month)
+        tmp_path.write_text(json.dumps(months), encoding="utf-8")
+        os.replace(tmp_path, self.registry_path)
+
+    def _partition(self, month: str) -> VectorBackend:
+        """获取分区，不存在时创建并记录"""
+        with self._lock:
+            if month not in self._partitions:
+                self._partitions[month] = self._open(month)
+                self._save_registry()
+            return self._partitions[month]
+
+    def _snapshot(self) -> dict[str, VectorBackend]:
+        with self._lock:
+            return dict(self._partitions)
+
+    def _relevant(self, where: dict[str, Any] | None) -> list[VectorBackend]:
+        """可能包含满足条件的文档的分区（未分区的文档总是包含在内）"""
+        low, high = where_time_range(where)
+        low_month = month_partition(low) if low is not None else None
+        high_month = month_partition(high) if high is not None else None
+        return [
+            backend
+            for month, backend in self._snapshot().items()
+            if not month
+            or (
+                (low_month is None or month >= low_month)
+                and (high_month is None or month <= high_month)
+            )
+        ]
+
+    def _write(self, ids, embeddings, documents, metadatas, replace: bool):
+        metadatas = metadatas or [{} for _ in ids]
+        groups: dict[str, list[int]] = {}
+        for i, metadata in enumerate(metadatas):
+            month = month_partition((metadata or {}).get(TIMESTAMP_KEY))
+            groups.setdefault(month, []).append(i)
+
+        for month, indexes in groups.items():
+            group_ids = [ids[i] for i in indexes]
+            if replace:
+                # 时间元数据变化的文档从原来的分区中移除
+                for other, backend in self._snapshot().items():
+                    if other != month:
+                        backend.delete(ids=group_ids)
+            write = self._partition(month).upsert if replace else self._partition(month).add
+            write(
+                ids=group_ids,
+                embeddings=[embeddings[i] for i in indexes],
+                documents=[documents[i] for i in indexes] if documents else None,
+                metadatas=[metadatas[i] for i in indexes],
+            )
+
+    def add(self, ids, embeddings, documents=None, metadatas=None):
+        self._write(ids, embeddings, documents, metadatas, False)
+
+    def upsert(self, ids, embeddings, documents=None, metadatas=None):
+        self._write(ids, embeddings, documents, metadatas, True)
+
+    def get(self, ids=None, where=None, include=None):
+        backends = self._relevant(where) if ids is None else self._snapshot().values()
+        merged: dict[str, Any] = {"ids": []}
+        for backend in backends:
+            result = backend.get(ids=ids, where=where, include=include)
+            merged["ids"].extend(result["ids"])
+            for key in ("documents", "metadatas", "embeddings"):
+                if result.get(key) is not None:
+                    merged.setdefault(key, []).extend(result[key])
+        return merged
+
+    def query(self, query_embeddings, n_results=10, where=None):
+        partial = [
+            backend.query(query_embeddings, n_results=n_results, where=where)
+            for backend in self._relevant(where)
+        ]
+        results = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        for i in range(len(query_embeddings)):
+            hits = []
+            for result in partial:
+                for j, doc_id in enumerate(result["ids"][i]):
+                    hits.append(
+                        (
+                            result["distances"][i][j],
+                            doc_id,
+                            result["documents"][i][j],
+                            result["metadatas"][i][j],
+                        )
+                    )
+            hits.sort(key=lambda hit: hit[0])
+            hits = hits[:n_results]
+            results["distances"].append([hit[0] for hit in hits])
+            results["ids"].append([hit[1] for hit in hits])
+            results["documents"].append([hit[2] for hit in hits])
+            results["metadatas"].append([hit[3] for hit in hits])
+        return results
+
+    def delete(self, ids=None, where=None):
+        backends = self._relevant(where) if ids is None else self._snapshot().values()
+        for backend in backends:
+            backend.delete(ids=ids, where=where)
+
+    def count(self) -> int:
+        return sum(backend.count() for backend in self._snapshot().values())
+
+    def iter_ids(self, batch_size: int = 1000) -> Iterator[list[str]]:
+        for backend in self._snapshot().values():
+            yield from backend.iter_ids(batch_size)
+
+    def reset(self):
+        with self._lock:
+            for backend in self._partitions.values():
+                backend.reset()
+            self._partitions = {UNPARTITIONED: self._partitions[UNPARTITIONED]}
+            self._save_registry()
+
+    def compact(self, force: bool = False) -> bool:
+        compacted = [backend.compact(force) for backend in self._snapshot().values()]
+        return any(compacted)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "backend": self.name,
+            "partitions": {
+                month or "unpartitioned": backend.count()
+                for month, backend in sorted(self._snapshot().items())
+            },
+        }
+
+    def close(self):
+        for backend in self._snapshot().values():
+            backend.close()
+
+
+def _create_backend(config, path: Path, collection_name: str) -> VectorBackend:
+    backend = config.get("vector_db.backend") or BACKEND_CHROMA
+    if backend == BACKEND_MMAP:
+        from lifetrace.llm.mmap_vector_index import MmapVectorIndex
+
+        return MmapVectorIndex(
+            path / "mmap" / collection_name,
+            max_segments=config.get("vector_db.mmap_max_segments"),
+            ivf_min_rows=config.get("vector_db.mmap_ivf_min_rows"),
+            ivf_nprobe=config.get("vector_db.mmap_ivf_nprobe"),
+        )
+    if backend == BACKEND_CHROMA:
+        return ChromaBackend(path, collection_name)
+    raise ValueError(f"不支持的向量库后端: {backend}")
+
+
+def create_vector_backend(config, path: str | Path, collection_name: str) -> VectorBackend:
+    """按配置创建向量库后端
+
+    Args:
+        config: 配置对象
+        path: 向量库持久化目录
+        collection_name: 集合名称
+    """
+    path = Path(path)
+    if config.get("vector_db.partition_by_month"):
+        return MonthPartitionedBackend(
+            lambda name: _create_backend(config, path, name),
+            collection_name,
+            path / "partitions" / f"{collection_name}.json",
+        )
+    return _create_backend(config, path, collection_name)
@@ -0,0 +1,246 @@
+"""向量压缩模块
+
+向量库可选地只保存维度缩减后的紧凑向量，以减小索引体积和检索扫描量：
+- truncate: Matryoshka 截断，保留前 N 维后重新归一化
+- pca: 按嵌入缓存中的样本拟合 PCA 投影，投影到 N 维后重新归一化
+
+写入文档时全维度向量（float32）按文档ID另存在 SQLite 文件中，检索时先用紧凑向量召回候选，
+再用全维度向量对候选精确重新打分（没有全维度向量的候选保留紧凑向量的距离，检索时不调用模型）。
+
+用法（拟合 PCA 投影）:
+    python -m lifetrace.llm.vector_compression --fit-pca --samples 20000
+"""
+
+import argparse
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+REDUCTION_TRUNCATE = "truncate"
+REDUCTION_PCA = "pca"
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """按行 L2 归一化"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def quantize_int8(vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """对称标量量化：每个向量按自身最大绝对值缩放到 [-127, 127]
+
+    Returns:
+        (int8 编码, 每个向量的 float32 缩放系数)
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(vectors).max(axis=-1, keepdims=True) / 127.0
+    scales = np.maximum(scales, 1e-12)
+    codes = np.clip(np.rint(vectors / scales), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize_int8(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """还原 int8 量化的向量"""
+    return codes.astype(np.float32) * scales
+
+
+def fit_pca(vectors: np.ndarray, dimensions: int) -> tuple[np.ndarray, np.ndarray]:
+    """拟合 PCA 投影
+
+    Returns:
+        (均值向量, 前 dimensions 个主成分组成的投影矩阵，形状为 [dimensions, 原维度])
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if len(vectors) < dimensions:
+        raise ValueError(f"PCA 样本数量不足：需要至少 {dimensions} 个，实际 {len(vectors)} 个")
+    mean = vectors.mean(axis=0)
+    _, _, vt = np.linalg.svd(vectors - mean, full_matrices=False)
+    return mean, vt[:dimensions]
+
+
+class VectorCompressor:
+    """嵌入向量维度缩减"""
+
+    def __init__(self, reduction: str, dimensions: int, pca_path: str | Path | None = None):
+        """
+        Args:
+            reduction: 缩减方式（truncate 或 pca）
+            dimensions: 保留的维度
+            pca_path: PCA 投影文件路径（reduction 为 pca 时必需）
+        """
+        if reduction not in (REDUCTION_TRUNCATE, REDUCTION_PCA):
+            raise ValueError(f"不支持的向量缩减方式: {reduction}")
+        self.reduction = reduction
+        self.dimensions = int(dimensions)
+        self.pca_path = Path(pca_path) if pca_path else None
+        self._mean = None
+        self._components = None
+
+        if reduction == REDUCTION_PCA:
+            if not self.pca_path or not self.pca_path.exists():
+                raise FileNotFoundError(
+                    f"未找到 PCA 投影文件 {self.pca_path}，"
+                    "请先运行 python -m lifetrace.llm.vector_compression --fit-pca"
+                )
+            data = np.load(self.pca_path)
+            self._mean = data["mean"]
+            self._components = data["components"]
+            if self._components.shape[0] != self.dimensions:
+                raise ValueError(
+                    f"PCA 投影维度为 {self._components.shape[0]}，与配置的 {self.dimensions} 不一致"
+                )
+
+    @property
+    def suffix(self) -> str:
+        """用于区分紧凑集合的名称后缀（如 truncate256）"""
+        return f"{self.reduction}{self.dimensions}"
+
+    def compress(self, vectors) -> np.ndarray:
+        """将全维度向量缩减为紧凑向量（已归一化）"""
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if self.reduction == REDUCTION_PCA:
+            reduced = (vectors - self._mean) @ self._components.T
+        else:
+            reduced = vectors[:, : self.dimensions]
+        return normalize(reduced)
+
+
+class FullVectorStore:
+    """按文档ID保存全维度向量（float32），供紧凑存储检索时精确重新打分"""
+
+    def __init__(self, db_path: str | Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS full_vectors (doc_id TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def put_many(self, vectors: dict[str, Any]):
+        """写入文档的全维度向量（已存在的直接覆盖）"""
+        if not vectors:
+            return
+        rows = [
+            (doc_id, np.asarray(vector, dtype=np.float32).tobytes())
+            for doc_id, vector in vectors.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO full_vectors (doc_id, vector) VALUES (?, ?)", rows
+            )
+            self._conn.commit()
+
+    def get_many(self, doc_ids: list[str]) -> dict[str, np.ndarray]:
+        """读取文档的全维度向量，返回文档ID到向量的映射（缺失的不包含在内）"""
+        found = {}
+        unique_ids = list(dict.fromkeys(doc_ids))
+        with self._lock:
+            # SQLite 单条语句的参数数量有上限，分块查询
+            for start in range(0, len(unique_ids), 500):
+                chunk = unique_ids[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT doc_id, vector FROM full_vectors WHERE doc_id IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for doc_id, blob in rows:
+                    found[doc_id] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def delete_many(self, doc_ids: list[str]):
+        """删除文档的全维度向量"""
+        if not doc_ids:
+            return
+        with self._lock:
+            for start in range(0, len(doc_ids), 500):
+                chunk = doc_ids[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                self._conn.execute(
+                    f"DELETE FROM full_vectors WHERE doc_id IN ({placeholders})", chunk
+                )
+            self._conn.commit()
+
+    def clear(self):
+        """清空所有向量"""
+        with self._lock:
+            self._conn.execute("DELETE FROM full_vectors")
+            self._conn.commit()
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取统计信息"""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM full_vectors").fetchone()[0]
+        size_bytes = self.db_path.stat().st_size if self.db_path.exists() else 0
+        return {"entries": count, "size_mb": size_bytes / 1024 / 1024}
+
+
+def save_pca(path: str | Path, mean: np.ndarray, components: np.ndarray):
+    """保存 PCA 投影"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(path, mean=mean.astype(np.float32), components=components.astype(np.float32))
+
+
+def get_pca_path(vector_db_path: str | Path, model_name: str, dimensions: int) -> Path:
+    """PCA 投影文件路径（按嵌入模型和维度区分）"""
+    safe_name = model_name.replace("/", "_")
+    return Path(vector_db_path) / f"pca_{safe_name}_{dimensions}.npz"
+
+
+def create_vector_compressor(config, vector_db_path: str | Path) -> VectorCompressor | None:
+    """按配置创建向量压缩器，未启用或不可用时返回 None"""
+    if not config.get("vector_db.compact_enabled"):
+        return None
+    reduction = config.get("vector_db.compact_reduction")
+    dimensions = config.get("vector_db.compact_dimensions")
+    pca_path = get_pca_path(vector_db_path, config.get("vector_db.embedding_model"), dimensions)
+    try:
+        return VectorCompressor(reduction, dimensions, pca_path)
+    except (ValueError, FileNotFoundError) as e:
+        logger.error(f"创建向量压缩器失败，使用全维度向量: {e}")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LifeTrace 向量压缩工具")
+    parser.add_argument("--fit-pca", action="store_true", help="用嵌入缓存中的向量拟合 PCA 投影")
+    parser.add_argument("--samples", type=int, default=20000, help="拟合使用的最大样本数量")
+    parser.add_argument("--dimensions", type=int, help="保留的维度（默认读取配置）")
+    args = parser.parse_args()
+
+    if not args.fit_pca:
+        parser.print_help()
+        return
+
+    from lifetrace.llm.embedding_cache import get_embedding_cache
+    from lifetrace.util.config import config
+
+    vector_db_path = Path(config.vector_db_persist_directory)
+    model_name = config.get("vector_db.embedding_model")
+    dimensions = args.dimensions or config.get("vector_db.compact_dimensions")
+
+    cache = get_embedding_cache(
+        vector_db_path / "embedding_cache.db",
+        config.get("vector_db.embedding_cache_max_entries"),
+        config.get("vector_db.embedding_cache_dtype"),
+    )
+    vectors = cache.sample(model_name, args.samples)
+    mean, components = fit_pca(vectors, dimensions)
+    path = get_pca_path(vector_db_path, model_name, dimensions)
+    save_pca(path, mean, components)
+    print(f"已使用 {len(vectors)} 个向量拟合 PCA 投影（{dimensions} 维），保存到 {path}")
+
+
+if __name__ == "__main__":
+    main()
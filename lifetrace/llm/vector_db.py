@@ -5,33 +5,88 @@
 """
 
 import hashlib
+import importlib.util
+from collections.abc import Iterator
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
+from lifetrace.llm.embedding_batcher import EmbeddingBatcher
+from lifetrace.llm.embedding_cache import get_embedding_cache, text_key
+from lifetrace.llm.vector_backends import (
+    BACKEND_CHROMA,
+    VectorBackend,
+    create_vector_backend,
+    missing_backend_dependencies,
+)
+from lifetrace.llm.vector_compression import FullVectorStore, create_vector_compressor
+from lifetrace.util.cache import TTLCache
 from lifetrace.util.logging_config import get_logger
+from lifetrace.util.model_registry import get_model_registry
 
 logger = get_logger()
 
-try:
-    import chromadb
-    import numpy as np
-    from chromadb.config import Settings
-    from sentence_transformers import CrossEncoder, SentenceTransformer
-except ImportError as e:
-    logger.warning(f"Vector database dependencies not installed: {e}")
-    logger.warning("Please install with: pip install -r requirements_vector.txt")
-    SentenceTransformer = None
-    CrossEncoder = None
-    chromadb = None
-    np = None
+# chromadb、sentence-transformers（连带 torch）导入耗时数秒，
+# 模块加载时只检查是否安装，真正的导入推迟到首次创建向量数据库或加载模型时
+# （后端自身的依赖见 vector_backends.BACKEND_DEPENDENCIES）
+VECTOR_DEPENDENCIES = ("sentence_transformers", "numpy")
+
+# 文档所在的集合：OCR文档（ocr_*）和事件分块文档（event_*）分别存放、分别检索，
+# 事件检索的耗时只与事件文档数量有关
+OCR_COLLECTION = "ocr"
+EVENT_COLLECTION = "events"
+
+
+def vector_dependencies_available(backend: str = BACKEND_CHROMA) -> bool:
+    """检查向量数据库依赖是否已安装（不导入）
+
+    Args:
+        backend: 向量库后端名称
+    """
+    missing = [name for name in VECTOR_DEPENDENCIES if importlib.util.find_spec(name) is None]
+    try:
+        missing += missing_backend_dependencies(backend)
+    except ValueError as e:
+        logger.error(str(e))
+        return False
+    if missing:
+        logger.warning(f"Vector database dependencies not installed: {', '.join(missing)}")
+        logger.warning("Please install with: pip install -r requirements_vector.txt")
+        return False
+    return True
+
+
+def _load_sentence_transformer(model_name: str):
+    """加载嵌入模型（延迟导入 sentence-transformers）"""
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+
+def _load_cross_encoder(model_name: str, max_length: int | None = None):
+    """加载交叉编码器（延迟导入 sentence-transformers）"""
+    from sentence_transformers import CrossEncoder
+
+    return CrossEncoder(model_name, max_length=max_length)
+
+
+def _outputs_probabilities(cross_encoder) -> bool:
+    """交叉编码器的输出是否已经过 sigmoid（不同 sentence-transformers 版本的属性名不同）"""
+    activation = getattr(cross_encoder, "activation_fn", None) or getattr(
+        cross_encoder, "default_activation_function", None
+    )
+    return type(activation).__name__ == "Sigmoid"
 
 
 class VectorDatabase:
     """向量数据库管理器
 
     提供文本嵌入、向量存储和语义检索功能。
-    使用 ChromaDB 作为向量数据库后端。
+    向量存储由可替换的后端提供（vector_db.backend：chroma 或 mmap），可按月分区。
+    OCR文档和事件文档使用两个集合（事件集合名称为 {collection_name}_events），
+    读写和检索方法的 kind 参数指定集合。
     """
 
     def __init__(self, config):
@@ -47,31 +102,56 @@ class VectorDatabase:
         if not self._check_dependencies():
             raise ImportError("Vector database dependencies not available")
 
-        # 初始化模型和数据库
-        self.embedding_model = None
-        self.cross_encoder = None
-        self.chroma_client = None
+        # 初始化模型和数据库（模型由进程级注册表共享，这里只持有句柄）
+        self._embedding_handle = None
+        self._cross_encoder_handle = None
+        self.embedding_cache = None
+        self.query_batcher = None
         self.collection = None
+        self.event_collection = None
 
         # 配置参数
         self.vector_db_path = Path(config.vector_db_persist_directory)
+        self.backend_name = config.get("vector_db.backend") or BACKEND_CHROMA
         self.embedding_model_name = config.get("vector_db.embedding_model")
         self.cross_encoder_model_name = config.get("vector_db.rerank_model")
         self.collection_name = config.get("vector_db.collection_name")
+        self.embedding_batch_size = config.get("vector_db.embedding_batch_size")
+        self.write_batch_size = max(1, config.get("vector_db.write_batch_size"))
+        self.rerank_batch_size = config.get("vector_db.rerank_batch_size")
+        self.rerank_max_length = config.get("vector_db.rerank_max_length")
+        self.rerank_margin = config.get("vector_db.rerank_margin")
+        self.compact_rescore_factor = max(1, config.get("vector_db.compact_rescore_factor"))
+        self.query_embed_timeout = config.get("vector_db.query_embed_timeout")
+        self.compressor = None
+        self.full_vectors = None
+
+        # 查询嵌入缓存：归一化查询文本的哈希 -> 向量
+        self.query_cache = TTLCache(
+            config.get("vector_db.query_cache_ttl"),
+            max_size=config.get("vector_db.query_cache_size"),
+        )
+
+        # 重排序分数缓存：(查询哈希, 文档哈希) -> 分数
+        self.rerank_cache = TTLCache(
+            config.get("vector_db.rerank_cache_ttl"),
+            max_size=config.get("vector_db.rerank_cache_size"),
+        )
 
         # 初始化
         self._initialize()
 
     def _check_dependencies(self) -> bool:
         """检查依赖是否可用"""
-        return all(
-            [
-                SentenceTransformer is not None,
-                CrossEncoder is not None,
-                chromadb is not None,
-                np is not None,
-            ]
-        )
+        return vector_dependencies_available(self.backend_name)
+
+    def _backend(self, kind: str) -> VectorBackend:
+        """文档类型对应的集合后端"""
+        if kind == EVENT_COLLECTION:
+            return self.event_collection
+        if kind == OCR_COLLECTION:
+            return self.collection
+        raise ValueError(f"未知的向量集合: {kind}")
 
     def _initialize(self):
         """初始化模型和数据库"""
@@ -79,25 +159,66 @@ class VectorDatabase:
             # 创建数据目录
             self.vector_db_path.mkdir(parents=True, exist_ok=True)
 
-            # 初始化嵌入模型
+            # 注册嵌入模型和交叉编码器（首次使用时加载，同名模型进程内只加载一份）
+            registry = get_model_registry()
             if self.embedding_model_name:
-                self.logger.info(f"Loading embedding model: {self.embedding_model_name}")
-                self.embedding_model = SentenceTransformer(self.embedding_model_name)
+                model_name = self.embedding_model_name
+                self._embedding_handle = registry.register(
+                    f"embedding:{model_name}", lambda: _load_sentence_transformer(model_name)
+                )
             else:
                 self.logger.info("Skipping embedding model initialization (multimodal mode)")
-                self.embedding_model = None
 
-            # 初始化 ChromaDB
-            self.logger.info(f"Initializing ChromaDB at: {self.vector_db_path}")
-            self.chroma_client = chromadb.PersistentClient(
-                path=str(self.vector_db_path),
-                settings=Settings(anonymized_telemetry=False, allow_reset=True),
-            )
+            # 查询编码微批处理：并发查询合并为一次模型调用
+            batch_window_ms = self.config.get("vector_db.query_batch_window_ms")
+            if self.embedding_model_name and batch_window_ms > 0:
+                self.query_batcher = EmbeddingBatcher(
+                    self._encode_queries,
+                    window_ms=batch_window_ms,
+                    max_batch_size=self.config.get("vector_db.query_batch_max_size"),
+                )
+
+            # 嵌入缓存：相同文本（按模型区分）只编码一次
+            if self.embedding_model_name and self.config.get("vector_db.embedding_cache_enabled"):
+                self.embedding_cache = get_embedding_cache(
+                    self.vector_db_path / "embedding_cache.db",
+                    self.config.get("vector_db.embedding_cache_max_entries"),
+                    self.config.get("vector_db.embedding_cache_dtype"),
+                )
 
-            # 获取或创建集合
-            self.collection = self.chroma_client.get_or_create_collection(
-                name=self.collection_name,
-                metadata={"description": "LifeTrace OCR text embeddings"},
+            # 紧凑存储：向量库只保存缩减维度后的向量，使用单独的集合
+            if self.embedding_model_name:
+                self.compressor = create_vector_compressor(self.config, self.vector_db_path)
+            if self.compressor:
+                self.collection_name = f"{self.collection_name}_{self.compressor.suffix}"
+                self.full_vectors = FullVectorStore(
+                    self.vector_db_path / f"{self.collection_name}_full_vectors.db"
+                )
+                self.logger.info(f"Compact vector storage enabled: {self.compressor.suffix}")
+
+            # 按月分区：各月份的文档写入单独的集合，整体使用新的集合名称（需重新同步）
+            if self.config.get("vector_db.partition_by_month"):
+                self.collection_name = f"{self.collection_name}_monthly"
+                self.logger.info("Monthly vector partitions enabled")
+
+            if self.cross_encoder_model_name:
+                rerank_name = self.cross_encoder_model_name
+                max_length = self.rerank_max_length
+                self._cross_encoder_handle = registry.register(
+                    f"cross_encoder:{rerank_name}",
+                    lambda: _load_cross_encoder(rerank_name, max_length),
+                )
+
+            # 初始化向量库后端（集合）
+            self.logger.info(
+                f"Initializing {self.backend_name} vector backend at: {self.vector_db_path}"
+            )
+            self.collection = create_vector_backend(
+                self.config, self.vector_db_path, self.collection_name
+            )
+            self.event_collection_name = f"{self.collection_name}_events"
+            self.event_collection = create_vector_backend(
+                self.config, self.vector_db_path, self.event_collection_name
             )
 
             self.logger.info("Vector database initialized successfully")
@@ -106,12 +227,18 @@ class VectorDatabase:
             self.logger.error(f"Failed to initialize vector database: {e}")
             raise
 
-    def _get_cross_encoder(self) -> CrossEncoder:
-        """延迟加载交叉编码器"""
-        if self.cross_encoder is None:
-            self.logger.info(f"Loading cross-encoder model: {self.cross_encoder_model_name}")
-            self.cross_encoder = CrossEncoder(self.cross_encoder_model_name)
-        return self.cross_encoder
+    @property
+    def embedding_model(self):
+        """共享的嵌入模型（延迟加载，空闲时可能被注册表卸载）"""
+        if self._embedding_handle is None:
+            return None
+        return self._embedding_handle.get()
+
+    def _get_cross_encoder(self):
+        """获取共享的交叉编码器（延迟加载）"""
+        if self._cross_encoder_handle is None:
+            raise RuntimeError("Cross-encoder model not configured")
+        return self._cross_encoder_handle.get()
 
     def embed_text(self, text: str) -> list[float]:
         """将文本转换为向量嵌入
@@ -125,16 +252,51 @@ class VectorDatabase:
         if not text or not text.strip():
             return []
 
-        if not self.embedding_model:
+        if not self.embedding_model_name:
             raise RuntimeError("Embedding model not available (multimodal mode)")
 
         try:
-            embedding = self.embedding_model.encode(text.strip(), normalize_embeddings=True)
-            return embedding.tolist()
+            return self._encode([text.strip()])[0]
         except Exception as e:
             self.logger.error(f"Failed to embed text: {e}")
             return []
 
+    def embed_query(self, query: str) -> list[float]:
+        """将查询文本转换为向量嵌入
+
+        先查进程内的查询嵌入缓存（按归一化文本），未命中时交给微批处理器，
+        与同一时间窗口内的其他查询合并为一次模型调用。
+
+        Args:
+            query: 查询文本
+
+        Returns:
+            查询的向量嵌入
+        """
+        if not query or not query.strip():
+            return []
+
+        if not self.embedding_model_name:
+            raise RuntimeError("Embedding model not available (multimodal mode)")
+
+        key = text_key(query)
+        embedding = self.query_cache.get(key)
+        if embedding is not None:
+            return embedding
+
+        try:
+            if self.query_batcher:
+                embedding = self.query_batcher.submit(key, query.strip()).result(
+                    timeout=self.query_embed_timeout
+                )
+            else:
+                embedding = self._encode_queries([query.strip()])[0]
+        except Exception as e:
+            self.logger.error(f"Failed to embed query: {e}")
+            return []
+        self.query_cache.set(key, embedding)
+        return embedding
+
     def add_document(self, doc_id: str, text: str, metadata: dict[str, Any] | None = None) -> bool:
         """添加文档到向量数据库
 
@@ -152,9 +314,10 @@ class VectorDatabase:
 
         try:
             # 生成嵌入
-            embedding = self.embed_text(text)
-            if not embedding:
+            full_embedding = self.embed_text(text)
+            if not full_embedding:
                 return False
+            embedding = self._to_stored([full_embedding])[0]
 
             # 准备元数据
             doc_metadata = {
@@ -175,6 +338,8 @@ class VectorDatabase:
                 metadatas=[doc_metadata],
                 ids=[doc_id],
             )
+            if self.full_vectors:
+                self.full_vectors.put_many({doc_id: full_embedding})
 
             self.logger.debug(f"Added document {doc_id} to vector database")
             return True
@@ -183,6 +348,187 @@ class VectorDatabase:
             self.logger.error(f"Failed to add document {doc_id}: {e}")
             return False
 
+    def embed_texts(self, texts: list[str], batch_size: int | None = None) -> list[list[float]]:
+        """批量将文本转换为向量嵌入
+
+        按文本长度排序后分批编码，同一批内长度接近，减少填充带来的无效计算；
+        返回结果保持输入顺序。
+
+        Args:
+            texts: 输入文本列表（调用方需保证非空）
+            batch_size: 模型编码批大小，None 表示使用配置值
+
+        Returns:
+            与输入一一对应的向量嵌入列表
+        """
+        if not texts:
+            return []
+        return self._encode(texts, batch_size)
+
+    def _encode(
+        self, texts: list[str], batch_size: int | None = None, use_cache: bool = True
+    ) -> list[list[float]]:
+        """编码文本：先查嵌入缓存，只对未命中且去重后的文本调用模型
+
+        Args:
+            texts: 输入文本列表
+            batch_size: 模型编码批大小，None 表示使用配置值
+            use_cache: 是否读写持久化的嵌入缓存
+        """
+        if not self.embedding_model_name:
+            raise RuntimeError("Embedding model not available (multimodal mode)")
+
+        cache = self.embedding_cache if use_cache else None
+        keys = [text_key(text) for text in texts]
+        vectors = cache.get_many(self.embedding_model_name, keys) if cache else {}
+
+        # 未命中的文本去重后按长度排序编码
+        missing: dict[str, int] = {}
+        for index, key in enumerate(keys):
+            if key not in vectors and key not in missing:
+                missing[key] = index
+        if missing:
+            order = sorted(missing.values(), key=lambda i: len(texts[i]))
+            embeddings = self.embedding_model.encode(
+                [texts[i] for i in order],
+                batch_size=batch_size or self.embedding_batch_size,
+                normalize_embeddings=True,
+            )
+            encoded = {keys[index]: embeddings[pos] for pos, index in enumerate(order)}
+            if cache:
+                cache.put_many(self.embedding_model_name, encoded)
+            vectors.update(encoded)
+
+        return [vectors[key].tolist() for key in keys]
+
+    def _encode_queries(self, texts: list[str]) -> list[list[float]]:
+        """编码查询文本（只使用进程内的查询缓存，不写入文档嵌入缓存，避免挤掉文档向量）"""
+        return self._encode(texts, use_cache=False)
+
+    def _to_stored(self, embeddings: list[list[float]]) -> list[list[float]]:
+        """转换为写入向量库的表示（启用紧凑存储时缩减维度）"""
+        if self.compressor is None:
+            return embeddings
+        return self.compressor.compress(embeddings).tolist()
+
+    def add_documents(
+        self,
+        doc_ids: list[str],
+        texts: list[str],
+        metadatas: list[dict[str, Any]] | None = None,
+        batch_size: int | None = None,
+        kind: str = OCR_COLLECTION,
+    ) -> int:
+        """批量添加文档到向量数据库（批量编码、分块写入）
+
+        Args:
+            doc_ids: 文档唯一标识符列表
+            texts: 文档文本内容列表
+            metadatas: 文档元数据列表
+            batch_size: 模型编码批大小，None 表示使用配置值
+            kind: 写入的集合
+
+        Returns:
+            成功添加的文档数量
+        """
+        return self._write_documents(doc_ids, texts, metadatas, False, batch_size, kind)
+
+    def upsert_documents(
+        self,
+        doc_ids: list[str],
+        texts: list[str],
+        metadatas: list[dict[str, Any]] | None = None,
+        batch_size: int | None = None,
+        kind: str = OCR_COLLECTION,
+    ) -> int:
+        """批量写入文档，已存在的文档直接覆盖
+
+        Args:
+            doc_ids: 文档唯一标识符列表
+            texts: 文档文本内容列表
+            metadatas: 文档元数据列表
+            batch_size: 模型编码批大小，None 表示使用配置值
+            kind: 写入的集合
+
+        Returns:
+            成功写入的文档数量
+        """
+        return self._write_documents(doc_ids, texts, metadatas, True, batch_size, kind)
+
+    def _write_documents(
+        self,
+        doc_ids: list[str],
+        texts: list[str],
+        metadatas: list[dict[str, Any]] | None,
+        upsert: bool,
+        batch_size: int | None = None,
+        kind: str = OCR_COLLECTION,
+    ) -> int:
+        """批量编码并分块写入文档
+
+        文档先按长度排序，再按 write_batch_size 分块编码和写入，
+        单块失败不影响其他块。
+        """
+        if metadatas is None:
+            metadatas = [{} for _ in doc_ids]
+
+        # 过滤空文本，并按长度排序（相邻文档长度接近，编码时填充更少）
+        items = sorted(
+            (
+                (doc_id, text.strip(), metadata or {})
+                for doc_id, text, metadata in zip(doc_ids, texts, metadatas, strict=True)
+                if text and text.strip()
+            ),
+            key=lambda item: len(item[1]),
+        )
+        if not items:
+            return 0
+
+        if not self.embedding_model_name:
+            raise RuntimeError("Embedding model not available (multimodal mode)")
+
+        backend = self._backend(kind)
+        write = backend.upsert if upsert else backend.add
+        batch_size = batch_size or self.embedding_batch_size
+        written = 0
+        for start in range(0, len(items), self.write_batch_size):
+            chunk = items[start : start + self.write_batch_size]
+            try:
+                ids = [item[0] for item in chunk]
+                documents = [item[1] for item in chunk]
+                full_embeddings = self._encode(documents, batch_size)
+                embeddings = self._to_stored(full_embeddings)
+
+                now = datetime.now().isoformat()
+                doc_metadatas = []
+                for _, text, metadata in chunk:
+                    doc_metadata = {
+                        "timestamp": now,
+                        "text_length": len(text),
+                        "text_hash": hashlib.md5(text.encode()).hexdigest(),
+                    }
+                    doc_metadata.update(metadata)
+                    # 过滤掉 None 值（ChromaDB 不接受 None）
+                    doc_metadatas.append({k: v for k, v in doc_metadata.items() if v is not None})
+
+                write(
+                    documents=documents,
+                    embeddings=embeddings,
+                    metadatas=doc_metadatas,
+                    ids=ids,
+                )
+                if self.full_vectors:
+                    self.full_vectors.put_many(dict(zip(ids, full_embeddings, strict=True)))
+                written += len(ids)
+
+            except Exception as e:
+                self.logger.error(f"Failed to write {len(chunk)} documents: {e}")
+
+        self.logger.debug(
+            f"Wrote {written}/{len(items)} documents to vector database (upsert={upsert})"
+        )
+        return written
+
     def add_document_with_embedding(
         self,
         doc_id: str,
@@ -240,7 +586,7 @@ class VectorDatabase:
     def update_document(
         self, doc_id: str, text: str, metadata: dict[str, Any] | None = None
     ) -> bool:
-        """更新文档
+        """更新文档（直接覆盖写入；新文本为空时删除旧文档）
 
         Args:
             doc_id: 文档唯一标识符
@@ -251,10 +597,10 @@ class VectorDatabase:
             是否更新成功
         """
         try:
-            # 先删除旧文档
-            self.delete_document(doc_id)
-            # 添加新文档
-            return self.add_document(doc_id, text, metadata)
+            if not text or not text.strip():
+                self.delete_document(doc_id)
+                return False
+            return self.upsert_documents([doc_id], [text], [metadata or {}]) == 1
         except Exception as e:
             self.logger.error(f"Failed to update document {doc_id}: {e}")
             return False
@@ -270,21 +616,171 @@ class VectorDatabase:
         """
         try:
             self.collection.delete(ids=[doc_id])
+            if self.full_vectors:
+                self.full_vectors.delete_many([doc_id])
             self.logger.debug(f"Deleted document {doc_id} from vector database")
             return True
         except Exception as e:
             self.logger.error(f"Failed to delete document {doc_id}: {e}")
             return False
 
+    def delete_documents(self, doc_ids: list[str], kind: str = OCR_COLLECTION) -> bool:
+        """批量删除文档
+
+        Args:
+            doc_ids: 文档唯一标识符列表
+            kind: 文档所在的集合
+
+        Returns:
+            是否删除成功
+        """
+        if not doc_ids:
+            return True
+        try:
+            self._backend(kind).delete(ids=doc_ids)
+            if self.full_vectors:
+                self.full_vectors.delete_many(doc_ids)
+            self.logger.debug(f"Deleted {len(doc_ids)} documents from vector database")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to delete {len(doc_ids)} documents: {e}")
+            return False
+
+    def get_metadatas(
+        self,
+        where: dict[str, Any] | None = None,
+        ids: list[str] | None = None,
+        kind: str = OCR_COLLECTION,
+    ) -> dict[str, dict[str, Any]]:
+        """按文档ID或元数据条件获取文档的元数据（不返回文本和向量）
+
+        Args:
+            where: 元数据过滤条件
+            ids: 文档ID列表
+            kind: 查询的集合
+
+        Returns:
+            文档ID到元数据的映射（不存在的文档不包含在内）
+        """
+        if ids is not None and not ids:
+            return {}
+        try:
+            results = self._backend(kind).get(ids=ids, where=where, include=["metadatas"])
+            return {
+                doc_id: metadata or {}
+                for doc_id, metadata in zip(results["ids"], results["metadatas"], strict=False)
+            }
+        except Exception as e:
+            self.logger.error(f"Failed to get document metadata: {e}")
+            return {}
+
+    def get_documents(self, ids: list[str]) -> dict[str, str]:
+        """按文档ID获取文档文本
+
+        Returns:
+            文档ID到文本的映射（不存在的文档不包含在内）
+        """
+        if not ids:
+            return {}
+        try:
+            results = self.collection.get(ids=ids, include=["documents"])
+            return dict(zip(results["ids"], results["documents"], strict=False))
+        except Exception as e:
+            self.logger.error(f"Failed to get documents: {e}")
+            return {}
+
+    def update_metadatas(self, updates: dict[str, dict[str, Any]]) -> int:
+        """更新文档的部分元数据字段（沿用已存储的向量，不重新编码）
+
+        Args:
+            updates: 文档ID到需要更新的元数据字段的映射
+
+        Returns:
+            更新的文档数量（不存在的文档跳过）
+        """
+        if not updates:
+            return 0
+        try:
+            results = self.collection.get(
+                ids=list(updates), include=["documents", "metadatas", "embeddings"]
+            )
+            if not results["ids"]:
+                return 0
+            metadatas = []
+            for doc_id, metadata in zip(results["ids"], results["metadatas"], strict=True):
+                merged = {**(metadata or {}), **updates[doc_id]}
+                metadatas.append({k: v for k, v in merged.items() if v is not None})
+            self.collection.upsert(
+                ids=results["ids"],
+                embeddings=[list(embedding) for embedding in results["embeddings"]],
+                documents=results["documents"],
+                metadatas=metadatas,
+            )
+            return len(results["ids"])
+        except Exception as e:
+            self.logger.error(f"Failed to update metadata of {len(updates)} documents: {e}")
+            return 0
+
+    def iter_ids(
+        self, batch_size: int = 1000, kind: str = OCR_COLLECTION
+    ) -> Iterator[list[str]]:
+        """分批遍历集合中的所有文档ID（遍历期间不要删除文档）"""
+        return self._backend(kind).iter_ids(batch_size)
+
+    def move_documents(self, doc_ids: list[str], source: str, target: str) -> int:
+        """把文档连同已存储的向量从一个集合移到另一个集合（不重新编码）
+
+        Returns:
+            移动的文档数量（源集合中不存在的文档跳过）
+        """
+        if not doc_ids:
+            return 0
+        results = self._backend(source).get(
+            ids=doc_ids, include=["documents", "metadatas", "embeddings"]
+        )
+        if not results["ids"]:
+            return 0
+        self._backend(target).upsert(
+            ids=results["ids"],
+            embeddings=[list(embedding) for embedding in results["embeddings"]],
+            documents=results["documents"],
+            metadatas=results["metadatas"],
+        )
+        self._backend(source).delete(ids=results["ids"])
+        return len(results["ids"])
+
+    def get_disk_usage(self) -> int:
+        """向量库目录占用的磁盘空间（字节，不含嵌入缓存）"""
+        cache_files = {"embedding_cache.db", "embedding_cache.db-wal", "embedding_cache.db-shm"}
+        total = 0
+        for file in self.vector_db_path.rglob("*"):
+            if file.name in cache_files:
+                continue
+            try:
+                if file.is_file():
+                    total += file.stat().st_size
+            except OSError:
+                # 统计期间被合并删除的文件
+                continue
+        return total
+
     def search(
-        self, query: str, top_k: int = 10, where: dict[str, Any] | None = None
+        self,
+        query: str,
+        top_k: int = 10,
+        where: dict[str, Any] | None = None,
+        kind: str = OCR_COLLECTION,
     ) -> list[dict[str, Any]]:
         """语义搜索
 
+        启用紧凑存储时，先用紧凑向量召回 top_k × compact_rescore_factor 个候选，
+        再用全维度向量重新计算距离并取前 top_k 个。
+
         Args:
             query: 查询文本
             top_k: 返回结果数量
             where: 元数据过滤条件
+            kind: 检索的集合
 
         Returns:
             搜索结果列表，每个结果包含 id, document, metadata, distance
@@ -294,7 +790,7 @@ class VectorDatabase:
 
         try:
             # 生成查询嵌入
-            query_embedding = self.embed_text(query)
+            query_embedding = self.embed_query(query)
             if not query_embedding:
                 return []
 
@@ -302,8 +798,11 @@ class VectorDatabase:
             cleaned_where = self._clean_where_clause(where)
 
             # 执行搜索
-            results = self.collection.query(
-                query_embeddings=[query_embedding], n_results=top_k, where=cleaned_where
+            n_results = top_k * self.compact_rescore_factor if self.compressor else top_k
+            results = self._backend(kind).query(
+                query_embeddings=self._to_stored([query_embedding]),
+                n_results=n_results,
+                where=cleaned_where,
             )
 
             # 格式化结果
@@ -318,6 +817,9 @@ class VectorDatabase:
                     }
                 )
 
+            if self.compressor and formatted_results:
+                formatted_results = self._rescore(query_embedding, formatted_results)[:top_k]
+
             self.logger.debug(f"Found {len(formatted_results)} results for query: {query[:50]}...")
             return formatted_results
 
@@ -325,6 +827,26 @@ class VectorDatabase:
             self.logger.error(f"Failed to search: {e}")
             return []
 
+    def _rescore(
+        self, query_embedding: list[float], results: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """用全维度向量重新计算候选结果的距离并排序
+
+        全维度向量在写入文档时按文档ID保存；没有全维度向量的候选（如启用此功能前写入的文档）
+        保留紧凑向量的距离，检索时不调用模型。
+        距离与 ChromaDB 默认的 l2 空间一致（归一化向量的平方欧氏距离 2 - 2cos）。
+        """
+        vectors = self.full_vectors.get_many([result["id"] for result in results])
+        query = np.asarray(query_embedding, dtype=np.float32)
+        for result in results:
+            vector = vectors.get(result["id"])
+            if vector is None or result["distance"] is None:
+                continue
+            result["compact_distance"] = result["distance"]
+            result["distance"] = max(0.0, 2.0 - 2.0 * float(vector @ query))
+        results.sort(key=lambda result: result["distance"])
+        return results
+
     def _clean_where_clause(self, where: dict[str, Any] | None) -> dict[str, Any] | None:
         """清理和验证 where 条件，移除空对象和无效操作符
 
@@ -353,6 +875,45 @@ class VectorDatabase:
 
         return cleaned if cleaned else None
 
+    def rerank_scores(self, query: str, documents: list[str]) -> list[float]:
+        """计算查询与各文档的相关性分数（0-1 之间，模型输出 logits 时经过 sigmoid）
+
+        已算过的 (查询, 文档) 分数直接从缓存读取；其余文档去重后按长度排序，
+        以 rerank_batch_size 分批交给交叉编码器。
+
+        Args:
+            query: 查询文本
+            documents: 文档列表
+
+        Returns:
+            与输入文档一一对应的分数列表
+        """
+        query_key = text_key(query)
+        keys = [(query_key, text_key(doc)) for doc in documents]
+        scores = self.rerank_cache.get_many(keys)
+
+        # 未命中的文档去重后按长度排序打分
+        missing: dict[tuple[str, str], int] = {}
+        for index, key in enumerate(keys):
+            if key not in scores and key not in missing:
+                missing[key] = index
+        if missing:
+            order = sorted(missing.values(), key=lambda i: len(documents[i]))
+            cross_encoder = self._get_cross_encoder()
+            predicted = cross_encoder.predict(
+                [(query, documents[i]) for i in order],
+                batch_size=self.rerank_batch_size,
+                show_progress_bar=False,
+            )
+            predicted = np.asarray(predicted, dtype=np.float64)
+            if not _outputs_probabilities(cross_encoder):
+                predicted = 1.0 / (1.0 + np.exp(-predicted))
+            computed = {keys[index]: float(predicted[pos]) for pos, index in enumerate(order)}
+            self.rerank_cache.set_many(computed)
+            scores.update(computed)
+
+        return [scores[key] for key in keys]
+
     def rerank(
         self, query: str, documents: list[str], top_k: int | None = None
     ) -> list[tuple[str, float]]:
@@ -370,29 +931,33 @@ class VectorDatabase:
             return []
 
         try:
-            cross_encoder = self._get_cross_encoder()
-
-            # 构建查询-文档对
-            pairs = [(query, doc) for doc in documents]
-
-            # 计算相关性分数
-            scores = cross_encoder.predict(pairs)
-
-            # 排序
-            scored_docs = list(zip(documents, scores, strict=False))
-            scored_docs.sort(key=lambda x: x[1], reverse=True)
-
-            # 返回指定数量
+            scores = self.rerank_scores(query, documents)
+            order = sorted(range(len(documents)), key=lambda i: scores[i], reverse=True)
             if top_k is not None:
-                scored_docs = scored_docs[:top_k]
+                order = order[:top_k]
 
-            self.logger.debug(f"Reranked {len(documents)} documents, returning {len(scored_docs)}")
-            return scored_docs
+            self.logger.debug(f"Reranked {len(documents)} documents, returning {len(order)}")
+            return [(documents[i], scores[i]) for i in order]
 
         except Exception as e:
             self.logger.error(f"Failed to rerank documents: {e}")
             return [(doc, 0.0) for doc in documents]
 
+    def _rerank_pool_size(self, results: list[dict[str, Any]]) -> int:
+        """自适应重排序截断
+
+        只有检索距离与最优结果相差不超过 rerank_margin 的候选才参与重排序；
+        与最优结果差距明显的候选保持检索顺序排在后面。最优结果总是参与重排序，
+        保证返回的分数都以交叉编码器的分数为基准。
+        """
+        if not self.rerank_margin or self.rerank_margin <= 0:
+            return len(results)
+        distances = [result.get("distance") for result in results]
+        if any(distance is None for distance in distances):
+            return len(results)
+        cutoff = distances[0] + self.rerank_margin
+        return sum(1 for distance in distances if distance <= cutoff)
+
     def search_and_rerank(
         self,
         query: str,
@@ -402,6 +967,10 @@ class VectorDatabase:
     ) -> list[dict[str, Any]]:
         """搜索并重排序
 
+        只对落在 rerank_margin 内的候选打分（检索结果已经明显分出高下时只对最优结果打分）。
+        所有结果的 score 在 0-1 之间且随排名不增：参与重排序的结果为交叉编码器分数，
+        其余结果为最低重排序分数乘以检索相似度（1 - 距离），排在重排序结果之后。
+
         Args:
             query: 查询文本
             retrieve_k: 初始检索数量
@@ -409,33 +978,44 @@ class VectorDatabase:
             where: 元数据过滤条件
 
         Returns:
-            重排序后的搜索结果
+            重排序后的搜索结果（带 score，参与重排序的结果另带 rerank_score）
         """
         # 初始检索
         search_results = self.search(query, retrieve_k, where)
         if not search_results:
             return []
 
-        # 提取文档文本
-        documents = [result["document"] for result in search_results]
+        pool_size = max(1, self._rerank_pool_size(search_results))
 
-        # 重排序
-        reranked_docs = self.rerank(query, documents, rerank_k)
+        # 按结果下标回填分数，相同文本的结果也能各自对应
+        pool = search_results[:pool_size]
+        try:
+            scores = self.rerank_scores(query, [result["document"] for result in pool])
+        except Exception as e:
+            self.logger.error(f"Failed to rerank documents: {e}")
+            return search_results[:rerank_k]
 
-        # 构建最终结果
+        order = sorted(range(pool_size), key=lambda i: scores[i], reverse=True)
         final_results = []
-        for doc, score in reranked_docs:
-            # 找到对应的原始结果
-            for result in search_results:
-                if result["document"] == doc:
-                    result["rerank_score"] = float(score)
-                    final_results.append(result)
-                    break
-
-        return final_results
+        for index in order:
+            result = pool[index]
+            result["rerank_score"] = scores[index]
+            result["score"] = scores[index]
+            final_results.append(result)
+
+        # 未参与重排序的结果按检索相似度缩放到最低重排序分数之下
+        lowest = min(scores)
+        for result in search_results[pool_size:]:
+            distance = result.get("distance")
+            similarity = 0.0 if distance is None else min(1.0, max(0.0, 1 - distance))
+            result["score"] = lowest * similarity
+            final_results.append(result)
+
+        self.logger.debug(f"Reranked {pool_size}/{len(search_results)} candidates")
+        return final_results[:rerank_k]
 
     def get_collection_stats(self) -> dict[str, Any]:
-        """获取集合统计信息
+        """获取集合统计信息（OCR集合和事件集合分别统计）
 
         Returns:
             集合统计信息
@@ -445,32 +1025,61 @@ class VectorDatabase:
             return {
                 "collection_name": self.collection_name,
                 "document_count": count,
+                "event_collection_name": self.event_collection_name,
+                "event_document_count": self.event_collection.count(),
                 "embedding_model": self.embedding_model_name,
                 "cross_encoder_model": self.cross_encoder_model_name,
                 "vector_db_path": str(self.vector_db_path),
+                "embedding_cache": (
+                    self.embedding_cache.get_stats() if self.embedding_cache else None
+                ),
+                "query_cache": self.query_cache.get_stats(),
+                "query_batcher": self.query_batcher.get_stats() if self.query_batcher else None,
+                "rerank_cache": self.rerank_cache.get_stats(),
+                "compact_storage": self.compressor.suffix if self.compressor else None,
+                "full_vectors": self.full_vectors.get_stats() if self.full_vectors else None,
+                "backend": self.collection.get_stats(),
+                "event_backend": self.event_collection.get_stats(),
             }
         except Exception as e:
             self.logger.error(f"Failed to get collection stats: {e}")
             return {}
 
     def reset_collection(self) -> bool:
-        """重置集合（删除所有数据）
+        """重置OCR集合和事件集合（删除所有数据）
 
         Returns:
             是否重置成功
         """
         try:
-            self.chroma_client.delete_collection(self.collection_name)
-            self.collection = self.chroma_client.create_collection(
-                name=self.collection_name,
-                metadata={"description": "LifeTrace OCR text embeddings"},
+            self.collection.reset()
+            self.event_collection.reset()
+            if self.full_vectors:
+                self.full_vectors.clear()
+            self.logger.info(
+                f"Reset collections {self.collection_name} and {self.event_collection_name}"
             )
-            self.logger.info(f"Reset collection {self.collection_name}")
             return True
         except Exception as e:
             self.logger.error(f"Failed to reset collection: {e}")
             return False
 
+    def compact(self, force: bool = False) -> bool:
+        """整理向量库后端的索引，回收已删除文档占用的空间
+
+        Args:
+            force: 是否合并全部数据（否则只在后端认为需要时整理）
+
+        Returns:
+            是否执行了整理
+        """
+        try:
+            compacted = self.collection.compact(force)
+            return self.event_collection.compact(force) or compacted
+        except Exception as e:
+            self.logger.error(f"Failed to compact vector index: {e}")
+            return False
+
 
 def create_vector_db(config) -> VectorDatabase | None:
     """创建向量数据库实例
@@ -482,7 +1091,7 @@ def create_vector_db(config) -> VectorDatabase | None:
         向量数据库实例，如果依赖不可用则返回 None
     """
     # 检查依赖
-    if not all([SentenceTransformer, CrossEncoder, chromadb, np]):
+    if not vector_dependencies_available(config.get("vector_db.backend") or BACKEND_CHROMA):
         logger.warning("Vector database dependencies not available")
         return None
 
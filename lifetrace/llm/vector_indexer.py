@@ -0,0 +1,286 @@
+"""向量索引后台任务模块
+
+OCR 结果写入 SQLite 后提交到本模块，由后台线程批量生成嵌入并写入向量库，
+嵌入模型较慢时也不会阻塞下一张截图的 OCR。
+事件文档按事件合并更新：同一事件在一个时间窗口内最多重建一次，事件结束时再重建一次。
+"""
+
+import queue
+import threading
+import time
+from typing import Any
+
+from lifetrace.util.config import config
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+
+class VectorIndexer:
+    """批量异步向量索引器
+
+    后台线程从队列中取出 OCR 记录，凑满 batch_size 条或等待 flush_interval 秒后
+    批量写入向量库。队列已满时新记录会被丢弃，不会阻塞提交方；队列消化完后
+    后台线程自动启动一次增量向量同步，补齐被丢弃的记录。
+
+    事件文档需要聚合事件内所有截图的文本，每张截图都重建的话，
+    长事件的总开销随截图数平方增长。因此记录涉及的事件只标记为待更新，
+    同一事件距上次重建不足 event_reindex_window 秒时继续等待，事件结束时立即重建。
+    """
+
+    def __init__(
+        self,
+        vector_service,
+        batch_size: int = 32,
+        flush_interval: float = 2.0,
+        max_pending: int = 1000,
+        event_reindex_window: float = 60.0,
+    ):
+        """
+        Args:
+            vector_service: 向量服务实例
+            batch_size: 每批最多索引的记录数
+            flush_interval: 未凑满一批时的最长等待时间（秒）
+            max_pending: 队列中最多积压的记录数
+            event_reindex_window: 同一事件两次重建事件文档的最小间隔（秒）
+        """
+        self.vector_service = vector_service
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = float(flush_interval)
+        self.event_reindex_window = float(event_reindex_window)
+
+        # 待更新的事件：事件ID -> 是否立即更新（事件已结束）
+        self._dirty_events: dict[int, bool] = {}
+        # 事件上次重建的时间
+        self._event_indexed_at: dict[int, float] = {}
+        self._events_lock = threading.Lock()
+
+        self._queue: queue.Queue[dict[str, Any]] = queue.Queue(maxsize=max_pending)
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        # 有记录被丢弃，等待队列消化后启动补齐同步
+        self._catch_up_pending = False
+
+        # 统计信息
+        self.indexed_count = 0
+        self.dropped_count = 0
+        self.batch_count = 0
+        self.event_index_count = 0
+        self.catch_up_sync_count = 0
+
+    def start(self):
+        """启动后台索引线程"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="VectorIndexer", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"向量索引器已启动，批大小: {self.batch_size}, 刷新间隔: {self.flush_interval}秒"
+        )
+
+    def stop(self, timeout: float = 30.0):
+        """停止后台线程（会先处理完队列中剩余的记录和待更新的事件）"""
+        if not self._thread:
+            return
+        self.flush(timeout)
+        self._stop_event.set()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+        self._index_events(force=True)
+        logger.info("向量索引器已停止")
+
+    def submit(self, record: dict[str, Any]) -> bool:
+        """提交一条OCR记录等待索引
+
+        Returns:
+            是否成功入队
+        """
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped_count += 1
+            self._catch_up_pending = True
+            logger.warning(
+                f"向量索引队列已满，丢弃OCR结果 {record.get('id')}（队列消化后自动同步补齐）"
+            )
+            return False
+
+    def schedule_event(self, event_id: int, immediate: bool = False):
+        """标记事件文档待更新
+
+        Args:
+            event_id: 事件ID
+            immediate: 是否忽略时间窗口，在下一轮立即更新（事件结束时使用）
+        """
+        with self._events_lock:
+            self._dirty_events[event_id] = immediate or self._dirty_events.get(event_id, False)
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """等待队列中已提交的记录全部索引完成
+
+        Returns:
+            是否在超时前完成
+        """
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取索引器统计信息"""
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "pending": self._queue.qsize(),
+            "indexed": self.indexed_count,
+            "dropped": self.dropped_count,
+            "batches": self.batch_count,
+            "events_pending": len(self._dirty_events),
+            "events_indexed": self.event_index_count,
+            "catch_up_pending": self._catch_up_pending,
+            "catch_up_syncs": self.catch_up_sync_count,
+        }
+
+    def _next_batch(self) -> list[dict[str, Any]]:
+        """取出一批记录：等到第一条后，在 flush_interval 内尽量凑满一批"""
+        try:
+            first = self._queue.get(timeout=self.flush_interval)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """后台线程主循环"""
+        while not self._stop_event.is_set():
+            batch = self._next_batch()
+            if batch:
+                try:
+                    self._index_batch(batch)
+                except Exception as e:
+                    logger.error(f"向量索引批处理失败: {e}")
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+            # 队列空闲时同样检查到期的事件
+            self._index_events()
+            if self._catch_up_pending and self._queue.empty():
+                self._start_catch_up_sync()
+
+    def _index_batch(self, batch: list[dict[str, Any]]):
+        """索引一批OCR记录，涉及的事件标记为待更新"""
+        added = self.vector_service.add_ocr_records(batch)
+        self.indexed_count += added
+        self.batch_count += 1
+
+        event_ids = {record.get("event_id") for record in batch if record.get("event_id")}
+        for event_id in event_ids:
+            self.schedule_event(event_id)
+
+        logger.debug(f"向量索引批次完成: {added}/{len(batch)} 条, 事件 {len(event_ids)} 个")
+
+    def _start_catch_up_sync(self):
+        """启动增量向量同步补齐被丢弃的记录（已有同步在运行时下一轮重试）"""
+        self._catch_up_pending = False
+        try:
+            started = self.vector_service.start_sync()
+        except Exception as e:
+            logger.error(f"启动向量补齐同步失败: {e}")
+            started = False
+        if started:
+            self.catch_up_sync_count += 1
+            logger.info(
+                f"向量索引队列已消化，启动增量同步补齐丢弃的记录（累计丢弃 {self.dropped_count} 条）"
+            )
+        else:
+            self._catch_up_pending = True
+
+    def _index_events(self, force: bool = False):
+        """重建到期的事件文档
+
+        Args:
+            force: 忽略时间窗口，重建所有待更新的事件
+        """
+        now = time.monotonic()
+        with self._events_lock:
+            due = [
+                event_id
+                for event_id, immediate in self._dirty_events.items()
+                if force
+                or immediate
+                or now - self._event_indexed_at.get(event_id, 0.0) >= self.event_reindex_window
+            ]
+            for event_id in due:
+                del self._dirty_events[event_id]
+            # 清理超出时间窗口的记录，避免长期运行时无限增长
+            self._event_indexed_at = {
+                event_id: indexed_at
+                for event_id, indexed_at in self._event_indexed_at.items()
+                if now - indexed_at < self.event_reindex_window
+            }
+
+        for event_id in due:
+            try:
+                self.vector_service.upsert_event_document(event_id)
+                self.event_index_count += 1
+            except Exception as e:
+                logger.error(f"更新事件 {event_id} 的向量文档失败: {e}")
+            with self._events_lock:
+                self._event_indexed_at[event_id] = time.monotonic()
+
+
+# 全局向量索引器实例
+_vector_indexer: VectorIndexer | None = None
+_vector_indexer_lock = threading.Lock()
+
+
+def get_vector_indexer(vector_service) -> VectorIndexer:
+    """获取全局向量索引器实例（首次调用时创建并启动）
+
+    Args:
+        vector_service: 向量服务实例
+    """
+    global _vector_indexer
+    if _vector_indexer is None:
+        with _vector_indexer_lock:
+            if _vector_indexer is None:
+                indexer = VectorIndexer(
+                    vector_service,
+                    batch_size=config.get("vector_db.indexer_batch_size"),
+                    flush_interval=config.get("vector_db.indexer_flush_interval"),
+                    max_pending=config.get("vector_db.indexer_max_pending"),
+                    event_reindex_window=config.get("vector_db.event_reindex_window"),
+                )
+                indexer.start()
+                _vector_indexer = indexer
+    return _vector_indexer
+
+
+def notify_event_completed(event_id: int):
+    """事件结束时立即更新其向量文档（索引器未启动时忽略）"""
+    indexer = _vector_indexer
+    if indexer is not None:
+        indexer.schedule_event(event_id, immediate=True)
+
+
+def stop_vector_indexer(timeout: float = 30.0):
+    """停止全局向量索引器（如果已创建）"""
+    global _vector_indexer
+    with _vector_indexer_lock:
+        indexer = _vector_indexer
+        _vector_indexer = None
+    if indexer:
+        indexer.stop(timeout)
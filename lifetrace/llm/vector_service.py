@@ -4,16 +4,116 @@
 与现有的 SQLite 数据库并行工作。
 """
 
-from datetime import datetime
+import hashlib
+import re
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime, timedelta
 from typing import Any
 
-from lifetrace.llm.vector_db import create_vector_db
-from lifetrace.storage import event_mgr, get_session
+from lifetrace.llm.near_duplicate import (
+    MIN_TEXT_LENGTH,
+    NearDuplicateIndex,
+    hamming_distance,
+    jaccard_similarity,
+    simhash,
+)
+from lifetrace.llm.vector_backends import APP_KEY, TIMESTAMP_KEY
+from lifetrace.llm.vector_db import EVENT_COLLECTION, OCR_COLLECTION, create_vector_db
+from lifetrace.storage import event_mgr, get_session, vector_sync_mgr
 from lifetrace.storage.models import OCRResult, Screenshot
+from lifetrace.storage.ocr_manager import build_ocr_record
+from lifetrace.storage.vector_sync_manager import (
+    STATUS_COMPLETED,
+    STATUS_FAILED,
+    STATUS_RUNNING,
+)
 from lifetrace.util.logging_config import get_logger
 
 logger = get_logger()
 
+# 事件分块文档的类型标记（与按截图写入的OCR文档区分）
+EVENT_CHUNK_DOC_TYPE = "event_chunk"
+
+# 向量文档元数据的版本：新增元数据字段时递增，下次同步会从头检查已有文档并补齐字段
+METADATA_VERSION = 3
+
+# 事件搜索时每个事件预期命中的分块数（不足 top_k 个事件时加倍检索数量重试）
+EVENT_CHUNK_OVERFETCH = 5
+EVENT_SEARCH_MAX_LIMIT = 2000
+
+# 向量文档ID：OCR文档 ocr_{id}，事件分块文档 event_{id}_chunk_{n}（旧版整篇文档 event_{id}）
+_OCR_DOC_ID_RE = re.compile(r"^ocr_(\d+)$")
+_EVENT_DOC_ID_RE = re.compile(r"^event_(\d+)(?:_chunk_\d+)?$")
+
+# 原文档的别名信息：近重复OCR结果的数量和截图ID（逗号分隔，ChromaDB 元数据只支持标量）
+ALIAS_COUNT_KEY = "alias_count"
+ALIAS_SCREENSHOTS_KEY = "alias_screenshot_ids"
+
+# 规范化应用名称时去掉的可执行文件后缀
+_APP_SUFFIXES = (".exe", ".app")
+
+
+def normalize_app_name(app_name: str | None) -> str | None:
+    """规范化应用名称（小写，去掉可执行文件后缀），用于元数据过滤的精确匹配"""
+    if not app_name:
+        return None
+    name = app_name.strip().lower()
+    for suffix in _APP_SUFFIXES:
+        name = name.removesuffix(suffix)
+    return name or None
+
+
+def to_epoch_seconds(value: datetime | None) -> int | None:
+    """将时间转换为 epoch 秒（元数据过滤按数值比较）"""
+    return int(value.timestamp()) if value else None
+
+
+def merge_where(*clauses: dict[str, Any] | None) -> dict[str, Any] | None:
+    """用 $and 合并多个过滤条件（忽略空条件）"""
+    clauses = [clause for clause in clauses if clause]
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def build_filter_where(
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    app_names: list[str] | None = None,
+) -> dict[str, Any] | None:
+    """构建时间范围和应用名称的元数据过滤条件（下推到向量索引查询）
+
+    应用名称按规范化后的名称精确匹配任一。每个条件只含一个操作符（ChromaDB 的要求）。
+    """
+    clauses = []
+    if start_date:
+        clauses.append({TIMESTAMP_KEY: {"$gte": to_epoch_seconds(start_date)}})
+    if end_date:
+        clauses.append({TIMESTAMP_KEY: {"$lte": to_epoch_seconds(end_date)}})
+    apps = sorted({normalize_app_name(app) for app in app_names or []} - {None})
+    if apps:
+        clauses.append({APP_KEY: apps[0]} if len(apps) == 1 else {APP_KEY: {"$in": apps}})
+    return merge_where(*clauses)
+
+
+def split_text_chunks(text: str, chunk_size: int, overlap: int) -> list[str]:
+    """按固定步长将文本切分为相互重叠的块
+
+    第 n 块从 n * (chunk_size - overlap) 处开始，文本末尾追加内容时，
+    已有的完整块保持不变，只有最后一块和新增的块会变化。
+    """
+    if not text:
+        return []
+    step = max(1, chunk_size - overlap)
+    chunks = []
+    for start in range(0, len(text), step):
+        chunks.append(text[start : start + chunk_size])
+        if start + chunk_size >= len(text):
+            break
+    return chunks
+
 
 class VectorService:
     """向量数据库服务
@@ -30,18 +130,61 @@ class VectorService:
         self.config = config
         self.logger = logger
 
-        # 初始化向量数据库
-        self.vector_db = create_vector_db(config)
-        if self.vector_db is None:
-            self.logger.warning("Vector database not available")
-            self.enabled = False
-        else:
-            self.enabled = True
-            self.logger.info("Vector service initialized successfully")
+        # 事件文本分块参数（字符数）
+        self.event_chunk_size = max(1, int(config.get("vector_db.event_chunk_size")))
+        self.event_chunk_overlap = max(0, int(config.get("vector_db.event_chunk_overlap")))
+        self.event_score_aggregation = config.get("vector_db.event_score_aggregation")
+
+        # 近重复OCR文本合并参数
+        self.near_duplicate_enabled = config.get("vector_db.near_duplicate_enabled")
+        self.near_duplicate_max_distance = config.get("vector_db.near_duplicate_max_distance")
+        self.near_duplicate_min_similarity = config.get("vector_db.near_duplicate_min_similarity")
+        self.near_duplicate_window = config.get("vector_db.near_duplicate_window")
+        self.sync_lag_seconds = max(0, int(config.get("vector_db.sync_lag_seconds") or 0))
+        self._near_duplicates = None
+
+        # 向量数据库在首次使用时初始化（导入 chromadb 较慢，不阻塞服务启动）
+        self._vector_db = None
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        # 近重复合并（读取别名表、判断、写入文档和别名表）需要原子完成；可重入，
+        # 删除原文档后会重新索引其别名
+        self._alias_lock = threading.RLock()
+
+    @property
+    def vector_db(self):
+        """向量数据库实例（首次访问时初始化，不可用时为 None）"""
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self._vector_db = create_vector_db(self.config)
+                    if self._vector_db is None:
+                        self.logger.warning("Vector database not available")
+                    else:
+                        self.logger.info("Vector service initialized successfully")
+                    self._initialized = True
+        return self._vector_db
+
+    @property
+    def near_duplicates(self) -> NearDuplicateIndex | None:
+        """近重复文本索引（未启用或向量数据库不可用时为 None）"""
+        if self._near_duplicates is None and self.near_duplicate_enabled and self.vector_db:
+            with self._init_lock:
+                if self._near_duplicates is None:
+                    self._near_duplicates = NearDuplicateIndex(
+                        self.vector_db.vector_db_path / "near_duplicates.db",
+                        self.near_duplicate_max_distance,
+                    )
+        return self._near_duplicates
+
+    def is_ready(self) -> bool:
+        """向量数据库是否已完成初始化（不触发初始化）"""
+        return self._initialized
 
     def is_enabled(self) -> bool:
         """检查向量服务是否可用"""
-        return self.enabled and self.vector_db is not None
+        return self.vector_db is not None
 
     def add_ocr_result(self, ocr_result: OCRResult, screenshot: Screenshot | None = None) -> bool:
         """添加 OCR 结果到向量数据库
@@ -90,6 +233,8 @@ class VectorService:
                         "width": screenshot.width,
                         "height": screenshot.height,
                         "event_id": getattr(screenshot, "event_id", None),
+                        TIMESTAMP_KEY: to_epoch_seconds(screenshot.created_at),
+                        APP_KEY: normalize_app_name(screenshot.app_name),
                     }
                 )
 
@@ -109,6 +254,277 @@ class VectorService:
             self.logger.error(f"Error adding OCR result {ocr_result.id} to vector database: {e}")
             return False
 
+    def add_ocr_results(
+        self,
+        items: list[tuple[OCRResult, Screenshot | None]],
+        upsert: bool = False,
+        batch_size: int | None = None,
+    ) -> int:
+        """批量添加 OCR 结果到向量数据库
+
+        Args:
+            items: (OCR 结果对象, 关联的截图对象) 列表
+            upsert: 是否覆盖已存在的文档
+            batch_size: 模型编码批大小，None 表示使用配置值
+
+        Returns:
+            成功添加的数量
+        """
+        records = [build_ocr_record(ocr_result, screenshot) for ocr_result, screenshot in items]
+        return self.add_ocr_records(records, upsert=upsert, batch_size=batch_size)
+
+    def add_ocr_records(
+        self,
+        records: list[dict[str, Any]],
+        upsert: bool = False,
+        batch_size: int | None = None,
+    ) -> int:
+        """批量添加 OCR 记录到向量数据库
+
+        Args:
+            records: OCRManager.save_ocr_result 返回的记录列表
+            upsert: 是否覆盖已存在的文档（重新识别历史截图时使用）
+            batch_size: 模型编码批大小，None 表示使用配置值
+
+        Returns:
+            成功添加的数量
+        """
+        if not self.is_enabled() or not records:
+            return 0
+
+        doc_ids, texts, metadatas = [], [], []
+        empty_doc_ids = []
+        for record in records:
+            text = record.get("text_content")
+            if not text or not text.strip():
+                empty_doc_ids.append(f"ocr_{record['id']}")
+                continue
+
+            created_at = record.get("created_at")
+            screenshot_created_at = record.get("screenshot_created_at")
+            doc_ids.append(f"ocr_{record['id']}")
+            texts.append(text)
+            metadatas.append(
+                {
+                    "ocr_result_id": record["id"],
+                    "screenshot_id": record["screenshot_id"],
+                    "confidence": record.get("confidence"),
+                    "language": record.get("language") or "unknown",
+                    "processing_time": record.get("processing_time"),
+                    "created_at": created_at.isoformat() if created_at else None,
+                    "text_length": len(text),
+                    "screenshot_path": record.get("file_path"),
+                    "screenshot_timestamp": (
+                        screenshot_created_at.isoformat() if screenshot_created_at else None
+                    ),
+                    "application": record.get("app_name"),
+                    "window_title": record.get("window_title"),
+                    "width": record.get("width"),
+                    "height": record.get("height"),
+                    "event_id": record.get("event_id"),
+                    TIMESTAMP_KEY: to_epoch_seconds(screenshot_created_at),
+                    APP_KEY: normalize_app_name(record.get("app_name")),
+                }
+            )
+
+        # 覆盖模式下，重新识别后没有文本的结果需要删除旧文档
+        if upsert and empty_doc_ids:
+            self._delete_ocr_documents(empty_doc_ids)
+
+        if not doc_ids:
+            return 0
+
+        try:
+            index = self.near_duplicates
+            with self._alias_lock if index else nullcontext():
+                aliased = 0
+                if index:
+                    doc_ids, texts, metadatas, aliased = self._merge_near_duplicates(
+                        doc_ids, texts, metadatas, upsert
+                    )
+                if not doc_ids:
+                    return aliased
+                if upsert:
+                    written = self.vector_db.upsert_documents(
+                        doc_ids, texts, metadatas, batch_size
+                    )
+                else:
+                    written = self.vector_db.add_documents(doc_ids, texts, metadatas, batch_size)
+                return written + aliased
+        except Exception as e:
+            self.logger.error(f"批量添加OCR结果到向量数据库失败: {e}")
+            return 0
+
+    def _merge_near_duplicates(
+        self,
+        doc_ids: list[str],
+        texts: list[str],
+        metadatas: list[dict[str, Any]],
+        upsert: bool,
+    ) -> tuple[list[str], list[str], list[dict[str, Any]], int]:
+        """把与已有文档（或本批中更早的文档）近重复的OCR结果记为别名
+
+        近重复需同时满足：同一应用、时间相差不超过 near_duplicate_window、SimHash 汉明距离不超过
+        near_duplicate_max_distance、n-gram Jaccard 相似度不低于 near_duplicate_min_similarity。
+        已有别名的文档始终保持为原文档，避免其别名失去归属。
+
+        Returns:
+            (需要写入的文档ID, 文本, 元数据（已补充别名信息）, 记为别名的数量)
+        """
+        index = self.near_duplicates
+        collection = self.vector_db.collection_name
+        ocr_result_ids = [metadata["ocr_result_id"] for metadata in metadatas]
+
+        # 重新写入时先解除旧的别名关系，按新文本重新判断
+        affected = index.remove_aliases(collection, ocr_result_ids) if upsert else set()
+        has_aliases = set(index.get_aliases(collection, doc_ids))
+
+        kept: list[int] = []
+        fingerprints = []
+        aliases = []
+        batch_docs: dict[str, tuple[int, str, str | None, int | None]] = {}
+        for i, (doc_id, text, metadata) in enumerate(zip(doc_ids, texts, metadatas, strict=True)):
+            text = text.strip()
+            app, ts = metadata.get(APP_KEY), metadata.get(TIMESTAMP_KEY)
+            if len(text) < MIN_TEXT_LENGTH:
+                kept.append(i)
+                continue
+            fingerprint = simhash(text)
+            target = None
+            if doc_id not in has_aliases:
+                target = self._find_near_duplicate(
+                    fingerprint, text, app, ts, batch_docs, set(doc_ids)
+                )
+            if target is None:
+                kept.append(i)
+                fingerprints.append((doc_id, fingerprint, app, ts))
+                batch_docs[doc_id] = (fingerprint, text, app, ts)
+                continue
+            text_hash = hashlib.md5(text.encode()).hexdigest()
+            aliases.append(
+                (metadata["ocr_result_id"], metadata.get("screenshot_id"), target, text_hash)
+            )
+            affected.add(target)
+
+        # 记为别名的OCR结果如果已有自己的文档（之前是原文档或启用前写入的），删除该文档
+        alias_doc_ids = [f"ocr_{ocr_result_id}" for ocr_result_id, *_ in aliases]
+        if upsert and alias_doc_ids and not self.vector_db.delete_documents(alias_doc_ids):
+            raise RuntimeError("删除向量文档失败")
+        index.remove_documents(collection, alias_doc_ids)
+        index.add_fingerprints(collection, fingerprints)
+        index.add_aliases(collection, aliases)
+
+        kept_doc_ids = [doc_ids[i] for i in kept]
+        alias_lists = index.get_aliases(collection, kept_doc_ids)
+        kept_metadatas = [
+            {**metadatas[i], **self._alias_metadata(alias_lists.get(doc_ids[i], []))} for i in kept
+        ]
+        self._refresh_alias_metadata(affected - set(kept_doc_ids))
+        if aliases:
+            self.logger.debug(f"Merged {len(aliases)} near-duplicate OCR results as aliases")
+        return kept_doc_ids, [texts[i] for i in kept], kept_metadatas, len(aliases)
+
+    def _find_near_duplicate(
+        self,
+        fingerprint: int,
+        text: str,
+        app: str | None,
+        ts: int | None,
+        batch_docs: dict[str, tuple[int, str, str | None, int | None]],
+        batch_doc_ids: set[str],
+    ) -> str | None:
+        """查找文本近重复的原文档
+
+        本批中的文档只与已确定为原文档的更早记录比较（批内其他文档可能随后变为别名）。
+
+        Returns:
+            原文档ID，没有时返回 None
+        """
+        window = self.near_duplicate_window
+        candidates = [
+            (doc_id, hamming_distance(fingerprint, other), other_text)
+            for doc_id, (other, other_text, other_app, other_ts) in batch_docs.items()
+            if other_app == app
+            and (ts is None or other_ts is None or abs(ts - other_ts) <= window)
+            and hamming_distance(fingerprint, other) <= self.near_duplicate_max_distance
+        ]
+        stored = self.near_duplicates.find_candidates(
+            self.vector_db.collection_name, fingerprint, app, ts, window
+        )
+        stored = [(doc_id, distance) for doc_id, distance in stored if doc_id not in batch_doc_ids]
+        documents = self.vector_db.get_documents([doc_id for doc_id, _ in stored])
+        candidates += [
+            (doc_id, distance, documents[doc_id])
+            for doc_id, distance in stored
+            if doc_id in documents
+        ]
+        for doc_id, _, other_text in sorted(candidates, key=lambda item: item[1]):
+            if jaccard_similarity(text, other_text) >= self.near_duplicate_min_similarity:
+                return doc_id
+        return None
+
+    @staticmethod
+    def _alias_metadata(aliases: list[dict[str, int]]) -> dict[str, Any]:
+        """原文档元数据中的别名信息"""
+        return {
+            ALIAS_COUNT_KEY: len(aliases),
+            ALIAS_SCREENSHOTS_KEY: ",".join(str(alias["screenshot_id"]) for alias in aliases),
+        }
+
+    def _refresh_alias_metadata(self, doc_ids: set[str]):
+        """按别名表重写原文档元数据中的别名信息（不重新编码）"""
+        if not doc_ids:
+            return
+        alias_lists = self.near_duplicates.get_aliases(
+            self.vector_db.collection_name, list(doc_ids)
+        )
+        self.vector_db.update_metadatas(
+            {doc_id: self._alias_metadata(alias_lists.get(doc_id, [])) for doc_id in doc_ids}
+        )
+
+    def _delete_ocr_documents(self, doc_ids: list[str]) -> bool:
+        """删除OCR文档，并维护近重复别名关系
+
+        被删除的OCR结果如果是别名，从原文档的别名列表中移除；被删除的原文档如果还有别名，
+        仍然有效的别名OCR结果重新索引（其中一个成为新的原文档）。
+
+        Returns:
+            是否删除成功
+        """
+        if not doc_ids:
+            return True
+        index = self.near_duplicates
+        if index is None:
+            return self.vector_db.delete_documents(doc_ids)
+
+        with self._alias_lock:
+            if not self.vector_db.delete_documents(doc_ids):
+                return False
+            collection = self.vector_db.collection_name
+            ocr_result_ids = [
+                int(match.group(1)) for match in map(_OCR_DOC_ID_RE.match, doc_ids) if match
+            ]
+            affected = index.remove_aliases(collection, ocr_result_ids)
+            released = index.remove_documents(collection, doc_ids)
+            self._refresh_alias_metadata(affected - set(doc_ids))
+            self._reindex_released_aliases(released, set(ocr_result_ids))
+        return True
+
+    def _reindex_released_aliases(
+        self, released: dict[str, list[int]], exclude: set[int] | None = None
+    ) -> int:
+        """重新索引失去原文档的别名OCR结果（调用方持有 _alias_lock）
+
+        Returns:
+            重新索引的OCR结果数量
+        """
+        orphaned = {ocr_result_id for ids in released.values() for ocr_result_id in ids}
+        records = vector_sync_mgr.get_live_records(list(orphaned - (exclude or set())))
+        if records:
+            self.add_ocr_records(records, upsert=True)
+            self.logger.debug(f"Re-indexed {len(records)} aliases of deleted OCR documents")
+        return len(records)
+
     def update_ocr_result(
         self, ocr_result: OCRResult, screenshot: Screenshot | None = None
     ) -> bool:
@@ -152,6 +568,8 @@ class VectorService:
                         "window_title": screenshot.window_title,
                         "width": screenshot.width,
                         "height": screenshot.height,
+                        TIMESTAMP_KEY: to_epoch_seconds(screenshot.created_at),
+                        APP_KEY: normalize_app_name(screenshot.app_name),
                     }
                 )
 
@@ -181,8 +599,7 @@ class VectorService:
             return False
 
         try:
-            doc_id = f"ocr_{ocr_result_id}"
-            success = self.vector_db.delete_document(doc_id)
+            success = self._delete_ocr_documents([f"ocr_{ocr_result_id}"])
 
             if success:
                 self.logger.debug(f"Deleted OCR result {ocr_result_id} from vector database")
@@ -202,15 +619,28 @@ class VectorService:
         use_rerank: bool = True,
         retrieve_k: int | None = None,
         filters: dict[str, Any] | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        app_names: list[str] | None = None,
+        expand_aliases: bool = False,
     ) -> list[dict[str, Any]]:
         """语义搜索 OCR 结果
 
+        时间和应用条件作为元数据过滤条件下推到向量索引查询，
+        满足条件的文档足够时总能返回 top_k 个结果。
+        近重复的OCR结果只作为原文档的别名出现一次（元数据 alias_count / alias_screenshot_ids），
+        expand_aliases 为 True 时在每个结果的 aliases 中附带别名的OCR结果和截图。
+
         Args:
             query: 搜索查询
             top_k: 返回结果数量
             use_rerank: 是否使用重排序
             retrieve_k: 初始检索数量（用于重排序）
             filters: 元数据过滤条件
+            start_date: 截图时间下界
+            end_date: 截图时间上界
+            app_names: 应用名称列表（规范化后精确匹配任一）
+            expand_aliases: 是否展开近重复别名
 
         Returns:
             搜索结果列表
@@ -221,6 +651,7 @@ class VectorService:
         if not query or not query.strip():
             return []
 
+        filters = merge_where(filters, build_filter_where(start_date, end_date, app_names))
         try:
             if use_rerank:
                 # 使用重排序搜索
@@ -234,74 +665,48 @@ class VectorService:
                 # 直接搜索
                 results = self.vector_db.search(query=query, top_k=top_k, where=filters)
 
-            # 增强结果信息
+            aliases = {}
+            if expand_aliases and self.near_duplicates:
+                aliases = self.near_duplicates.get_aliases(
+                    self.vector_db.collection_name, [result["id"] for result in results]
+                )
+
+            # 批量加载相关的数据库记录（每张表一次 IN 查询）
+            ocr_results, screenshots = self._load_ocr_records(
+                results + [{"metadata": alias} for items in aliases.values() for alias in items]
+            )
+
+            # 增强结果信息（保持检索排序）
             enhanced_results = []
             for result in results:
                 enhanced_result = result.copy()
 
-                # 统一score字段：优先使用rerank_score，其次使用distance转换为相似度
-                if "rerank_score" in result:
-                    enhanced_result["score"] = result["rerank_score"]
+                # 统一score字段：重排序结果已带0-1之间的score，否则将distance转换为相似度
+                if "score" in result:
+                    enhanced_result["score"] = result["score"]
                 elif "distance" in result:
                     # 将距离转换为相似度分数（0-1之间）
                     enhanced_result["score"] = max(0, 1 - result["distance"])
                 else:
                     enhanced_result["score"] = 0.0
 
-                # 尝试获取相关的数据库记录
-                try:
-                    metadata = result.get("metadata", {})
-                    ocr_result_id = metadata.get("ocr_result_id")
-                    screenshot_id = metadata.get("screenshot_id")
-
-                    if ocr_result_id:
-                        # 获取OCR结果详细信息
-                        with get_session() as session:
-                            from lifetrace.storage.models import OCRResult, Screenshot
-
-                            ocr_result = (
-                                session.query(OCRResult)
-                                .filter(OCRResult.id == ocr_result_id)
-                                .first()
-                            )
-                            if ocr_result:
-                                enhanced_result["ocr_result"] = {
-                                    "id": ocr_result.id,
-                                    "text_content": ocr_result.text_content,
-                                    "confidence": ocr_result.confidence,
-                                    "language": ocr_result.language,
-                                    "processing_time": ocr_result.processing_time,
-                                    "created_at": (
-                                        ocr_result.created_at.isoformat()
-                                        if ocr_result.created_at
-                                        else None
-                                    ),
-                                }
-
-                            # 获取截图信息
-                            if screenshot_id:
-                                screenshot = (
-                                    session.query(Screenshot)
-                                    .filter(Screenshot.id == screenshot_id)
-                                    .first()
-                                )
-                                if screenshot:
-                                    enhanced_result["screenshot"] = {
-                                        "id": screenshot.id,
-                                        "file_path": screenshot.file_path,
-                                        "app_name": screenshot.app_name,
-                                        "window_title": screenshot.window_title,
-                                        "width": screenshot.width,
-                                        "height": screenshot.height,
-                                        "created_at": (
-                                            screenshot.created_at.isoformat()
-                                            if screenshot.created_at
-                                            else None
-                                        ),
-                                    }
-                except Exception as db_error:
-                    self.logger.warning(f"无法获取相关数据库记录: {db_error}")
-                    # 继续处理，不影响搜索结果
+                metadata = result.get("metadata", {})
+                ocr_result = ocr_results.get(metadata.get("ocr_result_id"))
+                if ocr_result:
+                    enhanced_result["ocr_result"] = ocr_result
+                    screenshot = screenshots.get(metadata.get("screenshot_id"))
+                    if screenshot:
+                        enhanced_result["screenshot"] = screenshot
+
+                if expand_aliases:
+                    enhanced_result["aliases"] = [
+                        {
+                            "ocr_result": ocr_results[alias["ocr_result_id"]],
+                            "screenshot": screenshots.get(alias["screenshot_id"]),
+                        }
+                        for alias in aliases.get(result["id"], [])
+                        if alias["ocr_result_id"] in ocr_results
+                    ]
 
                 enhanced_results.append(enhanced_result)
 
@@ -311,194 +716,669 @@ class VectorService:
             self.logger.error(f"语义搜索失败: {e}")
             return []
 
+    def _load_ocr_records(
+        self, results: list[dict[str, Any]]
+    ) -> tuple[dict[int, dict[str, Any]], dict[int, dict[str, Any]]]:
+        """批量查询搜索结果关联的OCR结果和截图
+
+        Returns:
+            (OCR结果ID到详情的映射, 截图ID到详情的映射)
+        """
+        ocr_result_ids = set()
+        screenshot_ids = set()
+        for result in results:
+            metadata = result.get("metadata", {})
+            if metadata.get("ocr_result_id"):
+                ocr_result_ids.add(metadata["ocr_result_id"])
+                if metadata.get("screenshot_id"):
+                    screenshot_ids.add(metadata["screenshot_id"])
+
+        ocr_results = {}
+        screenshots = {}
+        if not ocr_result_ids:
+            return ocr_results, screenshots
+
+        try:
+            with get_session() as session:
+                for ocr_result in session.query(OCRResult).filter(
+                    OCRResult.id.in_(ocr_result_ids)
+                ):
+                    ocr_results[ocr_result.id] = {
+                        "id": ocr_result.id,
+                        "text_content": ocr_result.text_content,
+                        "confidence": ocr_result.confidence,
+                        "language": ocr_result.language,
+                        "processing_time": ocr_result.processing_time,
+                        "created_at": (
+                            ocr_result.created_at.isoformat() if ocr_result.created_at else None
+                        ),
+                    }
+
+                if screenshot_ids:
+                    for screenshot in session.query(Screenshot).filter(
+                        Screenshot.id.in_(screenshot_ids)
+                    ):
+                        screenshots[screenshot.id] = {
+                            "id": screenshot.id,
+                            "file_path": screenshot.file_path,
+                            "app_name": screenshot.app_name,
+                            "window_title": screenshot.window_title,
+                            "width": screenshot.width,
+                            "height": screenshot.height,
+                            "created_at": (
+                                screenshot.created_at.isoformat() if screenshot.created_at else None
+                            ),
+                        }
+        except Exception as db_error:
+            self.logger.warning(f"无法获取相关数据库记录: {db_error}")
+            # 继续处理，不影响搜索结果
+
+        return ocr_results, screenshots
+
     # 事件级索引与搜索
     def upsert_event_document(self, event_id: int) -> bool:
-        """将事件聚合文本写入向量库，文档ID: event_{event_id}"""
+        """将事件聚合文本分块写入向量库，文档ID: event_{event_id}_chunk_{n}
+
+        分块边界只由字符位置决定，事件追加新的OCR文本时前面的块不变，
+        只重新编码内容变化的尾部块和新增的块，并删除多余的块。
+        """
         if not self.is_enabled():
             return False
         try:
-            # 聚合事件文本
+            # 聚合事件文本并分块
             event_text = event_mgr.get_event_text(event_id) or ""
-            if not event_text or not event_text.strip():
+            chunks = split_text_chunks(event_text, self.event_chunk_size, self.event_chunk_overlap)
+            step = max(1, self.event_chunk_size - self.event_chunk_overlap)
+
+            wanted = {}
+            for index, chunk in enumerate(chunks):
+                if chunk.strip():
+                    wanted[f"event_{event_id}_chunk_{index}"] = (index, chunk)
+
+            existing = self.vector_db.get_metadatas(
+                {"$and": [{"event_id": event_id}, {"doc_type": EVENT_CHUNK_DOC_TYPE}]},
+                kind=EVENT_COLLECTION,
+            )
+
+            # 过滤字段：事件开始时间和应用名称（与事件列表的过滤方式一致）
+            summary = event_mgr.get_event_summaries([event_id]).get(event_id) or {}
+            filter_metadata = {
+                TIMESTAMP_KEY: to_epoch_seconds(summary.get("start_time")),
+                APP_KEY: normalize_app_name(summary.get("app_name")),
+            }
+
+            # 只写入内容或过滤字段有变化的块
+            doc_ids, texts, metadatas = [], [], []
+            for doc_id, (index, chunk) in wanted.items():
+                chunk_hash = hashlib.md5(chunk.encode()).hexdigest()
+                metadata = existing.get(doc_id, {})
+                if metadata.get("chunk_hash") == chunk_hash and all(
+                    metadata.get(key) == value for key, value in filter_metadata.items()
+                ):
+                    continue
+                doc_ids.append(doc_id)
+                texts.append(chunk)
+                metadatas.append(
+                    {
+                        "event_id": event_id,
+                        "doc_type": EVENT_CHUNK_DOC_TYPE,
+                        "chunk_index": index,
+                        "chunk_start": index * step,
+                        "chunk_hash": chunk_hash,
+                        **filter_metadata,
+                    }
+                )
+
+            # 删除多余的块以及旧版的整篇事件文档
+            stale_ids = [doc_id for doc_id in existing if doc_id not in wanted]
+            stale_ids.append(f"event_{event_id}")
+            self.vector_db.delete_documents(stale_ids, EVENT_COLLECTION)
+
+            if not wanted:
                 self.logger.debug(f"事件{event_id}无文本，跳过索引")
                 return False
 
-            # 元数据（基本信息）
-            # 为了简化，这里不再重复查事件信息，向上层调用者可扩展
-            doc_id = f"event_{event_id}"
-            return self.vector_db.update_document(doc_id, event_text, {"event_id": event_id})
+            written = (
+                self.vector_db.upsert_documents(doc_ids, texts, metadatas, kind=EVENT_COLLECTION)
+                if doc_ids
+                else 0
+            )
+            self.logger.debug(
+                f"事件{event_id}共{len(wanted)}个分块，更新{written}个，删除{len(stale_ids) - 1}个"
+            )
+            return written == len(doc_ids)
         except Exception as e:
             self.logger.error(f"事件{event_id}写入向量库失败: {e}")
             return False
 
-    def semantic_search_events(self, query: str, top_k: int = 10) -> list[dict[str, Any]]:
-        """对事件文档进行语义搜索（基于 event_{id} 文档）"""
+    def semantic_search_events(
+        self,
+        query: str,
+        top_k: int = 10,
+        aggregate: str | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        app_names: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """对事件文档进行语义搜索，分块命中按事件聚合
+
+        只检索事件集合（耗时与截图数量无关），时间（事件开始时间）和应用条件下推到向量索引查询。
+        一个事件可能命中多个分块，聚合后不足 top_k 个事件时加倍检索数量重试。
+
+        Args:
+            query: 查询文本
+            top_k: 返回的事件数量
+            aggregate: 分块分数的聚合方式，max 取最高分，sum 累加；None 表示使用配置值
+            start_date: 事件开始时间下界
+            end_date: 事件开始时间上界
+            app_names: 应用名称列表（规范化后精确匹配任一）
+
+        Returns:
+            按语义分数排序的事件列表
+        """
         if not self.is_enabled():
             return []
+        aggregate = aggregate or self.event_score_aggregation
+        where = build_filter_where(start_date, end_date, app_names)
         try:
-            # 由于向量数据库的where条件有问题，我们先搜索所有文档，然后手动过滤
-            # 搜索更多结果以确保能找到足够的事件文档
-            search_limit = max(top_k * 3, 50)
-            all_results = self.vector_db.search(query=query, top_k=search_limit)
-
-            if not all_results:
-                return []
+            search_limit = max(top_k * EVENT_CHUNK_OVERFETCH, 50)
+            while True:
+                results = self.vector_db.search(
+                    query=query, top_k=search_limit, where=where, kind=EVENT_COLLECTION
+                )
+                event_scores = self._aggregate_event_scores(results, aggregate)
 
-            # 按event_id聚合结果，保留最高分数
-            event_scores = {}
-            for result in all_results:
-                metadata = result.get("metadata", {})
-                event_id = metadata.get("event_id")
-
-                if event_id:
-                    # 计算语义分数
-                    semantic_score = result.get("score", 0.0)
-                    if semantic_score == 0.0 and "distance" in result:
-                        # 如果没有score，从distance计算相似度分数
-                        semantic_score = max(0, 1 - result["distance"])
-
-                    # 保留每个事件的最高分数
-                    if (
-                        event_id not in event_scores
-                        or semantic_score > event_scores[event_id]["score"]
-                    ):
-                        event_scores[event_id] = {
-                            "score": semantic_score,
-                            "distance": result.get("distance", 1.0),
-                        }
+                # 按语义相似度排序，批量获取事件详细信息（已删除的事件跳过）
+                ranked = sorted(
+                    event_scores.items(), key=lambda item: item[1]["score"], reverse=True
+                )
+                summaries = event_mgr.get_event_summaries([event_id for event_id, _ in ranked])
+                found = sum(1 for event_id, _ in ranked if event_id in summaries)
+                exhausted = len(results) < search_limit or search_limit >= EVENT_SEARCH_MAX_LIMIT
+                if found >= top_k or exhausted:
+                    break
+                search_limit = min(search_limit * 2, EVENT_SEARCH_MAX_LIMIT)
 
-            # 获取事件详细信息
             event_results = []
-            for event_id, score_info in event_scores.items():
-                try:
-                    with get_session() as session:
-                        from lifetrace.storage.models import Event, Screenshot
-
-                        event = session.query(Event).filter(Event.id == event_id).first()
-
-                        if event:
-                            # 获取该事件的截图数量
-                            screenshot_count = (
-                                session.query(Screenshot)
-                                .filter(Screenshot.event_id == event_id)
-                                .count()
-                            )
-                            first_screenshot = (
-                                session.query(Screenshot)
-                                .filter(Screenshot.event_id == event_id)
-                                .order_by(Screenshot.created_at.asc())
-                                .first()
-                            )
-
-                            event_data = {
-                                "id": event.id,
-                                "app_name": event.app_name,
-                                "window_title": event.window_title,
-                                "start_time": (
-                                    event.start_time.isoformat() if event.start_time else None
-                                ),
-                                "end_time": (
-                                    event.end_time.isoformat() if event.end_time else None
-                                ),
-                                "screenshot_count": screenshot_count,
-                                "first_screenshot_id": (
-                                    first_screenshot.id if first_screenshot else None
-                                ),
-                                "semantic_score": score_info["score"],
-                                "distance": score_info["distance"],
-                            }
-                            event_results.append(event_data)
-
-                except Exception as db_error:
-                    self.logger.warning(f"获取事件{event_id}详细信息失败: {db_error}")
+            for event_id, score_info in ranked:
+                summary = summaries.get(event_id)
+                if not summary:
                     continue
+                if len(event_results) >= top_k:
+                    break
+                event_results.append(
+                    {
+                        "id": summary["id"],
+                        "app_name": summary["app_name"],
+                        "window_title": summary["window_title"],
+                        "start_time": (
+                            summary["start_time"].isoformat() if summary["start_time"] else None
+                        ),
+                        "end_time": (
+                            summary["end_time"].isoformat() if summary["end_time"] else None
+                        ),
+                        "screenshot_count": summary["screenshot_count"],
+                        "first_screenshot_id": summary["first_screenshot_id"],
+                        "semantic_score": score_info["score"],
+                        "distance": score_info["distance"],
+                    }
+                )
 
-            # 按语义相似度排序
-            event_results.sort(key=lambda x: x.get("semantic_score", 0.0), reverse=True)
-
-            return event_results[:top_k]
+            return event_results
 
         except Exception as e:
             self.logger.error(f"事件语义搜索失败: {e}")
             return []
 
+    def _aggregate_event_scores(
+        self, results: list[dict[str, Any]], aggregate: str
+    ) -> dict[int, dict[str, float]]:
+        """按event_id聚合事件分块的分数和最小距离"""
+        event_scores = {}
+        for result in results:
+            event_id = result.get("metadata", {}).get("event_id")
+            if not event_id:
+                continue
+
+            # 计算语义分数
+            semantic_score = result.get("score", 0.0)
+            distance = result.get("distance")
+            if semantic_score == 0.0 and distance is not None:
+                # 如果没有score，从distance计算相似度分数
+                semantic_score = max(0, 1 - distance)
+
+            info = event_scores.setdefault(event_id, {"score": 0.0, "distance": 1.0})
+            if aggregate == "sum":
+                info["score"] += semantic_score
+            else:
+                info["score"] = max(info["score"], semantic_score)
+            if distance is not None:
+                info["distance"] = min(info["distance"], distance)
+        return event_scores
+
+    def _sync_state_name(self) -> str:
+        """同步状态按集合和元数据版本区分
+
+        切换紧凑存储等会使用新的集合，需要重新同步；元数据版本变化后从头同步一遍，
+        补齐已有文档缺少的元数据字段。
+        """
+        return f"{self.vector_db.collection_name}_v{METADATA_VERSION}"
+
+    def _event_migration_name(self) -> str:
+        """事件文档迁移的状态名称（按集合区分，完成后不再执行）"""
+        return f"{self.vector_db.collection_name}_event_split"
+
+    def _migrate_event_documents(self) -> int:
+        """把旧版本写入OCR集合的事件文档移到事件集合（只执行一次）
+
+        事件分块文档连同已存储的向量直接移动，不重新编码；旧版整篇事件文档删除，并为这些事件
+        重建分块文档。在同步锁内执行：同步和向量库清理开始前先执行迁移，直到迁移完成。
+
+        Returns:
+            移动的文档数量
+        """
+        name = self._event_migration_name()
+        state = vector_sync_mgr.get_state(name)
+        if state is None or state["status"] == STATUS_COMPLETED:
+            return 0
+
+        # 先遍历完再移动（分页遍历期间删除会跳过部分文档）
+        batch_size = self.vector_db.write_batch_size
+        chunk_ids, legacy_event_ids = [], {}
+        for doc_ids in self.vector_db.iter_ids(batch_size, OCR_COLLECTION):
+            for doc_id in doc_ids:
+                match = _EVENT_DOC_ID_RE.match(doc_id)
+                if not match:
+                    continue
+                if doc_id == f"event_{match.group(1)}":
+                    legacy_event_ids[doc_id] = int(match.group(1))
+                else:
+                    chunk_ids.append(doc_id)
+
+        moved = 0
+        for offset in range(0, len(chunk_ids), batch_size):
+            moved += self.vector_db.move_documents(
+                chunk_ids[offset : offset + batch_size], OCR_COLLECTION, EVENT_COLLECTION
+            )
+        if legacy_event_ids and not self.vector_db.delete_documents(list(legacy_event_ids)):
+            raise RuntimeError("删除向量文档失败")
+        for event_id in sorted(set(legacy_event_ids.values())):
+            self.upsert_event_document(event_id)
+
+        vector_sync_mgr.update_state(
+            name,
+            status=STATUS_COMPLETED,
+            synced=moved,
+            deleted=len(legacy_event_ids),
+            finished_at=datetime.now(),
+        )
+        if moved or legacy_event_ids:
+            self.logger.info(
+                f"Moved {moved} event documents to {self.vector_db.event_collection_name}, "
+                f"rebuilt {len(legacy_event_ids)} legacy event documents"
+            )
+        return moved
+
     def sync_from_database(self, limit: int | None = None, force_reset: bool = False) -> int:
-        """从 SQLite 数据库同步 OCR 结果到向量数据库
+        """从 SQLite 数据库增量同步 OCR 结果到向量数据库
+
+        按 (updated_at, id) 高水位分批读取新增和变更的 OCR 结果并批量写入，
+        文本未变化的文档跳过编码，已删除的结果删除对应文档，物理删除的结果通过删除标记处理。
+        每批写入后保存高水位，中断后再次调用即从断点继续；每轮从高水位之前 sync_lag_seconds
+        开始读取，补上时间戳早于高水位但提交较晚的结果。
 
         Args:
-            limit: 同步的最大记录数，None 表示同步全部
-            force_reset: 是否先重置向量数据库
+            limit: 本次最多处理的 OCR 结果数量，None 表示处理全部
+            force_reset: 是否先重置向量数据库并从头同步
 
         Returns:
-            同步的记录数
+            本次写入的文档数量
         """
         if not self.is_enabled():
             return 0
+        if not self._sync_lock.acquire(blocking=False):
+            self.logger.warning("Vector sync is already running")
+            return 0
+        try:
+            return self._run_sync(limit, force_reset)
+        finally:
+            self._sync_lock.release()
+
+    def _run_sync(self, limit: int | None, force_reset: bool) -> int:
+        if force_reset:
+            self.reset()
+
+        state = vector_sync_mgr.get_state(self._sync_state_name())
+        if state is None:
+            return 0
+        # 高水位是提交前取的时间戳，并行提交时时间戳较早的结果可能在高水位推进之后才提交。
+        # 因此每轮从高水位之前 sync_lag_seconds 开始重新读取（本轮内游标单调推进，同一结果
+        # 只读一次；已同步且未变化的结果会被跳过），持久化的高水位只前进不后退
+        mark = (state["last_updated_at"], state["last_ocr_id"])
+        last_updated_at, last_ocr_id = mark
+        if last_updated_at is not None and self.sync_lag_seconds:
+            last_updated_at = last_updated_at - timedelta(seconds=self.sync_lag_seconds)
+            last_ocr_id = 0
+
+        synced = 0
+        deleted = 0
+        processed = 0
+        batch_size = self.vector_db.write_batch_size
+        vector_sync_mgr.update_state(
+            self._sync_state_name(),
+            status=STATUS_RUNNING,
+            synced=0,
+            deleted=0,
+            error=None,
+            started_at=datetime.now(),
+            finished_at=None,
+        )
 
         try:
-            with get_session() as session:
-                # 检查SQLite数据库中的OCR结果数量
-                total_ocr_count = session.query(OCRResult).count()
-                self.logger.info(f"SQLite database has {total_ocr_count} OCR results")
-
-                # 获取向量数据库中的文档数量
-                vector_stats = self.vector_db.get_collection_stats()
-                vector_doc_count = vector_stats.get("document_count", 0)
-                self.logger.info(f"Vector database has {vector_doc_count} documents")
-
-                # 如果SQLite为空但向量数据库不为空，或者强制重置，则清空向量数据库
-                if (total_ocr_count == 0 and vector_doc_count > 0) or force_reset:
-                    self.logger.info("Resetting vector database to match empty SQLite database")
-                    self.reset()
-                    if total_ocr_count == 0:
-                        return 0  # SQLite为空，同步完成
-
-                # 如果两个数据库都为空，无需同步
-                if total_ocr_count == 0 and vector_doc_count == 0:
-                    self.logger.info("Both databases are empty, no sync needed")
-                    return 0
-
-                synced_count = 0
-
-                # 查询所有 OCR 结果
-                query = session.query(OCRResult).join(
-                    Screenshot, OCRResult.screenshot_id == Screenshot.id
+            self._migrate_event_documents()
+
+            # 处理物理删除的 OCR 结果
+            deleted += self._apply_tombstones()
+            vector_sync_mgr.update_state(self._sync_state_name(), deleted=deleted)
+
+            # 从高水位之后分批同步新增、变更和软删除的 OCR 结果
+            while limit is None or processed < limit:
+                size = batch_size if limit is None else min(batch_size, limit - processed)
+                records = vector_sync_mgr.get_changed_records(last_updated_at, last_ocr_id, size)
+                if not records:
+                    break
+
+                removed_ids = [f"ocr_{record['id']}" for record in records if record["deleted"]]
+                changed, backfill_event_ids = self._filter_unchanged_records(
+                    [record for record in records if not record["deleted"]]
+                )
+                expected = sum(
+                    1 for record in changed if (record.get("text_content") or "").strip()
+                )
+                written = self.add_ocr_records(changed, upsert=True) if changed else 0
+                if written < expected:
+                    raise RuntimeError(f"写入向量文档失败（{written}/{expected}）")
+                if removed_ids and not self._delete_ocr_documents(removed_ids):
+                    raise RuntimeError("删除向量文档失败")
+                for event_id in backfill_event_ids:
+                    self.upsert_event_document(event_id)
+
+                # 本批完成后推进游标和高水位
+                last_updated_at = records[-1]["updated_at"]
+                last_ocr_id = records[-1]["id"]
+                if mark[0] is None or (last_updated_at, last_ocr_id) > mark:
+                    mark = (last_updated_at, last_ocr_id)
+                synced += written
+                deleted += len(removed_ids)
+                processed += len(records)
+                vector_sync_mgr.update_state(
+                    self._sync_state_name(),
+                    last_updated_at=mark[0],
+                    last_ocr_id=mark[1],
+                    synced=synced,
+                    deleted=deleted,
+                )
+                self.logger.info(
+                    f"Synced {processed} OCR results to vector database "
+                    f"(written {synced}, deleted {deleted})"
                 )
-                if limit:
-                    query = query.limit(limit)
 
-                ocr_results = query.all()
+            vector_sync_mgr.update_state(
+                self._sync_state_name(), status=STATUS_COMPLETED, finished_at=datetime.now()
+            )
+            self.logger.info(f"Completed sync: {synced} documents written, {deleted} deleted")
+        except Exception as e:
+            self.logger.error(f"Error syncing from database: {e}")
+            vector_sync_mgr.update_state(
+                self._sync_state_name(),
+                status=STATUS_FAILED,
+                error=str(e),
+                finished_at=datetime.now(),
+            )
+        return synced
 
-                # 如果需要完全同步，先重置向量数据库
-                if not limit and len(ocr_results) != vector_doc_count:
-                    self.logger.info(
-                        f"Document count mismatch (SQLite: {len(ocr_results)}, Vector: {vector_doc_count}), resetting vector database"
-                    )
-                    self.reset()
-
-                for ocr_result in ocr_results:
-                    # 通过 screenshot_id 获取对应的 Screenshot 对象
-                    screenshot = (
-                        session.query(Screenshot)
-                        .filter(Screenshot.id == ocr_result.screenshot_id)
-                        .first()
-                    )
-                    if screenshot is None:
-                        self.logger.warning(f"Screenshot not found for OCR result {ocr_result.id}")
-                        continue
+    def _apply_tombstones(self) -> int:
+        """分批处理删除标记：删除OCR结果的向量文档，按剩余文本重建事件文档
 
-                    if self.add_ocr_result(ocr_result, screenshot):
-                        synced_count += 1
+        Returns:
+            删除的OCR文档数量
+        """
+        deleted = 0
+        while True:
+            tombstones = vector_sync_mgr.get_tombstones(self.vector_db.write_batch_size)
+            if not tombstones:
+                return deleted
+            ocr_doc_ids = []
+            event_ids = set()
+            for _, doc_id in tombstones:
+                match = _EVENT_DOC_ID_RE.match(doc_id)
+                if match:
+                    event_ids.add(int(match.group(1)))
+                else:
+                    ocr_doc_ids.append(doc_id)
+            if ocr_doc_ids and not self._delete_ocr_documents(ocr_doc_ids):
+                raise RuntimeError("删除向量文档失败")
+            for event_id in sorted(event_ids):
+                self.upsert_event_document(event_id)
+            vector_sync_mgr.delete_tombstones([tombstone_id for tombstone_id, _ in tombstones])
+            deleted += len(ocr_doc_ids)
 
-                    if synced_count % 100 == 0:
-                        self.logger.info(f"Synced {synced_count} OCR results to vector database")
+    def apply_tombstones(self) -> int:
+        """处理所有删除标记（数据清理后调用）
 
-            self.logger.info(f"Completed sync: {synced_count} OCR results added to vector database")
-            return synced_count
+        同步或向量库清理正在运行时跳过，剩余的删除标记由它们或下一次运行处理。
 
+        Returns:
+            删除的OCR文档数量
+        """
+        if not self.is_enabled() or not self._sync_lock.acquire(blocking=False):
+            return 0
+        try:
+            deleted = self._apply_tombstones()
+            if deleted:
+                self.logger.info(f"Deleted {deleted} tombstoned documents from vector database")
+            return deleted
         except Exception as e:
-            self.logger.error(f"Error syncing from database: {e}")
+            self.logger.error(f"处理向量删除标记失败: {e}")
+            return 0
+        finally:
+            self._sync_lock.release()
+
+    def collect_garbage(self, batch_size: int | None = None) -> dict[str, Any]:
+        """清理向量库中的孤立文档并整理索引
+
+        先处理删除标记，再分批遍历向量库的文档ID，与数据库中仍然有效的OCR结果和事件比对，
+        删除对应记录已不存在的文档，最后整理索引回收空间。与同步互斥。
+
+        Args:
+            batch_size: 每批比对和删除的文档数量，None 表示使用 write_batch_size
+
+        Returns:
+            scanned: 遍历的文档数量
+            tombstones: 按删除标记删除的文档数量
+            orphans: 删除的孤立文档数量
+            reclaimed_documents: 回收的文档数量
+            reclaimed_bytes: 回收的磁盘空间（字节）
+            compacted: 是否整理了索引
+            elapsed_s: 耗时（秒）
+        """
+        if not self.is_enabled():
+            return {"enabled": False}
+        if not self._sync_lock.acquire(blocking=False):
+            self.logger.warning("Vector sync is running, skipping garbage collection")
+            return {"skipped": True}
+        try:
+            return self._run_garbage_collection(batch_size or self.vector_db.write_batch_size)
+        except Exception as e:
+            self.logger.error(f"向量库清理失败: {e}")
+            return {"error": str(e)}
+        finally:
+            self._sync_lock.release()
+
+    def _run_garbage_collection(self, batch_size: int) -> dict[str, Any]:
+        start = time.perf_counter()
+        bytes_before = self.vector_db.get_disk_usage()
+        self._migrate_event_documents()
+        tombstones = self._apply_tombstones()
+
+        # 先遍历完再删除（分页遍历期间删除会跳过部分文档）
+        scanned = 0
+        found: dict[str, list[str]] = {OCR_COLLECTION: [], EVENT_COLLECTION: []}
+        for kind, kind_orphans in found.items():
+            for doc_ids in self.vector_db.iter_ids(batch_size, kind):
+                scanned += len(doc_ids)
+                kind_orphans.extend(self._find_orphans(doc_ids))
+        for offset in range(0, len(found[OCR_COLLECTION]), batch_size):
+            if not self._delete_ocr_documents(
+                found[OCR_COLLECTION][offset : offset + batch_size]
+            ):
+                raise RuntimeError("删除向量文档失败")
+        for offset in range(0, len(found[EVENT_COLLECTION]), batch_size):
+            if not self.vector_db.delete_documents(
+                found[EVENT_COLLECTION][offset : offset + batch_size], EVENT_COLLECTION
+            ):
+                raise RuntimeError("删除向量文档失败")
+        orphans = found[OCR_COLLECTION] + found[EVENT_COLLECTION]
+        dangling = self._release_dangling_aliases(batch_size)
+
+        reclaimed = tombstones + len(orphans)
+        compacted = self.vector_db.compact(force=reclaimed > 0)
+        reclaimed_bytes = max(0, bytes_before - self.vector_db.get_disk_usage())
+        result = {
+            "scanned": scanned,
+            "tombstones": tombstones,
+            "orphans": len(orphans),
+            "dangling_aliases": dangling,
+            "reclaimed_documents": reclaimed,
+            "reclaimed_bytes": reclaimed_bytes,
+            "compacted": compacted,
+            "elapsed_s": round(time.perf_counter() - start, 2),
+        }
+        self.logger.info(
+            f"Vector garbage collection: scanned {scanned} documents, "
+            f"removed {tombstones} tombstoned and {len(orphans)} orphaned, "
+            f"re-indexed {dangling} dangling aliases, "
+            f"reclaimed {reclaimed_bytes / 1024 / 1024:.1f}MB"
+        )
+        return result
+
+    def _release_dangling_aliases(self, batch_size: int) -> int:
+        """重新索引原文档已不存在的别名（例如并发合并时原文档被删除），避免其永远缺失
+
+        Returns:
+            重新索引的OCR结果数量
+        """
+        index = self.near_duplicates
+        if index is None:
             return 0
+        collection = self.vector_db.collection_name
+        target_ids = index.get_alias_doc_ids(collection)
+        reindexed = 0
+        for offset in range(0, len(target_ids), batch_size):
+            chunk = target_ids[offset : offset + batch_size]
+            # 持锁后再确认原文档不存在（遍历期间其他线程可能刚写入）
+            with self._alias_lock:
+                existing = self.vector_db.get_metadatas(ids=chunk)
+                missing = [doc_id for doc_id in chunk if doc_id not in existing]
+                if missing:
+                    released = index.remove_documents(collection, missing)
+                    reindexed += self._reindex_released_aliases(released)
+        return reindexed
+
+    def _find_orphans(self, doc_ids: list[str]) -> list[str]:
+        """找出对应的OCR结果或事件已不存在的文档ID（其他格式的文档不处理）"""
+        ocr_docs: dict[str, int] = {}
+        event_docs: dict[str, int] = {}
+        for doc_id in doc_ids:
+            match = _OCR_DOC_ID_RE.match(doc_id)
+            if match:
+                ocr_docs[doc_id] = int(match.group(1))
+                continue
+            match = _EVENT_DOC_ID_RE.match(doc_id)
+            if match:
+                event_docs[doc_id] = int(match.group(1))
+
+        live_ocr_ids = vector_sync_mgr.get_live_ocr_result_ids(list(set(ocr_docs.values())))
+        live_event_ids = vector_sync_mgr.get_live_event_ids(list(set(event_docs.values())))
+        orphans = [doc_id for doc_id, ocr_id in ocr_docs.items() if ocr_id not in live_ocr_ids]
+        orphans += [
+            doc_id for doc_id, event_id in event_docs.items() if event_id not in live_event_ids
+        ]
+        return orphans
+
+    def _filter_unchanged_records(
+        self, records: list[dict[str, Any]]
+    ) -> tuple[list[dict[str, Any]], set[int]]:
+        """过滤掉向量库中已存在、文本未变化且元数据字段齐全的记录（避免重复编码）
+
+        Returns:
+            (需要写入的记录, 需要补齐元数据的事件ID)
+        """
+        existing = self.vector_db.get_metadatas(ids=[f"ocr_{record['id']}" for record in records])
+        aliases = (
+            self.near_duplicates.get_alias_targets(
+                self.vector_db.collection_name, [record["id"] for record in records]
+            )
+            if self.near_duplicates
+            else {}
+        )
+        changed = []
+        backfill_event_ids = set()
+        for record in records:
+            text = (record.get("text_content") or "").strip()
+            metadata = existing.get(f"ocr_{record['id']}")
+            text_hash = hashlib.md5(text.encode()).hexdigest() if text else None
+            alias = aliases.get(record["id"])
+            if alias and text_hash and alias["text_hash"] == text_hash:
+                continue
+            if metadata and text_hash and metadata.get("text_hash") == text_hash:
+                has_filters = TIMESTAMP_KEY in metadata or not record.get("screenshot_created_at")
+                # 启用近重复合并前写入的文档需要重新判断是否为近重复
+                deduplicated = not self.near_duplicates or ALIAS_COUNT_KEY in metadata
+                if has_filters and deduplicated:
+                    continue
+                # 旧版本写入的文档缺少过滤字段，所属事件的分块文档同样需要补齐
+                if not has_filters and record.get("event_id"):
+                    backfill_event_ids.add(record["event_id"])
+            changed.append(record)
+        return changed, backfill_event_ids
+
+    def start_sync(self, limit: int | None = None, force_reset: bool = False) -> bool:
+        """在后台线程中执行增量同步
+
+        Returns:
+            是否启动成功（已有同步在运行时返回 False）
+        """
+        if not self.is_enabled() or self._sync_lock.locked():
+            return False
+        thread = threading.Thread(
+            target=self.sync_from_database,
+            args=(limit, force_reset),
+            name="VectorSync",
+            daemon=True,
+        )
+        thread.start()
+        return True
+
+    def get_sync_status(self) -> dict[str, Any]:
+        """获取同步进度
+
+        Returns:
+            高水位与本轮计数，以及：
+                active: 是否有同步正在运行
+                pending: 高水位之后尚未同步的 OCR 结果数量
+                pending_deletions: 尚未处理的删除标记数量
+        """
+        state = vector_sync_mgr.get_state(self._sync_state_name()) or {}
+        pending = vector_sync_mgr.count_pending(
+            state.get("last_updated_at"), state.get("last_ocr_id", 0)
+        )
+        return {
+            **state,
+            "active": self._sync_lock.locked(),
+            "pending": pending,
+            "pending_deletions": vector_sync_mgr.count_tombstones(),
+        }
 
     def get_stats(self) -> dict[str, Any]:
         """获取向量数据库统计信息
@@ -512,6 +1392,10 @@ class VectorService:
         try:
             stats = self.vector_db.get_collection_stats()
             stats["enabled"] = True
+            if self.near_duplicates:
+                stats["near_duplicates"] = self.near_duplicates.get_stats(
+                    self.vector_db.collection_name
+                )
             return stats
         except Exception as e:
             self.logger.error(f"Error getting vector database stats: {e}")
@@ -529,6 +1413,10 @@ class VectorService:
         try:
             success = self.vector_db.reset_collection()
             if success:
+                if self.near_duplicates:
+                    self.near_duplicates.clear(self.vector_db.collection_name)
+                # 集合已清空，下次同步从头开始
+                vector_sync_mgr.reset_state(self._sync_state_name())
                 self.logger.info("Vector database reset successfully")
             return success
         except Exception as e:
@@ -546,3 +1434,20 @@ def create_vector_service(config) -> VectorService:
         向量服务实例
     """
     return VectorService(config)
+
+
+# 进程内共享的向量服务实例（服务器与后台任务共用同一个 Chroma 客户端）
+_vector_service: VectorService | None = None
+_vector_service_lock = threading.Lock()
+
+
+def get_vector_service() -> VectorService:
+    """获取进程内共享的向量服务实例"""
+    global _vector_service
+    if _vector_service is None:
+        with _vector_service_lock:
+            if _vector_service is None:
+                from lifetrace.util.config import config
+
+                _vector_service = create_vector_service(config)
+    return _vector_service
@@ -5,6 +5,7 @@ from datetime import datetime
 from fastapi import APIRouter
 from openai import OpenAI
 
+from lifetrace.jobs.warmup import get_readiness
 from lifetrace.routers import dependencies as deps
 from lifetrace.storage import db_base
 from lifetrace.util.logging_config import get_logger
@@ -16,12 +17,15 @@ router = APIRouter()
 
 @router.get("/health")
 async def health_check():
-    """健康检查"""
+    """健康检查（服务可响应即为 healthy，模型加载进度见 components）"""
+    readiness = get_readiness()
     return {
         "status": "healthy",
         "timestamp": datetime.now(),
         "database": "connected" if db_base.engine else "disconnected",
         "ocr": "available" if deps.ocr_processor.is_available() else "unavailable",
+        "ready": readiness["ready"],
+        "components": readiness["components"],
     }
 
 
@@ -1,6 +1,9 @@
 """OCR相关路由"""
 
-from fastapi import APIRouter, HTTPException
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
 
 from lifetrace.routers import dependencies as deps
 from lifetrace.storage import ocr_mgr, screenshot_mgr
@@ -11,6 +14,18 @@ logger = get_logger()
 router = APIRouter(prefix="/api/ocr", tags=["ocr"])
 
 
+class OCRReprocessRequest(BaseModel):
+    """历史截图OCR重处理请求"""
+
+    start_time: datetime | None = None
+    end_time: datetime | None = None
+    app_name: str | None = None
+    engine_version: str | None = None
+    outdated_only: bool = False
+    workers: int | None = Field(None, ge=1)
+    batch_size: int | None = Field(None, ge=1)
+
+
 @router.post("/process")
 async def process_ocr(screenshot_id: int):
     """手动触发OCR处理"""
@@ -56,3 +71,59 @@ async def process_ocr(screenshot_id: int):
 async def get_ocr_statistics():
     """获取OCR处理统计"""
     return deps.ocr_processor.get_statistics()
+
+
+@router.post("/reprocess")
+async def start_ocr_reprocess(request: OCRReprocessRequest):
+    """按时间范围、应用或引擎版本重新识别历史截图"""
+    from lifetrace.jobs.ocr_reprocess import start_reprocess
+
+    # 筛选条件以JSON保存在任务中，时间转换为ISO格式字符串
+    filters = request.model_dump(
+        mode="json", exclude={"workers", "batch_size"}, exclude_none=True
+    )
+    status = start_reprocess(filters, request.workers, request.batch_size)
+    if not status:
+        raise HTTPException(status_code=500, detail="创建OCR重处理任务失败")
+    return status
+
+
+@router.get("/reprocess")
+async def list_ocr_reprocess_jobs(limit: int = Query(20, ge=1, le=100)):
+    """获取最近的OCR重处理任务"""
+    from lifetrace.jobs.ocr_reprocess import list_reprocess_jobs
+
+    return {"jobs": list_reprocess_jobs(limit)}
+
+
+@router.get("/reprocess/{job_id}")
+async def get_ocr_reprocess_status(job_id: int):
+    """获取OCR重处理任务进度（含预计剩余时间）"""
+    from lifetrace.jobs.ocr_reprocess import get_reprocess_status
+
+    status = get_reprocess_status(job_id)
+    if not status:
+        raise HTTPException(status_code=404, detail="任务不存在")
+    return status
+
+
+@router.post("/reprocess/{job_id}/resume")
+async def resume_ocr_reprocess(job_id: int):
+    """从断点继续OCR重处理任务"""
+    from lifetrace.jobs.ocr_reprocess import resume_reprocess
+
+    status = resume_reprocess(job_id)
+    if not status:
+        raise HTTPException(status_code=404, detail="任务不存在")
+    return status
+
+
+@router.post("/reprocess/{job_id}/cancel")
+async def cancel_ocr_reprocess(job_id: int):
+    """取消OCR重处理任务（当前批次完成后停止）"""
+    from lifetrace.jobs.ocr_reprocess import cancel_reprocess
+
+    status = cancel_reprocess(job_id)
+    if not status:
+        raise HTTPException(status_code=404, detail="任务不存在")
+    return status
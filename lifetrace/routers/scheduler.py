@@ -6,6 +6,7 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from lifetrace.jobs.ocr_governor import get_ocr_governor
 from lifetrace.jobs.scheduler import get_scheduler_manager
 from lifetrace.util.config import config
 from lifetrace.util.logging_config import get_logger
@@ -56,6 +57,22 @@ class JobOperationResponse(BaseModel):
     message: str
 
 
+class OCRThrottleResponse(BaseModel):
+    """OCR资源调控状态"""
+
+    paused: bool
+    concurrency: int
+    delay: float
+    reason: str
+    cpu_percent: float
+    cpu_budget: float
+    on_battery: bool
+    battery_percent: float | None = None
+    foreground_active: bool
+    max_workers: int
+    evaluated_at: str
+
+
 @router.get("/jobs", response_model=JobListResponse)
 async def get_all_jobs():
     """获取所有定时任务"""
@@ -290,6 +307,16 @@ async def resume_all_jobs():
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@router.get("/ocr-throttle", response_model=OCRThrottleResponse)
+async def get_ocr_throttle():
+    """获取OCR资源调控的当前决策（并发数、处理间隔及原因）"""
+    try:
+        return OCRThrottleResponse(**get_ocr_governor().get_status())
+    except Exception as e:
+        logger.error(f"获取OCR调控状态失败: {e}")
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
 def _sync_job_enabled_to_config(job_id: str, enabled: bool):
     """同步任务的启用状态到配置文件
 
@@ -304,6 +331,7 @@ def _sync_job_enabled_to_config(job_id: str, enabled: bool):
         "task_context_mapper_job": "jobs.task_context_mapper.enabled",
         "task_summary_job": "jobs.task_summary.enabled",
         "clean_data_job": "jobs.clean_data.enabled",
+        "vector_gc_job": "jobs.vector_gc.enabled",
     }
 
     if job_id in job_config_map:
@@ -333,6 +361,7 @@ def _sync_job_interval_to_config(
         "task_context_mapper_job": "jobs.task_context_mapper.interval",
         "task_summary_job": "jobs.task_summary.interval",
         "clean_data_job": "jobs.clean_data.interval",
+        "vector_gc_job": "jobs.vector_gc.interval",
     }
 
     if job_id in job_config_map:
@@ -3,13 +3,16 @@
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.requests import Request
 
+from lifetrace.llm.hybrid_search_service import get_hybrid_search_service
 from lifetrace.routers import dependencies as deps
 from lifetrace.schemas.event import EventResponse
 from lifetrace.schemas.screenshot import ScreenshotResponse
 from lifetrace.schemas.search import SearchRequest
 from lifetrace.storage import event_mgr, screenshot_mgr
+from lifetrace.util.config import config
 from lifetrace.util.logging_config import get_logger
 
 logger = get_logger()
@@ -17,9 +20,30 @@ logger = get_logger()
 router = APIRouter(prefix="/api", tags=["search"])
 
 
+def _run_screenshot_search(search_request: SearchRequest) -> list[dict]:
+    """有查询文本时使用混合检索（按相关性排序），否则按时间浏览截图"""
+    query = (search_request.query or "").strip()
+    if query and search_request.mode == "hybrid" and config.get("search.hybrid_enabled"):
+        return get_hybrid_search_service().search(
+            query,
+            start_date=search_request.start_date,
+            end_date=search_request.end_date,
+            app_names=[search_request.app_name] if search_request.app_name else None,
+            limit=search_request.limit,
+        )["results"]
+
+    return screenshot_mgr.search_screenshots(
+        query=search_request.query,
+        start_date=search_request.start_date,
+        end_date=search_request.end_date,
+        app_name=search_request.app_name,
+        limit=search_request.limit,
+    )
+
+
 @router.post("/search", response_model=list[ScreenshotResponse])
 async def search_screenshots(search_request: SearchRequest, request: Request):
-    """搜索截图"""
+    """搜索截图（全文 + 语义混合检索）"""
     start_time = datetime.now()
 
     try:
@@ -27,13 +51,8 @@ async def search_screenshots(search_request: SearchRequest, request: Request):
         user_agent = request.headers.get("user-agent", "")
         client_ip = request.client.host if request.client else "unknown"
 
-        results = screenshot_mgr.search_screenshots(
-            query=search_request.query,
-            start_date=search_request.start_date,
-            end_date=search_request.end_date,
-            app_name=search_request.app_name,
-            limit=search_request.limit,
-        )
+        # 检索是同步调用（查询编码会等待微批处理），放到线程池中执行，不阻塞事件循环
+        results = await run_in_threadpool(_run_screenshot_search, search_request)
 
         # 计算响应时间
         response_time = (datetime.now() - start_time).total_seconds() * 1000
@@ -45,6 +64,7 @@ async def search_screenshots(search_request: SearchRequest, request: Request):
                 action_details={
                     "query": search_request.query,
                     "app_name": search_request.app_name,
+                    "mode": search_request.mode,
                     "results_count": len(results),
                     "limit": search_request.limit,
                     "success": True,
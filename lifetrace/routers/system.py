@@ -11,6 +11,7 @@ from lifetrace.schemas.stats import StatisticsResponse
 from lifetrace.schemas.system import ProcessInfo, SystemResourcesResponse
 from lifetrace.storage import stats_mgr
 from lifetrace.util.logging_config import get_logger
+from lifetrace.util.model_registry import get_model_registry
 
 logger = get_logger()
 
@@ -35,6 +36,16 @@ async def cleanup_old_data(days: int = Query(30, ge=1)):
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@router.get("/models")
+async def get_loaded_models():
+    """获取模型注册表中各模型的加载状态、引用计数和内存占用"""
+    try:
+        return get_model_registry().get_stats()
+    except Exception as e:
+        logger.error(f"获取模型状态失败: {e}")
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
 @router.get("/system-resources", response_model=SystemResourcesResponse)
 async def get_system_resources():
     """获取系统资源使用情况"""
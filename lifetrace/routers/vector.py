@@ -1,6 +1,7 @@
 """向量数据库相关路由"""
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 
 from lifetrace.routers import dependencies as deps
 from lifetrace.schemas.event import EventResponse
@@ -24,12 +25,18 @@ async def semantic_search(request: SemanticSearchRequest):
         if not deps.vector_service.is_enabled():
             raise HTTPException(status_code=503, detail="向量数据库服务不可用")
 
-        results = deps.vector_service.semantic_search(
+        # 检索是同步调用（查询编码会等待微批处理），放到线程池中执行，不阻塞事件循环
+        results = await run_in_threadpool(
+            deps.vector_service.semantic_search,
             query=request.query,
             top_k=request.top_k,
             use_rerank=request.use_rerank,
             retrieve_k=request.retrieve_k,
             filters=request.filters,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            app_names=[request.app_name] if request.app_name else None,
+            expand_aliases=request.expand_aliases,
         )
 
         # 转换为响应格式
@@ -41,6 +48,7 @@ async def semantic_search(request: SemanticSearchRequest):
                 metadata=result.get("metadata", {}),
                 ocr_result=result.get("ocr_result"),
                 screenshot=result.get("screenshot"),
+                aliases=result.get("aliases"),
             )
             search_results.append(search_result)
 
@@ -57,8 +65,13 @@ async def event_semantic_search(request: SemanticSearchRequest):
     try:
         if not deps.vector_service.is_enabled():
             raise HTTPException(status_code=503, detail="向量数据库服务不可用")
-        raw_results = deps.vector_service.semantic_search_events(
-            query=request.query, top_k=request.top_k
+        raw_results = await run_in_threadpool(
+            deps.vector_service.semantic_search_events,
+            query=request.query,
+            top_k=request.top_k,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            app_names=[request.app_name] if request.app_name else None,
         )
 
         # semantic_search_events 现在直接返回格式化的事件数据
@@ -100,23 +113,62 @@ async def get_vector_stats():
 
 @router.post("/vector-sync")
 async def sync_vector_database(
-    limit: int | None = Query(None, description="同步的最大记录数"),
-    force_reset: bool = Query(False, description="是否强制重置向量数据库"),
+    limit: int | None = Query(None, description="本次同步的最大记录数"),
+    force_reset: bool = Query(False, description="是否强制重置向量数据库后从头同步"),
+    wait: bool = Query(False, description="是否等待同步完成后再返回"),
 ):
-    """同步 SQLite 数据库到向量数据库"""
+    """增量同步 SQLite 数据库到向量数据库（默认在后台执行，进度通过 GET 查询）"""
     try:
         if not deps.vector_service.is_enabled():
             raise HTTPException(status_code=503, detail="向量数据库服务不可用")
 
-        synced_count = deps.vector_service.sync_from_database(limit=limit, force_reset=force_reset)
-
-        return {"message": "同步完成", "synced_count": synced_count}
+        if wait:
+            synced_count = deps.vector_service.sync_from_database(
+                limit=limit, force_reset=force_reset
+            )
+            return {
+                "message": "同步完成",
+                "synced_count": synced_count,
+                "status": deps.vector_service.get_sync_status(),
+            }
+
+        started = deps.vector_service.start_sync(limit=limit, force_reset=force_reset)
+        return {
+            "message": "同步已开始" if started else "已有同步正在进行",
+            "status": deps.vector_service.get_sync_status(),
+        }
 
     except Exception as e:
         logger.error(f"向量数据库同步失败: {e}")
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@router.get("/vector-sync")
+async def get_vector_sync_status():
+    """获取向量数据库同步进度"""
+    try:
+        if not deps.vector_service.is_enabled():
+            raise HTTPException(status_code=503, detail="向量数据库服务不可用")
+        return deps.vector_service.get_sync_status()
+    except Exception as e:
+        logger.error(f"获取向量同步进度失败: {e}")
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@router.post("/vector-gc")
+async def collect_vector_garbage():
+    """清理向量库中记录已不存在的文档并整理索引，返回回收的文档数量和磁盘空间"""
+    try:
+        if not deps.vector_service.is_enabled():
+            raise HTTPException(status_code=503, detail="向量数据库服务不可用")
+        return deps.vector_service.collect_garbage()
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"向量库清理失败: {e}")
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
 @router.post("/vector-reset")
 async def reset_vector_database():
     """重置向量数据库"""
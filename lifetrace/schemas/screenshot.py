@@ -15,3 +15,4 @@ class ScreenshotResponse(BaseModel):
     width: int
     height: int
     file_deleted: bool = False  # 文件是否已被清理
+    score: float | None = None  # 混合检索的融合分数（其他检索方式为空）
@@ -11,3 +11,4 @@ class SearchRequest(BaseModel):
     end_date: datetime | None = None
     app_name: str | None = None
     limit: int = 50
+    mode: str = "hybrid"  # hybrid：全文 + 语义混合检索；text：仅 OCR 文本模糊匹配
@@ -1,5 +1,6 @@
 """向量数据库相关的 Pydantic 模型"""
 
+from datetime import datetime
 from typing import Any
 
 from pydantic import BaseModel
@@ -11,6 +12,10 @@ class SemanticSearchRequest(BaseModel):
     use_rerank: bool = True
     retrieve_k: int | None = None
     filters: dict[str, Any] | None = None
+    start_date: datetime | None = None
+    end_date: datetime | None = None
+    app_name: str | None = None  # 规范化后精确匹配（不区分大小写，忽略 .exe 后缀）
+    expand_aliases: bool = False  # 附带近重复别名的OCR结果和截图
 
 
 class SemanticSearchResult(BaseModel):
@@ -19,10 +24,13 @@ class SemanticSearchResult(BaseModel):
     metadata: dict[str, Any]
     ocr_result: dict[str, Any] | None = None
     screenshot: dict[str, Any] | None = None
+    aliases: list[dict[str, Any]] | None = None
 
 
 class VectorStatsResponse(BaseModel):
     enabled: bool
     collection_name: str | None = None
     document_count: int | None = None
+    event_collection_name: str | None = None
+    event_document_count: int | None = None
     error: str | None = None
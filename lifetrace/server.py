@@ -6,8 +6,9 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from lifetrace.jobs.job_manager import get_job_manager
 from lifetrace.jobs.ocr import SimpleOCRProcessor
+from lifetrace.jobs.warmup import start_warmup
 from lifetrace.llm.rag_service import RAGService
-from lifetrace.llm.vector_service import create_vector_service
+from lifetrace.llm.vector_service import get_vector_service
 from lifetrace.routers import (
     chat,
     context,
@@ -56,6 +57,9 @@ async def lifespan(app: FastAPI):
     # 启动所有后台任务
     job_manager.start_all()
 
+    # 后台预热模型，不阻塞服务开始监听
+    start_warmup()
+
     yield
 
     # 关闭逻辑
@@ -88,8 +92,8 @@ app.add_middleware(
 # 初始化OCR处理器
 ocr_processor = SimpleOCRProcessor()
 
-# 初始化向量数据库服务
-vector_service = create_vector_service(config)
+# 初始化向量数据库服务（与后台任务共享同一实例）
+vector_service = get_vector_service()
 
 # 初始化RAG服务 - 从配置文件读取API配置
 rag_service = RAGService()
@@ -11,10 +11,14 @@ from lifetrace.storage.database import (
     get_db,
     get_session,
     ocr_mgr,
+    ocr_queue_mgr,
+    ocr_reprocess_mgr,
     project_mgr,
     screenshot_mgr,
     stats_mgr,
     task_mgr,
+    text_search_mgr,
+    vector_sync_mgr,
 )
 
 __all__ = [
@@ -22,11 +26,15 @@ __all__ = [
     "screenshot_mgr",
     "event_mgr",
     "ocr_mgr",
+    "ocr_queue_mgr",
+    "ocr_reprocess_mgr",
     "project_mgr",
     "task_mgr",
     "context_mgr",
     "chat_mgr",
     "stats_mgr",
+    "vector_sync_mgr",
+    "text_search_mgr",
     # 数据库基础
     "db_base",
     "get_session",
@@ -7,10 +7,14 @@ from lifetrace.storage.context_manager import ContextManager
 from lifetrace.storage.database_base import DatabaseBase
 from lifetrace.storage.event_manager import EventManager
 from lifetrace.storage.ocr_manager import OCRManager
+from lifetrace.storage.ocr_queue_manager import OCRQueueManager
+from lifetrace.storage.ocr_reprocess_manager import OCRReprocessManager
 from lifetrace.storage.project_manager import ProjectManager
 from lifetrace.storage.screenshot_manager import ScreenshotManager
 from lifetrace.storage.stats_manager import StatsManager
 from lifetrace.storage.task_manager import TaskManager
+from lifetrace.storage.text_search_manager import TextSearchManager
+from lifetrace.storage.vector_sync_manager import VectorSyncManager
 from lifetrace.util.logging_config import get_logger
 
 logger = get_logger()
@@ -22,11 +26,15 @@ db_base = DatabaseBase()
 screenshot_mgr = ScreenshotManager(db_base)
 event_mgr = EventManager(db_base)
 ocr_mgr = OCRManager(db_base)
+ocr_queue_mgr = OCRQueueManager(db_base)
+ocr_reprocess_mgr = OCRReprocessManager(db_base)
 project_mgr = ProjectManager(db_base)
 task_mgr = TaskManager(db_base)
 context_mgr = ContextManager(db_base)
 chat_mgr = ChatManager(db_base)
 stats_mgr = StatsManager(db_base)
+vector_sync_mgr = VectorSyncManager(db_base)
+text_search_mgr = TextSearchManager(db_base)
 
 # ===== 向后兼容：保留原有的接口 =====
 engine = db_base.engine
@@ -13,6 +13,9 @@ from lifetrace.util.utils import ensure_dir
 
 logger = get_logger()
 
+# OCR文本全文索引（FTS5 外部内容表，由 ocr_results 上的触发器保持同步）
+OCR_FTS_TABLE = "ocr_results_fts"
+
 
 class DatabaseBase:
     """数据库基础管理类 - 处理数据库初始化和会话管理"""
@@ -45,6 +48,9 @@ class DatabaseBase:
             # 进行 projects 表结构迁移（确保新列存在）
             self._migrate_projects_table()
 
+            # 进行 ocr_results 表结构迁移（确保新列存在）
+            self._migrate_ocr_results_table()
+
             # 只在数据库不存在时（新创建）打印日志
             if not db_exists:
                 logger.info(f"数据库初始化完成: {config.database_path}")
@@ -52,6 +58,9 @@ class DatabaseBase:
             # 性能优化：添加关键索引
             self._create_performance_indexes()
 
+            # OCR文本全文索引（混合检索的关键词一路）
+            self._create_fulltext_index()
+
         except Exception as e:
             logger.error(f"数据库初始化失败: {e}")
             raise
@@ -87,6 +96,10 @@ class DatabaseBase:
                         "idx_screenshots_event_id",
                         "CREATE INDEX IF NOT EXISTS idx_screenshots_event_id ON screenshots(event_id)",
                     ),
+                    (
+                        "idx_ocr_queue_status_id",
+                        "CREATE INDEX IF NOT EXISTS idx_ocr_queue_status_id ON ocr_queue(status, id)",
+                    ),
                 ]
 
                 # 创建索引
@@ -107,6 +120,63 @@ class DatabaseBase:
             logger.warning(f"创建性能索引失败: {e}")
             raise
 
+    def _create_fulltext_index(self):
+        """创建OCR文本的 FTS5 全文索引及同步触发器
+
+        使用 trigram 分词（按三字符切分），中文和错误码、工单号等标识符都能做子串匹配。
+        索引首次创建时用已有数据重建；SQLite 不支持 FTS5 时跳过，关键词检索退化为 LIKE。
+        """
+        table = OCR_FTS_TABLE
+        try:
+            with self.engine.connect() as conn:
+                exists = conn.execute(
+                    text("SELECT name FROM sqlite_master WHERE type='table' AND name=:name"),
+                    {"name": table},
+                ).first()
+                if not exists:
+                    conn.execute(
+                        text(
+                            f"CREATE VIRTUAL TABLE {table} USING fts5("
+                            "text_content, content='ocr_results', content_rowid='id', "
+                            "tokenize='trigram')"
+                        )
+                    )
+
+                conn.execute(
+                    text(
+                        f"CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON ocr_results "
+                        f"BEGIN INSERT INTO {table}(rowid, text_content) "
+                        "VALUES (new.id, new.text_content); END"
+                    )
+                )
+                conn.execute(
+                    text(
+                        f"CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON ocr_results "
+                        f"BEGIN INSERT INTO {table}({table}, rowid, text_content) "
+                        "VALUES ('delete', old.id, old.text_content); END"
+                    )
+                )
+                conn.execute(
+                    text(
+                        f"CREATE TRIGGER IF NOT EXISTS {table}_au "
+                        "AFTER UPDATE OF text_content ON ocr_results "
+                        f"BEGIN INSERT INTO {table}({table}, rowid, text_content) "
+                        "VALUES ('delete', old.id, old.text_content); "
+                        f"INSERT INTO {table}(rowid, text_content) "
+                        "VALUES (new.id, new.text_content); END"
+                    )
+                )
+
+                if not exists:
+                    conn.execute(text(f"INSERT INTO {table}({table}) VALUES ('rebuild')"))
+                    logger.info("已创建OCR文本全文索引")
+
+                conn.commit()
+
+        except Exception as e:
+            # 全文索引不可用不影响服务启动，关键词检索退化为 LIKE 匹配
+            logger.warning(f"创建OCR文本全文索引失败: {e}")
+
     def _migrate_projects_table(self):
         """迁移 projects 表结构，保持与最新 ORM 定义一致（SQLite 兼容方式）
 
@@ -130,6 +200,36 @@ class DatabaseBase:
             # 迁移失败不应阻止服务启动，但需要记录错误
             logger.error(f"projects 表结构迁移失败: {e}")
 
+    def _migrate_ocr_results_table(self):
+        """迁移 ocr_results 表结构，补充新增的列（SQLite 兼容方式）"""
+        try:
+            with self.engine.connect() as conn:
+                column_rows = conn.execute(text("PRAGMA table_info('ocr_results')")).fetchall()
+                columns = [row[1] for row in column_rows]
+                if not columns:
+                    return
+
+                self._add_column_if_missing(
+                    conn,
+                    columns,
+                    "prefilter",
+                    "ALTER TABLE ocr_results ADD COLUMN prefilter VARCHAR(20)",
+                    table_name="ocr_results",
+                )
+                self._add_column_if_missing(
+                    conn,
+                    columns,
+                    "engine_version",
+                    "ALTER TABLE ocr_results ADD COLUMN engine_version VARCHAR(100)",
+                    table_name="ocr_results",
+                )
+
+                conn.commit()
+
+        except Exception as e:
+            # 迁移失败不应阻止服务启动，但需要记录错误
+            logger.error(f"ocr_results 表结构迁移失败: {e}")
+
     def _projects_table_exists(self, conn) -> bool:
         """检查 projects 表是否存在"""
         tables = [
@@ -151,11 +251,12 @@ class DatabaseBase:
         columns: list[str],
         column_name: str,
         ddl: str,
+        table_name: str = "projects",
     ) -> list[str]:
         """如果列不存在，则执行 ALTER TABLE 添加"""
         if column_name not in columns:
             conn.execute(text(ddl))
-            logger.info(f"已为 projects 表添加列: {column_name}")
+            logger.info(f"已为 {table_name} 表添加列: {column_name}")
             columns.append(column_name)
         return columns
 
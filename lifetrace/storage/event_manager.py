@@ -3,22 +3,71 @@
 from datetime import datetime, timedelta
 from typing import Any
 
-from sqlalchemy import text
+from sqlalchemy import func, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from lifetrace.storage.database_base import DatabaseBase
 from lifetrace.storage.models import Event, OCRResult, Screenshot
+from lifetrace.util.cache import TTLCache
 from lifetrace.util.logging_config import get_logger
 
 logger = get_logger()
 
+# 事件聚合信息（截图数量、首张截图ID）的缓存有效期（秒）
+EVENT_AGGREGATE_CACHE_TTL = 30
+
 
 class EventManager:
     """事件管理类"""
 
     def __init__(self, db_base: DatabaseBase):
         self.db_base = db_base
+        # 事件列表、事件摘要和事件语义搜索共用
+        self.aggregate_cache = TTLCache(EVENT_AGGREGATE_CACHE_TTL, max_size=2048)
+
+    def _get_event_aggregates(
+        self, session: Session, event_ids: list[int]
+    ) -> dict[int, dict[str, Any]]:
+        """批量获取事件的截图数量与首张截图ID（一次 GROUP BY 查询，带短期缓存）"""
+        aggregates = self.aggregate_cache.get_many(event_ids)
+        missing = [event_id for event_id in dict.fromkeys(event_ids) if event_id not in aggregates]
+        if missing:
+            loaded = {
+                event_id: {"screenshot_count": 0, "first_screenshot_id": None}
+                for event_id in missing
+            }
+            # 截图ID随时间递增，与 search_events_simple 一致以 MIN(id) 作为首张截图
+            rows = (
+                session.query(
+                    Screenshot.event_id, func.count(Screenshot.id), func.min(Screenshot.id)
+                )
+                .filter(Screenshot.event_id.in_(missing))
+                .group_by(Screenshot.event_id)
+                .all()
+            )
+            for event_id, shot_count, first_shot_id in rows:
+                loaded[event_id] = {
+                    "screenshot_count": shot_count,
+                    "first_screenshot_id": first_shot_id,
+                }
+            self.aggregate_cache.set_many(loaded)
+            aggregates.update(loaded)
+        return aggregates
+
+    @staticmethod
+    def _event_to_summary(ev: Event, aggregate: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "id": ev.id,
+            "app_name": ev.app_name,
+            "window_title": ev.window_title,
+            "start_time": ev.start_time,
+            "end_time": ev.end_time,
+            "screenshot_count": aggregate["screenshot_count"],
+            "first_screenshot_id": aggregate["first_screenshot_id"],
+            "ai_title": ev.ai_title,
+            "ai_summary": ev.ai_summary,
+        }
 
     def _get_last_open_event(self, session: Session) -> Event | None:
         """获取最后一个未结束的事件"""
@@ -72,6 +121,16 @@ class EventManager:
 
         return True
 
+    @staticmethod
+    def _notify_event_closed(event_id: int):
+        """事件结束后立即更新一次事件向量文档（平时按时间窗口合并更新）"""
+        try:
+            from lifetrace.llm.vector_indexer import notify_event_completed
+
+            notify_event_completed(event_id)
+        except Exception as e:
+            logger.error(f"触发事件向量文档更新失败: {e}")
+
     def get_active_event(self) -> int | None:
         """获取当前活跃的事件ID（用于截图任务关联事件）
 
@@ -162,6 +221,9 @@ class EventManager:
                     f"✨ 创建新事件 {new_event_id}: {app_name} - {window_title} (end_time=NULL)"
                 )
 
+            if closed_event_id:
+                self._notify_event_closed(closed_event_id)
+
             # 在session关闭后，异步生成已关闭事件的摘要
             if closed_event_id:
                 try:
@@ -192,6 +254,9 @@ class EventManager:
                     closed_event_id = last_event.id
                     session.flush()
 
+            if closed_event_id:
+                self._notify_event_closed(closed_event_id)
+
             # 在session关闭后，异步生成已关闭事件的摘要
             if closed_event_id:
                 try:
@@ -258,32 +323,9 @@ class EventManager:
                 q = q.order_by(Event.start_time.desc()).offset(offset).limit(limit)
                 events = q.all()
 
-                results: list[dict[str, Any]] = []
-                for ev in events:
-                    # 统计截图与首图
-                    first_shot = (
-                        session.query(Screenshot)
-                        .filter(Screenshot.event_id == ev.id)
-                        .order_by(Screenshot.created_at.asc())
-                        .first()
-                    )
-                    shot_count = (
-                        session.query(Screenshot).filter(Screenshot.event_id == ev.id).count()
-                    )
-                    results.append(
-                        {
-                            "id": ev.id,
-                            "app_name": ev.app_name,
-                            "window_title": ev.window_title,
-                            "start_time": ev.start_time,
-                            "end_time": ev.end_time,
-                            "screenshot_count": shot_count,
-                            "first_screenshot_id": (first_shot.id if first_shot else None),
-                            "ai_title": ev.ai_title,
-                            "ai_summary": ev.ai_summary,
-                        }
-                    )
-                return results
+                # 统计截图与首图（整页一次查询）
+                aggregates = self._get_event_aggregates(session, [ev.id for ev in events])
+                return [self._event_to_summary(ev, aggregates[ev.id]) for ev in events]
         except SQLAlchemyError as e:
             logger.error(f"列出事件失败: {e}")
             return []
@@ -418,28 +460,29 @@ class EventManager:
                 ev = session.query(Event).filter(Event.id == event_id).first()
                 if not ev:
                     return None
-                first_shot = (
-                    session.query(Screenshot)
-                    .filter(Screenshot.event_id == ev.id)
-                    .order_by(Screenshot.created_at.asc())
-                    .first()
-                )
-                shot_count = session.query(Screenshot).filter(Screenshot.event_id == ev.id).count()
-                return {
-                    "id": ev.id,
-                    "app_name": ev.app_name,
-                    "window_title": ev.window_title,
-                    "start_time": ev.start_time,
-                    "end_time": ev.end_time,
-                    "screenshot_count": shot_count,
-                    "first_screenshot_id": first_shot.id if first_shot else None,
-                    "ai_title": ev.ai_title,
-                    "ai_summary": ev.ai_summary,
-                }
+                aggregates = self._get_event_aggregates(session, [ev.id])
+                return self._event_to_summary(ev, aggregates[ev.id])
         except SQLAlchemyError as e:
             logger.error(f"获取事件摘要失败: {e}")
             return None
 
+    def get_event_summaries(self, event_ids: list[int]) -> dict[int, dict[str, Any]]:
+        """批量获取事件摘要（事件表与截图表各一次 IN 查询）
+
+        Returns:
+            事件ID到摘要的映射，不存在的事件不包含在内
+        """
+        if not event_ids:
+            return {}
+        try:
+            with self.db_base.get_session() as session:
+                events = session.query(Event).filter(Event.id.in_(set(event_ids))).all()
+                aggregates = self._get_event_aggregates(session, [ev.id for ev in events])
+                return {ev.id: self._event_to_summary(ev, aggregates[ev.id]) for ev in events}
+        except SQLAlchemyError as e:
+            logger.error(f"批量获取事件摘要失败: {e}")
+            return {}
+
     def get_event_id_by_screenshot(self, screenshot_id: int) -> int | None:
         """根据截图ID获取所属事件ID"""
         try:
@@ -526,6 +569,7 @@ class EventManager:
                 if screenshot:
                     screenshot.event_id = new_event.id
                     session.flush()
+                    self.aggregate_cache.invalidate(new_event.id)
 
                 logger.info(f"✨ 创建新事件 {new_event.id}: {app_name} (status=new)")
                 return new_event.id
@@ -563,6 +607,7 @@ class EventManager:
 
                 # 将截图关联到事件
                 screenshot.event_id = event_id
+                self.aggregate_cache.invalidate(event_id)
 
                 # 更新事件状态为 processing
                 if event.status == "new":
@@ -600,6 +645,8 @@ class EventManager:
 
                 logger.info(f"🔚 完成事件 {event_id}: {event.app_name} (status=done)")
 
+            self._notify_event_closed(event_id)
+
             # 在session关闭后，异步生成已关闭事件的摘要
             try:
                 logger.info(f"📝 触发已完成事件 {event_id} 的摘要生成")
@@ -51,6 +51,8 @@ class OCRResult(Base):
     confidence = Column(Float)  # 置信度[0, 1]
     language = Column(String(10))  # 识别语言（zh, en, ja, etc.）
     processing_time = Column(Float)  # OCR处理耗时（秒）
+    prefilter = Column(String(20))  # 文本预判结果：text_rich, text_poor, textless（为空表示未预判）
+    engine_version = Column(String(100))  # 生成该结果的OCR引擎版本（模型与参数指纹）
     created_at = Column(DateTime, default=get_local_time, nullable=False)
     updated_at = Column(DateTime, default=get_local_time, onupdate=get_local_time, nullable=False)
     deleted_at = Column(DateTime)  # 软删除时间戳
@@ -59,6 +61,87 @@ class OCRResult(Base):
         return f"<OCRResult(id={self.id}, screenshot_id={self.screenshot_id})>"
 
 
+class OCRQueueItem(Base):
+    """OCR待处理队列模型（录制器入队，OCR工作者通过租约认领）"""
+
+    __tablename__ = "ocr_queue"
+
+    id = Column(Integer, primary_key=True)
+    screenshot_id = Column(Integer, nullable=False, unique=True)  # 关联截图ID
+    status = Column(String(20), default="pending", nullable=False)  # pending, processing, failed
+    attempts = Column(Integer, default=0, nullable=False)  # 已认领次数
+    claimed_by = Column(String(100))  # 认领者标识
+    claimed_at = Column(DateTime)  # 认领时间（租约起点）
+    last_error = Column(Text)  # 最近一次失败原因
+    created_at = Column(DateTime, default=get_local_time, nullable=False)
+    updated_at = Column(DateTime, default=get_local_time, onupdate=get_local_time, nullable=False)
+
+    def __repr__(self):
+        return f"<OCRQueueItem(id={self.id}, screenshot_id={self.screenshot_id}, status={self.status})>"
+
+
+class OCRReprocessJob(Base):
+    """历史截图OCR重处理任务模型（记录筛选条件和断点进度，支持崩溃后继续）"""
+
+    __tablename__ = "ocr_reprocess_jobs"
+
+    id = Column(Integer, primary_key=True)
+    status = Column(
+        String(20), default="pending", nullable=False
+    )  # pending, running, completed, cancelled, failed
+    filters = Column(Text)  # 筛选条件（JSON格式）
+    engine_version = Column(String(100))  # 重处理使用的OCR引擎版本
+    workers = Column(Integer, default=2)  # 并行数
+    batch_size = Column(Integer, default=32)  # 每批处理数量
+    total = Column(Integer, default=0)  # 待处理总数
+    processed = Column(Integer, default=0)  # 已处理数量
+    failed = Column(Integer, default=0)  # 失败数量
+    last_screenshot_id = Column(Integer, default=0)  # 断点：已完成的最大截图ID
+    error = Column(Text)  # 失败原因
+    started_at = Column(DateTime)  # 开始（或最近一次继续）时间
+    finished_at = Column(DateTime)  # 结束时间
+    created_at = Column(DateTime, default=get_local_time, nullable=False)
+    updated_at = Column(DateTime, default=get_local_time, onupdate=get_local_time, nullable=False)
+
+    def __repr__(self):
+        return f"<OCRReprocessJob(id={self.id}, status={self.status}, processed={self.processed}/{self.total})>"
+
+
+class VectorSyncState(Base):
+    """向量库同步状态模型（记录已同步OCR结果的高水位，支持中断后继续）"""
+
+    __tablename__ = "vector_sync_state"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False, unique=True)  # 同步对象名称（ocr）
+    status = Column(String(20), default="idle", nullable=False)  # idle, running, completed, failed
+    last_updated_at = Column(DateTime)  # 高水位：已同步OCR结果的最大更新时间
+    last_ocr_id = Column(Integer, default=0)  # 高水位：同一更新时间下已同步的最大OCR结果ID
+    synced = Column(Integer, default=0)  # 本轮写入的文档数量
+    deleted = Column(Integer, default=0)  # 本轮删除的文档数量
+    error = Column(Text)  # 失败原因
+    started_at = Column(DateTime)  # 本轮开始时间
+    finished_at = Column(DateTime)  # 本轮结束时间
+    created_at = Column(DateTime, default=get_local_time, nullable=False)
+    updated_at = Column(DateTime, default=get_local_time, onupdate=get_local_time, nullable=False)
+
+    def __repr__(self):
+        return f"<VectorSyncState(name={self.name}, status={self.status}, last_ocr_id={self.last_ocr_id})>"
+
+
+class VectorTombstone(Base):
+    """向量库删除标记模型（物理删除OCR结果时记录，下次同步时删除对应向量文档）"""
+
+    __tablename__ = "vector_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    doc_id = Column(String(100), nullable=False)  # 待删除的向量文档ID
+    created_at = Column(DateTime, default=get_local_time, nullable=False)
+
+    def __repr__(self):
+        return f"<VectorTombstone(id={self.id}, doc_id={self.doc_id})>"
+
+
 class Event(Base):
     """事件模型（按前台应用连续使用区间聚合截图）"""
 
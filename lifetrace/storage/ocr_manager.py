@@ -6,12 +6,40 @@ from typing import Any
 from sqlalchemy.exc import SQLAlchemyError
 
 from lifetrace.storage.database_base import DatabaseBase
-from lifetrace.storage.models import OCRResult, Screenshot
+from lifetrace.storage.models import OCRQueueItem, OCRResult, Screenshot
 from lifetrace.util.logging_config import get_logger
 
 logger = get_logger()
 
 
+def build_ocr_record(ocr_result: OCRResult, screenshot: Screenshot | None) -> dict[str, Any]:
+    """构建供向量索引使用的OCR记录（OCR结果与截图元数据）"""
+    record = {
+        "id": ocr_result.id,
+        "screenshot_id": ocr_result.screenshot_id,
+        "text_content": ocr_result.text_content,
+        "confidence": ocr_result.confidence,
+        "language": ocr_result.language,
+        "processing_time": ocr_result.processing_time,
+        "prefilter": ocr_result.prefilter,
+        "engine_version": ocr_result.engine_version,
+        "created_at": ocr_result.created_at,
+    }
+    if screenshot:
+        record.update(
+            {
+                "file_path": screenshot.file_path,
+                "screenshot_created_at": screenshot.created_at,
+                "app_name": screenshot.app_name,
+                "window_title": screenshot.window_title,
+                "width": screenshot.width,
+                "height": screenshot.height,
+                "event_id": screenshot.event_id,
+            }
+        )
+    return record
+
+
 class OCRManager:
     """OCR结果管理类"""
 
@@ -53,6 +81,47 @@ class OCRManager:
             logger.error(f"添加OCR结果失败: {e}")
             return None
 
+    def save_ocr_result(self, screenshot_id: int, result: dict[str, Any]) -> dict[str, Any] | None:
+        """在单个事务中保存OCR结果：写入结果、标记截图已处理、移出OCR队列
+
+        Args:
+            screenshot_id: 截图ID
+            result: OCR结果，包含 text_content、confidence、language、processing_time，
+                可选 prefilter、engine_version
+
+        Returns:
+            供向量索引使用的记录（OCR结果与截图元数据），失败返回None
+        """
+        try:
+            with self.db_base.get_session() as session:
+                ocr_result = OCRResult(
+                    screenshot_id=screenshot_id,
+                    text_content=result["text_content"],
+                    confidence=result.get("confidence", 0.0),
+                    language=result.get("language", "ch"),
+                    processing_time=result.get("processing_time", 0.0),
+                    prefilter=result.get("prefilter"),
+                    engine_version=result.get("engine_version"),
+                )
+                session.add(ocr_result)
+
+                screenshot = session.get(Screenshot, screenshot_id)
+                if screenshot:
+                    screenshot.is_processed = True
+                    screenshot.processed_at = datetime.now()
+
+                session.query(OCRQueueItem).filter_by(screenshot_id=screenshot_id).delete(
+                    synchronize_session=False
+                )
+                session.flush()
+
+                logger.debug(f"保存OCR结果: {ocr_result.id} (screenshot_id={screenshot_id})")
+                return build_ocr_record(ocr_result, screenshot)
+
+        except SQLAlchemyError as e:
+            logger.error(f"保存OCR结果失败 (screenshot_id={screenshot_id}): {e}")
+            return None
+
     def get_ocr_results_by_screenshot(self, screenshot_id: int) -> list[dict[str, Any]]:
         """根据截图ID获取OCR结果"""
         try:
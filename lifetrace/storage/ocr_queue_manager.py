@@ -0,0 +1,267 @@
+"""OCR队列管理器 - 负责OCR待处理队列的入队、认领和租约回收"""
+
+import threading
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import func, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from lifetrace.storage.database_base import DatabaseBase
+from lifetrace.storage.models import OCRQueueItem, Screenshot
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+# 队列状态
+STATUS_PENDING = "pending"
+STATUS_PROCESSING = "processing"
+STATUS_FAILED = "failed"
+
+
+class OCRQueueManager:
+    """OCR队列管理类
+
+    录制器在截图入库后调用 enqueue 入队，OCR 工作者通过 claim 原子地认领任务。
+    认领会记录 claimed_by / claimed_at 作为租约，超时未完成的任务由 requeue_stale
+    重新放回队列，超过最大尝试次数后标记为 failed。处理完成的任务在保存OCR结果的事务中删除，
+    保证队列表始终很小，认领查询只依赖 (status, id) 索引。
+    """
+
+    def __init__(self, db_base: DatabaseBase):
+        self.db_base = db_base
+        self._listeners: list[Callable[[], None]] = []
+        self._listeners_lock = threading.Lock()
+
+    def add_listener(self, callback: Callable[[], None]):
+        """注册入队通知回调（用于在同一进程内立即唤醒空闲的OCR工作者）"""
+        with self._listeners_lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def _notify_listeners(self):
+        """通知所有监听者有新任务入队"""
+        with self._listeners_lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"OCR队列通知回调执行失败: {e}")
+
+    def enqueue(self, screenshot_id: int) -> bool:
+        """将截图加入OCR队列（已在队列中则忽略）
+
+        Returns:
+            是否新入队
+        """
+        try:
+            with self.db_base.get_session() as session:
+                exists = session.query(OCRQueueItem.id).filter_by(screenshot_id=screenshot_id).first()
+                if exists:
+                    return False
+                session.add(OCRQueueItem(screenshot_id=screenshot_id, status=STATUS_PENDING))
+                session.flush()
+                logger.debug(f"截图 {screenshot_id} 已加入OCR队列")
+        except SQLAlchemyError as e:
+            logger.error(f"截图 {screenshot_id} 加入OCR队列失败: {e}")
+            return False
+
+        self._notify_listeners()
+        return True
+
+    def claim(self, worker_id: str, limit: int = 50) -> list[dict[str, Any]]:
+        """原子地认领一批待处理任务（按入队顺序，先入队的先处理）
+
+        每个候选任务通过带状态条件的 UPDATE 进行比较并交换，
+        多个工作者并发认领时同一任务只会被一个工作者拿到。
+
+        Args:
+            worker_id: 认领者标识
+            limit: 最多认领的任务数
+
+        Returns:
+            认领到的截图信息列表
+        """
+        try:
+            with self.db_base.get_session() as session:
+                candidate_ids = [
+                    row[0]
+                    for row in session.query(OCRQueueItem.id)
+                    .filter(OCRQueueItem.status == STATUS_PENDING)
+                    .order_by(OCRQueueItem.id.asc())
+                    .limit(limit)
+                    .all()
+                ]
+                if not candidate_ids:
+                    return []
+
+                now = datetime.now()
+                claimed_ids = []
+                for queue_id in candidate_ids:
+                    updated = (
+                        session.query(OCRQueueItem)
+                        .filter(
+                            OCRQueueItem.id == queue_id,
+                            OCRQueueItem.status == STATUS_PENDING,
+                        )
+                        .update(
+                            {
+                                OCRQueueItem.status: STATUS_PROCESSING,
+                                OCRQueueItem.claimed_by: worker_id,
+                                OCRQueueItem.claimed_at: now,
+                                OCRQueueItem.attempts: OCRQueueItem.attempts + 1,
+                                OCRQueueItem.updated_at: now,
+                            },
+                            synchronize_session=False,
+                        )
+                    )
+                    if updated == 1:
+                        claimed_ids.append(queue_id)
+
+                if not claimed_ids:
+                    return []
+
+                rows = (
+                    session.query(OCRQueueItem, Screenshot)
+                    .outerjoin(Screenshot, Screenshot.id == OCRQueueItem.screenshot_id)
+                    .filter(OCRQueueItem.id.in_(claimed_ids))
+                    .order_by(OCRQueueItem.id.asc())
+                    .all()
+                )
+
+                return [
+                    {
+                        "queue_id": item.id,
+                        "id": item.screenshot_id,
+                        "file_path": screenshot.file_path if screenshot else None,
+                        "created_at": screenshot.created_at if screenshot else None,
+                        "attempts": item.attempts,
+                    }
+                    for item, screenshot in rows
+                ]
+        except SQLAlchemyError as e:
+            logger.error(f"认领OCR任务失败: {e}")
+            return []
+
+    def release(
+        self,
+        screenshot_id: int,
+        error: str | None = None,
+        max_attempts: int = 3,
+        permanent: bool = False,
+    ) -> bool:
+        """释放租约：未超过最大尝试次数的任务放回队列，否则标记为失败
+
+        Args:
+            screenshot_id: 截图ID
+            error: 失败原因
+            max_attempts: 最大尝试次数
+            permanent: 是否为不可重试的失败（如文件已不存在）
+        """
+        try:
+            with self.db_base.get_session() as session:
+                item = session.query(OCRQueueItem).filter_by(screenshot_id=screenshot_id).first()
+                if not item:
+                    return False
+
+                if permanent or item.attempts >= max_attempts:
+                    item.status = STATUS_FAILED
+                else:
+                    item.status = STATUS_PENDING
+                item.claimed_by = None
+                item.claimed_at = None
+                item.last_error = error
+                return True
+        except SQLAlchemyError as e:
+            logger.error(f"释放OCR任务失败 (screenshot_id={screenshot_id}): {e}")
+            return False
+
+    def requeue_stale(self, lease_timeout: int, max_attempts: int) -> tuple[int, int]:
+        """回收过期租约
+
+        Args:
+            lease_timeout: 租约超时时间（秒）
+            max_attempts: 最大尝试次数
+
+        Returns:
+            (重新入队数量, 标记失败数量)
+        """
+        try:
+            cutoff = datetime.now() - timedelta(seconds=lease_timeout)
+            with self.db_base.get_session() as session:
+                stale = session.query(OCRQueueItem).filter(
+                    OCRQueueItem.status == STATUS_PROCESSING,
+                    OCRQueueItem.claimed_at < cutoff,
+                )
+                failed = stale.filter(OCRQueueItem.attempts >= max_attempts).update(
+                    {
+                        OCRQueueItem.status: STATUS_FAILED,
+                        OCRQueueItem.last_error: "租约超时且超过最大尝试次数",
+                    },
+                    synchronize_session=False,
+                )
+                requeued = stale.filter(OCRQueueItem.attempts < max_attempts).update(
+                    {
+                        OCRQueueItem.status: STATUS_PENDING,
+                        OCRQueueItem.claimed_by: None,
+                        OCRQueueItem.claimed_at: None,
+                    },
+                    synchronize_session=False,
+                )
+
+            if requeued or failed:
+                logger.info(f"回收过期OCR租约: 重新入队 {requeued} 个，标记失败 {failed} 个")
+            return requeued, failed
+        except SQLAlchemyError as e:
+            logger.error(f"回收过期OCR租约失败: {e}")
+            return 0, 0
+
+    def backfill(self) -> int:
+        """将尚无OCR结果且不在队列中的截图补充入队（用于升级后的一次性迁移和崩溃恢复）
+
+        Returns:
+            补充入队的数量
+        """
+        try:
+            now = datetime.now()
+            with self.db_base.get_session() as session:
+                result = session.execute(
+                    text(
+                        """
+                        INSERT INTO ocr_queue (screenshot_id, status, attempts, created_at, updated_at)
+                        SELECT s.id, :status, 0, :now, :now
+                        FROM screenshots s
+                        WHERE NOT EXISTS (SELECT 1 FROM ocr_results o WHERE o.screenshot_id = s.id)
+                          AND NOT EXISTS (SELECT 1 FROM ocr_queue q WHERE q.screenshot_id = s.id)
+                          AND (s.file_deleted IS NULL OR s.file_deleted = 0)
+                        """
+                    ),
+                    {"status": STATUS_PENDING, "now": now},
+                )
+                count = result.rowcount or 0
+
+            if count:
+                logger.info(f"已将 {count} 张历史未处理截图补充到OCR队列")
+                self._notify_listeners()
+            return count
+        except SQLAlchemyError as e:
+            logger.error(f"补充OCR队列失败: {e}")
+            return 0
+
+    def get_queue_stats(self) -> dict[str, int]:
+        """获取队列中各状态的任务数量"""
+        try:
+            with self.db_base.get_session() as session:
+                rows = (
+                    session.query(OCRQueueItem.status, func.count(OCRQueueItem.id))
+                    .group_by(OCRQueueItem.status)
+                    .all()
+                )
+                stats = {STATUS_PENDING: 0, STATUS_PROCESSING: 0, STATUS_FAILED: 0}
+                stats.update(dict(rows))
+                return stats
+        except SQLAlchemyError as e:
+            logger.error(f"获取OCR队列统计失败: {e}")
+            return {}
@@ -0,0 +1,259 @@
+"""OCR重处理管理器 - 负责历史截图重处理任务的筛选、断点和结果批量写入"""
+
+import json
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import and_, exists, or_
+from sqlalchemy.exc import SQLAlchemyError
+
+from lifetrace.storage.database_base import DatabaseBase
+from lifetrace.storage.models import OCRQueueItem, OCRReprocessJob, OCRResult, Screenshot
+from lifetrace.storage.ocr_manager import build_ocr_record
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+# 任务状态
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_CANCELLED = "cancelled"
+STATUS_FAILED = "failed"
+
+
+class OCRReprocessManager:
+    """OCR重处理任务管理类
+
+    按截图ID升序分批处理，每批结果与断点在同一事务中提交，
+    进程崩溃后从断点继续即可，不会重复或遗漏。
+    """
+
+    def __init__(self, db_base: DatabaseBase):
+        self.db_base = db_base
+
+    def _candidate_query(self, session, filters: dict[str, Any], engine_version: str | None):
+        """构建候选截图查询
+
+        支持的筛选条件：
+            start_time / end_time: 截图时间范围（ISO格式）
+            app_name: 应用名称
+            engine_version: 只处理现有结果由该引擎版本生成的截图
+            outdated_only: 跳过已由当前引擎版本处理过的截图
+        """
+        query = session.query(Screenshot.id, Screenshot.file_path).filter(
+            Screenshot.deleted_at.is_(None),
+            or_(Screenshot.file_deleted.is_(None), Screenshot.file_deleted.is_(False)),
+        )
+
+        if filters.get("start_time"):
+            query = query.filter(
+                Screenshot.created_at >= datetime.fromisoformat(filters["start_time"])
+            )
+        if filters.get("end_time"):
+            query = query.filter(
+                Screenshot.created_at <= datetime.fromisoformat(filters["end_time"])
+            )
+        if filters.get("app_name"):
+            query = query.filter(Screenshot.app_name == filters["app_name"])
+
+        if filters.get("engine_version"):
+            query = query.filter(
+                exists().where(
+                    and_(
+                        OCRResult.screenshot_id == Screenshot.id,
+                        OCRResult.engine_version == filters["engine_version"],
+                    )
+                )
+            )
+        if filters.get("outdated_only") and engine_version:
+            query = query.filter(
+                ~exists().where(
+                    and_(
+                        OCRResult.screenshot_id == Screenshot.id,
+                        OCRResult.engine_version == engine_version,
+                    )
+                )
+            )
+        return query
+
+    def create_job(
+        self,
+        filters: dict[str, Any],
+        engine_version: str | None,
+        workers: int = 2,
+        batch_size: int = 32,
+    ) -> int | None:
+        """创建重处理任务并统计待处理总数"""
+        try:
+            with self.db_base.get_session() as session:
+                total = self._candidate_query(session, filters, engine_version).count()
+                job = OCRReprocessJob(
+                    status=STATUS_PENDING,
+                    filters=json.dumps(filters, ensure_ascii=False),
+                    engine_version=engine_version,
+                    workers=workers,
+                    batch_size=batch_size,
+                    total=total,
+                    processed=0,
+                    failed=0,
+                    last_screenshot_id=0,
+                )
+                session.add(job)
+                session.flush()
+                logger.info(f"创建OCR重处理任务 {job.id}，待处理 {total} 张截图")
+                return job.id
+        except SQLAlchemyError as e:
+            logger.error(f"创建OCR重处理任务失败: {e}")
+            return None
+
+    def _job_to_dict(self, job: OCRReprocessJob) -> dict[str, Any]:
+        """将任务对象转换为字典"""
+        return {
+            "id": job.id,
+            "status": job.status,
+            "filters": json.loads(job.filters) if job.filters else {},
+            "engine_version": job.engine_version,
+            "workers": job.workers,
+            "batch_size": job.batch_size,
+            "total": job.total or 0,
+            "processed": job.processed or 0,
+            "failed": job.failed or 0,
+            "last_screenshot_id": job.last_screenshot_id or 0,
+            "error": job.error,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+            "created_at": job.created_at,
+            "updated_at": job.updated_at,
+        }
+
+    def get_job(self, job_id: int) -> dict[str, Any] | None:
+        """获取任务信息"""
+        try:
+            with self.db_base.get_session() as session:
+                job = session.get(OCRReprocessJob, job_id)
+                return self._job_to_dict(job) if job else None
+        except SQLAlchemyError as e:
+            logger.error(f"获取OCR重处理任务失败: {e}")
+            return None
+
+    def list_jobs(self, limit: int = 20) -> list[dict[str, Any]]:
+        """获取最近的任务列表"""
+        try:
+            with self.db_base.get_session() as session:
+                jobs = (
+                    session.query(OCRReprocessJob)
+                    .order_by(OCRReprocessJob.id.desc())
+                    .limit(limit)
+                    .all()
+                )
+                return [self._job_to_dict(job) for job in jobs]
+        except SQLAlchemyError as e:
+            logger.error(f"获取OCR重处理任务列表失败: {e}")
+            return []
+
+    def update_job(self, job_id: int, **fields) -> bool:
+        """更新任务字段（状态、错误信息、时间等）"""
+        try:
+            with self.db_base.get_session() as session:
+                job = session.get(OCRReprocessJob, job_id)
+                if not job:
+                    return False
+                for key, value in fields.items():
+                    setattr(job, key, value)
+                return True
+        except SQLAlchemyError as e:
+            logger.error(f"更新OCR重处理任务失败: {e}")
+            return False
+
+    def select_batch(self, job: dict[str, Any], limit: int) -> list[dict[str, Any]]:
+        """从断点之后按截图ID升序选取一批待处理截图"""
+        try:
+            with self.db_base.get_session() as session:
+                rows = (
+                    self._candidate_query(session, job["filters"], job["engine_version"])
+                    .filter(Screenshot.id > job["last_screenshot_id"])
+                    .order_by(Screenshot.id.asc())
+                    .limit(limit)
+                    .all()
+                )
+                return [{"id": row.id, "file_path": row.file_path} for row in rows]
+        except SQLAlchemyError as e:
+            logger.error(f"选取OCR重处理批次失败: {e}")
+            return []
+
+    def save_batch(
+        self,
+        job_id: int,
+        results: dict[int, dict[str, Any]],
+        last_screenshot_id: int,
+        failed_count: int,
+    ) -> list[dict[str, Any]]:
+        """在单个事务中写入一批结果并推进断点
+
+        已有OCR结果的截图覆盖最近一条结果，
+        保持结果ID不变以便向量文档原地覆盖；
+        没有结果的截图新增一条。
+
+        Args:
+            job_id: 任务ID
+            results: 截图ID到OCR结果的映射
+            last_screenshot_id: 本批最大截图ID（新的断点）
+            failed_count: 本批失败数量
+
+        Returns:
+            供向量索引使用的记录列表
+        """
+        try:
+            with self.db_base.get_session() as session:
+                screenshot_ids = list(results)
+                existing = {}
+                if screenshot_ids:
+                    for ocr_result in (
+                        session.query(OCRResult)
+                        .filter(OCRResult.screenshot_id.in_(screenshot_ids))
+                        .order_by(OCRResult.id.asc())
+                    ):
+                        existing[ocr_result.screenshot_id] = ocr_result
+                screenshots = {
+                    s.id: s
+                    for s in session.query(Screenshot).filter(Screenshot.id.in_(screenshot_ids))
+                }
+
+                now = datetime.now()
+                saved = []
+                for screenshot_id, result in results.items():
+                    ocr_result = existing.get(screenshot_id)
+                    if ocr_result is None:
+                        ocr_result = OCRResult(screenshot_id=screenshot_id)
+                        session.add(ocr_result)
+                    ocr_result.text_content = result["text_content"]
+                    ocr_result.confidence = result.get("confidence", 0.0)
+                    ocr_result.language = result.get("language", "ch")
+                    ocr_result.processing_time = result.get("processing_time", 0.0)
+                    ocr_result.prefilter = result.get("prefilter")
+                    ocr_result.engine_version = result.get("engine_version")
+
+                    screenshot = screenshots.get(screenshot_id)
+                    if screenshot:
+                        screenshot.is_processed = True
+                        screenshot.processed_at = now
+                    saved.append((ocr_result, screenshot))
+
+                if screenshot_ids:
+                    session.query(OCRQueueItem).filter(
+                        OCRQueueItem.screenshot_id.in_(screenshot_ids)
+                    ).delete(synchronize_session=False)
+
+                job = session.get(OCRReprocessJob, job_id)
+                if job:
+                    job.processed = (job.processed or 0) + len(results)
+                    job.failed = (job.failed or 0) + failed_count
+                    job.last_screenshot_id = last_screenshot_id
+
+                session.flush()
+                return [build_ocr_record(result, screenshot) for result, screenshot in saved]
+
+        except SQLAlchemyError as e:
+            logger.error(f"写入OCR重处理结果失败 (任务 {job_id}): {e}")
+            raise
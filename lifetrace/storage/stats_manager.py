@@ -8,6 +8,7 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from lifetrace.storage.database_base import DatabaseBase
 from lifetrace.storage.models import OCRResult, Screenshot
+from lifetrace.storage.vector_sync_manager import add_vector_tombstones
 from lifetrace.util.logging_config import get_logger
 
 logger = get_logger()
@@ -61,8 +62,16 @@ class StatsManager:
                 )
 
                 deleted_count = 0
+                event_ids = set()
                 for screenshot in old_screenshots:
-                    # 删除相关的OCR结果
+                    # 删除相关的OCR结果，并记录删除标记以便同步删除向量文档
+                    ocr_result_ids = [
+                        row.id
+                        for row in session.query(OCRResult.id).filter_by(
+                            screenshot_id=screenshot.id
+                        )
+                    ]
+                    add_vector_tombstones(session, ocr_result_ids)
                     session.query(OCRResult).filter_by(screenshot_id=screenshot.id).delete()
 
                     # 删除文件
@@ -73,9 +82,13 @@ class StatsManager:
                             logger.error(f"删除文件失败 {screenshot.file_path}: {e}")
 
                     # 删除截图记录
+                    event_ids.add(screenshot.event_id)
                     session.delete(screenshot)
                     deleted_count += 1
 
+                # 截图被删除的事件需要按剩余文本重建向量文档
+                add_vector_tombstones(session, [], list(event_ids))
+
                 logger.info(f"清理了 {deleted_count} 条旧数据")
 
         except SQLAlchemyError as e:
@@ -0,0 +1,173 @@
+"""全文检索管理器 - 负责OCR文本的关键词检索（FTS5 全文索引，不可用时退化为 LIKE）"""
+
+import re
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import case, column, or_, table, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from lifetrace.storage.database_base import OCR_FTS_TABLE, DatabaseBase
+from lifetrace.storage.models import OCRResult, Screenshot
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+# trigram 分词的最短可检索长度（更短的词只能用 LIKE 匹配）
+FTS_MIN_TERM_LENGTH = 3
+
+# 单次检索最多使用的关键词数量
+MAX_SEARCH_TERMS = 10
+
+# 按空白和标点切分关键词（保留 - _ . # / : 等标识符中常见的字符）
+_TERM_SPLIT_RE = re.compile(r"[\s,，。；;！!？?、\"'“”‘’()（）\[\]【】<>《》]+")
+
+_fts_table = table(OCR_FTS_TABLE, column("rowid"))
+
+
+def extract_search_terms(query: str | None) -> list[str]:
+    """将查询文本切分为关键词（去重，最多 MAX_SEARCH_TERMS 个）"""
+    terms = []
+    for term in _TERM_SPLIT_RE.split(query or ""):
+        if term and term not in terms:
+            terms.append(term)
+    return terms[:MAX_SEARCH_TERMS]
+
+
+class TextSearchManager:
+    """OCR文本全文检索管理类
+
+    关键词之间为“或”关系，FTS5 按 bm25 排序；时间和应用过滤在排序之前执行。
+    """
+
+    def __init__(self, db_base: DatabaseBase):
+        self.db_base = db_base
+        self._fts_available = None
+
+    def fts_available(self) -> bool:
+        """全文索引是否可用（首次调用时检查）"""
+        if self._fts_available is None:
+            try:
+                with self.db_base.get_session() as session:
+                    row = session.execute(
+                        text("SELECT name FROM sqlite_master WHERE type='table' AND name=:name"),
+                        {"name": OCR_FTS_TABLE},
+                    ).first()
+                    self._fts_available = row is not None
+            except SQLAlchemyError as e:
+                logger.error(f"检查全文索引失败: {e}")
+                return False
+        return self._fts_available
+
+    def _apply_filters(
+        self,
+        query,
+        start_date: datetime | None,
+        end_date: datetime | None,
+        app_names: list[str] | None,
+    ):
+        """过滤已删除的数据，并按截图时间和应用名称过滤"""
+        query = query.filter(OCRResult.deleted_at.is_(None), Screenshot.deleted_at.is_(None))
+        if start_date:
+            query = query.filter(Screenshot.created_at >= start_date)
+        if end_date:
+            query = query.filter(Screenshot.created_at <= end_date)
+        if app_names:
+            query = query.filter(or_(*[Screenshot.app_name.ilike(f"%{app}%") for app in app_names]))
+        return query
+
+    def search_ocr(
+        self,
+        terms: list[str],
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        app_names: list[str] | None = None,
+        limit: int = 100,
+    ) -> list[dict[str, Any]]:
+        """按关键词检索OCR结果
+
+        长度不少于 FTS_MIN_TERM_LENGTH 的关键词走全文索引（按 bm25 排序）；
+        只有更短的关键词或全文索引不可用时，按命中关键词数量和时间排序的 LIKE 匹配。
+
+        Args:
+            terms: 关键词列表（任一命中即可）
+            start_date: 开始时间
+            end_date: 结束时间
+            app_names: 应用名称列表（模糊匹配任一）
+            limit: 返回数量
+
+        Returns:
+            按相关性排序的结果列表，每项包含 ocr_result_id 和 screenshot_id
+        """
+        terms = [term for term in terms if term]
+        if not terms:
+            return []
+
+        fts_terms = [term for term in terms if len(term) >= FTS_MIN_TERM_LENGTH]
+        try:
+            with self.db_base.get_session() as session:
+                query = session.query(OCRResult.id, OCRResult.screenshot_id).join(
+                    Screenshot, OCRResult.screenshot_id == Screenshot.id
+                )
+                if fts_terms and self.fts_available():
+                    match = " OR ".join('"' + term.replace('"', '""') + '"' for term in fts_terms)
+                    query = (
+                        query.join(_fts_table, _fts_table.c.rowid == OCRResult.id)
+                        .filter(text(f"{OCR_FTS_TABLE} MATCH :match").bindparams(match=match))
+                        .order_by(text(f"bm25({OCR_FTS_TABLE})"))
+                    )
+                else:
+                    conditions = [OCRResult.text_content.like(f"%{term}%") for term in terms]
+                    hits = sum(case((condition, 1), else_=0) for condition in conditions)
+                    query = query.filter(or_(*conditions)).order_by(
+                        hits.desc(), Screenshot.created_at.desc()
+                    )
+
+                rows = (
+                    self._apply_filters(query, start_date, end_date, app_names).limit(limit).all()
+                )
+                return [{"ocr_result_id": row[0], "screenshot_id": row[1]} for row in rows]
+        except SQLAlchemyError as e:
+            logger.error(f"全文检索OCR结果失败: {e}")
+            return []
+
+    def get_search_records(
+        self,
+        ocr_result_ids: list[int],
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        app_names: list[str] | None = None,
+    ) -> dict[int, dict[str, Any]]:
+        """批量读取检索结果对应的OCR文本和截图信息，同时应用过滤条件
+
+        Returns:
+            OCR结果ID到记录的映射（已删除或不满足过滤条件的不包含在内）
+        """
+        if not ocr_result_ids:
+            return {}
+        try:
+            with self.db_base.get_session() as session:
+                query = session.query(OCRResult, Screenshot).join(
+                    Screenshot, OCRResult.screenshot_id == Screenshot.id
+                )
+                query = self._apply_filters(
+                    query.filter(OCRResult.id.in_(ocr_result_ids)), start_date, end_date, app_names
+                )
+                return {
+                    ocr_result.id: {
+                        "ocr_result_id": ocr_result.id,
+                        "screenshot_id": screenshot.id,
+                        "text_content": ocr_result.text_content,
+                        "file_path": screenshot.file_path,
+                        "app_name": screenshot.app_name,
+                        "window_title": screenshot.window_title,
+                        "created_at": screenshot.created_at,
+                        "width": screenshot.width,
+                        "height": screenshot.height,
+                        "file_deleted": screenshot.file_deleted or False,
+                    }
+                    for ocr_result, screenshot in query.all()
+                }
+        except SQLAlchemyError as e:
+            logger.error(f"读取检索结果记录失败: {e}")
+            return {}
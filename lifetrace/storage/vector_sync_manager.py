@@ -0,0 +1,266 @@
+"""向量同步管理器 - 负责向量库增量同步的高水位、变更读取和删除标记"""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from lifetrace.storage.database_base import DatabaseBase
+from lifetrace.storage.models import (
+    Event,
+    OCRResult,
+    Screenshot,
+    VectorSyncState,
+    VectorTombstone,
+)
+from lifetrace.storage.ocr_manager import build_ocr_record
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+# OCR结果同步状态名称
+OCR_SYNC = "ocr"
+
+# 同步状态
+STATUS_IDLE = "idle"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+
+def add_vector_tombstones(
+    session: Session, ocr_result_ids: list[int], event_ids: list[int] | None = None
+):
+    """记录被物理删除的OCR结果，在调用方的事务中写入
+
+    处理删除标记时删除OCR结果对应的向量文档；event_ids 为截图被删除的事件，
+    按剩余的文本重建事件分块文档（没有剩余文本时全部删除）。
+    """
+    for ocr_result_id in ocr_result_ids:
+        session.add(VectorTombstone(doc_id=f"ocr_{ocr_result_id}"))
+    for event_id in set(event_ids or []) - {None}:
+        session.add(VectorTombstone(doc_id=f"event_{event_id}"))
+
+
+class VectorSyncManager:
+    """向量同步状态管理类
+
+    OCR结果按 (updated_at, id) 升序读取，每批写入向量库后推进高水位，
+    新增和重新识别的结果都会被读到；同步中断后从高水位继续。
+    """
+
+    def __init__(self, db_base: DatabaseBase):
+        self.db_base = db_base
+
+    def _state_to_dict(self, state: VectorSyncState) -> dict[str, Any]:
+        """将同步状态对象转换为字典"""
+        return {
+            "name": state.name,
+            "status": state.status,
+            "last_updated_at": state.last_updated_at,
+            "last_ocr_id": state.last_ocr_id or 0,
+            "synced": state.synced or 0,
+            "deleted": state.deleted or 0,
+            "error": state.error,
+            "started_at": state.started_at,
+            "finished_at": state.finished_at,
+        }
+
+    def _get_or_create_state(self, session: Session, name: str) -> VectorSyncState:
+        state = session.query(VectorSyncState).filter(VectorSyncState.name == name).first()
+        if state is None:
+            state = VectorSyncState(name=name, status=STATUS_IDLE, last_ocr_id=0)
+            session.add(state)
+            session.flush()
+        return state
+
+    def get_state(self, name: str = OCR_SYNC) -> dict[str, Any] | None:
+        """获取同步状态（不存在时创建）"""
+        try:
+            with self.db_base.get_session() as session:
+                return self._state_to_dict(self._get_or_create_state(session, name))
+        except SQLAlchemyError as e:
+            logger.error(f"获取向量同步状态失败: {e}")
+            return None
+
+    def update_state(self, name: str = OCR_SYNC, **fields) -> bool:
+        """更新同步状态字段（高水位、状态、计数等）"""
+        try:
+            with self.db_base.get_session() as session:
+                state = self._get_or_create_state(session, name)
+                for key, value in fields.items():
+                    setattr(state, key, value)
+                return True
+        except SQLAlchemyError as e:
+            logger.error(f"更新向量同步状态失败: {e}")
+            return False
+
+    def reset_state(self, name: str = OCR_SYNC) -> bool:
+        """清空高水位（向量库被重置后调用，下次同步从头开始）"""
+        return self.update_state(
+            name,
+            status=STATUS_IDLE,
+            last_updated_at=None,
+            last_ocr_id=0,
+            synced=0,
+            deleted=0,
+            error=None,
+        )
+
+    def _changes_query(self, session: Session, last_updated_at: datetime | None, last_ocr_id: int):
+        query = session.query(OCRResult, Screenshot).outerjoin(
+            Screenshot, OCRResult.screenshot_id == Screenshot.id
+        )
+        if last_updated_at is not None:
+            query = query.filter(
+                or_(
+                    OCRResult.updated_at > last_updated_at,
+                    and_(OCRResult.updated_at == last_updated_at, OCRResult.id > last_ocr_id),
+                )
+            )
+        return query
+
+    def get_changed_records(
+        self, last_updated_at: datetime | None, last_ocr_id: int, limit: int
+    ) -> list[dict[str, Any]]:
+        """按 (updated_at, id) 从高水位之后读取一批OCR结果
+
+        Returns:
+            记录列表（build_ocr_record 的结果），额外包含：
+                updated_at: OCR结果更新时间（用于推进高水位）
+                deleted: OCR结果或截图已被删除，需要删除对应向量文档
+        """
+        try:
+            with self.db_base.get_session() as session:
+                rows = (
+                    self._changes_query(session, last_updated_at, last_ocr_id)
+                    .order_by(OCRResult.updated_at.asc(), OCRResult.id.asc())
+                    .limit(limit)
+                    .all()
+                )
+                records = []
+                for ocr_result, screenshot in rows:
+                    record = build_ocr_record(ocr_result, screenshot)
+                    record["updated_at"] = ocr_result.updated_at
+                    record["deleted"] = (
+                        ocr_result.deleted_at is not None
+                        or screenshot is None
+                        or screenshot.deleted_at is not None
+                    )
+                    records.append(record)
+                return records
+        except SQLAlchemyError as e:
+            logger.error(f"读取待同步OCR结果失败: {e}")
+            raise
+
+    def count_pending(self, last_updated_at: datetime | None, last_ocr_id: int) -> int:
+        """统计高水位之后尚未同步的OCR结果数量"""
+        try:
+            with self.db_base.get_session() as session:
+                return self._changes_query(session, last_updated_at, last_ocr_id).count()
+        except SQLAlchemyError as e:
+            logger.error(f"统计待同步OCR结果失败: {e}")
+            return 0
+
+    def get_tombstones(self, limit: int) -> list[tuple[int, str]]:
+        """获取一批删除标记
+
+        Returns:
+            (标记ID, 向量文档ID) 列表
+        """
+        try:
+            with self.db_base.get_session() as session:
+                rows = (
+                    session.query(VectorTombstone.id, VectorTombstone.doc_id)
+                    .order_by(VectorTombstone.id.asc())
+                    .limit(limit)
+                    .all()
+                )
+                return [(row.id, row.doc_id) for row in rows]
+        except SQLAlchemyError as e:
+            logger.error(f"获取向量删除标记失败: {e}")
+            return []
+
+    def count_tombstones(self) -> int:
+        """统计尚未处理的删除标记数量"""
+        try:
+            with self.db_base.get_session() as session:
+                return session.query(VectorTombstone).count()
+        except SQLAlchemyError as e:
+            logger.error(f"统计向量删除标记失败: {e}")
+            return 0
+
+    def delete_tombstones(self, tombstone_ids: list[int]) -> bool:
+        """删除已处理的删除标记"""
+        if not tombstone_ids:
+            return True
+        try:
+            with self.db_base.get_session() as session:
+                session.query(VectorTombstone).filter(
+                    VectorTombstone.id.in_(tombstone_ids)
+                ).delete(synchronize_session=False)
+                return True
+        except SQLAlchemyError as e:
+            logger.error(f"删除向量删除标记失败: {e}")
+            return False
+
+    def get_live_ocr_result_ids(self, ocr_result_ids: list[int]) -> set[int]:
+        """返回其中仍然有效（OCR结果和截图都未被删除）的OCR结果ID"""
+        if not ocr_result_ids:
+            return set()
+        try:
+            with self.db_base.get_session() as session:
+                rows = (
+                    session.query(OCRResult.id)
+                    .join(Screenshot, OCRResult.screenshot_id == Screenshot.id)
+                    .filter(
+                        OCRResult.id.in_(ocr_result_ids),
+                        OCRResult.deleted_at.is_(None),
+                        Screenshot.deleted_at.is_(None),
+                    )
+                    .all()
+                )
+                return {row.id for row in rows}
+        except SQLAlchemyError as e:
+            logger.error(f"查询有效OCR结果失败: {e}")
+            raise
+
+    def get_live_records(self, ocr_result_ids: list[int]) -> list[dict[str, Any]]:
+        """读取其中仍然有效的OCR结果（build_ocr_record 的结果，按ID排序）"""
+        if not ocr_result_ids:
+            return []
+        try:
+            with self.db_base.get_session() as session:
+                rows = (
+                    session.query(OCRResult, Screenshot)
+                    .join(Screenshot, OCRResult.screenshot_id == Screenshot.id)
+                    .filter(
+                        OCRResult.id.in_(ocr_result_ids),
+                        OCRResult.deleted_at.is_(None),
+                        Screenshot.deleted_at.is_(None),
+                    )
+                    .order_by(OCRResult.id.asc())
+                    .all()
+                )
+                return [build_ocr_record(ocr_result, screenshot) for ocr_result, screenshot in rows]
+        except SQLAlchemyError as e:
+            logger.error(f"读取有效OCR结果失败: {e}")
+            raise
+
+    def get_live_event_ids(self, event_ids: list[int]) -> set[int]:
+        """返回其中仍然有效（未被删除）的事件ID"""
+        if not event_ids:
+            return set()
+        try:
+            with self.db_base.get_session() as session:
+                rows = (
+                    session.query(Event.id)
+                    .filter(Event.id.in_(event_ids), Event.deleted_at.is_(None))
+                    .all()
+                )
+                return {row.id for row in rows}
+        except SQLAlchemyError as e:
+            logger.error(f"查询有效事件失败: {e}")
+            raise
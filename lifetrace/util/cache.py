@@ -0,0 +1,100 @@
+"""
+内存缓存工具
+提供带过期时间和容量上限的线程安全缓存，用于缓存短时间内会被重复查询的聚合结果。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+
+class TTLCache:
+    """带过期时间的 LRU 缓存"""
+
+    def __init__(self, ttl: float, max_size: int = 1024):
+        """
+        Args:
+            ttl: 缓存项的有效期（秒）
+            max_size: 最多缓存的项数，超出后淘汰最久未使用的项
+        """
+        self.ttl = ttl
+        self.max_size = max(1, int(max_size))
+        self._items: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _get_locked(self, key: Hashable, now: float) -> tuple[bool, Any]:
+        item = self._items.get(key)
+        if item is None:
+            return False, None
+        expires_at, value = item
+        if expires_at <= now:
+            del self._items[key]
+            return False, None
+        self._items.move_to_end(key)
+        return True, value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """获取缓存项，不存在或已过期时返回 default"""
+        with self._lock:
+            found, value = self._get_locked(key, time.monotonic())
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            return default
+
+    def get_many(self, keys: Iterable[Hashable]) -> dict[Hashable, Any]:
+        """批量获取缓存项，只返回命中的项"""
+        found_items = {}
+        with self._lock:
+            now = time.monotonic()
+            for key in keys:
+                found, value = self._get_locked(key, now)
+                if found:
+                    found_items[key] = value
+                    self.hits += 1
+                else:
+                    self.misses += 1
+        return found_items
+
+    def set(self, key: Hashable, value: Any):
+        """写入缓存项"""
+        self.set_many({key: value})
+
+    def set_many(self, items: dict[Hashable, Any]):
+        """批量写入缓存项"""
+        with self._lock:
+            expires_at = time.monotonic() + self.ttl
+            for key, value in items.items():
+                self._items[key] = (expires_at, value)
+                self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """删除缓存项"""
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._items.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取缓存统计信息"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._items),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
@@ -0,0 +1,273 @@
+"""
+模型注册表
+进程内共享 RapidOCR、嵌入模型、重排序模型等重量级模型：
+- 按名称注册加载函数，首次使用时才加载
+- 组件持有 ModelHandle 而不是模型本身，同一模型在进程内只加载一份
+- 引用计数记录正在使用模型的调用数，空闲超时且无人使用时自动卸载
+- 记录每个模型的加载耗时和内存占用
+"""
+
+import gc
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any
+
+import psutil
+
+from lifetrace.util.config import config
+from lifetrace.util.logging_config import get_logger
+
+logger = get_logger()
+
+
+def _estimate_model_bytes(model: Any) -> int | None:
+    """根据模型参数估算权重占用（PyTorch 模型），无法估算时返回None"""
+    module = model if hasattr(model, "parameters") else getattr(model, "model", None)
+    if module is None or not hasattr(module, "parameters"):
+        return None
+    try:
+        return sum(p.numel() * p.element_size() for p in module.parameters())
+    except Exception:
+        return None
+
+
+class _ModelEntry:
+    """单个模型的注册信息和运行状态"""
+
+    def __init__(self, name: str, loader: Callable[[], Any]):
+        self.name = name
+        self.loader = loader
+        self.model = None
+        self.lock = threading.Lock()
+        self.in_use = 0
+        self.holders = 0
+        self.last_used = 0.0
+        self.loaded_at: datetime | None = None
+        self.load_seconds = 0.0
+        self.memory_bytes: int | None = None
+        self.load_count = 0
+
+
+class ModelHandle:
+    """模型句柄，组件通过它访问共享模型
+
+    句柄本身很轻量，可以长期持有；模型被空闲卸载后，下次访问时会重新加载。
+    """
+
+    def __init__(self, registry: "ModelRegistry", name: str):
+        self._registry = registry
+        self.name = name
+
+    def get(self) -> Any:
+        """获取模型（必要时加载）"""
+        return self._registry.get(self.name)
+
+    @contextmanager
+    def use(self) -> Iterator[Any]:
+        """在使用期间持有引用，防止模型被空闲卸载"""
+        with self._registry.use(self.name) as model:
+            yield model
+
+    def release(self):
+        """释放句柄（不再使用该模型）"""
+        self._registry.release(self)
+
+
+class ModelRegistry:
+    """进程级模型注册表"""
+
+    def __init__(self, idle_timeout: float = 0, check_interval: float = 60):
+        """
+        Args:
+            idle_timeout: 模型空闲多久后卸载（秒），0 表示不卸载
+            check_interval: 空闲检查间隔（秒）
+        """
+        self.idle_timeout = float(idle_timeout)
+        self.check_interval = max(1.0, float(check_interval))
+        self._entries: dict[str, _ModelEntry] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._monitor: threading.Thread | None = None
+
+    def register(self, name: str, loader: Callable[[], Any]) -> ModelHandle:
+        """注册模型加载函数并返回句柄（同名模型只注册一次）"""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                entry = _ModelEntry(name, loader)
+                self._entries[name] = entry
+                logger.debug(f"注册模型: {name}")
+            entry.holders += 1
+        self._ensure_monitor()
+        return ModelHandle(self, name)
+
+    def release(self, handle: ModelHandle):
+        """释放句柄，最后一个持有者释放后立即卸载模型"""
+        entry = self._entries.get(handle.name)
+        if entry is None:
+            return
+        with entry.lock:
+            entry.holders = max(0, entry.holders - 1)
+            if entry.holders == 0 and entry.in_use == 0:
+                self._unload(entry)
+
+    def _load(self, entry: _ModelEntry):
+        """加载模型并记录耗时和内存占用（调用方持有 entry.lock）"""
+        process = psutil.Process()
+        rss_before = process.memory_info().rss
+        start = time.perf_counter()
+
+        logger.info(f"正在加载模型: {entry.name}")
+        entry.model = entry.loader()
+
+        entry.load_seconds = time.perf_counter() - start
+        entry.loaded_at = datetime.now()
+        entry.load_count += 1
+        # PyTorch 模型按参数大小计算；ONNX 等无法直接统计的按加载前后 RSS 差值估算
+        entry.memory_bytes = _estimate_model_bytes(entry.model)
+        if entry.memory_bytes is None:
+            entry.memory_bytes = max(0, process.memory_info().rss - rss_before)
+        logger.info(
+            f"模型 {entry.name} 加载完成，用时 {entry.load_seconds:.2f}秒，"
+            f"内存约 {entry.memory_bytes / 1024 / 1024:.1f} MB"
+        )
+
+    def _unload(self, entry: _ModelEntry):
+        """卸载模型（调用方持有 entry.lock）"""
+        if entry.model is None:
+            return
+        entry.model = None
+        entry.loaded_at = None
+        gc.collect()
+        logger.info(f"模型 {entry.name} 已卸载")
+
+    def _get_entry(self, name: str) -> _ModelEntry:
+        entry = self._entries.get(name)
+        if entry is None:
+            raise KeyError(f"模型 {name} 未注册")
+        return entry
+
+    def get(self, name: str) -> Any:
+        """获取模型（首次访问或被卸载后重新加载）"""
+        entry = self._get_entry(name)
+        with entry.lock:
+            if entry.model is None:
+                self._load(entry)
+            entry.last_used = time.monotonic()
+            return entry.model
+
+    @contextmanager
+    def use(self, name: str) -> Iterator[Any]:
+        """使用模型期间增加引用计数"""
+        entry = self._get_entry(name)
+        with entry.lock:
+            if entry.model is None:
+                self._load(entry)
+            entry.in_use += 1
+            model = entry.model
+        try:
+            yield model
+        finally:
+            with entry.lock:
+                entry.in_use -= 1
+                entry.last_used = time.monotonic()
+
+    def unload_idle(self) -> list[str]:
+        """卸载空闲超时且无人使用的模型
+
+        Returns:
+            被卸载的模型名称列表
+        """
+        if self.idle_timeout <= 0:
+            return []
+
+        unloaded = []
+        now = time.monotonic()
+        for entry in list(self._entries.values()):
+            with entry.lock:
+                if (
+                    entry.model is not None
+                    and entry.in_use == 0
+                    and now - entry.last_used > self.idle_timeout
+                ):
+                    self._unload(entry)
+                    unloaded.append(entry.name)
+        return unloaded
+
+    def unload_all(self):
+        """卸载所有未在使用中的模型"""
+        for entry in list(self._entries.values()):
+            with entry.lock:
+                if entry.in_use == 0:
+                    self._unload(entry)
+
+    def _ensure_monitor(self):
+        """启动空闲检查线程"""
+        if self.idle_timeout <= 0 or self._monitor is not None:
+            return
+        with self._lock:
+            if self._monitor is None:
+                self._monitor = threading.Thread(
+                    target=self._monitor_loop, name="ModelRegistryMonitor", daemon=True
+                )
+                self._monitor.start()
+
+    def _monitor_loop(self):
+        while not self._stop_event.wait(self.check_interval):
+            try:
+                self.unload_idle()
+            except Exception as e:
+                logger.error(f"模型空闲检查失败: {e}")
+
+    def stop(self):
+        """停止空闲检查线程"""
+        self._stop_event.set()
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取已注册模型的状态和内存占用"""
+        now = time.monotonic()
+        models = []
+        total_bytes = 0
+        for entry in list(self._entries.values()):
+            loaded = entry.model is not None
+            if loaded and entry.memory_bytes:
+                total_bytes += entry.memory_bytes
+            models.append(
+                {
+                    "name": entry.name,
+                    "loaded": loaded,
+                    "holders": entry.holders,
+                    "in_use": entry.in_use,
+                    "load_count": entry.load_count,
+                    "loaded_at": entry.loaded_at.isoformat() if entry.loaded_at else None,
+                    "load_seconds": entry.load_seconds,
+                    "idle_seconds": now - entry.last_used if loaded else None,
+                    "memory_mb": (entry.memory_bytes or 0) / 1024 / 1024 if loaded else 0.0,
+                }
+            )
+        return {
+            "idle_timeout": self.idle_timeout,
+            "total_memory_mb": total_bytes / 1024 / 1024,
+            "models": models,
+        }
+
+
+# 全局模型注册表实例
+_model_registry: ModelRegistry | None = None
+_model_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """获取全局模型注册表实例"""
+    global _model_registry
+    if _model_registry is None:
+        with _model_registry_lock:
+            if _model_registry is None:
+                _model_registry = ModelRegistry(
+                    idle_timeout=config.get("models.idle_unload_timeout"),
+                    check_interval=config.get("models.idle_check_interval"),
+                )
+    return _model_registry